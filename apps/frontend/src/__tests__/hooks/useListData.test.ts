@@ -97,4 +97,35 @@ describe('useListData Hook', () => {
 
     expect(result.current.currentPageSize).toBe(20);
   });
+
+  it('should append pages in cursor mode', async () => {
+    const cursorFetch = jest.fn(async (params) => {
+      if (!params.cursor) {
+        return { data: mockData.slice(0, 2), pageSize: 2, nextCursor: 'abc' };
+      }
+      return { data: mockData.slice(2), pageSize: 2, nextCursor: null };
+    });
+
+    const { result } = renderHook(() =>
+      useListData(cursorFetch as any, { pageSize: 2, mode: 'cursor' })
+    );
+
+    await waitFor(() => {
+      expect(result.current.hasMore).toBe(true);
+    });
+
+    expect(cursorFetch).toHaveBeenCalledWith(
+      expect.objectContaining({ cursor: '' })
+    );
+
+    await act(async () => {
+      await result.current.loadMore();
+    });
+
+    expect(cursorFetch).toHaveBeenCalledWith(
+      expect.objectContaining({ cursor: 'abc' })
+    );
+    expect(result.current.data).toEqual(mockData);
+    expect(result.current.hasMore).toBe(false);
+  });
 });
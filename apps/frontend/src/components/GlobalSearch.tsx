@@ -3,10 +3,22 @@ import { Search, Clock, Save, X, Star } from 'lucide-react';
 import { useSearchStore } from '@stores/search-store';
 import { useRecentItemsStore } from '@stores/recent-items-store';
 import { useNavigate } from 'react-router-dom';
+import { searchService } from '@/services/search-service';
+import type { SearchSuggestion } from '@types';
+
+const SUGGEST_DEBOUNCE_MS = 200;
+
+const SUGGESTION_PATHS: Record<SearchSuggestion['type'], string> = {
+  participant: '/participants',
+  dataset: '/datasets',
+  schema: '/schemas',
+  vocabulary: '/vocabularies',
+};
 
 export const GlobalSearch = () => {
   const [isOpen, setIsOpen] = useState(false);
   const [searchQuery, setSearchQuery] = useState('');
+  const [suggestions, setSuggestions] = useState<SearchSuggestion[]>([]);
   const inputRef = useRef<HTMLInputElement>(null);
   const containerRef = useRef<HTMLDivElement>(null);
   const navigate = useNavigate();
@@ -32,12 +44,37 @@ export const GlobalSearch = () => {
     return () => document.removeEventListener('mousedown', handleClickOutside);
   }, [isOpen]);
 
+  // Fetch type-ahead suggestions once typing pauses; stale responses are dropped
+  useEffect(() => {
+    const query = searchQuery.trim();
+    if (!query) {
+      setSuggestions([]);
+      return;
+    }
+
+    let cancelled = false;
+    const timeout = setTimeout(() => {
+      searchService
+        .suggest(query)
+        .then((results) => {
+          if (!cancelled) setSuggestions(results);
+        })
+        .catch(() => {
+          if (!cancelled) setSuggestions([]);
+        });
+    }, SUGGEST_DEBOUNCE_MS);
+
+    return () => {
+      cancelled = true;
+      clearTimeout(timeout);
+    };
+  }, [searchQuery]);
+
   const handleSearch = (query: string) => {
     if (!query.trim()) return;
 
     addToHistory(query);
-    // In a real app, this would navigate to a search results page
-    // For now, we'll just close the dropdown
+    navigate(`/search?q=${encodeURIComponent(query.trim())}`);
     setIsOpen(false);
     setSearchQuery('');
   };
@@ -106,6 +143,31 @@ export const GlobalSearch = () => {
             </div>
           )}
 
+          {/* Type-ahead Suggestions */}
+          {searchQuery && suggestions.length > 0 && (
+            <div className="p-3 border-b border-neutral-100">
+              <div className="space-y-1">
+                {suggestions.map((suggestion) => (
+                  <button
+                    key={`${suggestion.type}-${suggestion.id}`}
+                    onClick={() => {
+                      navigate(`${SUGGESTION_PATHS[suggestion.type]}/${suggestion.id}`);
+                      setIsOpen(false);
+                      setSearchQuery('');
+                    }}
+                    className="w-full text-left px-3 py-2 hover:bg-neutral-50 rounded-lg transition-colors flex items-center gap-2"
+                  >
+                    <Search size={14} className="text-neutral-400 flex-shrink-0" />
+                    <span className="text-sm text-neutral-900 flex-1 truncate">{suggestion.name}</span>
+                    <span className={`text-xs px-2 py-1 rounded ${getTypeColor(suggestion.type)}`}>
+                      {suggestion.type}
+                    </span>
+                  </button>
+                ))}
+              </div>
+            </div>
+          )}
+
           {/* Recent Items */}
           {recentItems.length > 0 && !searchQuery && (
             <div className="p-3 border-b border-neutral-100">
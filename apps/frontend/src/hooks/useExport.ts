@@ -4,18 +4,22 @@ import {
   exportToJSON,
   exportToJSONL,
   exportSelectedRecords,
+  downloadExport,
   getTimestampedFilename,
+  type ServerExportFormat,
 } from '@utils/data-export';
 
 interface UseExportOptions {
   idField?: string;
   entityName?: string;
+  /** URL of the service's streaming export, e.g. participantsService.getExportUrl */
+  exportUrl?: (format: ServerExportFormat) => string;
 }
 
 export function useExport<T extends Record<string, any>>(
   options: UseExportOptions = {}
 ) {
-  const { idField = 'id', entityName = 'data' } = options;
+  const { idField = 'id', entityName = 'data', exportUrl } = options;
   const [isExporting, setIsExporting] = useState(false);
 
   const exportAll = async (
@@ -67,9 +71,29 @@ export function useExport<T extends Record<string, any>>(
     }
   };
 
+  /**
+   * Export every record (not just the loaded page) by streaming the
+   * service's /export endpoint to disk
+   */
+  const exportFromServer = async (format: ServerExportFormat = 'csv') => {
+    if (!exportUrl) {
+      console.warn('No export URL configured');
+      return;
+    }
+
+    setIsExporting(true);
+    try {
+      const filename = getTimestampedFilename(`${entityName}.${format}`);
+      await downloadExport(exportUrl(format), filename);
+    } finally {
+      setIsExporting(false);
+    }
+  };
+
   return {
     isExporting,
     exportAll,
     exportSelected,
+    exportFromServer,
   };
 }
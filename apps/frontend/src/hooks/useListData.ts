@@ -12,18 +12,24 @@ export interface ListParams {
   search?: string;
   sort?: string;
   order?: 'asc' | 'desc';
+  cursor?: string;
 }
 
 interface UseListDataOptions {
   pageSize?: number;
   debounceMs?: number;
+  /**
+   * 'offset' uses page numbers (default), 'cursor' uses keyset pagination
+   * and appends pages via loadMore() for infinite scroll
+   */
+  mode?: 'offset' | 'cursor';
 }
 
 export function useListData<T>(
   fetchFn: (params: ListParams) => Promise<PaginatedResponse<T>>,
   options: UseListDataOptions = {}
 ) {
-  const { pageSize = 10, debounceMs = 500 } = options;
+  const { pageSize = 10, debounceMs = 500, mode = 'offset' } = options;
 
   // Use ref to store fetchFn to avoid dependency issues
   const fetchFnRef = useRef(fetchFn);
@@ -43,6 +49,8 @@ export function useListData<T>(
   const [sortField, setSortField] = useState<string>('');
   const [sortOrder, setSortOrder] = useState<'asc' | 'desc'>('asc');
   const [searchTimeout, setSearchTimeout] = useState<NodeJS.Timeout | null>(null);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
 
   // Fetch data whenever filters change
   const fetchData = useCallback(async () => {
@@ -51,24 +59,56 @@ export function useListData<T>(
 
     try {
       const response = await fetchFnRef.current({
-        page: currentPage,
+        page: mode === 'cursor' ? undefined : currentPage,
         pageSize: currentPageSize,
         search: searchQuery || undefined,
         sort: sortField || undefined,
         order: sortOrder,
+        // Empty cursor requests the first keyset page
+        cursor: mode === 'cursor' ? '' : undefined,
       });
 
       setData(response.data);
-      setTotalItems(response.total);
+      setTotalItems(response.total ?? response.data.length);
+      setNextCursor(response.nextCursor ?? null);
     } catch (err) {
       const message =
         err instanceof Error ? err.message : 'Failed to load data';
       setError(message);
       setData([]);
+      setNextCursor(null);
     } finally {
       setIsLoading(false);
     }
-  }, [currentPage, currentPageSize, searchQuery, sortField, sortOrder]);
+  }, [mode, currentPage, currentPageSize, searchQuery, sortField, sortOrder]);
+
+  // Append the next keyset page (cursor mode)
+  const loadMore = useCallback(async () => {
+    if (mode !== 'cursor' || !nextCursor || isLoadingMore) return;
+
+    setIsLoadingMore(true);
+    setError(null);
+
+    try {
+      const response = await fetchFnRef.current({
+        pageSize: currentPageSize,
+        search: searchQuery || undefined,
+        sort: sortField || undefined,
+        order: sortOrder,
+        cursor: nextCursor,
+      });
+
+      setData((prev) => [...prev, ...response.data]);
+      setTotalItems((prev) => response.total ?? prev + response.data.length);
+      setNextCursor(response.nextCursor ?? null);
+    } catch (err) {
+      const message =
+        err instanceof Error ? err.message : 'Failed to load data';
+      setError(message);
+    } finally {
+      setIsLoadingMore(false);
+    }
+  }, [mode, nextCursor, isLoadingMore, currentPageSize, searchQuery, sortField, sortOrder]);
 
   // Auto-fetch on mount and dependencies change
   useEffect(() => {
@@ -134,6 +174,10 @@ export function useListData<T>(
     handlePageSizeChange,
     handleSort,
     refresh,
+    loadMore,
+    hasMore: nextCursor !== null,
+    isLoadingMore,
+    nextCursor,
     totalPages: Math.ceil(totalItems / currentPageSize),
   };
 }
@@ -1,10 +1,12 @@
 import { useState, useEffect } from 'react';
 import { useListData } from '@hooks/useListData';
+import { useExport } from '@hooks/useExport';
 import { useCrudOperations } from '@hooks/useCrudOperations';
 import { datasetsService } from '@/services/datasets-service';
 import { DataTable } from '@components/DataTable';
 import { StatusBadge } from '@components/Badge';
 import { Button } from '@components/Button';
+import { ExportButton } from '@components/ExportButton';
 import { DatasetForm } from '@components/DatasetForm';
 import { ConfirmDialog } from '@components/ConfirmDialog';
 import { Plus, Edit2, Trash2 } from 'lucide-react';
@@ -33,6 +35,11 @@ export const Datasets = () => {
     pageSize: 10,
   });
 
+  const { isExporting, exportFromServer } = useExport({
+    entityName: 'datasets',
+    exportUrl: (format) => datasetsService.getExportUrl(format),
+  });
+
   const {
     isLoading: isCrudLoading,
     selectedItem,
@@ -65,6 +72,24 @@ export const Datasets = () => {
     }
   }, [error, addNotification]);
 
+  // Stream the full catalog from the broker rather than the loaded page
+  const handleExport = async (format: 'csv' | 'ndjson', label: string) => {
+    try {
+      await exportFromServer(format);
+      addNotification({
+        type: 'success',
+        title: 'Export Successful',
+        message: `Datasets exported as ${label}`,
+      });
+    } catch (err) {
+      addNotification({
+        type: 'error',
+        title: 'Export Failed',
+        message: err instanceof Error ? err.message : 'Failed to export datasets',
+      });
+    }
+  };
+
   const columns = [
     { key: 'name' as const, label: 'Dataset Name', sortable: true },
     { key: 'description' as const, label: 'Description', sortable: false, render: (v: string) => <div className="max-w-xs truncate" title={v}>{v}</div> },
@@ -108,7 +133,14 @@ export const Datasets = () => {
           <h1 className="text-3xl font-bold text-neutral-900">Datasets</h1>
           <p className="text-neutral-600 mt-2">Manage data assets and catalogs</p>
         </div>
-        <Button icon={<Plus size={16} />} onClick={openCreateModal}>Add Dataset</Button>
+        <div className="flex gap-2">
+          <ExportButton
+            onExportCSV={() => handleExport('csv', 'CSV')}
+            onExportJSONL={() => handleExport('ndjson', 'JSONL')}
+            isLoading={isExporting}
+          />
+          <Button icon={<Plus size={16} />} onClick={openCreateModal}>Add Dataset</Button>
+        </div>
       </div>
       <DataTable<Dataset>
         items={data}
@@ -37,8 +37,9 @@ export const Participants = () => {
     pageSize: 10,
   });
 
-  const { exportAll, exportSelected } = useExport({
+  const { isExporting, exportAll, exportSelected, exportFromServer } = useExport({
     entityName: 'participants',
+    exportUrl: (format) => participantsService.getExportUrl(format),
   });
 
   const {
@@ -73,17 +74,26 @@ export const Participants = () => {
     }
   }, [error, addNotification]); // Only trigger when error changes
 
-  const handleExportCSV = () => {
-    if (selectedIds.length > 0) {
-      exportSelected(data, selectedIds, 'csv');
-    } else {
-      exportAll(data, 'csv');
+  const handleExportCSV = async () => {
+    try {
+      if (selectedIds.length > 0) {
+        exportSelected(data, selectedIds, 'csv');
+      } else {
+        // Stream the full table from the broker instead of the loaded page
+        await exportFromServer('csv');
+      }
+      addNotification({
+        type: 'success',
+        title: 'Export Successful',
+        message: 'Participants exported as CSV',
+      });
+    } catch (err) {
+      addNotification({
+        type: 'error',
+        title: 'Export Failed',
+        message: err instanceof Error ? err.message : 'Failed to export participants',
+      });
     }
-    addNotification({
-      type: 'success',
-      title: 'Export Successful',
-      message: 'Participants exported as CSV',
-    });
   };
 
   const handleExportJSON = () => {
@@ -99,6 +109,27 @@ export const Participants = () => {
     });
   };
 
+  const handleExportJSONL = async () => {
+    try {
+      if (selectedIds.length > 0) {
+        exportSelected(data, selectedIds, 'jsonl');
+      } else {
+        await exportFromServer('ndjson');
+      }
+      addNotification({
+        type: 'success',
+        title: 'Export Successful',
+        message: 'Participants exported as JSONL',
+      });
+    } catch (err) {
+      addNotification({
+        type: 'error',
+        title: 'Export Failed',
+        message: err instanceof Error ? err.message : 'Failed to export participants',
+      });
+    }
+  };
+
   const columns = [
     {
       key: 'name' as const,
@@ -171,6 +202,8 @@ export const Participants = () => {
           <ExportButton
             onExportCSV={handleExportCSV}
             onExportJSON={handleExportJSON}
+            onExportJSONL={handleExportJSONL}
+            isLoading={isExporting}
             selectedCount={selectedIds.length}
           />
           <Button icon={<Plus size={16} />} onClick={openCreateModal}>Add Participant</Button>
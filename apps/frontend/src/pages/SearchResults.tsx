@@ -1,46 +1,13 @@
-import { useState, useMemo } from 'react';
+import { useState, useMemo, useEffect } from 'react';
 import { useLocation, useNavigate } from 'react-router-dom';
-import { Search, Clock, Trash2 } from 'lucide-react';
+import { Search, Clock, Trash2, Loader2 } from 'lucide-react';
 import { useSearchStore } from '@stores/search-store';
-import { useAdvancedSearch } from '@hooks/useAdvancedSearch';
 import { AdvancedFilters, FilterField } from '@components/AdvancedFilters';
+import { searchService } from '@/services/search-service';
+import type { SearchDocumentType, SearchHit, SearchResponse } from '@types';
 
-// Mock search data across all services
-const SEARCHABLE_ITEMS = [
-  // Participants
-  { id: 'p1', title: 'Global Data Partners Inc', description: 'Healthcare data partner', type: 'participant', category: 'Organization' },
-  { id: 'p2', title: 'Research Institute EU', description: 'Research data provider', type: 'participant', category: 'Organization' },
-  { id: 'p3', title: 'FinanceData Solutions', description: 'Financial data aggregator', type: 'participant', category: 'Organization' },
-
-  // Datasets
-  { id: 'd1', title: 'Patient Records 2024', description: 'Anonymized healthcare records', type: 'dataset', category: 'Healthcare' },
-  { id: 'd2', title: 'Market Analysis Data', description: 'Quarterly market insights', type: 'dataset', category: 'Finance' },
-  { id: 'd3', title: 'Climate Observations', description: 'Global climate measurement data', type: 'dataset', category: 'Environment' },
-
-  // Schemas
-  { id: 's1', title: 'HL7 FHIR Schema', description: 'Healthcare interoperability standard', type: 'schema', category: 'Healthcare' },
-  { id: 's2', title: 'Financial Transaction Schema', description: 'Transaction data structure', type: 'schema', category: 'Finance' },
-
-  // Policies
-  { id: 'pol1', title: 'Data Access Control Policy', description: 'Access rules for datasets', type: 'policy', category: 'Governance' },
-  { id: 'pol2', title: 'Retention Policy', description: 'Data retention guidelines', type: 'policy', category: 'Governance' },
-
-  // Contracts
-  { id: 'c1', title: 'Data Sharing Agreement 2024', description: 'Bilateral data sharing terms', type: 'contract', category: 'Legal' },
-  { id: 'c2', title: 'Service Level Agreement', description: 'Service availability terms', type: 'contract', category: 'Legal' },
-
-  // Vocabularies
-  { id: 'v1', title: 'Medical Terminology', description: 'ICD-10 medical codes', type: 'vocabulary', category: 'Healthcare' },
-  { id: 'v2', title: 'Industry Classifications', description: 'NAICS industry codes', type: 'vocabulary', category: 'Business' },
-
-  // Apps
-  { id: 'a1', title: 'Data Analysis Dashboard', description: 'Real-time analytics application', type: 'app', category: 'Analytics' },
-  { id: 'a2', title: 'Report Generator', description: 'Automated report creation tool', type: 'app', category: 'Reporting' },
-
-  // Connectors
-  { id: 'con1', title: 'PostgreSQL Connector', description: 'PostgreSQL database integration', type: 'connector', category: 'Database' },
-  { id: 'con2', title: 'REST API Connector', description: 'REST endpoint integration', type: 'connector', category: 'API' },
-];
+const SEARCH_DEBOUNCE_MS = 300;
+const PAGE_SIZE = 20;
 
 const FILTER_FIELDS: FilterField[] = [
   {
@@ -55,46 +22,98 @@ const FILTER_FIELDS: FilterField[] = [
       { value: 'contract', label: 'Contract' },
       { value: 'vocabulary', label: 'Vocabulary' },
       { value: 'app', label: 'App' },
-      { value: 'connector', label: 'Connector' },
     ],
   },
   {
-    key: 'category',
-    label: 'Category',
+    key: 'mode',
+    label: 'Match',
     type: 'select',
     options: [
-      { value: 'Organization', label: 'Organization' },
-      { value: 'Healthcare', label: 'Healthcare' },
-      { value: 'Finance', label: 'Finance' },
-      { value: 'Environment', label: 'Environment' },
-      { value: 'Governance', label: 'Governance' },
-      { value: 'Legal', label: 'Legal' },
-      { value: 'Business', label: 'Business' },
-      { value: 'Analytics', label: 'Analytics' },
-      { value: 'Reporting', label: 'Reporting' },
-      { value: 'Database', label: 'Database' },
-      { value: 'API', label: 'API' },
+      { value: 'fulltext', label: 'Words (prefix)' },
+      { value: 'fuzzy', label: 'Fuzzy (typo tolerant)' },
     ],
   },
 ];
 
-type ItemType = (typeof SEARCHABLE_ITEMS)[0];
+const RESULT_PATHS: Record<SearchDocumentType, string> = {
+  participant: '/participants',
+  dataset: '/datasets',
+  schema: '/schemas',
+  vocabulary: '/vocabularies',
+  policy: '/policies',
+  contract: '/contracts',
+  app: '/apps',
+};
 
 export const SearchResults = () => {
   const location = useLocation();
   const navigate = useNavigate();
-  const searchParams = new URLSearchParams(location.search);
-  const initialQuery = searchParams.get('q') || '';
+  const initialQuery = new URLSearchParams(location.search).get('q') || '';
 
   const [searchQuery, setSearchQuery] = useState(initialQuery);
   const [filters, setFilters] = useState<Record<string, any>>({});
+  const [page, setPage] = useState(1);
+  const [response, setResponse] = useState<SearchResponse | null>(null);
+  const [loading, setLoading] = useState(false);
+  const [error, setError] = useState<string | null>(null);
 
   const { getHistory, clearHistory } = useSearchStore();
   const searchHistory = getHistory();
 
-  const { results } = useAdvancedSearch(SEARCHABLE_ITEMS as ItemType[], searchQuery, filters, {
-    searchFields: ['title', 'description', 'category'],
-  });
+  // A new search from the global search box replaces the current query
+  useEffect(() => {
+    setSearchQuery(initialQuery);
+  }, [initialQuery]);
+
+  useEffect(() => {
+    setPage(1);
+  }, [searchQuery, filters]);
+
+  // One request to the unified index once typing pauses; stale responses are dropped
+  useEffect(() => {
+    const query = searchQuery.trim();
+    if (!query) {
+      setResponse(null);
+      setError(null);
+      return;
+    }
+
+    let cancelled = false;
+    const timeout = setTimeout(() => {
+      setLoading(true);
+      searchService
+        .search(query, {
+          types: filters.type ? [filters.type] : undefined,
+          mode: filters.mode,
+          page,
+          pageSize: PAGE_SIZE,
+        })
+        .then((result) => {
+          if (!cancelled) {
+            setResponse(result);
+            setError(null);
+          }
+        })
+        .catch((err) => {
+          if (!cancelled) {
+            setResponse(null);
+            setError(err instanceof Error ? err.message : 'Failed to search');
+          }
+        })
+        .finally(() => {
+          if (!cancelled) setLoading(false);
+        });
+    }, SEARCH_DEBOUNCE_MS);
+
+    return () => {
+      cancelled = true;
+      clearTimeout(timeout);
+    };
+  }, [searchQuery, filters, page]);
+
+  const results = useMemo(() => response?.data || [], [response]);
+  const total = response?.total ?? results.length;
+  const totalPages = response?.totalPages ?? 1;
 
   const getTypeColor = (type: string) => {
     const colors: Record<string, string> = {
@@ -113,37 +132,8 @@ export const SearchResults = () => {
     return colors[type] || 'bg-neutral-100 text-neutral-900 border-neutral-300';
   };
 
-  const getCategoryIcon = (category: string) => {
-    const icons: Record<string, string> = {
-      Organization: '🏢',
-      Healthcare: '🏥',
-      Finance: '💰',
-      Environment: '🌍',
-      Governance: '⚖️',
-      Legal: '📋',
-      Business: '📊',
-      Analytics: '📈',
-      Reporting: '📑',
-      Database: '🗄️',
-      API: '🔌',
-    };
-    return icons[category] || '📄';
-  };
-
-  const handleItemClick = (item: ItemType) => {
-    // Navigate to detail page based on type
-    const routes: Record<string, string> = {
-      participant: '/participants',
-      dataset: '/datasets',
-      schema: '/schemas',
-      vocabulary: '/vocabularies',
-      policy: '/policies',
-      contract: '/contracts',
-      app: '/apps',
-      connector: '/connectors',
-    };
-    const basePath = routes[item.type] || '/';
-    navigate(`${basePath}/${item.id}`);
+  const handleItemClick = (item: SearchHit) => {
+    navigate(`${RESULT_PATHS[item.type] || ''}/${item.id}`);
   };
 
   const groupedResults = useMemo(() => {
@@ -154,7 +144,7 @@ export const SearchResults = () => {
         acc[type].push(item);
         return acc;
       },
-      {} as Record<string, ItemType[]>
+      {} as Record<string, SearchHit[]>
     );
   }, [results]);
 
@@ -164,7 +154,7 @@ export const SearchResults = () => {
       <div>
         <h1 className="text-3xl font-bold text-neutral-900 mb-2">Search Results</h1>
         <p className="text-neutral-600">
-          {results.length} result{results.length !== 1 ? 's' : ''} found
+          {total} result{total !== 1 ? 's' : ''} found
           {searchQuery && ` for "${searchQuery}"`}
         </p>
       </div>
@@ -215,17 +205,23 @@ export const SearchResults = () => {
       )}
 
       {/* Results */}
-      {results.length > 0 ? (
+      {loading && results.length === 0 ? (
+        <div className="p-12 flex justify-center">
+          <Loader2 size={24} className="animate-spin text-neutral-400" />
+        </div>
+      ) : error ? (
+        <div className="p-4 bg-red-50 border border-red-200 rounded-lg text-sm text-red-700">{error}</div>
+      ) : results.length > 0 ? (
         <div className="space-y-6">
           {Object.entries(groupedResults).map(([type, items]) => (
             <div key={type}>
               <h2 className="text-lg font-semibold text-neutral-900 mb-3 capitalize">
-                {type}s ({items.length})
+                {type}s ({response?.facets[type as SearchDocumentType] ?? items.length})
               </h2>
               <div className="grid gap-3">
                 {items.map((item) => (
                   <button
-                    key={item.id}
+                    key={`${item.type}-${item.id}`}
                     onClick={() => handleItemClick(item)}
                     className="p-4 bg-white border border-neutral-200 rounded-lg hover:shadow-md hover:border-primary-300 transition-all text-left group"
                   >
@@ -234,16 +230,14 @@ export const SearchResults = () => {
                         <h3 className="font-semibold text-neutral-900 group-hover:text-primary-600 transition-colors">
                           {item.title}
                         </h3>
-                        <p className="text-sm text-neutral-600 mt-1">{item.description}</p>
+                        {item.body && <p className="text-sm text-neutral-600 mt-1">{item.body}</p>}
                       </div>
                       <div className="flex flex-col gap-2 items-end">
                         <span className={`px-2.5 py-1 rounded-full text-xs font-medium border capitalize ${getTypeColor(item.type)}`}>
                           {item.type}
                         </span>
-                        {item.category && (
-                          <span className="text-sm text-neutral-500 flex items-center gap-1">
-                            {getCategoryIcon(item.category)} {item.category}
-                          </span>
+                        {item.status && (
+                          <span className="text-sm text-neutral-500 capitalize">{item.status}</span>
                         )}
                       </div>
                     </div>
@@ -252,6 +246,29 @@ export const SearchResults = () => {
               </div>
             </div>
           ))}
+
+          {/* Pagination */}
+          {totalPages > 1 && (
+            <div className="flex items-center justify-between">
+              <button
+                onClick={() => setPage(page - 1)}
+                disabled={page <= 1 || loading}
+                className="px-4 py-2 border border-neutral-200 rounded-lg text-sm disabled:opacity-50"
+              >
+                Previous
+              </button>
+              <span className="text-sm text-neutral-600">
+                Page {page} of {totalPages}
+              </span>
+              <button
+                onClick={() => setPage(page + 1)}
+                disabled={page >= totalPages || loading}
+                className="px-4 py-2 border border-neutral-200 rounded-lg text-sm disabled:opacity-50"
+              >
+                Next
+              </button>
+            </div>
+          )}
         </div>
       ) : (
         <div className="p-12 text-center bg-neutral-50 rounded-lg border border-neutral-200">
@@ -1,10 +1,11 @@
 import { useState, useEffect } from 'react';
 import { useListData } from '@hooks/useListData';
+import { useExport } from '@hooks/useExport';
 import { transactionsService } from '@/services/transactions-service';
 import { DataTable } from '@components/DataTable';
-import { Button } from '@components/Button';
+import { ExportButton } from '@components/ExportButton';
 import { TransactionForm } from '@components/TransactionForm';
-import { Download, Eye } from 'lucide-react';
+import { Eye } from 'lucide-react';
 import { useNotificationStore } from '@stores/notification-store';
 import type { Transaction } from '@types';
 
@@ -31,6 +32,11 @@ export const Transactions = () => {
     pageSize: 10,
   });
 
+  const { isExporting, exportFromServer } = useExport({
+    entityName: 'transactions',
+    exportUrl: (format) => transactionsService.getExportUrl(format),
+  });
+
   // Show error notifications
   useEffect(() => {
     if (error) {
@@ -42,6 +48,24 @@ export const Transactions = () => {
     }
   }, [error, addNotification]);
 
+  // Stream the whole ledger rather than the loaded page
+  const handleExport = async (format: 'csv' | 'ndjson', label: string) => {
+    try {
+      await exportFromServer(format);
+      addNotification({
+        type: 'success',
+        title: 'Export Successful',
+        message: `Ledger exported as ${label}`,
+      });
+    } catch (err) {
+      addNotification({
+        type: 'error',
+        title: 'Export Failed',
+        message: err instanceof Error ? err.message : 'Failed to export ledger',
+      });
+    }
+  };
+
   const openViewModal = (transaction: Transaction) => {
     setSelectedTransaction(transaction);
     setIsViewModalOpen(true);
@@ -85,7 +109,11 @@ export const Transactions = () => {
           <h1 className="text-3xl font-bold text-neutral-900">Transactions</h1>
           <p className="text-neutral-600 mt-2">View ledger and transaction logs (read-only)</p>
         </div>
-        <Button icon={<Download size={16} />} disabled>Export Ledger</Button>
+        <ExportButton
+          onExportCSV={() => handleExport('csv', 'CSV')}
+          onExportJSONL={() => handleExport('ndjson', 'JSONL')}
+          isLoading={isExporting}
+        />
       </div>
       <DataTable<Transaction>
         items={data}
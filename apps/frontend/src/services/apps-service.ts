@@ -13,6 +13,7 @@ export interface ListParams {
   search?: string;
   sort?: string;
   order?: 'asc' | 'desc';
+  cursor?: string;
 }
 
 export interface CreateAppData {
@@ -46,6 +47,7 @@ class AppsService {
       if (params?.search) queryParams.search = params.search;
       if (params?.sort) queryParams.sort = params.sort;
       if (params?.order) queryParams.order = params.order;
+      if (params?.cursor !== undefined) queryParams.cursor = params.cursor;
 
       const response = await appstoreClient.get<PaginatedResponse<App>>(
         '/apps',
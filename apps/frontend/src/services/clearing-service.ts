@@ -13,6 +13,7 @@ export interface ListParams {
   search?: string;
   sort?: string;
   order?: 'asc' | 'desc';
+  cursor?: string;
 }
 
 export interface CreateClearingRecordData {
@@ -44,6 +45,7 @@ class ClearingService {
       if (params?.search) queryParams.search = params.search;
       if (params?.sort) queryParams.sort = params.sort;
       if (params?.order) queryParams.order = params.order;
+      if (params?.cursor !== undefined) queryParams.cursor = params.cursor;
 
       const response = await clearingClient.get<PaginatedResponse<ClearingRecord>>(
         '/clearing-records',
@@ -13,6 +13,7 @@ export interface ListParams {
   search?: string;
   sort?: string;
   order?: 'asc' | 'desc';
+  cursor?: string;
 }
 
 export interface CreateContractData {
@@ -48,6 +49,7 @@ class ContractsService {
       if (params?.search) queryParams.search = params.search;
       if (params?.sort) queryParams.sort = params.sort;
       if (params?.order) queryParams.order = params.order;
+      if (params?.cursor !== undefined) queryParams.cursor = params.cursor;
 
       const response = await contractClient.get<PaginatedResponse<Contract>>(
         '/contracts',
@@ -5,6 +5,7 @@
  */
 
 import { brokerClient } from '@/utils/api-client';
+import type { ServerExportFormat } from '@/utils/data-export';
 import type { Dataset, PaginatedResponse } from '@types';
 
 export interface ListParams {
@@ -13,6 +14,7 @@ export interface ListParams {
   search?: string;
   sort?: string;
   order?: 'asc' | 'desc';
+  cursor?: string;
 }
 
 export interface CreateDatasetData {
@@ -30,6 +32,15 @@ export interface UpdateDatasetData {
 }
 
 class DatasetsService {
+  /**
+   * Get the URL of the streaming export of all datasets
+   * @param format - Export format (csv or ndjson)
+   * @returns Absolute export URL
+   */
+  getExportUrl(format: ServerExportFormat): string {
+    return brokerClient.getUrl('/datasets/export', { format });
+  }
+
   /**
    * Get paginated list of datasets with optional filters
    */
@@ -43,6 +54,7 @@ class DatasetsService {
       if (params?.search) queryParams.search = params.search;
       if (params?.sort) queryParams.sort = params.sort;
       if (params?.order) queryParams.order = params.order;
+      if (params?.cursor !== undefined) queryParams.cursor = params.cursor;
 
       const response = await brokerClient.get<PaginatedResponse<Dataset>>(
         '/datasets',
@@ -5,6 +5,7 @@
  */
 
 import { brokerClient } from '@/utils/api-client';
+import type { ServerExportFormat } from '@/utils/data-export';
 import type { Participant, PaginatedResponse } from '@types';
 
 export interface ListParams {
@@ -13,6 +14,7 @@ export interface ListParams {
   search?: string;
   sort?: string;
   order?: 'asc' | 'desc';
+  cursor?: string;
 }
 
 export interface CreateParticipantData {
@@ -32,6 +34,15 @@ export interface UpdateParticipantData {
 }
 
 class ParticipantsService {
+  /**
+   * Get the URL of the streaming export of all participants
+   * @param format - Export format (csv or ndjson)
+   * @returns Absolute export URL
+   */
+  getExportUrl(format: ServerExportFormat): string {
+    return brokerClient.getUrl('/participants/export', { format });
+  }
+
   /**
    * Get paginated list of participants with optional filters
    * @param params - Pagination and filter parameters
@@ -48,6 +59,7 @@ class ParticipantsService {
       if (params?.search) queryParams.search = params.search;
       if (params?.sort) queryParams.sort = params.sort;
       if (params?.order) queryParams.order = params.order;
+      if (params?.cursor !== undefined) queryParams.cursor = params.cursor;
 
       const response = await brokerClient.get<PaginatedResponse<Participant>>(
         '/participants',
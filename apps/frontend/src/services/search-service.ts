@@ -0,0 +1,66 @@
+/**
+ * Search Service
+ * Unified search across all services and type-ahead suggestions for the global search box
+ * Backend: Broker Service (Port 3001) /search and /suggest, Hub Service (Port 3002) /suggest
+ */
+
+import { brokerClient, hubClient } from '@/utils/api-client';
+import type { SearchDocumentType, SearchResponse, SearchSuggestion } from '@types';
+
+export interface SearchParams {
+  types?: SearchDocumentType[];
+  mode?: 'fulltext' | 'fuzzy';
+  page?: number;
+  pageSize?: number;
+}
+
+class SearchService {
+  /**
+   * Ranked, paginated search over the broker's unified index of participants,
+   * datasets, schemas, vocabularies, policies, contracts and apps
+   * @param query - Search text
+   * @param params - Type filter, match mode and page
+   * @returns Page of hits with per-type match counts
+   */
+  async search(query: string, params?: SearchParams): Promise<SearchResponse> {
+    try {
+      const queryParams: Record<string, any> = {
+        q: query,
+        page: params?.page || 1,
+        pageSize: params?.pageSize || 20,
+      };
+
+      if (params?.types?.length) queryParams.type = params.types.join(',');
+      if (params?.mode) queryParams.mode = params.mode;
+
+      return await brokerClient.get<SearchResponse>('/search', queryParams);
+    } catch (error) {
+      const message = error instanceof Error ? error.message : 'Failed to search';
+      console.error('SearchService.search:', message);
+      throw new Error(`Failed to search: ${message}`);
+    }
+  }
+
+  /**
+   * Get top name suggestions across participants, datasets, schemas and vocabularies
+   * @param query - Partial text typed by the user
+   * @param limit - Maximum number of suggestions
+   * @returns Suggestions, best match first (a failing backend contributes none)
+   */
+  async suggest(query: string, limit: number = 8): Promise<SearchSuggestion[]> {
+    const params = { q: query, limit };
+    const results = await Promise.allSettled([
+      brokerClient.get<{ data: SearchSuggestion[] }>('/suggest', params),
+      hubClient.get<{ data: SearchSuggestion[] }>('/suggest', params),
+    ]);
+
+    return results
+      .flatMap((result) => (result.status === 'fulfilled' ? result.value.data : []))
+      .sort((a, b) => b.score - a.score)
+      .slice(0, limit);
+  }
+}
+
+// Export singleton instance
+export const searchService = new SearchService();
+export default searchService;
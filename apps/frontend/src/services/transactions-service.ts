@@ -5,6 +5,7 @@
  */
 
 import { ledgerClient } from '@/utils/api-client';
+import type { ServerExportFormat } from '@/utils/data-export';
 import type { Transaction, PaginatedResponse } from '@types';
 
 export interface ListParams {
@@ -13,9 +14,19 @@ export interface ListParams {
   search?: string;
   sort?: string;
   order?: 'asc' | 'desc';
+  cursor?: string;
 }
 
 class TransactionsService {
+  /**
+   * Get the URL of the streaming export of all transactions
+   * @param format - Export format (csv or ndjson)
+   * @returns Absolute export URL
+   */
+  getExportUrl(format: ServerExportFormat): string {
+    return ledgerClient.getUrl('/transactions/export', { format });
+  }
+
   /**
    * Get paginated list of transactions (READ-ONLY)
    */
@@ -29,6 +40,7 @@ class TransactionsService {
       if (params?.search) queryParams.search = params.search;
       if (params?.sort) queryParams.sort = params.sort;
       if (params?.order) queryParams.order = params.order;
+      if (params?.cursor !== undefined) queryParams.cursor = params.cursor;
 
       const response = await ledgerClient.get<PaginatedResponse<Transaction>>(
         '/transactions',
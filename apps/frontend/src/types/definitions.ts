@@ -195,6 +195,8 @@ export interface PaginatedResponse<T> {
   page: number;
   pageSize: number;
   totalPages: number;
+  /** Opaque cursor for the next page (cursor mode only, null on last page) */
+  nextCursor?: string | null;
 }
 
 // ============= Metrics =============
@@ -231,3 +233,38 @@ export interface Vocabulary {
   createdAt: string;
   updatedAt: string;
 }
+
+// ============= Search =============
+export interface SearchSuggestion {
+  type: 'participant' | 'dataset' | 'schema' | 'vocabulary';
+  id: string;
+  name: string;
+  /** Trigram word similarity to the query, 0..1 */
+  score: number;
+}
+
+export type SearchDocumentType =
+  | 'participant'
+  | 'dataset'
+  | 'schema'
+  | 'vocabulary'
+  | 'policy'
+  | 'contract'
+  | 'app';
+
+export interface SearchHit {
+  type: SearchDocumentType;
+  id: string;
+  title: string;
+  body?: string | null;
+  status?: string | null;
+  metadata: Record<string, unknown>;
+  /** Relevance rank from the unified index, higher is better */
+  score: number;
+  updatedAt: string;
+}
+
+export interface SearchResponse extends PaginatedResponse<SearchHit> {
+  /** Matches per type for the query, ignoring the type filter */
+  facets: Partial<Record<SearchDocumentType, number>>;
+}
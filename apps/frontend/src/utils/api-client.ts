@@ -86,6 +86,14 @@ class ApiClient {
     }
   }
 
+  /**
+   * Resolve a path and query params to an absolute URL, for requests made
+   * outside axios such as streamed downloads
+   */
+  getUrl(path: string, params?: Record<string, any>): string {
+    return this.axiosInstance.getUri({ url: path, params });
+  }
+
   private handleError(error: any): Error {
     if (axios.isAxiosError(error)) {
       const message = error.response?.data?.message || error.message;
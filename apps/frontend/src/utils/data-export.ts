@@ -148,7 +148,13 @@ export const downloadFile = (
   filename: string,
   mimeType: string
 ) => {
-  const blob = new Blob([content], { type: mimeType });
+  saveBlob(new Blob([content], { type: mimeType }), filename);
+};
+
+/**
+ * Trigger a browser download of a blob through a temporary object URL
+ */
+const saveBlob = (blob: Blob, filename: string) => {
   const url = URL.createObjectURL(blob);
   const link = document.createElement('a');
   link.href = url;
@@ -159,6 +165,58 @@ export const downloadFile = (
   URL.revokeObjectURL(url);
 };
 
+/**
+ * Formats produced by the services' streaming /export endpoints
+ */
+export type ServerExportFormat = 'csv' | 'ndjson';
+
+/**
+ * Fetch a service URL with the stored auth token, failing on non-2xx
+ */
+const fetchExport = async (url: string): Promise<Response> => {
+  const token = localStorage.getItem('authToken');
+  const response = await fetch(url, {
+    headers: token ? { Authorization: `Bearer ${token}` } : {},
+  });
+  if (!response.ok) {
+    throw new Error(`Export failed with status ${response.status}`);
+  }
+  return response;
+};
+
+/**
+ * Download a server-side export.
+ * Where the File System Access API is available the response body is piped
+ * straight into the chosen file without being held in memory; otherwise the
+ * response is read into a blob and saved through a temporary object URL. Both
+ * paths send the auth token, so exports work when the services require it.
+ */
+export const downloadExport = async (url: string, filename: string): Promise<void> => {
+  const showSaveFilePicker = (window as any).showSaveFilePicker;
+
+  if (typeof showSaveFilePicker === 'function') {
+    let handle;
+    try {
+      handle = await showSaveFilePicker({ suggestedName: filename });
+    } catch (error) {
+      // The user closed the save dialog
+      if (error instanceof DOMException && error.name === 'AbortError') return;
+      throw error;
+    }
+
+    const response = await fetchExport(url);
+    if (!response.body) {
+      throw new Error('Export returned an empty response');
+    }
+
+    await response.body.pipeTo(await handle.createWritable());
+    return;
+  }
+
+  const response = await fetchExport(url);
+  saveBlob(await response.blob(), filename);
+};
+
 /**
  * Generate a timestamp suffix for filenames
  */
@@ -5,6 +5,7 @@
 -- Enable UUID extension
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 CREATE EXTENSION IF NOT EXISTS "pgcrypto";
+CREATE EXTENSION IF NOT EXISTS "pg_trgm";
 
 -- Audit table for tracking changes
 CREATE TABLE IF NOT EXISTS audit_log (
@@ -41,11 +42,20 @@ CREATE TABLE IF NOT EXISTS participants (
   public_key TEXT,
   status VARCHAR(50) DEFAULT 'active' CHECK (status IN ('active', 'inactive', 'suspended')),
   created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-  updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+  updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+  search_vector tsvector GENERATED ALWAYS AS (
+    setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+    setweight(to_tsvector('simple', coalesce(did, '')), 'A') ||
+    setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+  ) STORED
 );
 
 CREATE INDEX idx_participants_did ON participants(did);
 CREATE INDEX idx_participants_status ON participants(status);
+CREATE INDEX idx_participants_search ON participants USING GIN (search_vector);
+CREATE INDEX idx_participants_name_trgm ON participants USING GIN (name gin_trgm_ops);
+CREATE INDEX idx_participants_did_trgm ON participants USING GIN (did gin_trgm_ops);
+CREATE INDEX idx_participants_keyset ON participants(created_at DESC, id DESC);
 
 -- Datasets registry (for Broker)
 CREATE TABLE IF NOT EXISTS datasets (
@@ -56,11 +66,19 @@ CREATE TABLE IF NOT EXISTS datasets (
   schema_ref VARCHAR(255),
   status VARCHAR(50) DEFAULT 'published' CHECK (status IN ('draft', 'published', 'archived')),
   created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-  updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+  updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+  search_vector tsvector GENERATED ALWAYS AS (
+    setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+    setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+  ) STORED
 );
 
 CREATE INDEX idx_datasets_participant ON datasets(participant_id);
 CREATE INDEX idx_datasets_status ON datasets(status);
+CREATE INDEX idx_datasets_search ON datasets USING GIN (search_vector);
+CREATE INDEX idx_datasets_name_trgm ON datasets USING GIN (name gin_trgm_ops);
+CREATE INDEX idx_datasets_keyset ON datasets(created_at DESC, id DESC);
+CREATE INDEX idx_datasets_participant_keyset ON datasets(participant_id, created_at DESC, id DESC);
 
 -- Policies registry (for Policy Authority)
 CREATE TABLE IF NOT EXISTS policies (
@@ -110,11 +128,14 @@ CREATE TABLE IF NOT EXISTS credentials (
 CREATE INDEX idx_credentials_client_id ON credentials(client_id);
 CREATE INDEX idx_credentials_participant ON credentials(participant_id);
 CREATE INDEX idx_credentials_status ON credentials(status);
+CREATE INDEX idx_credentials_keyset ON credentials(created_at DESC, id DESC);
+CREATE INDEX idx_credentials_participant_keyset ON credentials(participant_id, created_at DESC, id DESC);
 
 -- API Keys registry (for IDP)
 CREATE TABLE IF NOT EXISTS api_keys (
   id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-  key VARCHAR(255) UNIQUE NOT NULL,
+  key_prefix VARCHAR(16) NOT NULL,
+  key_hash CHAR(64) NOT NULL,
   name VARCHAR(255) NOT NULL,
   participant_id UUID NOT NULL REFERENCES participants(id),
   scope TEXT[] DEFAULT ARRAY['read:*'],
@@ -125,9 +146,26 @@ CREATE TABLE IF NOT EXISTS api_keys (
   expires_at TIMESTAMP WITH TIME ZONE
 );
 
-CREATE INDEX idx_api_keys_key ON api_keys(key);
+CREATE UNIQUE INDEX idx_api_keys_key_hash ON api_keys(key_hash);
 CREATE INDEX idx_api_keys_participant ON api_keys(participant_id);
 CREATE INDEX idx_api_keys_status ON api_keys(status);
+CREATE INDEX idx_api_keys_keyset ON api_keys(created_at DESC, id DESC);
+CREATE INDEX idx_api_keys_participant_keyset ON api_keys(participant_id, created_at DESC, id DESC);
+
+-- Refresh tokens (for IDP), stored hashed and redeemed once
+CREATE TABLE IF NOT EXISTS refresh_tokens (
+  id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+  token_hash CHAR(64) NOT NULL,
+  credential_id UUID NOT NULL REFERENCES credentials(id) ON DELETE CASCADE,
+  access_token_id UUID NOT NULL,
+  scope TEXT[] NOT NULL,
+  created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+  used_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE UNIQUE INDEX idx_refresh_tokens_token_hash ON refresh_tokens(token_hash);
+CREATE INDEX idx_refresh_tokens_credential ON refresh_tokens(credential_id);
 
 -- Schemas registry (for Hub Service)
 CREATE TABLE IF NOT EXISTS schemas (
@@ -145,6 +183,8 @@ CREATE TABLE IF NOT EXISTS schemas (
 CREATE INDEX idx_schemas_namespace ON schemas(namespace);
 CREATE INDEX idx_schemas_status ON schemas(status);
 CREATE UNIQUE INDEX idx_schemas_namespace_version ON schemas(namespace, version);
+CREATE INDEX idx_schemas_name_trgm ON schemas USING GIN (name gin_trgm_ops);
+CREATE INDEX idx_schemas_keyset ON schemas(created_at DESC, id DESC);
 
 -- Vocabularies registry (for Hub Service)
 CREATE TABLE IF NOT EXISTS vocabularies (
@@ -161,6 +201,8 @@ CREATE TABLE IF NOT EXISTS vocabularies (
 CREATE INDEX idx_vocabularies_namespace ON vocabularies(namespace);
 CREATE INDEX idx_vocabularies_status ON vocabularies(status);
 CREATE UNIQUE INDEX idx_vocabularies_namespace_version ON vocabularies(namespace, version);
+CREATE INDEX idx_vocabularies_name_trgm ON vocabularies USING GIN (name gin_trgm_ops);
+CREATE INDEX idx_vocabularies_keyset ON vocabularies(created_at DESC, id DESC);
 
 -- Policies registry (for TrustCore Policy Service)
 CREATE TABLE IF NOT EXISTS trustcore_policies (
@@ -175,6 +217,7 @@ CREATE TABLE IF NOT EXISTS trustcore_policies (
 
 CREATE INDEX idx_trustcore_policies_status ON trustcore_policies(status);
 CREATE INDEX idx_trustcore_policies_name ON trustcore_policies(name);
+CREATE INDEX idx_trustcore_policies_keyset ON trustcore_policies(created_at DESC, id DESC);
 
 -- Ledger entries (for TrustCore Ledger Service)
 CREATE TABLE IF NOT EXISTS trustcore_ledger (
@@ -189,6 +232,7 @@ CREATE TABLE IF NOT EXISTS trustcore_ledger (
 
 CREATE INDEX idx_trustcore_ledger_status ON trustcore_ledger(status);
 CREATE INDEX idx_trustcore_ledger_name ON trustcore_ledger(name);
+CREATE INDEX idx_trustcore_ledger_keyset ON trustcore_ledger(created_at DESC, id DESC);
 
 -- Contracts (for TrustCore Contract Service)
 CREATE TABLE IF NOT EXISTS trustcore_contracts (
@@ -202,6 +246,7 @@ CREATE TABLE IF NOT EXISTS trustcore_contracts (
 );
 
 CREATE INDEX idx_trustcore_contracts_status ON trustcore_contracts(status);
+CREATE INDEX idx_trustcore_contracts_keyset ON trustcore_contracts(created_at DESC, id DESC);
 
 -- Compliance records (for TrustCore Compliance Service)
 CREATE TABLE IF NOT EXISTS trustcore_compliance (
@@ -215,6 +260,7 @@ CREATE TABLE IF NOT EXISTS trustcore_compliance (
 );
 
 CREATE INDEX idx_trustcore_compliance_status ON trustcore_compliance(status);
+CREATE INDEX idx_trustcore_compliance_keyset ON trustcore_compliance(created_at DESC, id DESC);
 
 -- Connectors (for TrustCore Connector Service)
 CREATE TABLE IF NOT EXISTS trustcore_connectors (
@@ -228,6 +274,7 @@ CREATE TABLE IF NOT EXISTS trustcore_connectors (
 );
 
 CREATE INDEX idx_trustcore_connectors_status ON trustcore_connectors(status);
+CREATE INDEX idx_trustcore_connectors_keyset ON trustcore_connectors(created_at DESC, id DESC);
 
 -- Clearing records (for TrustCore Clearing Service)
 CREATE TABLE IF NOT EXISTS trustcore_clearing (
@@ -241,3 +288,43 @@ CREATE TABLE IF NOT EXISTS trustcore_clearing (
 );
 
 CREATE INDEX idx_trustcore_clearing_status ON trustcore_clearing(status);
+CREATE INDEX idx_trustcore_clearing_keyset ON trustcore_clearing(created_at DESC, id DESC);
+
+-- Unified search index (maintained by the broker from domain events)
+CREATE TABLE IF NOT EXISTS search_documents (
+  doc_type VARCHAR(32) NOT NULL,
+  doc_id VARCHAR(255) NOT NULL,
+  title VARCHAR(500) NOT NULL,
+  body TEXT,
+  status VARCHAR(50),
+  metadata JSONB DEFAULT '{}'::jsonb,
+  search_vector tsvector GENERATED ALWAYS AS (
+    setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('simple', coalesce(body, '')), 'B')
+  ) STORED,
+  source_updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  deleted_at TIMESTAMP WITH TIME ZONE,
+  PRIMARY KEY (doc_type, doc_id)
+);
+
+CREATE INDEX idx_search_documents_search ON search_documents USING GIN (search_vector) WHERE deleted_at IS NULL;
+CREATE INDEX idx_search_documents_title_trgm ON search_documents USING GIN (title gin_trgm_ops) WHERE deleted_at IS NULL;
+
+-- Domain events written with each entity change, drained to Kafka by OutboxRelay
+CREATE TABLE IF NOT EXISTS event_outbox (
+  id BIGSERIAL PRIMARY KEY,
+  event_id UUID NOT NULL UNIQUE,
+  topic VARCHAR(255) NOT NULL,
+  message_key VARCHAR(255) NOT NULL,
+  event_type VARCHAR(100) NOT NULL,
+  payload JSONB NOT NULL,
+  headers JSONB DEFAULT '{}'::jsonb,
+  attempts INTEGER NOT NULL DEFAULT 0,
+  last_error TEXT,
+  created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  published_at TIMESTAMP WITH TIME ZONE,
+  failed_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE INDEX idx_event_outbox_pending ON event_outbox(id) WHERE published_at IS NULL;
+CREATE INDEX idx_event_outbox_published_at ON event_outbox(published_at) WHERE published_at IS NOT NULL;
@@ -20,6 +20,7 @@ SET search_path TO public;
 
 -- Create extensions (only those available in alpine postgres)
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
+CREATE EXTENSION IF NOT EXISTS "pg_trgm";
 -- Note: postgis, hstore, and jsonb_plperl not available in alpine image
 -- They require additional system packages not included in the base image
 
@@ -49,7 +49,12 @@ CREATE TABLE IF NOT EXISTS participants (
     metadata JSONB,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    deleted_at TIMESTAMP
+    deleted_at TIMESTAMP,
+    search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(did, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+    ) STORED
 );
 
 -- Datasets Table
@@ -64,7 +69,11 @@ CREATE TABLE IF NOT EXISTS datasets (
     metadata JSONB,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    deleted_at TIMESTAMP
+    deleted_at TIMESTAMP,
+    search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+    ) STORED
 );
 
 -- ============================================================================
@@ -196,6 +205,47 @@ CREATE TABLE IF NOT EXISTS connectors (
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- ============================================================================
+-- SEARCH
+-- ============================================================================
+
+-- Unified search index (maintained by the broker from domain events)
+CREATE TABLE IF NOT EXISTS search_documents (
+    doc_type VARCHAR(32) NOT NULL,
+    doc_id VARCHAR(255) NOT NULL,
+    title VARCHAR(500) NOT NULL,
+    body TEXT,
+    status VARCHAR(50),
+    metadata JSONB DEFAULT '{}'::jsonb,
+    search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(body, '')), 'B')
+    ) STORED,
+    source_updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    deleted_at TIMESTAMP WITH TIME ZONE,
+    PRIMARY KEY (doc_type, doc_id)
+);
+
+-- ============================================================================
+-- EVENT OUTBOX
+-- ============================================================================
+
+-- Domain events written with each entity change, drained to Kafka by OutboxRelay
+CREATE TABLE IF NOT EXISTS event_outbox (
+    id BIGSERIAL PRIMARY KEY,
+    event_id UUID NOT NULL UNIQUE,
+    topic VARCHAR(255) NOT NULL,
+    message_key VARCHAR(255) NOT NULL,
+    event_type VARCHAR(100) NOT NULL,
+    payload JSONB NOT NULL,
+    headers JSONB DEFAULT '{}'::jsonb,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    published_at TIMESTAMP WITH TIME ZONE,
+    failed_at TIMESTAMP WITH TIME ZONE
+);
+
 -- ============================================================================
 -- INDEXES
 -- ============================================================================
@@ -204,11 +254,25 @@ CREATE TABLE IF NOT EXISTS connectors (
 CREATE INDEX IF NOT EXISTS idx_participants_did ON participants(did);
 CREATE INDEX IF NOT EXISTS idx_participants_status ON participants(status);
 CREATE INDEX IF NOT EXISTS idx_participants_created_at ON participants(created_at);
+CREATE INDEX IF NOT EXISTS idx_participants_search ON participants USING GIN (search_vector);
+CREATE INDEX IF NOT EXISTS idx_participants_name_trgm ON participants USING GIN (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_participants_did_trgm ON participants USING GIN (did gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_participants_keyset ON participants(created_at DESC, id DESC);
 
 -- Datasets indexes
 CREATE INDEX IF NOT EXISTS idx_datasets_participant_id ON datasets(participant_id);
 CREATE INDEX IF NOT EXISTS idx_datasets_status ON datasets(status);
 CREATE INDEX IF NOT EXISTS idx_datasets_created_at ON datasets(created_at);
+CREATE INDEX IF NOT EXISTS idx_datasets_search ON datasets USING GIN (search_vector);
+CREATE INDEX IF NOT EXISTS idx_datasets_name_trgm ON datasets USING GIN (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_datasets_keyset ON datasets(created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_datasets_participant_keyset ON datasets(participant_id, created_at DESC, id DESC);
+
+-- Schemas & vocabularies indexes
+CREATE INDEX IF NOT EXISTS idx_schemas_name_trgm ON schemas USING GIN (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_vocabularies_name_trgm ON vocabularies USING GIN (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_schemas_keyset ON schemas(created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_vocabularies_keyset ON vocabularies(created_at DESC, id DESC);
 
 -- Policies indexes
 CREATE INDEX IF NOT EXISTS idx_policies_status ON policies(status);
@@ -227,6 +291,17 @@ CREATE INDEX IF NOT EXISTS idx_audit_logs_created_at ON audit_logs(created_at);
 CREATE INDEX IF NOT EXISTS idx_transactions_status ON transactions(status);
 CREATE INDEX IF NOT EXISTS idx_transactions_created_at ON transactions(created_at);
 
+-- Connectors indexes
+CREATE INDEX IF NOT EXISTS idx_connectors_keyset ON connectors(created_at DESC, id DESC);
+
+-- Search index indexes
+CREATE INDEX IF NOT EXISTS idx_search_documents_search ON search_documents USING GIN (search_vector) WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_search_documents_title_trgm ON search_documents USING GIN (title gin_trgm_ops) WHERE deleted_at IS NULL;
+
+-- Event outbox indexes
+CREATE INDEX IF NOT EXISTS idx_event_outbox_pending ON event_outbox(id) WHERE published_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_event_outbox_published_at ON event_outbox(published_at) WHERE published_at IS NOT NULL;
+
 -- ============================================================================
 -- VIEWS
 -- ============================================================================
@@ -0,0 +1,47 @@
+-- ============================================================================
+-- MIGRATION: 002 - Keyset Pagination Indexes
+-- Description: Composite (created_at DESC, id DESC) indexes backing cursor
+--              pagination on list endpoints
+-- Created: October 2026
+-- ============================================================================
+
+-- CREATE INDEX CONCURRENTLY cannot run inside a transaction block,
+-- so this migration is intentionally not wrapped in BEGIN/COMMIT.
+
+-- Broker
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_participants_keyset
+  ON participants(created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_datasets_keyset
+  ON datasets(created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_datasets_participant_keyset
+  ON datasets(participant_id, created_at DESC, id DESC);
+
+-- IDP
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_credentials_keyset
+  ON credentials(created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_credentials_participant_keyset
+  ON credentials(participant_id, created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_api_keys_keyset
+  ON api_keys(created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_api_keys_participant_keyset
+  ON api_keys(participant_id, created_at DESC, id DESC);
+
+-- Hub
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_schemas_keyset
+  ON schemas(created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_vocabularies_keyset
+  ON vocabularies(created_at DESC, id DESC);
+
+-- TrustCore
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_trustcore_policies_keyset
+  ON trustcore_policies(created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_trustcore_ledger_keyset
+  ON trustcore_ledger(created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_trustcore_contracts_keyset
+  ON trustcore_contracts(created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_trustcore_compliance_keyset
+  ON trustcore_compliance(created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_trustcore_connectors_keyset
+  ON trustcore_connectors(created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_trustcore_clearing_keyset
+  ON trustcore_clearing(created_at DESC, id DESC);
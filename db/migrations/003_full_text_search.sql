@@ -0,0 +1,37 @@
+-- ============================================================================
+-- MIGRATION: 003 - Full-Text Search
+-- Description: Generated tsvector columns with GIN indexes backing ranked
+--              prefix search on participants and datasets
+-- Created: October 2026
+-- ============================================================================
+
+-- Adding a STORED generated column rewrites the table under an exclusive lock;
+-- run during a maintenance window on large tables. CREATE INDEX CONCURRENTLY
+-- cannot run inside a transaction block, so this migration is intentionally
+-- not wrapped in BEGIN/COMMIT.
+
+-- Weights: A = name / DID, B = description. The 'simple' configuration does
+-- no stemming and must match SEARCH_CONFIG in libs/db/src/search.ts.
+
+ALTER TABLE participants
+  ADD COLUMN IF NOT EXISTS search_vector tsvector
+  GENERATED ALWAYS AS (
+    setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+    setweight(to_tsvector('simple', coalesce(did, '')), 'A') ||
+    setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+  ) STORED;
+
+ALTER TABLE datasets
+  ADD COLUMN IF NOT EXISTS search_vector tsvector
+  GENERATED ALWAYS AS (
+    setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+    setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+  ) STORED;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_participants_search
+  ON participants USING GIN (search_vector);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_datasets_search
+  ON datasets USING GIN (search_vector);
+
+ANALYZE participants;
+ANALYZE datasets;
@@ -0,0 +1,25 @@
+-- ============================================================================
+-- MIGRATION: 004 - Trigram Search
+-- Description: pg_trgm GIN indexes backing fuzzy (mode=fuzzy) search,
+--              substring search and /suggest autocomplete on catalog names
+-- Created: October 2026
+-- ============================================================================
+
+-- CREATE INDEX CONCURRENTLY cannot run inside a transaction block,
+-- so this migration is intentionally not wrapped in BEGIN/COMMIT.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Broker
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_participants_name_trgm
+  ON participants USING GIN (name gin_trgm_ops);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_participants_did_trgm
+  ON participants USING GIN (did gin_trgm_ops);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_datasets_name_trgm
+  ON datasets USING GIN (name gin_trgm_ops);
+
+-- Hub
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_schemas_name_trgm
+  ON schemas USING GIN (name gin_trgm_ops);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_vocabularies_name_trgm
+  ON vocabularies USING GIN (name gin_trgm_ops);
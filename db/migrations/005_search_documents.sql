@@ -0,0 +1,74 @@
+-- ============================================================================
+-- MIGRATION: 005 - Unified Search Index
+-- Description: Denormalized search_documents table backing the broker's
+--              cross-service /search endpoint, kept up to date from domain
+--              events and backfilled here from the source tables
+-- Created: October 2026
+-- ============================================================================
+
+-- CREATE INDEX CONCURRENTLY cannot run inside a transaction block,
+-- so this migration is intentionally not wrapped in BEGIN/COMMIT.
+
+-- One row per searchable entity, keyed by (doc_type, doc_id). Deletes leave a
+-- tombstone (deleted_at) so a late, out-of-order event cannot resurrect a row;
+-- source_updated_at is the timestamp of the last applied event and older
+-- events are ignored. Weights: A = title, B = body. The 'simple' configuration
+-- must match SEARCH_CONFIG in libs/db/src/search.ts.
+CREATE TABLE IF NOT EXISTS search_documents (
+  doc_type VARCHAR(32) NOT NULL,
+  doc_id VARCHAR(255) NOT NULL,
+  title VARCHAR(500) NOT NULL,
+  body TEXT,
+  status VARCHAR(50),
+  metadata JSONB DEFAULT '{}'::jsonb,
+  search_vector tsvector GENERATED ALWAYS AS (
+    setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('simple', coalesce(body, '')), 'B')
+  ) STORED,
+  source_updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  deleted_at TIMESTAMP WITH TIME ZONE,
+  PRIMARY KEY (doc_type, doc_id)
+);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_search_documents_search
+  ON search_documents USING GIN (search_vector) WHERE deleted_at IS NULL;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_search_documents_title_trgm
+  ON search_documents USING GIN (title gin_trgm_ops) WHERE deleted_at IS NULL;
+
+-- Backfill from the tables owned by each service. Apps live in the app store's
+-- own store and are indexed from app.* events only.
+INSERT INTO search_documents (doc_type, doc_id, title, body, status, metadata, source_updated_at)
+SELECT 'participant', id::text, name, description, status,
+       jsonb_build_object('did', did), coalesce(updated_at, CURRENT_TIMESTAMP)
+FROM participants
+ON CONFLICT (doc_type, doc_id) DO NOTHING;
+
+INSERT INTO search_documents (doc_type, doc_id, title, body, status, metadata, source_updated_at)
+SELECT 'dataset', id::text, name, description, status,
+       jsonb_build_object('participantId', participant_id), coalesce(updated_at, CURRENT_TIMESTAMP)
+FROM datasets
+ON CONFLICT (doc_type, doc_id) DO NOTHING;
+
+INSERT INTO search_documents (doc_type, doc_id, title, body, status, metadata, source_updated_at)
+SELECT 'schema', id::text, name, description, status,
+       jsonb_build_object('version', version), coalesce(updated_at, CURRENT_TIMESTAMP)
+FROM schemas
+ON CONFLICT (doc_type, doc_id) DO NOTHING;
+
+INSERT INTO search_documents (doc_type, doc_id, title, body, status, metadata, source_updated_at)
+SELECT 'vocabulary', id::text, name, description, status,
+       jsonb_build_object('namespace', namespace), coalesce(updated_at, CURRENT_TIMESTAMP)
+FROM vocabularies
+ON CONFLICT (doc_type, doc_id) DO NOTHING;
+
+INSERT INTO search_documents (doc_type, doc_id, title, body, status, metadata, source_updated_at)
+SELECT 'policy', id::text, name, description, status, '{}'::jsonb, coalesce(updated_at, CURRENT_TIMESTAMP)
+FROM trustcore_policies
+ON CONFLICT (doc_type, doc_id) DO NOTHING;
+
+INSERT INTO search_documents (doc_type, doc_id, title, body, status, metadata, source_updated_at)
+SELECT 'contract', id::text, name, description, status, '{}'::jsonb, coalesce(updated_at, CURRENT_TIMESTAMP)
+FROM trustcore_contracts
+ON CONFLICT (doc_type, doc_id) DO NOTHING;
+
+ANALYZE search_documents;
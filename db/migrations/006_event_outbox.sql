@@ -0,0 +1,33 @@
+-- ============================================================================
+-- MIGRATION: 006 - Transactional Event Outbox
+-- Description: event_outbox table written in the same transaction as each
+--              entity change and drained to Kafka by OutboxRelay
+--              (libs/kafka), so requests never wait on the broker
+-- Created: October 2026
+-- ============================================================================
+
+-- CREATE INDEX CONCURRENTLY cannot run inside a transaction block,
+-- so this migration is intentionally not wrapped in BEGIN/COMMIT.
+
+-- id orders events for publishing. published_at stays NULL until Kafka has
+-- acknowledged the event; attempts/last_error record failed relay batches.
+-- Published rows are purged by the relay after its retention period.
+CREATE TABLE IF NOT EXISTS event_outbox (
+  id BIGSERIAL PRIMARY KEY,
+  event_id UUID NOT NULL UNIQUE,
+  topic VARCHAR(255) NOT NULL,
+  message_key VARCHAR(255) NOT NULL,
+  event_type VARCHAR(100) NOT NULL,
+  payload JSONB NOT NULL,
+  headers JSONB DEFAULT '{}'::jsonb,
+  attempts INTEGER NOT NULL DEFAULT 0,
+  last_error TEXT,
+  created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  published_at TIMESTAMP WITH TIME ZONE
+);
+
+-- The relay only ever reads the unpublished head of the table
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_event_outbox_pending
+  ON event_outbox (id) WHERE published_at IS NULL;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_event_outbox_published_at
+  ON event_outbox (published_at) WHERE published_at IS NOT NULL;
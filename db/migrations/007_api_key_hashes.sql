@@ -0,0 +1,29 @@
+-- ============================================================================
+-- MIGRATION: 007 - Hashed API Keys
+-- Description: API keys are stored as a display prefix plus a SHA-256 hash
+--              under a unique index instead of the raw key, so lookups are
+--              one indexed equality match and no usable key is at rest
+-- Created: October 2026
+-- ============================================================================
+
+-- CREATE INDEX CONCURRENTLY cannot run inside a transaction block,
+-- so this migration is intentionally not wrapped in BEGIN/COMMIT.
+-- Deploy together with the IdP release that reads key_hash: the raw key
+-- column is dropped at the end.
+
+ALTER TABLE api_keys ADD COLUMN IF NOT EXISTS key_prefix VARCHAR(16);
+ALTER TABLE api_keys ADD COLUMN IF NOT EXISTS key_hash CHAR(64);
+
+-- Hex SHA-256 of the UTF-8 key, the same value hashApiKey (libs/auth) computes
+UPDATE api_keys
+SET key_prefix = LEFT(key, 12),
+    key_hash = encode(sha256(convert_to(key, 'UTF8')), 'hex')
+WHERE key_hash IS NULL;
+
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS idx_api_keys_key_hash ON api_keys(key_hash);
+
+ALTER TABLE api_keys ALTER COLUMN key_prefix SET NOT NULL;
+ALTER TABLE api_keys ALTER COLUMN key_hash SET NOT NULL;
+
+-- Also drops idx_api_keys_key and the unique constraint on the raw key
+ALTER TABLE api_keys DROP COLUMN IF EXISTS key;
@@ -0,0 +1,28 @@
+-- ============================================================================
+-- MIGRATION: 008 - Refresh Tokens
+-- Description: Refresh tokens issued by the IdP, stored as a SHA-256 hash
+--              under a unique index. Each token is single use: redeeming it
+--              marks it used and issues a new one
+-- Created: October 2026
+-- ============================================================================
+
+-- CREATE INDEX CONCURRENTLY cannot run inside a transaction block,
+-- so this migration is intentionally not wrapped in BEGIN/COMMIT.
+
+-- access_token_id is the jti of the access token issued alongside, reported
+-- as the previous token when the refresh token is redeemed
+CREATE TABLE IF NOT EXISTS refresh_tokens (
+  id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+  token_hash CHAR(64) NOT NULL,
+  credential_id UUID NOT NULL REFERENCES credentials(id) ON DELETE CASCADE,
+  access_token_id UUID NOT NULL,
+  scope TEXT[] NOT NULL,
+  created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+  used_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS idx_refresh_tokens_token_hash
+  ON refresh_tokens (token_hash);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_refresh_tokens_credential
+  ON refresh_tokens (credential_id);
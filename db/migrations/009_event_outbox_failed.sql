@@ -0,0 +1,15 @@
+-- ============================================================================
+-- MIGRATION: 009 - Failed Outbox Events
+-- Description: failed_at marks an outbox event the relay gave up on after
+--              OUTBOX_MAX_ATTEMPTS failures on its own, so it no longer
+--              blocks the events behind it
+-- Created: October 2026
+-- ============================================================================
+
+BEGIN;
+
+-- Failed rows keep attempts/last_error for inspection. To requeue one:
+--   UPDATE event_outbox SET failed_at = NULL, attempts = 0 WHERE id = ...;
+ALTER TABLE event_outbox ADD COLUMN IF NOT EXISTS failed_at TIMESTAMP WITH TIME ZONE;
+
+COMMIT;
@@ -0,0 +1,236 @@
+import { createHash, randomBytes } from 'crypto';
+import pino from 'pino';
+import { LruCache } from '@dataspace/redis';
+import { BloomFilter } from './bloom-filter';
+
+const logger = pino({ level: process.env.LOG_LEVEL || 'info' });
+
+// API keys are 192 random bits, so a single SHA-256 is a safe way to store
+// them and keeps lookups to one indexed equality match. The first
+// API_KEY_PREFIX_LENGTH characters are kept in clear to tell keys apart.
+export const API_KEY_PREFIX_LENGTH = 12;
+
+export const generateApiKey = (): string => `key_${randomBytes(24).toString('base64url')}`;
+
+export const hashApiKey = (key: string): string => createHash('sha256').update(key).digest('hex');
+
+export const apiKeyPrefix = (key: string): string => key.slice(0, API_KEY_PREFIX_LENGTH);
+
+export interface ApiKeyRecord {
+  id: string;
+  participantId: string;
+  scope: string[];
+  status: string;
+  expiresAt?: string;
+}
+
+export interface ApiKeyUsage {
+  id: string;
+  usedAt: Date;
+}
+
+// Storage the authenticator reads; the IdP's ApiKeyRepository implements it
+export interface ApiKeyStore<T extends ApiKeyRecord> {
+  findByHash(keyHash: string): Promise<T | null>;
+  // Hashes of keys created after `since` (all keys when null) and the newest created_at seen
+  listHashes(since: Date | null): Promise<{ hashes: string[]; latest: Date | null }>;
+  updateLastUsedBatch(usage: ApiKeyUsage[]): Promise<void>;
+}
+
+export interface ApiKeyAuthenticatorOptions {
+  cacheMaxEntries?: number; // Positive cache of found keys, default 10000
+  cacheTtlSeconds?: number; // Default 30; bounds how long another instance's revoke takes to apply
+  expectedKeys?: number; // Bloom filter capacity, default 100000 or twice the keys loaded
+  falsePositiveRate?: number; // Default 0.001
+  syncIntervalMs?: number; // Keys created by other instances are picked up this often, default 5000
+  rebuildIntervalMs?: number; // Full reload, dropping deleted keys, default 1 hour
+  flushIntervalMs?: number; // last_used_at writes are buffered this long, default 5000
+  flushThreshold?: number; // ... or until this many keys were used, default 1000
+}
+
+export interface ApiKeyAuthenticatorStats {
+  authenticated: number;
+  rejected: number;
+  bloomRejects: number; // Unknown keys turned away without a query
+  cacheHits: number;
+  lookups: number; // Queries by key hash
+  bloomKeys: number;
+  bloomBytes: number;
+  pendingUsage: number;
+  flushes: number;
+  flushErrors: number;
+}
+
+// Lookback applied to each incremental sync, so keys whose transaction
+// committed after a later key was already seen are not missed
+const SYNC_OVERLAP_MS = 60 * 1000;
+
+/**
+ * Resolves presented API keys with as little database work as possible:
+ * a Bloom filter of every stored key hash rejects unknown keys in memory,
+ * found keys are kept in a short-lived LRU, and last_used_at is buffered and
+ * written for many keys in one statement.
+ */
+export class ApiKeyAuthenticator<T extends ApiKeyRecord> {
+  private bloom: BloomFilter | null = null;
+  private cache: LruCache<T>;
+  private watermark: Date | null = null;
+  private usage = new Map<string, Date>();
+  private timers: NodeJS.Timeout[] = [];
+  private flushing: Promise<void> | null = null;
+  private stats = {
+    authenticated: 0,
+    rejected: 0,
+    bloomRejects: 0,
+    cacheHits: 0,
+    lookups: 0,
+    flushes: 0,
+    flushErrors: 0,
+  };
+  private options: Required<ApiKeyAuthenticatorOptions>;
+
+  constructor(
+    private store: ApiKeyStore<T>,
+    options: ApiKeyAuthenticatorOptions = {}
+  ) {
+    this.options = {
+      cacheMaxEntries: options.cacheMaxEntries || 10000,
+      cacheTtlSeconds: options.cacheTtlSeconds || 30,
+      expectedKeys: options.expectedKeys || 100000,
+      falsePositiveRate: options.falsePositiveRate || 0.001,
+      syncIntervalMs: options.syncIntervalMs || 5000,
+      rebuildIntervalMs: options.rebuildIntervalMs || 3600 * 1000,
+      flushIntervalMs: options.flushIntervalMs || 5000,
+      flushThreshold: options.flushThreshold || 1000,
+    };
+    this.cache = new LruCache({ maxEntries: this.options.cacheMaxEntries, ttlSeconds: this.options.cacheTtlSeconds });
+  }
+
+  // Load the filter and start the sync and flush timers. Until a load
+  // succeeds, every key is looked up in the database.
+  async start(): Promise<void> {
+    await this.rebuild().catch((error) => logger.error('Failed to load API key hashes:', error));
+    const every = (ms: number, task: () => Promise<void>) => {
+      const timer = setInterval(() => task().catch((error) => logger.error('API key maintenance failed:', error)), ms);
+      timer.unref();
+      this.timers.push(timer);
+    };
+    every(this.options.syncIntervalMs, () => this.sync());
+    every(this.options.rebuildIntervalMs, () => this.rebuild());
+    every(this.options.flushIntervalMs, () => this.flush());
+  }
+
+  async stop(): Promise<void> {
+    this.timers.forEach(clearInterval);
+    this.timers = [];
+    await this.flush();
+  }
+
+  /**
+   * The active, unexpired key record for a presented key, or null
+   */
+  async authenticate(key: string): Promise<T | null> {
+    const keyHash = hashApiKey(key);
+    if (this.bloom && !this.bloom.mightContain(keyHash)) {
+      this.stats.bloomRejects++;
+      this.stats.rejected++;
+      return null;
+    }
+
+    let record = this.cache.get(keyHash);
+    if (record) {
+      this.stats.cacheHits++;
+    } else {
+      this.stats.lookups++;
+      record = (await this.store.findByHash(keyHash)) ?? undefined;
+      if (record) this.cache.set(keyHash, record);
+    }
+
+    if (!record || record.status !== 'active' || (record.expiresAt && new Date(record.expiresAt) <= new Date())) {
+      this.stats.rejected++;
+      return null;
+    }
+
+    this.stats.authenticated++;
+    this.recordUse(record.id);
+    return record;
+  }
+
+  // Make a key created by this instance usable here immediately
+  register(key: string): void {
+    this.bloom?.add(hashApiKey(key));
+  }
+
+  // Drop cached records after keys were updated, revoked or deleted
+  forget(): void {
+    this.cache.clear();
+  }
+
+  getStats(): ApiKeyAuthenticatorStats {
+    return {
+      ...this.stats,
+      bloomKeys: this.bloom?.count ?? 0,
+      bloomBytes: this.bloom?.bytes ?? 0,
+      pendingUsage: this.usage.size,
+    };
+  }
+
+  // Write buffered last_used_at values in one batch
+  flush(): Promise<void> {
+    if (this.flushing) return this.flushing;
+    if (this.usage.size === 0) return Promise.resolve();
+
+    const batch = [...this.usage].map(([id, usedAt]) => ({ id, usedAt }));
+    this.usage.clear();
+    this.flushing = this.store
+      .updateLastUsedBatch(batch)
+      .then(() => {
+        this.stats.flushes++;
+      })
+      .catch((error) => {
+        this.stats.flushErrors++;
+        // Keep the newer of the failed and any since-recorded use for the next flush
+        for (const { id, usedAt } of batch) {
+          const pending = this.usage.get(id);
+          if (!pending || pending < usedAt) this.usage.set(id, usedAt);
+        }
+        logger.error('Failed to flush API key usage:', error);
+      })
+      .finally(() => {
+        this.flushing = null;
+      });
+    return this.flushing;
+  }
+
+  private recordUse(id: string): void {
+    this.usage.set(id, new Date());
+    if (this.usage.size >= this.options.flushThreshold) {
+      void this.flush();
+    }
+  }
+
+  private async rebuild(): Promise<void> {
+    const { hashes, latest } = await this.store.listHashes(null);
+    const bloom = new BloomFilter({
+      expectedItems: Math.max(this.options.expectedKeys, hashes.length * 2),
+      falsePositiveRate: this.options.falsePositiveRate,
+    });
+    hashes.forEach((hash) => bloom.add(hash));
+
+    this.bloom = bloom;
+    this.watermark = latest;
+    // Keys committed while the full list was loading
+    if (latest) await this.sync();
+    logger.info(`Loaded ${hashes.length} API key hashes (${bloom.bytes} byte filter)`);
+  }
+
+  private async sync(): Promise<void> {
+    if (!this.bloom) return this.rebuild();
+    const since = this.watermark ? new Date(this.watermark.getTime() - SYNC_OVERLAP_MS) : null;
+    const { hashes, latest } = await this.store.listHashes(since);
+    hashes.forEach((hash) => this.bloom!.add(hash));
+    if (latest && (!this.watermark || latest > this.watermark)) {
+      this.watermark = latest;
+    }
+  }
+}
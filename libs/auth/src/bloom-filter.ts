@@ -0,0 +1,64 @@
+// Fixed-size Bloom filter over strings. mightContain() is never false for a
+// value that was added; for other values it is true with roughly the
+// configured false-positive rate once `expectedItems` values have been added.
+// Positions come from two FNV-1a hashes combined (Kirsch-Mitzenmacher).
+
+export interface BloomFilterOptions {
+  expectedItems: number;
+  falsePositiveRate?: number; // Default 0.001
+}
+
+const fnv1a = (value: string, seed: number): number => {
+  let hash = seed;
+  for (let i = 0; i < value.length; i++) {
+    hash ^= value.charCodeAt(i);
+    hash = Math.imul(hash, 0x01000193);
+  }
+  return hash >>> 0;
+};
+
+export class BloomFilter {
+  private bits: Uint8Array;
+  private size: number;
+  private hashes: number;
+  private added = 0;
+
+  constructor(options: BloomFilterOptions) {
+    const items = Math.max(1, options.expectedItems);
+    const rate = options.falsePositiveRate || 0.001;
+    this.size = Math.max(64, Math.ceil((-items * Math.log(rate)) / Math.LN2 ** 2));
+    this.hashes = Math.max(1, Math.round((this.size / items) * Math.LN2));
+    this.bits = new Uint8Array(Math.ceil(this.size / 8));
+  }
+
+  get count(): number {
+    return this.added;
+  }
+
+  // Memory held by the bit array
+  get bytes(): number {
+    return this.bits.length;
+  }
+
+  add(value: string): void {
+    const h1 = fnv1a(value, 0x811c9dc5);
+    const h2 = fnv1a(value, 0x050c5d1f) | 1;
+    for (let i = 0; i < this.hashes; i++) {
+      const position = (h1 + Math.imul(i, h2)) >>> 0;
+      const bit = position % this.size;
+      this.bits[bit >>> 3] |= 1 << (bit & 7);
+    }
+    this.added++;
+  }
+
+  mightContain(value: string): boolean {
+    const h1 = fnv1a(value, 0x811c9dc5);
+    const h2 = fnv1a(value, 0x050c5d1f) | 1;
+    for (let i = 0; i < this.hashes; i++) {
+      const position = (h1 + Math.imul(i, h2)) >>> 0;
+      const bit = position % this.size;
+      if ((this.bits[bit >>> 3] & (1 << (bit & 7))) === 0) return false;
+    }
+    return true;
+  }
+}
@@ -0,0 +1,56 @@
+export {
+  JwtSigner,
+  JwtError,
+  JWT_ALGORITHMS,
+  createJwtSignerFromEnv,
+  decodeJwt,
+  verifySignature,
+  toPublicJwk,
+  jwkThumbprint,
+  type JwtAlgorithm,
+  type JwtClaims,
+  type JwtHeader,
+  type JwtErrorCode,
+  type DecodedJwt,
+  type Jwk,
+  type Jwks,
+  type VerificationKey,
+  type KeyResolver,
+  type JwtSignerOptions,
+  type SignedJwt,
+} from './jwt';
+export { JwksKeyStore, type JwksKeyStoreOptions, type JwksKeyStoreStats } from './jwks';
+export {
+  JwtVerifier,
+  createJwtVerifierFromEnv,
+  type JwtVerifierOptions,
+  type JwtVerifierStats,
+} from './verifier';
+export {
+  SecretHasher,
+  generateSecret,
+  createSecretHasherFromEnv,
+  type SecretHasherOptions,
+  type SecretHasherStats,
+} from './secret-hasher';
+export {
+  RevocationList,
+  createRevocationListFromEnv,
+  type RevocationChecker,
+  type RevocationListOptions,
+  type RevocationListStats,
+} from './revocation-list';
+export { BloomFilter, type BloomFilterOptions } from './bloom-filter';
+export {
+  ApiKeyAuthenticator,
+  API_KEY_PREFIX_LENGTH,
+  generateApiKey,
+  hashApiKey,
+  apiKeyPrefix,
+  type ApiKeyRecord,
+  type ApiKeyUsage,
+  type ApiKeyStore,
+  type ApiKeyAuthenticatorOptions,
+  type ApiKeyAuthenticatorStats,
+} from './api-key-authenticator';
+export { jwtAuth, requireScope, hasScope, DEFAULT_PUBLIC_PATHS, type JwtAuthOptions } from './plugin';
@@ -0,0 +1,103 @@
+import { createPublicKey } from 'crypto';
+import pino from 'pino';
+import { Jwk, JWT_ALGORITHMS, JwtAlgorithm, KeyResolver, VerificationKey } from './jwt';
+
+const logger = pino({ level: process.env.LOG_LEVEL || 'info' });
+
+export interface JwksKeyStoreOptions {
+  url: string;
+  maxAgeMs?: number; // Keys are refetched in the background after this, default 10 minutes
+  refetchCooldownMs?: number; // Minimum gap between fetches for unknown key ids, default 30000
+  timeoutMs?: number; // Default 5000
+}
+
+export interface JwksKeyStoreStats {
+  keys: number;
+  fetches: number;
+  fetchErrors: number;
+  fetchedAt: string | null;
+}
+
+// Public keys fetched from the IdP's JWKS endpoint and held in memory. A token
+// with an unknown `kid` (the IdP rotated its key) triggers one refetch, rate
+// limited so forged key ids cannot turn every request into a fetch; when the
+// IdP is unreachable the keys already held keep working.
+export class JwksKeyStore implements KeyResolver {
+  private keys = new Map<string, VerificationKey>();
+  private fetchedAt = 0;
+  private lastAttempt = 0;
+  private inflight: Promise<void> | null = null;
+  private stats = { fetches: 0, fetchErrors: 0 };
+  private options: Required<JwksKeyStoreOptions>;
+
+  constructor(options: JwksKeyStoreOptions) {
+    this.options = {
+      url: options.url,
+      maxAgeMs: options.maxAgeMs || 10 * 60 * 1000,
+      refetchCooldownMs: options.refetchCooldownMs || 30000,
+      timeoutMs: options.timeoutMs || 5000,
+    };
+  }
+
+  async resolve(kid: string): Promise<VerificationKey | undefined> {
+    if (this.keys.size === 0) {
+      await this.refreshIfAllowed();
+    } else if (Date.now() - this.fetchedAt > this.options.maxAgeMs) {
+      void this.refreshIfAllowed();
+    }
+
+    const key = this.keys.get(kid);
+    if (key) return key;
+
+    await this.refreshIfAllowed();
+    return this.keys.get(kid);
+  }
+
+  getStats(): JwksKeyStoreStats {
+    return {
+      keys: this.keys.size,
+      ...this.stats,
+      fetchedAt: this.fetchedAt ? new Date(this.fetchedAt).toISOString() : null,
+    };
+  }
+
+  // Concurrent callers share one fetch; failures are logged, not thrown
+  private refreshIfAllowed(): Promise<void> {
+    if (this.inflight) return this.inflight;
+    if (Date.now() - this.lastAttempt < this.options.refetchCooldownMs) return Promise.resolve();
+
+    this.lastAttempt = Date.now();
+    this.inflight = this.fetchKeys()
+      .catch((error) => {
+        this.stats.fetchErrors++;
+        logger.error(`Failed to fetch JWKS from ${this.options.url}:`, error);
+      })
+      .finally(() => {
+        this.inflight = null;
+      });
+    return this.inflight;
+  }
+
+  private async fetchKeys(): Promise<void> {
+    this.stats.fetches++;
+    const response = await fetch(this.options.url, { signal: AbortSignal.timeout(this.options.timeoutMs) });
+    if (!response.ok) {
+      throw new Error(`JWKS request failed with status ${response.status}`);
+    }
+
+    const body = (await response.json()) as { keys?: Jwk[] };
+    const keys = new Map<string, VerificationKey>();
+    for (const jwk of body.keys || []) {
+      if (!jwk.kid || !JWT_ALGORITHMS.includes(jwk.alg) || (jwk.use && jwk.use !== 'sig')) continue;
+      try {
+        keys.set(jwk.kid, { kid: jwk.kid, alg: jwk.alg as JwtAlgorithm, key: createPublicKey({ key: jwk, format: 'jwk' }) });
+      } catch (error) {
+        logger.warn(`Skipping unreadable JWK ${jwk.kid}:`, error);
+      }
+    }
+
+    this.keys = keys;
+    this.fetchedAt = Date.now();
+    logger.info(`Loaded ${keys.size} signing keys from ${this.options.url}`);
+  }
+}
@@ -0,0 +1,275 @@
+import {
+  createHash,
+  createPrivateKey,
+  createPublicKey,
+  generateKeyPairSync,
+  JsonWebKey,
+  KeyObject,
+  randomUUID,
+  sign,
+  verify,
+} from 'crypto';
+import pino from 'pino';
+
+const logger = pino({ level: process.env.LOG_LEVEL || 'info' });
+
+export type JwtAlgorithm = 'RS256' | 'EdDSA';
+
+export const JWT_ALGORITHMS: JwtAlgorithm[] = ['RS256', 'EdDSA'];
+
+export interface JwtClaims {
+  iss?: string;
+  sub?: string;
+  aud?: string | string[];
+  exp?: number; // Seconds since the epoch
+  nbf?: number;
+  iat?: number;
+  jti?: string;
+  scope?: string; // Space-separated, as in OAuth2
+  [claim: string]: unknown;
+}
+
+export interface JwtHeader {
+  alg: string;
+  typ?: string;
+  kid?: string;
+}
+
+export interface Jwk extends JsonWebKey {
+  kid: string;
+  alg: JwtAlgorithm;
+  use: 'sig';
+}
+
+export interface Jwks {
+  keys: Jwk[];
+}
+
+// A public key a token's `kid` resolves to
+export interface VerificationKey {
+  kid: string;
+  alg: JwtAlgorithm;
+  key: KeyObject;
+}
+
+// Where a verifier looks up public keys: the signer itself inside the IdP,
+// a JwksKeyStore everywhere else
+export interface KeyResolver {
+  resolve(kid: string): Promise<VerificationKey | undefined>;
+}
+
+export type JwtErrorCode =
+  | 'malformed'
+  | 'unsupported_alg'
+  | 'unknown_key'
+  | 'invalid_signature'
+  | 'expired'
+  | 'not_yet_valid'
+  | 'invalid_claims'
+  | 'revoked';
+
+export class JwtError extends Error {
+  constructor(
+    public code: JwtErrorCode,
+    message: string
+  ) {
+    super(message);
+    this.name = 'JwtError';
+  }
+}
+
+export interface DecodedJwt {
+  header: JwtHeader;
+  claims: JwtClaims;
+  signingInput: string;
+  signature: Buffer;
+}
+
+const encodeSegment = (value: object): string => Buffer.from(JSON.stringify(value)).toString('base64url');
+
+const decodeSegment = (segment: string): any => {
+  try {
+    return JSON.parse(Buffer.from(segment, 'base64url').toString('utf8'));
+  } catch {
+    throw new JwtError('malformed', 'Token segment is not base64url-encoded JSON');
+  }
+};
+
+// Split a compact JWS without checking anything but its shape
+export const decodeJwt = (token: string): DecodedJwt => {
+  const parts = token.split('.');
+  if (parts.length !== 3 || parts.some((part) => part.length === 0)) {
+    throw new JwtError('malformed', 'Token must have three non-empty segments');
+  }
+
+  const header = decodeSegment(parts[0]);
+  const claims = decodeSegment(parts[1]);
+  if (typeof header !== 'object' || header === null || typeof claims !== 'object' || claims === null) {
+    throw new JwtError('malformed', 'Token header and claims must be JSON objects');
+  }
+
+  return {
+    header,
+    claims,
+    signingInput: `${parts[0]}.${parts[1]}`,
+    signature: Buffer.from(parts[2], 'base64url'),
+  };
+};
+
+// RS256 needs an RSA key and EdDSA an Ed25519 key; checking the pair stops a
+// token from choosing how its own signature is checked
+const algorithmFor = (key: KeyObject): JwtAlgorithm => {
+  switch (key.asymmetricKeyType) {
+    case 'rsa':
+      return 'RS256';
+    case 'ed25519':
+      return 'EdDSA';
+    default:
+      throw new Error(`Unsupported JWT signing key type: ${key.asymmetricKeyType}`);
+  }
+};
+
+const digestFor = (alg: JwtAlgorithm): string | null => (alg === 'RS256' ? 'sha256' : null);
+
+const KEY_TYPES: Record<JwtAlgorithm, string> = { RS256: 'rsa', EdDSA: 'ed25519' };
+
+// False for a bad signature and for any key that does not match the token's
+// alg, including key types no JwtAlgorithm uses
+export const verifySignature = (decoded: DecodedJwt, key: VerificationKey): boolean => {
+  if (decoded.header.alg !== key.alg || key.key.asymmetricKeyType !== KEY_TYPES[key.alg]) {
+    return false;
+  }
+  return verify(digestFor(key.alg), Buffer.from(decoded.signingInput), key.key, decoded.signature);
+};
+
+// Public JWK for a key, with the members RFC 7517 defines for its type only
+export const toPublicJwk = (key: KeyObject, kid: string): Jwk => {
+  const { kty, n, e, crv, x } = key.export({ format: 'jwk' });
+  const material = kty === 'RSA' ? { kty, n, e } : { kty, crv, x };
+  return { ...material, kid, alg: algorithmFor(key), use: 'sig' };
+};
+
+// RFC 7638 thumbprint, the default key id
+export const jwkThumbprint = (key: KeyObject): string => {
+  const { kty, n, e, crv, x } = key.export({ format: 'jwk' });
+  const members = kty === 'RSA' ? { e, kty, n } : { crv, kty, x };
+  return createHash('sha256').update(JSON.stringify(members)).digest('base64url');
+};
+
+export interface JwtSignerOptions {
+  privateKey: KeyObject | string; // KeyObject or PEM
+  keyId?: string; // Default the key's RFC 7638 thumbprint
+  issuer: string;
+  audience?: string | string[];
+  // Public keys of retired signing keys, still published in the JWKS until
+  // every token they signed has expired
+  previousPublicKeys?: (KeyObject | string)[];
+}
+
+export interface SignedJwt {
+  token: string;
+  jti: string;
+  issuedAt: Date;
+  expiresAt: Date;
+}
+
+// Signs access tokens with one private key and publishes the public half as a
+// JWKS, so services verify tokens locally instead of calling the IdP
+export class JwtSigner implements KeyResolver {
+  readonly algorithm: JwtAlgorithm;
+  readonly keyId: string;
+  private privateKey: KeyObject;
+  private publicKeys = new Map<string, VerificationKey>();
+  private jwks: Jwks;
+
+  constructor(private options: JwtSignerOptions) {
+    this.privateKey =
+      typeof options.privateKey === 'string' ? createPrivateKey(options.privateKey) : options.privateKey;
+    this.algorithm = algorithmFor(this.privateKey);
+
+    const publicKey = createPublicKey(this.privateKey);
+    this.keyId = options.keyId || jwkThumbprint(publicKey);
+    this.publicKeys.set(this.keyId, { kid: this.keyId, alg: this.algorithm, key: publicKey });
+
+    for (const previous of options.previousPublicKeys || []) {
+      const key = typeof previous === 'string' ? createPublicKey(previous) : previous;
+      const kid = jwkThumbprint(key);
+      this.publicKeys.set(kid, { kid, alg: algorithmFor(key), key });
+    }
+
+    this.jwks = { keys: [...this.publicKeys.values()].map(({ key, kid }) => toPublicJwk(key, kid)) };
+  }
+
+  get issuer(): string {
+    return this.options.issuer;
+  }
+
+  get audience(): string | string[] | undefined {
+    return this.options.audience;
+  }
+
+  // Sign `claims` with iss, aud, iat, exp and jti filled in unless given
+  sign(claims: JwtClaims, expiresInSeconds: number): SignedJwt {
+    const now = Math.floor(Date.now() / 1000);
+    const payload: JwtClaims = {
+      iss: this.options.issuer,
+      ...(this.options.audience ? { aud: this.options.audience } : {}),
+      iat: now,
+      exp: now + expiresInSeconds,
+      jti: randomUUID(),
+      ...claims,
+    };
+
+    const header: JwtHeader = { alg: this.algorithm, typ: 'at+jwt', kid: this.keyId };
+    const signingInput = `${encodeSegment(header)}.${encodeSegment(payload)}`;
+    const signature = sign(digestFor(this.algorithm), Buffer.from(signingInput), this.privateKey);
+
+    return {
+      token: `${signingInput}.${signature.toString('base64url')}`,
+      jti: payload.jti as string,
+      issuedAt: new Date((payload.iat as number) * 1000),
+      expiresAt: new Date((payload.exp as number) * 1000),
+    };
+  }
+
+  getJwks(): Jwks {
+    return this.jwks;
+  }
+
+  async resolve(kid: string): Promise<VerificationKey | undefined> {
+    return this.publicKeys.get(kid);
+  }
+}
+
+// PEM values in env files usually carry literal "\n" sequences
+const pemFromEnv = (value: string | undefined): string | undefined => value?.replace(/\\n/g, '\n');
+
+// Signer settings from the environment: JWT_PRIVATE_KEY (PEM, RSA or Ed25519),
+// JWT_PRIVATE_KEY_ID, JWT_PREVIOUS_PUBLIC_KEYS (PEMs separated by blank lines),
+// JWT_ISSUER (default dataspace-idp) and JWT_AUDIENCE (default dataspace).
+// Without JWT_PRIVATE_KEY a key of type JWT_SIGNING_ALG (EdDSA or RS256) is
+// generated per process, which only suits a single IdP instance in development.
+export const createJwtSignerFromEnv = (env: NodeJS.ProcessEnv = process.env): JwtSigner => {
+  let privateKey: KeyObject | string | undefined = pemFromEnv(env.JWT_PRIVATE_KEY);
+  if (!privateKey) {
+    const algorithm = env.JWT_SIGNING_ALG === 'RS256' ? 'RS256' : 'EdDSA';
+    privateKey =
+      algorithm === 'RS256'
+        ? generateKeyPairSync('rsa', { modulusLength: 2048 }).privateKey
+        : generateKeyPairSync('ed25519').privateKey;
+    logger.warn(`JWT_PRIVATE_KEY is not set; signing with a generated ${algorithm} key that changes on restart`);
+  }
+
+  const previousPublicKeys = (pemFromEnv(env.JWT_PREVIOUS_PUBLIC_KEYS) || '')
+    .split(/\n\s*\n/)
+    .map((pem) => pem.trim())
+    .filter(Boolean);
+
+  return new JwtSigner({
+    privateKey,
+    keyId: env.JWT_PRIVATE_KEY_ID || undefined,
+    issuer: env.JWT_ISSUER || 'dataspace-idp',
+    audience: env.JWT_AUDIENCE || 'dataspace',
+    previousPublicKeys,
+  });
+};
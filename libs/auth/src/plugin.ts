@@ -0,0 +1,101 @@
+import { FastifyReply, FastifyRequest, preHandlerHookHandler } from 'fastify';
+import fp from 'fastify-plugin';
+import { ApiKeyRecord } from './api-key-authenticator';
+import { JwtClaims } from './jwt';
+import { JwtVerifier } from './verifier';
+
+declare module 'fastify' {
+  interface FastifyRequest {
+    auth: JwtClaims | null; // Claims of the verified bearer token, if one was sent
+  }
+}
+
+export interface JwtAuthOptions {
+  verifier: JwtVerifier;
+  // Reject requests without a token, except on publicPaths. Default false:
+  // tokens are verified when present and routes opt in with requireScope.
+  required?: boolean;
+  // Exact paths, or prefixes ending in '*'. Default /health, /metrics/* and /.well-known/*
+  publicPaths?: string[];
+  // Also accept `X-API-Key` headers, resolved by an ApiKeyAuthenticator
+  apiKeys?: { authenticate(key: string): Promise<ApiKeyRecord | null> };
+}
+
+export const DEFAULT_PUBLIC_PATHS = ['/health', '/metrics/*', '/.well-known/*'];
+
+const isPublicPath = (url: string, publicPaths: string[]): boolean => {
+  const path = url.split('?')[0];
+  return publicPaths.some((pattern) =>
+    pattern.endsWith('*') ? path.startsWith(pattern.slice(0, -1)) : path === pattern
+  );
+};
+
+const unauthorized = (reply: FastifyReply, error: string, challenge: string) =>
+  reply.status(401).header('WWW-Authenticate', challenge).send({ error });
+
+// Scopes are space-separated; a granted `read:*` covers every `read:...` scope
+export const hasScope = (claims: JwtClaims, scope: string): boolean =>
+  (claims.scope || '')
+    .split(' ')
+    .some((granted) => granted === scope || (granted.endsWith(':*') && scope.startsWith(granted.slice(0, -1))));
+
+/**
+ * Verifies `Authorization: Bearer` tokens (and, when configured, API keys)
+ * on every request and sets request.auth. Verification is local (JWKS keys cached in memory, verified
+ * tokens memoized), so no request waits on the IdP.
+ */
+export const jwtAuth = fp<JwtAuthOptions>(
+  async (app, options) => {
+    const publicPaths = options.publicPaths || DEFAULT_PUBLIC_PATHS;
+
+    app.decorateRequest('auth', null);
+
+    app.addHook('onRequest', async (request: FastifyRequest, reply: FastifyReply) => {
+      const header = request.headers.authorization;
+      if (header && /^Bearer\s/i.test(header)) {
+        try {
+          request.auth = await options.verifier.verify(header.slice(7).trim());
+        } catch (error) {
+          request.log.debug({ err: error }, 'Rejected bearer token');
+          return unauthorized(reply, 'Invalid access token', 'Bearer error="invalid_token"');
+        }
+      }
+
+      const apiKey = request.headers['x-api-key'];
+      if (!request.auth && options.apiKeys && typeof apiKey === 'string') {
+        const record = await options.apiKeys.authenticate(apiKey);
+        if (!record) {
+          return unauthorized(reply, 'Invalid API key', 'Bearer');
+        }
+        // Exposed in the same shape as token claims, so requireScope applies
+        request.auth = {
+          sub: `apikey:${record.id}`,
+          participant_id: record.participantId,
+          scope: record.scope.join(' '),
+        };
+      }
+
+      if (!request.auth && options.required && !isPublicPath(request.url, publicPaths)) {
+        return unauthorized(reply, 'Access token required', 'Bearer');
+      }
+    });
+  },
+  { name: '@dataspace/auth', fastify: '4.x' }
+);
+
+/**
+ * Route preHandler requiring a token that grants every listed scope
+ */
+export const requireScope =
+  (...scopes: string[]): preHandlerHookHandler =>
+  async (request, reply) => {
+    if (!request.auth) {
+      return unauthorized(reply, 'Access token required', 'Bearer');
+    }
+    if (!scopes.every((scope) => hasScope(request.auth!, scope))) {
+      return reply
+        .status(403)
+        .header('WWW-Authenticate', `Bearer error="insufficient_scope", scope="${scopes.join(' ')}"`)
+        .send({ error: 'Insufficient scope' });
+    }
+  };
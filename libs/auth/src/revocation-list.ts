@@ -0,0 +1,170 @@
+import pino from 'pino';
+import { RedisClient } from '@dataspace/redis';
+
+const logger = pino({ level: process.env.LOG_LEVEL || 'info' });
+
+// What JwtVerifier consults for every token, memoized or not
+export interface RevocationChecker {
+  isRevoked(jti: string): boolean;
+}
+
+export interface RevocationListOptions {
+  redis?: RedisClient | null; // Without Redis, revocations only apply in this process
+  key?: string; // Sorted set of revoked jti scored by expiry, default auth:revoked-tokens
+  channel?: string; // Default auth:token-revocations
+  resyncIntervalMs?: number; // Full reload from Redis, covering missed messages, default 30000
+  sweepIntervalMs?: number; // Expired entries are dropped this often, default 60000
+  // Entries are kept this long past their token's expiry, default 30. Must be at
+  // least the verifiers' clockToleranceSeconds, which accept a token until exp + tolerance.
+  graceSeconds?: number;
+}
+
+export interface RevocationListStats {
+  entries: number;
+  revoked: number; // Revocations issued by this process
+  received: number; // Revocations received over pub/sub
+  resyncs: number;
+  resyncErrors: number;
+  replicated: boolean;
+}
+
+// Adds the jti, drops entries whose token is no longer accepted anyway, and
+// notifies every instance, in one atomic step
+const REVOKE_SCRIPT = `
+redis.call('ZADD', KEYS[1], ARGV[2], ARGV[1])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[3])
+redis.call('PUBLISH', ARGV[4], ARGV[1] .. ' ' .. ARGV[2])
+return 1
+`;
+
+const LIST_SCRIPT = `return redis.call('ZRANGEBYSCORE', KEYS[1], ARGV[1], '+inf', 'WITHSCORES')`;
+
+const nowSeconds = () => Math.floor(Date.now() / 1000);
+
+/**
+ * Revoked token ids, held in memory in every service so the verification
+ * path checks them with one Map lookup. Redis holds the shared list (each
+ * entry lives until a verifier would reject its token as expired) and
+ * pub/sub pushes new revocations to all instances as they happen; a periodic
+ * resync repairs anything missed while disconnected.
+ */
+export class RevocationList implements RevocationChecker {
+  private revoked = new Map<string, number>(); // jti -> token expiry, seconds
+  private timers: NodeJS.Timeout[] = [];
+  private stats = { revoked: 0, received: 0, resyncs: 0, resyncErrors: 0 };
+  private redis: RedisClient | null;
+  private options: Required<Omit<RevocationListOptions, 'redis'>>;
+
+  constructor(options: RevocationListOptions = {}) {
+    this.redis = options.redis || null;
+    this.options = {
+      key: options.key || 'auth:revoked-tokens',
+      channel: options.channel || 'auth:token-revocations',
+      resyncIntervalMs: options.resyncIntervalMs || 30000,
+      sweepIntervalMs: options.sweepIntervalMs || 60000,
+      graceSeconds: options.graceSeconds ?? 30,
+    };
+  }
+
+  // Subscribe before the first load, so no revocation falls in between
+  async start(): Promise<void> {
+    const every = (ms: number, task: () => void | Promise<void>) => {
+      const timer = setInterval(task, ms);
+      timer.unref();
+      this.timers.push(timer);
+    };
+    every(this.options.sweepIntervalMs, () => this.sweep());
+
+    if (!this.redis) return;
+    await this.redis.subscribe(this.options.channel, (message) => {
+      const [jti, exp] = message.split(' ');
+      if (jti && exp) {
+        this.add(jti, Number(exp));
+        this.stats.received++;
+      }
+    });
+    await this.resync();
+    every(this.options.resyncIntervalMs, () => this.resync());
+  }
+
+  stop(): void {
+    this.timers.forEach(clearInterval);
+    this.timers = [];
+  }
+
+  isRevoked(jti: string): boolean {
+    const exp = this.revoked.get(jti);
+    return exp !== undefined && exp + this.options.graceSeconds > nowSeconds();
+  }
+
+  /**
+   * Revoke a token until its expiry, plus the grace period
+   * @param jti Token id
+   * @param exp Token expiry, seconds since the epoch
+   */
+  async revoke(jti: string, exp: number): Promise<void> {
+    this.add(jti, exp);
+    this.stats.revoked++;
+    if (!this.redis) return;
+
+    await this.redis.eval(
+      REVOKE_SCRIPT,
+      [this.options.key],
+      [jti, String(exp), String(nowSeconds() - this.options.graceSeconds), this.options.channel]
+    );
+  }
+
+  getStats(): RevocationListStats {
+    return { entries: this.revoked.size, ...this.stats, replicated: this.redis !== null };
+  }
+
+  private add(jti: string, exp: number): void {
+    if (exp + this.options.graceSeconds > nowSeconds()) this.revoked.set(jti, exp);
+  }
+
+  private async resync(): Promise<void> {
+    if (!this.redis) return;
+    try {
+      const since = String(nowSeconds() - this.options.graceSeconds);
+      const flat = (await this.redis.eval(LIST_SCRIPT, [this.options.key], [since])) as string[];
+      for (let i = 0; i < flat.length; i += 2) {
+        this.add(flat[i], Number(flat[i + 1]));
+      }
+      this.stats.resyncs++;
+    } catch (error) {
+      this.stats.resyncErrors++;
+      logger.error('Failed to load token revocations:', error);
+    }
+  }
+
+  private sweep(): void {
+    const cutoff = nowSeconds() - this.options.graceSeconds;
+    for (const [jti, exp] of this.revoked) {
+      if (exp <= cutoff) this.revoked.delete(jti);
+    }
+  }
+}
+
+// Revocation list replicated through the Redis at REDIS_HOST, REDIS_PORT and
+// REDIS_PASSWORD. When Redis cannot be reached the list still works, but only
+// for revocations made by this process.
+export const createRevocationListFromEnv = async (
+  env: NodeJS.ProcessEnv = process.env
+): Promise<RevocationList> => {
+  let redis: RedisClient | null = new RedisClient({
+    host: env.REDIS_HOST || 'localhost',
+    port: parseInt(env.REDIS_PORT || '6379'),
+    password: env.REDIS_PASSWORD || undefined,
+  });
+
+  try {
+    await redis.connect();
+  } catch (error) {
+    logger.error('Token revocations are not replicated, Redis unavailable:', error);
+    redis = null;
+  }
+
+  const list = new RevocationList({ redis });
+  await list.start().catch((error) => logger.error('Failed to start token revocation list:', error));
+  return list;
+};
@@ -0,0 +1,220 @@
+import { createHash, randomBytes, timingSafeEqual } from 'crypto';
+import { cpus } from 'os';
+import { Worker } from 'worker_threads';
+import pino from 'pino';
+import { LruCache } from '@dataspace/redis';
+
+const logger = pino({ level: process.env.LOG_LEVEL || 'info' });
+
+// Runs scrypt synchronously inside the worker. Kept inline (eval) so the pool
+// works the same from compiled output and from TypeScript sources under tsx.
+const WORKER_SOURCE = `
+const { parentPort } = require('worker_threads');
+const { scryptSync } = require('crypto');
+parentPort.on('message', ({ secret, salt, keylen, N, r, p }) => {
+  try {
+    const hash = scryptSync(secret, salt, keylen, { N, r, p, maxmem: 256 * N * r });
+    parentPort.postMessage({ hash });
+  } catch (error) {
+    parentPort.postMessage({ error: error.message });
+  }
+});
+`;
+
+// Stored as `$scrypt$ln=15,r=8,p=1$<salt>$<hash>`, base64 without padding as in
+// PHC strings, so the parameters travel with each hash and can be raised later
+const HASH_PATTERN = /^\$scrypt\$ln=(\d+),r=(\d+),p=(\d+)\$([A-Za-z0-9+/]+)\$([A-Za-z0-9+/]+)$/;
+
+const KEY_LENGTH = 32;
+const SALT_LENGTH = 16;
+
+interface ScryptParams {
+  ln: number; // log2 of the CPU/memory cost N
+  r: number;
+  p: number;
+}
+
+interface HashTask {
+  secret: string;
+  salt: Buffer;
+  params: ScryptParams;
+  keylen: number;
+  resolve: (hash: Buffer) => void;
+  reject: (error: Error) => void;
+}
+
+export interface SecretHasherOptions {
+  workers?: number; // Default CPU count - 1, between 1 and 4
+  cost?: number; // log2 of the scrypt N parameter, default 15 (32 MiB per hash)
+  // Successful verifications are remembered by a SHA-256 of the stored hash
+  // and the presented secret, so repeated logins with the same secret skip
+  // scrypt. A changed secret produces a new key. 0 disables it.
+  verifyCacheMaxEntries?: number; // Default 10000
+  verifyCacheTtlSeconds?: number; // Default 300
+}
+
+export interface SecretHasherStats {
+  workers: number;
+  busy: number;
+  queued: number;
+  hashes: number;
+  verifications: number;
+  cacheHits: number;
+}
+
+const toBase64 = (buffer: Buffer): string => buffer.toString('base64').replace(/=+$/, '');
+
+// Random secret for clients, base64url encoded
+export const generateSecret = (bytes: number = 32): string => randomBytes(bytes).toString('base64url');
+
+// Hashes and verifies client secrets with scrypt on a pool of worker threads,
+// so a burst of token requests never stalls the event loop or the libuv pool
+// the database driver and file I/O share
+export class SecretHasher {
+  private params: ScryptParams;
+  private size: number;
+  private workers = new Set<Worker>();
+  private idle: Worker[] = [];
+  private running = new Map<Worker, HashTask>();
+  private queue: HashTask[] = [];
+  private verified: LruCache<true> | null;
+  private stats = { hashes: 0, verifications: 0, cacheHits: 0 };
+
+  constructor(options: SecretHasherOptions = {}) {
+    this.params = { ln: options.cost || 15, r: 8, p: 1 };
+    this.size = options.workers || Math.min(4, Math.max(1, cpus().length - 1));
+    const maxEntries = options.verifyCacheMaxEntries ?? 10000;
+    this.verified =
+      maxEntries > 0 ? new LruCache({ maxEntries, ttlSeconds: options.verifyCacheTtlSeconds || 300 }) : null;
+  }
+
+  async hash(secret: string): Promise<string> {
+    const salt = randomBytes(SALT_LENGTH);
+    const hash = await this.run(secret, salt, this.params);
+    this.stats.hashes++;
+    const { ln, r, p } = this.params;
+    return `$scrypt$ln=${ln},r=${r},p=${p}$${toBase64(salt)}$${toBase64(hash)}`;
+  }
+
+  /**
+   * Check a presented secret against a stored hash. Stored values that are
+   * not scrypt hashes are compared as plaintext, for rows written before
+   * hashing; needsRehash() reports those so callers can upgrade them.
+   */
+  async verify(secret: string, stored: string): Promise<boolean> {
+    this.stats.verifications++;
+    const cacheKey = this.verified
+      ? createHash('sha256').update(stored).update('\0').update(secret).digest('base64')
+      : '';
+    if (this.verified?.get(cacheKey)) {
+      this.stats.cacheHits++;
+      return true;
+    }
+
+    const match = HASH_PATTERN.exec(stored);
+    let valid: boolean;
+    if (match) {
+      const expected = Buffer.from(match[5], 'base64');
+      const params = { ln: Number(match[1]), r: Number(match[2]), p: Number(match[3]) };
+      const actual = await this.run(secret, Buffer.from(match[4], 'base64'), params, expected.length);
+      valid = timingSafeEqual(actual, expected);
+    } else {
+      const digest = (value: string) => createHash('sha256').update(value).digest();
+      valid = timingSafeEqual(digest(secret), digest(stored));
+    }
+
+    if (valid) this.verified?.set(cacheKey, true);
+    return valid;
+  }
+
+  // True for plaintext values and hashes weaker than the current cost
+  needsRehash(stored: string): boolean {
+    const match = HASH_PATTERN.exec(stored);
+    return !match || Number(match[1]) < this.params.ln || Number(match[2]) < this.params.r;
+  }
+
+  getStats(): SecretHasherStats {
+    return {
+      workers: this.workers.size,
+      busy: this.running.size,
+      queued: this.queue.length,
+      ...this.stats,
+    };
+  }
+
+  async close(): Promise<void> {
+    const workers = [...this.workers];
+    this.workers.clear();
+    this.idle = [];
+    await Promise.all(workers.map((worker) => worker.terminate()));
+  }
+
+  private run(secret: string, salt: Buffer, params: ScryptParams, keylen: number = KEY_LENGTH): Promise<Buffer> {
+    return new Promise((resolve, reject) => {
+      this.queue.push({ secret, salt, params, keylen, resolve, reject });
+      this.dispatch();
+    });
+  }
+
+  private dispatch(): void {
+    while (this.queue.length > 0) {
+      const worker = this.idle.pop() || (this.workers.size < this.size ? this.spawn() : null);
+      if (!worker) return;
+
+      const task = this.queue.shift()!;
+      this.running.set(worker, task);
+      worker.postMessage({
+        secret: task.secret,
+        salt: task.salt,
+        keylen: task.keylen,
+        N: 2 ** task.params.ln,
+        r: task.params.r,
+        p: task.params.p,
+      });
+    }
+  }
+
+  private spawn(): Worker {
+    const worker = new Worker(WORKER_SOURCE, { eval: true });
+    worker.unref();
+    this.workers.add(worker);
+
+    worker.on('message', (message: { hash?: Uint8Array; error?: string }) => {
+      const task = this.running.get(worker);
+      this.running.delete(worker);
+      if (this.workers.has(worker)) this.idle.push(worker);
+
+      if (task) {
+        if (message.hash) {
+          task.resolve(Buffer.from(message.hash.buffer, message.hash.byteOffset, message.hash.byteLength));
+        } else {
+          task.reject(new Error(message.error || 'Secret hashing failed'));
+        }
+      }
+      this.dispatch();
+    });
+
+    // A crashed worker fails its task and is replaced on the next dispatch
+    const discard = (error: Error) => {
+      if (!this.workers.delete(worker)) return;
+      this.idle = this.idle.filter((candidate) => candidate !== worker);
+      const task = this.running.get(worker);
+      this.running.delete(worker);
+      task?.reject(error);
+      logger.error('Secret hashing worker stopped:', error);
+      this.dispatch();
+    };
+    worker.on('error', discard);
+    worker.on('exit', (code) => discard(new Error(`Secret hashing worker exited with code ${code}`)));
+
+    return worker;
+  }
+}
+
+// Hasher settings from the environment: SECRET_HASH_WORKERS and
+// SECRET_HASH_COST (log2 of scrypt N, default 15)
+export const createSecretHasherFromEnv = (env: NodeJS.ProcessEnv = process.env): SecretHasher =>
+  new SecretHasher({
+    workers: env.SECRET_HASH_WORKERS ? parseInt(env.SECRET_HASH_WORKERS) : undefined,
+    cost: env.SECRET_HASH_COST ? parseInt(env.SECRET_HASH_COST) : undefined,
+  });
@@ -0,0 +1,147 @@
+import { LruCache } from '@dataspace/redis';
+import { decodeJwt, JWT_ALGORITHMS, JwtAlgorithm, JwtClaims, JwtError, KeyResolver, verifySignature } from './jwt';
+import { JwksKeyStore } from './jwks';
+import { RevocationChecker } from './revocation-list';
+
+export interface JwtVerifierOptions {
+  keys: KeyResolver;
+  issuer?: string; // Required `iss`, when set
+  audience?: string | string[]; // Token `aud` must contain one of these, when set
+  algorithms?: JwtAlgorithm[]; // Default RS256 and EdDSA
+  revocations?: RevocationChecker; // Checked by jti on every call, memoized or not; a jti is then required
+  clockToleranceSeconds?: number; // Allowed skew for exp and nbf, default 30
+  // Verified tokens are remembered until they expire, so a client sending the
+  // same token on every request pays for one signature check. 0 disables it.
+  cacheMaxEntries?: number; // Default 10000
+  cacheMaxAgeSeconds?: number; // Upper bound per entry, default 300
+}
+
+export interface JwtVerifierStats {
+  verified: number; // Signature checks that passed
+  cacheHits: number;
+  rejected: number;
+  revoked: number;
+  cacheSize: number;
+}
+
+// Verifies access tokens locally against keys from a KeyResolver
+export class JwtVerifier {
+  private memo: LruCache<JwtClaims> | null;
+  private algorithms: JwtAlgorithm[];
+  private clockTolerance: number;
+  private stats = { verified: 0, cacheHits: 0, rejected: 0, revoked: 0 };
+
+  constructor(private options: JwtVerifierOptions) {
+    this.algorithms = options.algorithms || JWT_ALGORITHMS;
+    this.clockTolerance = options.clockToleranceSeconds ?? 30;
+    const maxEntries = options.cacheMaxEntries ?? 10000;
+    this.memo =
+      maxEntries > 0 ? new LruCache({ maxEntries, ttlSeconds: options.cacheMaxAgeSeconds || 300 }) : null;
+  }
+
+  /**
+   * Verify a compact JWT and return its claims. Returned claims are shared
+   * with the memo and frozen.
+   * @throws JwtError when the token is malformed, unsigned by a known key,
+   *   expired, not yet valid, revoked, issued for another issuer or audience,
+   *   or lacks an exp (or a jti, when revocations are checked)
+   */
+  async verify(token: string): Promise<JwtClaims> {
+    const now = Math.floor(Date.now() / 1000);
+
+    const cached = this.memo?.get(token);
+    if (cached && cached.exp! + this.clockTolerance > now) {
+      this.stats.cacheHits++;
+      this.checkRevocation(cached);
+      return cached;
+    }
+
+    try {
+      const claims = await this.verifyUncached(token, now);
+      this.stats.verified++;
+
+      if (this.memo) {
+        this.memo.set(token, claims, claims.exp! + this.clockTolerance - now);
+      }
+      this.checkRevocation(claims);
+      return claims;
+    } catch (error) {
+      if (!(error instanceof JwtError && error.code === 'revoked')) this.stats.rejected++;
+      throw error;
+    }
+  }
+
+  // Valid tokens are memoized even when revoked, so a later call is a Map lookup either way
+  private checkRevocation(claims: JwtClaims): void {
+    if (claims.jti && this.options.revocations?.isRevoked(claims.jti)) {
+      this.stats.revoked++;
+      throw new JwtError('revoked', 'Token has been revoked');
+    }
+  }
+
+  getStats(): JwtVerifierStats {
+    return { ...this.stats, cacheSize: this.memo?.size ?? 0 };
+  }
+
+  private async verifyUncached(token: string, now: number): Promise<JwtClaims> {
+    const decoded = decodeJwt(token);
+    const { header, claims } = decoded;
+
+    if (!this.algorithms.includes(header.alg as JwtAlgorithm)) {
+      throw new JwtError('unsupported_alg', `Unsupported token algorithm: ${header.alg}`);
+    }
+    if (!header.kid) {
+      throw new JwtError('unknown_key', 'Token has no key id');
+    }
+
+    const key = await this.options.keys.resolve(header.kid);
+    if (!key) {
+      throw new JwtError('unknown_key', `Unknown signing key: ${header.kid}`);
+    }
+    if (!verifySignature(decoded, key)) {
+      throw new JwtError('invalid_signature', 'Token signature is invalid');
+    }
+
+    // A token without exp would be memoized forever, and one without jti could not be revoked
+    if (typeof claims.exp !== 'number') {
+      throw new JwtError('invalid_claims', 'Token has no expiry');
+    }
+    if (this.options.revocations && (typeof claims.jti !== 'string' || claims.jti === '')) {
+      throw new JwtError('invalid_claims', 'Token has no id');
+    }
+    if (claims.exp + this.clockTolerance <= now) {
+      throw new JwtError('expired', 'Token has expired');
+    }
+    if (typeof claims.nbf === 'number' && claims.nbf - this.clockTolerance > now) {
+      throw new JwtError('not_yet_valid', 'Token is not yet valid');
+    }
+    if (this.options.issuer && claims.iss !== this.options.issuer) {
+      throw new JwtError('invalid_claims', 'Token issuer is not accepted');
+    }
+    if (this.options.audience) {
+      const expected = ([] as string[]).concat(this.options.audience);
+      const actual = ([] as string[]).concat(claims.aud ?? []);
+      if (!actual.some((aud) => expected.includes(aud))) {
+        throw new JwtError('invalid_claims', 'Token audience is not accepted');
+      }
+    }
+
+    return Object.freeze(claims);
+  }
+}
+
+// Verifier for services other than the IdP: keys come from IDP_JWKS_URL
+// (default IDP_URL + /.well-known/jwks.json) and tokens must match JWT_ISSUER
+// and JWT_AUDIENCE. Keys are fetched on the first request carrying a token.
+export const createJwtVerifierFromEnv = (
+  revocations?: RevocationChecker,
+  env: NodeJS.ProcessEnv = process.env
+): JwtVerifier =>
+  new JwtVerifier({
+    revocations,
+    keys: new JwksKeyStore({
+      url: env.IDP_JWKS_URL || `${env.IDP_URL || 'http://localhost:3000'}/.well-known/jwks.json`,
+    }),
+    issuer: env.JWT_ISSUER || 'dataspace-idp',
+    audience: env.JWT_AUDIENCE || 'dataspace',
+  });
@@ -0,0 +1,312 @@
+import { describe, it, expect, afterEach } from 'vitest';
+import {
+  ApiKeyAuthenticator,
+  generateApiKey,
+  hashApiKey,
+  type ApiKeyRecord,
+  type ApiKeyStore,
+  type ApiKeyUsage,
+} from '../src/api-key-authenticator';
+
+const T0 = new Date('2026-06-01T12:00:00.000Z');
+
+const at = (offsetMs: number) => new Date(T0.getTime() + offsetMs);
+
+interface StoredKey {
+  hash: string;
+  createdAt: Date;
+  // False until the creating transaction commits
+  visible: boolean;
+  record: ApiKeyRecord;
+}
+
+/**
+ * In-memory key table that records every call the authenticator makes
+ */
+class MemoryStore implements ApiKeyStore<ApiKeyRecord> {
+  keys: StoredKey[] = [];
+  lookups: string[] = [];
+  listCalls: (Date | null)[] = [];
+  flushed: ApiKeyUsage[][] = [];
+  failList = false;
+  failFlush = false;
+
+  add(createdAt: Date, overrides: Partial<ApiKeyRecord> = {}, visible = true): { key: string; stored: StoredKey } {
+    const key = generateApiKey();
+    const stored = {
+      hash: hashApiKey(key),
+      createdAt,
+      visible,
+      record: { id: `key-${this.keys.length + 1}`, participantId: 'p-1', scope: ['read'], status: 'active', ...overrides },
+    };
+    this.keys.push(stored);
+    return { key, stored };
+  }
+
+  async findByHash(keyHash: string): Promise<ApiKeyRecord | null> {
+    this.lookups.push(keyHash);
+    return this.keys.find((key) => key.visible && key.hash === keyHash)?.record ?? null;
+  }
+
+  async listHashes(since: Date | null): Promise<{ hashes: string[]; latest: Date | null }> {
+    this.listCalls.push(since);
+    if (this.failList) throw new Error('connection refused');
+    const keys = this.keys.filter((key) => key.visible && (!since || key.createdAt > since));
+    const latest = keys.reduce<Date | null>((max, key) => (!max || key.createdAt > max ? key.createdAt : max), null);
+    return { hashes: keys.map((key) => key.hash), latest };
+  }
+
+  async updateLastUsedBatch(usage: ApiKeyUsage[]): Promise<void> {
+    if (this.failFlush) throw new Error('connection refused');
+    this.flushed.push(usage);
+  }
+}
+
+let authenticator: ApiKeyAuthenticator<ApiKeyRecord> | null = null;
+
+const started = async (store: MemoryStore, options = {}) => {
+  authenticator = new ApiKeyAuthenticator(store, options);
+  await authenticator.start();
+  return authenticator;
+};
+
+// The interval task that picks up keys created by other instances
+const sync = (instance: ApiKeyAuthenticator<ApiKeyRecord>) => instance['sync']();
+
+afterEach(async () => {
+  await authenticator?.stop();
+  authenticator = null;
+});
+
+describe('ApiKeyAuthenticator', () => {
+  describe('Bloom filter', () => {
+    it('turns unknown keys away without a query', async () => {
+      const store = new MemoryStore();
+      store.add(T0);
+      const auth = await started(store);
+
+      expect(await auth.authenticate(generateApiKey())).toBeNull();
+      expect(store.lookups).toHaveLength(0);
+      expect(auth.getStats()).toMatchObject({ bloomRejects: 1, rejected: 1, lookups: 0 });
+    });
+
+    it('finds every stored key after loading', async () => {
+      const store = new MemoryStore();
+      const keys = Array.from({ length: 500 }, (_, i) => store.add(at(i)).key);
+      const auth = await started(store);
+
+      for (const key of keys) {
+        expect(await auth.authenticate(key)).not.toBeNull();
+      }
+      expect(auth.getStats().bloomRejects).toBe(0);
+    });
+
+    it('sizes the filter for twice the keys loaded', async () => {
+      const store = new MemoryStore();
+      Array.from({ length: 100 }, (_, i) => store.add(at(i)));
+      const auth = await started(store, { expectedKeys: 10, falsePositiveRate: 0.01 });
+
+      // 200 items at 1%: ceil(200 * ln 100 / ln² 2) = 1918 bits
+      expect(auth.getStats().bloomBytes).toBe(240);
+    });
+
+    it('accepts a key registered on this instance before the next sync', async () => {
+      const store = new MemoryStore();
+      const auth = await started(store);
+      const { key } = store.add(at(1000));
+
+      auth.register(key);
+
+      expect(await auth.authenticate(key)).not.toBeNull();
+    });
+
+    it('looks every key up while the filter cannot be loaded', async () => {
+      const store = new MemoryStore();
+      const { key } = store.add(T0);
+      store.failList = true;
+      const auth = await started(store);
+
+      expect(await auth.authenticate(key)).not.toBeNull();
+      expect(await auth.authenticate(generateApiKey())).toBeNull();
+      expect(store.lookups).toHaveLength(2);
+    });
+  });
+
+  describe('sync', () => {
+    it('asks for keys created since the newest seen, less the overlap', async () => {
+      const store = new MemoryStore();
+      store.add(T0);
+      const auth = await started(store);
+      store.listCalls = [];
+
+      await sync(auth);
+
+      expect(store.listCalls).toEqual([at(-60 * 1000)]);
+    });
+
+    it('picks up keys created by other instances', async () => {
+      const store = new MemoryStore();
+      store.add(T0);
+      const auth = await started(store);
+      const { key } = store.add(at(5000));
+
+      expect(await auth.authenticate(key)).toBeNull();
+      await sync(auth);
+      expect(await auth.authenticate(key)).not.toBeNull();
+    });
+
+    it('picks up a key that committed after a newer key was seen', async () => {
+      const store = new MemoryStore();
+      store.add(T0);
+      // Created 30s before the newest key, but its transaction was still open during the load
+      const { key, stored } = store.add(at(-30 * 1000), {}, false);
+      const auth = await started(store);
+
+      stored.visible = true;
+      await sync(auth);
+
+      expect(await auth.authenticate(key)).not.toBeNull();
+    });
+
+    it('leaves keys committed later than the overlap to the next rebuild', async () => {
+      const store = new MemoryStore();
+      store.add(T0);
+      const { key, stored } = store.add(at(-2 * 60 * 1000), {}, false);
+      const auth = await started(store);
+
+      stored.visible = true;
+      await sync(auth);
+      expect(await auth.authenticate(key)).toBeNull();
+
+      await auth['rebuild']();
+      expect(await auth.authenticate(key)).not.toBeNull();
+    });
+
+    it('does not move the watermark back', async () => {
+      const store = new MemoryStore();
+      store.add(T0);
+      const auth = await started(store);
+      store.add(at(-10 * 1000));
+      store.listCalls = [];
+
+      await sync(auth);
+      await sync(auth);
+
+      expect(store.listCalls).toEqual([at(-60 * 1000), at(-60 * 1000)]);
+    });
+
+    it('keeps keys added while a rebuild was loading', async () => {
+      const store = new MemoryStore();
+      store.add(T0);
+      const { key, stored } = store.add(at(1000), {}, false);
+      const list = store.listHashes.bind(store);
+      // The key commits between the full load and the follow-up sync
+      store.listHashes = async (since) => {
+        const result = await list(since);
+        stored.visible = true;
+        return result;
+      };
+
+      const auth = await started(store);
+
+      expect(await auth.authenticate(key)).not.toBeNull();
+    });
+  });
+
+  describe('records', () => {
+    it('caches found keys', async () => {
+      const store = new MemoryStore();
+      const { key } = store.add(T0);
+      const auth = await started(store);
+
+      await auth.authenticate(key);
+      await auth.authenticate(key);
+
+      expect(store.lookups).toHaveLength(1);
+      expect(auth.getStats()).toMatchObject({ authenticated: 2, cacheHits: 1, lookups: 1 });
+    });
+
+    it('rejects revoked and expired keys', async () => {
+      const store = new MemoryStore();
+      const revoked = store.add(T0, { status: 'revoked' }).key;
+      const expired = store.add(T0, { expiresAt: '2020-01-01T00:00:00.000Z' }).key;
+      const current = store.add(T0, { expiresAt: '2999-01-01T00:00:00.000Z' }).key;
+      const auth = await started(store);
+
+      expect(await auth.authenticate(revoked)).toBeNull();
+      expect(await auth.authenticate(expired)).toBeNull();
+      expect(await auth.authenticate(current)).not.toBeNull();
+    });
+
+    it('reads a revocation after forget()', async () => {
+      const store = new MemoryStore();
+      const { key, stored } = store.add(T0);
+      const auth = await started(store);
+      await auth.authenticate(key);
+
+      stored.record = { ...stored.record, status: 'revoked' };
+      auth.forget();
+
+      expect(await auth.authenticate(key)).toBeNull();
+    });
+  });
+
+  describe('usage', () => {
+    it('writes last_used_at for many keys in one batch', async () => {
+      const store = new MemoryStore();
+      const keys = [store.add(T0).key, store.add(T0).key];
+      const auth = await started(store);
+
+      await auth.authenticate(keys[0]);
+      await auth.authenticate(keys[1]);
+      await auth.authenticate(keys[0]);
+      expect(store.flushed).toHaveLength(0);
+
+      await auth.flush();
+
+      expect(store.flushed).toHaveLength(1);
+      expect(store.flushed[0].map((usage) => usage.id).sort()).toEqual(['key-1', 'key-2']);
+      expect(auth.getStats().pendingUsage).toBe(0);
+    });
+
+    it('flushes once the threshold is reached', async () => {
+      const store = new MemoryStore();
+      const keys = [store.add(T0).key, store.add(T0).key];
+      const auth = await started(store, { flushThreshold: 2 });
+
+      await auth.authenticate(keys[0]);
+      await auth.authenticate(keys[1]);
+      await auth.flush();
+
+      expect(store.flushed).toHaveLength(1);
+      expect(store.flushed[0]).toHaveLength(2);
+    });
+
+    it('keeps usage for the next flush when a write fails', async () => {
+      const store = new MemoryStore();
+      const { key } = store.add(T0);
+      const auth = await started(store);
+      await auth.authenticate(key);
+
+      store.failFlush = true;
+      await auth.flush();
+      expect(auth.getStats()).toMatchObject({ pendingUsage: 1, flushErrors: 1 });
+
+      store.failFlush = false;
+      await auth.flush();
+      expect(store.flushed.map((batch) => batch.map((usage) => usage.id))).toEqual([['key-1']]);
+      expect(auth.getStats().pendingUsage).toBe(0);
+    });
+
+    it('flushes on stop', async () => {
+      const store = new MemoryStore();
+      const { key } = store.add(T0);
+      const auth = await started(store);
+      await auth.authenticate(key);
+
+      await auth.stop();
+
+      expect(store.flushed).toHaveLength(1);
+    });
+  });
+});
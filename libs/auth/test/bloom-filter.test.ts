@@ -0,0 +1,87 @@
+import { describe, it, expect } from 'vitest';
+import { createHash } from 'crypto';
+import { BloomFilter } from '../src/bloom-filter';
+
+// Stored API key hashes are SHA-256 hex digests
+const keyHash = (value: string) => createHash('sha256').update(value).digest('hex');
+
+const fill = (filter: BloomFilter, count: number, prefix = 'stored') => {
+  for (let i = 0; i < count; i++) filter.add(keyHash(`${prefix}-${i}`));
+};
+
+const falsePositiveRate = (filter: BloomFilter, probes = 100000) => {
+  let positives = 0;
+  for (let i = 0; i < probes; i++) {
+    if (filter.mightContain(keyHash(`absent-${i}`))) positives++;
+  }
+  return positives / probes;
+};
+
+// Optimal bit count m = -n ln p / (ln 2)^2, held in whole bytes
+const optimalBytes = (items: number, rate: number) =>
+  Math.ceil(Math.ceil((-items * Math.log(rate)) / Math.LN2 ** 2) / 8);
+
+describe('BloomFilter', () => {
+  describe('sizing', () => {
+    it.each([
+      [1000, 0.01],
+      [10000, 0.001],
+      [100000, 0.001],
+    ])('holds %i items at rate %d in the optimal number of bits', (items, rate) => {
+      const filter = new BloomFilter({ expectedItems: items, falsePositiveRate: rate });
+
+      expect(filter.bytes).toBe(optimalBytes(items, rate));
+    });
+
+    it('defaults to a 0.1% rate', () => {
+      expect(new BloomFilter({ expectedItems: 100000 }).bytes).toBe(optimalBytes(100000, 0.001));
+      expect(new BloomFilter({ expectedItems: 100000 }).bytes).toBe(179720);
+    });
+
+    it('keeps at least 64 bits', () => {
+      expect(new BloomFilter({ expectedItems: 1 }).bytes).toBe(8);
+      expect(new BloomFilter({ expectedItems: 0 }).bytes).toBe(8);
+    });
+  });
+
+  it('never misses a value that was added', () => {
+    const filter = new BloomFilter({ expectedItems: 10000 });
+    fill(filter, 20000);
+
+    for (let i = 0; i < 20000; i++) {
+      expect(filter.mightContain(keyHash(`stored-${i}`))).toBe(true);
+    }
+    expect(filter.count).toBe(20000);
+  });
+
+  it('is empty before anything is added', () => {
+    const filter = new BloomFilter({ expectedItems: 1000 });
+
+    expect(filter.count).toBe(0);
+    expect(filter.mightContain(keyHash('stored-0'))).toBe(false);
+  });
+
+  it.each([0.01, 0.001])('stays near a configured rate of %d at capacity', (rate) => {
+    const filter = new BloomFilter({ expectedItems: 10000, falsePositiveRate: rate });
+    fill(filter, 10000);
+
+    const observed = falsePositiveRate(filter);
+
+    expect(observed).toBeGreaterThan(rate / 2);
+    expect(observed).toBeLessThan(rate * 1.5);
+  });
+
+  it('rejects almost everything below capacity', () => {
+    const filter = new BloomFilter({ expectedItems: 10000, falsePositiveRate: 0.01 });
+    fill(filter, 1000);
+
+    expect(falsePositiveRate(filter)).toBeLessThan(0.0001);
+  });
+
+  it('degrades when filled past capacity', () => {
+    const filter = new BloomFilter({ expectedItems: 1000, falsePositiveRate: 0.01 });
+    fill(filter, 4000);
+
+    expect(falsePositiveRate(filter, 20000)).toBeGreaterThan(0.3);
+  });
+});
@@ -0,0 +1,208 @@
+import { describe, it, expect } from 'vitest';
+import { createPublicKey, generateKeyPairSync, KeyObject } from 'crypto';
+import {
+  JwtSigner,
+  JwtError,
+  createJwtSignerFromEnv,
+  decodeJwt,
+  jwkThumbprint,
+  toPublicJwk,
+  verifySignature,
+  type JwtAlgorithm,
+} from '../src/jwt';
+
+const rsa = generateKeyPairSync('rsa', { modulusLength: 2048 });
+const ed25519 = generateKeyPairSync('ed25519');
+const KEYS: Record<JwtAlgorithm, { privateKey: KeyObject; publicKey: KeyObject }> = { RS256: rsa, EdDSA: ed25519 };
+
+const segment = (value: unknown) => Buffer.from(JSON.stringify(value)).toString('base64url');
+
+// Replace the header of a signed token, keeping its claims and signature
+const withHeader = (token: string, header: object) => [segment(header), ...token.split('.').slice(1)].join('.');
+
+describe('JwtSigner and verifySignature', () => {
+  describe.each(['RS256', 'EdDSA'] as const)('%s', (alg) => {
+    const signer = new JwtSigner({ privateKey: KEYS[alg].privateKey, issuer: 'idp', audience: 'dataspace' });
+
+    it('picks the algorithm from the key', () => {
+      expect(signer.algorithm).toBe(alg);
+      expect(signer.keyId).toBe(jwkThumbprint(KEYS[alg].publicKey));
+    });
+
+    it('signs a token its own key verifies', async () => {
+      const { token } = signer.sign({ sub: 'client-1', scope: 'read' }, 60);
+      const decoded = decodeJwt(token);
+
+      expect(decoded.header).toEqual({ alg, typ: 'at+jwt', kid: signer.keyId });
+      expect(verifySignature(decoded, (await signer.resolve(signer.keyId))!)).toBe(true);
+    });
+
+    it('fills in registered claims unless given', () => {
+      const signed = signer.sign({ sub: 'client-1', aud: 'broker' }, 60);
+      const { claims } = decodeJwt(signed.token);
+
+      expect(claims).toMatchObject({ iss: 'idp', aud: 'broker', sub: 'client-1', jti: signed.jti });
+      expect(claims.exp! - claims.iat!).toBe(60);
+      expect(signed.expiresAt.getTime()).toBe(claims.exp! * 1000);
+    });
+
+    it('rejects changed claims and signatures', async () => {
+      const { token } = signer.sign({ sub: 'client-1' }, 60);
+      const [header, , signature] = token.split('.');
+      const key = (await signer.resolve(signer.keyId))!;
+
+      const forgedClaims = `${header}.${segment({ sub: 'admin', exp: 9999999999 })}.${signature}`;
+      expect(verifySignature(decodeJwt(forgedClaims), key)).toBe(false);
+
+      const flipped = Buffer.from(signature, 'base64url');
+      flipped[0] ^= 1;
+      expect(verifySignature(decodeJwt(`${token.split('.').slice(0, 2).join('.')}.${flipped.toString('base64url')}`), key)).toBe(false);
+    });
+  });
+
+  describe('algorithm and key type mismatches', () => {
+    const rsaSigner = new JwtSigner({ privateKey: rsa.privateKey, issuer: 'idp' });
+    const edSigner = new JwtSigner({ privateKey: ed25519.privateKey, issuer: 'idp' });
+
+    it('rejects a header alg that differs from the key alg', () => {
+      const { token } = rsaSigner.sign({}, 60);
+      const forged = decodeJwt(withHeader(token, { alg: 'EdDSA', kid: rsaSigner.keyId }));
+
+      expect(verifySignature(forged, { kid: rsaSigner.keyId, alg: 'RS256', key: rsa.publicKey })).toBe(false);
+      expect(verifySignature(forged, { kid: rsaSigner.keyId, alg: 'EdDSA', key: rsa.publicKey })).toBe(false);
+    });
+
+    it('rejects a key whose type does not match its alg', () => {
+      const decoded = decodeJwt(edSigner.sign({}, 60).token);
+
+      expect(verifySignature(decoded, { kid: edSigner.keyId, alg: 'EdDSA', key: rsa.publicKey })).toBe(false);
+      expect(
+        verifySignature(decodeJwt(rsaSigner.sign({}, 60).token), { kid: rsaSigner.keyId, alg: 'RS256', key: ed25519.publicKey })
+      ).toBe(false);
+    });
+
+    it('rejects key types no algorithm uses', () => {
+      const ec = generateKeyPairSync('ec', { namedCurve: 'P-256' });
+      const decoded = decodeJwt(rsaSigner.sign({}, 60).token);
+
+      expect(verifySignature(decoded, { kid: 'ec', alg: 'RS256', key: ec.publicKey })).toBe(false);
+    });
+
+    it('rejects alg none', () => {
+      const { token } = rsaSigner.sign({}, 60);
+      const decoded = decodeJwt(withHeader(token, { alg: 'none', kid: rsaSigner.keyId }));
+
+      expect(verifySignature(decoded, { kid: rsaSigner.keyId, alg: 'RS256', key: rsa.publicKey })).toBe(false);
+    });
+
+    it('refuses to sign with an unsupported key type', () => {
+      const ec = generateKeyPairSync('ec', { namedCurve: 'P-256' });
+
+      expect(() => new JwtSigner({ privateKey: ec.privateKey, issuer: 'idp' })).toThrow('Unsupported JWT signing key type: ec');
+    });
+  });
+
+  describe('key rotation', () => {
+    const previous = new JwtSigner({ privateKey: rsa.privateKey, issuer: 'idp' });
+    const current = new JwtSigner({
+      privateKey: ed25519.privateKey,
+      issuer: 'idp',
+      previousPublicKeys: [rsa.publicKey.export({ type: 'spki', format: 'pem' }) as string],
+    });
+
+    it('signs with the new key only', () => {
+      expect(decodeJwt(current.sign({}, 60).token).header.kid).toBe(current.keyId);
+      expect(current.keyId).not.toBe(previous.keyId);
+    });
+
+    it('still resolves tokens signed with a previous key', async () => {
+      const decoded = decodeJwt(previous.sign({}, 60).token);
+      const key = await current.resolve(decoded.header.kid!);
+
+      expect(key).toMatchObject({ kid: previous.keyId, alg: 'RS256' });
+      expect(verifySignature(decoded, key!)).toBe(true);
+    });
+
+    it('publishes both keys', () => {
+      const jwks = current.getJwks();
+
+      expect(jwks.keys.map((key) => [key.kid, key.alg])).toEqual([
+        [current.keyId, 'EdDSA'],
+        [previous.keyId, 'RS256'],
+      ]);
+    });
+
+    it('publishes under a configured key id', async () => {
+      const signer = new JwtSigner({ privateKey: ed25519.privateKey, keyId: '2026-06', issuer: 'idp' });
+
+      expect(decodeJwt(signer.sign({}, 60).token).header.kid).toBe('2026-06');
+      expect(signer.getJwks().keys[0].kid).toBe('2026-06');
+      expect(await signer.resolve(jwkThumbprint(ed25519.publicKey))).toBeUndefined();
+    });
+  });
+});
+
+describe('decodeJwt', () => {
+  it.each([
+    ['two segments', 'a.b'],
+    ['an empty signature', `${segment({ alg: 'RS256' })}.${segment({})}.`],
+    ['a header that is not JSON', `not-json.${segment({})}.sig`],
+    ['claims that are not an object', `${segment({ alg: 'RS256' })}.${segment(42)}.sig`],
+    ['a null header', `${segment(null)}.${segment({})}.sig`],
+  ])('rejects %s as malformed', (_, token) => {
+    expect(() => decodeJwt(token)).toThrow(JwtError);
+    try {
+      decodeJwt(token);
+    } catch (error: any) {
+      expect(error.code).toBe('malformed');
+    }
+  });
+});
+
+describe('JWKs', () => {
+  it('publishes only public RSA members', () => {
+    const jwk = toPublicJwk(rsa.publicKey, 'k1');
+
+    expect(Object.keys(jwk).sort()).toEqual(['alg', 'e', 'kid', 'kty', 'n', 'use']);
+    expect(jwk).toMatchObject({ kty: 'RSA', alg: 'RS256', use: 'sig', kid: 'k1' });
+  });
+
+  it('publishes only public Ed25519 members', () => {
+    const jwk = toPublicJwk(createPublicKey(ed25519.privateKey), 'k2');
+
+    expect(Object.keys(jwk).sort()).toEqual(['alg', 'crv', 'kid', 'kty', 'use', 'x']);
+    expect(jwk).toMatchObject({ kty: 'OKP', crv: 'Ed25519', alg: 'EdDSA' });
+  });
+
+  it('round-trips a published key', () => {
+    const jwk = toPublicJwk(rsa.publicKey, 'k1');
+    const key = createPublicKey({ key: jwk as any, format: 'jwk' });
+
+    expect(jwkThumbprint(key)).toBe(jwkThumbprint(rsa.publicKey));
+  });
+});
+
+describe('createJwtSignerFromEnv', () => {
+  const pem = (key: KeyObject, type: 'pkcs8' | 'spki') =>
+    (key.export({ type, format: 'pem' }) as string).trim().replace(/\n/g, '\\n');
+
+  it('reads escaped PEMs and previous keys separated by blank lines', async () => {
+    const older = generateKeyPairSync('ed25519');
+    const signer = createJwtSignerFromEnv({
+      JWT_PRIVATE_KEY: pem(rsa.privateKey, 'pkcs8'),
+      JWT_PREVIOUS_PUBLIC_KEYS: `${pem(ed25519.publicKey, 'spki')}\\n\\n${pem(older.publicKey, 'spki')}`,
+      JWT_ISSUER: 'https://idp.example',
+    });
+
+    expect(signer.algorithm).toBe('RS256');
+    expect(signer.issuer).toBe('https://idp.example');
+    expect(signer.audience).toBe('dataspace');
+    expect(signer.getJwks().keys).toHaveLength(3);
+    expect(await signer.resolve(jwkThumbprint(older.publicKey))).toBeDefined();
+  });
+
+  it('generates a key of the configured type without one', () => {
+    expect(createJwtSignerFromEnv({}).algorithm).toBe('EdDSA');
+    expect(createJwtSignerFromEnv({ JWT_SIGNING_ALG: 'RS256' }).algorithm).toBe('RS256');
+  });
+});
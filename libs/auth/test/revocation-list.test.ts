@@ -0,0 +1,81 @@
+import { describe, it, expect, afterEach } from 'vitest';
+import { RevocationList } from '../src/revocation-list';
+
+const now = () => Math.floor(Date.now() / 1000);
+
+/**
+ * Records the scripts the list runs and serves a fixed sorted set to LIST_SCRIPT
+ */
+class FakeRedis {
+  evals: { script: string; args: string[] }[] = [];
+  stored: [string, number][] = [];
+
+  async subscribe(): Promise<void> {}
+
+  async eval(script: string, _keys: string[], args: string[]): Promise<unknown> {
+    this.evals.push({ script, args });
+    const since = Number(args[0]);
+    return this.stored.filter(([, exp]) => exp >= since).flatMap(([jti, exp]) => [jti, String(exp)]);
+  }
+}
+
+let list: RevocationList | null = null;
+
+const started = async (redis: FakeRedis | null = null, options = {}) => {
+  list = new RevocationList({ redis: redis as any, ...options });
+  await list.start();
+  return list;
+};
+
+afterEach(() => {
+  list?.stop();
+  list = null;
+});
+
+describe('RevocationList', () => {
+  it('keeps a revoked token within the grace period after its expiry', async () => {
+    const revocations = await started();
+
+    await revocations.revoke('expired-10s-ago', now() - 10);
+    await revocations.revoke('expired-60s-ago', now() - 60);
+
+    expect(revocations.isRevoked('expired-10s-ago')).toBe(true);
+    expect(revocations.isRevoked('expired-60s-ago')).toBe(false);
+    expect(revocations.getStats().entries).toBe(1);
+  });
+
+  it('follows a configured grace period', async () => {
+    const revocations = await started(null, { graceSeconds: 0 });
+
+    await revocations.revoke('expired-10s-ago', now() - 10);
+
+    expect(revocations.isRevoked('expired-10s-ago')).toBe(false);
+  });
+
+  it('keeps entries within the grace period in the sweep', async () => {
+    const revocations = await started();
+    await revocations.revoke('expires-now', now());
+    revocations['revoked'].set('long-expired', now() - 31);
+
+    revocations['sweep']();
+
+    expect([...revocations['revoked'].keys()]).toEqual(['expires-now']);
+  });
+
+  it('sweeps Redis and resyncs from the grace period before now', async () => {
+    const redis = new FakeRedis();
+    redis.stored = [
+      ['expired-10s-ago', now() - 10],
+      ['current', now() + 60],
+    ];
+    const revocations = await started(redis);
+
+    expect(Number(redis.evals[0].args[0])).toBeLessThanOrEqual(now() - 30);
+    expect(revocations.isRevoked('expired-10s-ago')).toBe(true);
+    expect(revocations.isRevoked('current')).toBe(true);
+
+    await revocations.revoke('revoked', now() + 60);
+
+    expect(Number(redis.evals[1].args[2])).toBeLessThanOrEqual(now() - 30);
+  });
+});
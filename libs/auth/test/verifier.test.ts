@@ -0,0 +1,188 @@
+import { describe, it, expect } from 'vitest';
+import { generateKeyPairSync, KeyObject } from 'crypto';
+import { JwtSigner, type JwtClaims } from '../src/jwt';
+import { JwtVerifier, type JwtVerifierOptions } from '../src/verifier';
+
+const rsa = generateKeyPairSync('rsa', { modulusLength: 2048 });
+const ed25519 = generateKeyPairSync('ed25519');
+
+const rsaSigner = new JwtSigner({ privateKey: rsa.privateKey, issuer: 'idp', audience: 'dataspace' });
+const edSigner = new JwtSigner({ privateKey: ed25519.privateKey, issuer: 'idp', audience: 'dataspace' });
+
+const now = () => Math.floor(Date.now() / 1000);
+
+const pem = (key: KeyObject) => key.export({ type: 'spki', format: 'pem' }) as string;
+
+const segment = (value: unknown) => Buffer.from(JSON.stringify(value)).toString('base64url');
+
+const verifier = (overrides: Partial<JwtVerifierOptions> = {}) =>
+  new JwtVerifier({ keys: edSigner, issuer: 'idp', audience: 'dataspace', ...overrides });
+
+// A token valid for 60s; `claims` override the signer's iss, aud, exp and nbf
+const token = (claims: JwtClaims = {}, signer: JwtSigner = edSigner) => signer.sign(claims, 60).token;
+
+describe('JwtVerifier', () => {
+  it.each([
+    ['RS256', rsaSigner],
+    ['EdDSA', edSigner],
+  ])('accepts a valid %s token', async (_, signer) => {
+    const claims = await verifier({ keys: signer }).verify(token({ sub: 'client-1' }, signer));
+
+    expect(claims).toMatchObject({ iss: 'idp', aud: 'dataspace', sub: 'client-1' });
+    expect(Object.isFrozen(claims)).toBe(true);
+  });
+
+  describe('signature and key', () => {
+    it('rejects a token signed with another key under a known kid', async () => {
+      const other = new JwtSigner({ privateKey: generateKeyPairSync('ed25519').privateKey, keyId: edSigner.keyId, issuer: 'idp' });
+
+      await expect(verifier().verify(token({}, other))).rejects.toMatchObject({ code: 'invalid_signature' });
+    });
+
+    it('rejects a token whose alg was switched', async () => {
+      const [, claims, signature] = token({}, rsaSigner).split('.');
+      const forged = `${segment({ alg: 'EdDSA', kid: rsaSigner.keyId })}.${claims}.${signature}`;
+
+      await expect(verifier({ keys: rsaSigner }).verify(forged)).rejects.toMatchObject({ code: 'invalid_signature' });
+    });
+
+    it('rejects algorithms that are not allowed', async () => {
+      await expect(verifier({ keys: rsaSigner, algorithms: ['EdDSA'] }).verify(token({}, rsaSigner))).rejects.toMatchObject({
+        code: 'unsupported_alg',
+      });
+
+      const [, claims] = token().split('.');
+      await expect(verifier().verify(`${segment({ alg: 'none', kid: edSigner.keyId })}.${claims}.x`)).rejects.toMatchObject({
+        code: 'unsupported_alg',
+      });
+    });
+
+    it('rejects missing and unknown key ids', async () => {
+      const [, claims, signature] = token().split('.');
+
+      await expect(verifier().verify(`${segment({ alg: 'EdDSA' })}.${claims}.${signature}`)).rejects.toMatchObject({
+        code: 'unknown_key',
+      });
+      await expect(verifier().verify(token({}, rsaSigner))).rejects.toMatchObject({ code: 'unknown_key' });
+    });
+
+    it('rejects malformed tokens', async () => {
+      await expect(verifier().verify('not.a-token')).rejects.toMatchObject({ code: 'malformed' });
+    });
+  });
+
+  describe('exp and nbf', () => {
+    it('rejects a token that expired beyond the clock tolerance', async () => {
+      await expect(verifier().verify(token({ exp: now() - 31 }))).rejects.toMatchObject({ code: 'expired' });
+    });
+
+    it('accepts a token that expired within the clock tolerance', async () => {
+      await expect(verifier().verify(token({ exp: now() - 10 }))).resolves.toBeDefined();
+      await expect(verifier({ clockToleranceSeconds: 0 }).verify(token({ exp: now() - 10 }))).rejects.toMatchObject({
+        code: 'expired',
+      });
+    });
+
+    it('rejects a token that is not valid yet', async () => {
+      await expect(verifier().verify(token({ nbf: now() + 120 }))).rejects.toMatchObject({ code: 'not_yet_valid' });
+    });
+
+    it('accepts an nbf within the clock tolerance', async () => {
+      await expect(verifier().verify(token({ nbf: now() + 10 }))).resolves.toBeDefined();
+    });
+
+    it('rejects a token without a numeric exp', async () => {
+      await expect(verifier().verify(token({ exp: undefined }))).rejects.toMatchObject({ code: 'invalid_claims' });
+      await expect(verifier().verify(token({ exp: '9999999999' as any }))).rejects.toMatchObject({
+        code: 'invalid_claims',
+      });
+    });
+
+    it('does not serve an expired token from the cache', async () => {
+      const instance = verifier({ clockToleranceSeconds: 0 });
+      const expiring = token({ exp: now() + 1 });
+      await instance.verify(expiring);
+
+      await new Promise((resolve) => setTimeout(resolve, 2100));
+
+      await expect(instance.verify(expiring)).rejects.toMatchObject({ code: 'expired' });
+    });
+  });
+
+  describe('issuer and audience', () => {
+    it('rejects another issuer', async () => {
+      await expect(verifier().verify(token({ iss: 'elsewhere' }))).rejects.toMatchObject({ code: 'invalid_claims' });
+    });
+
+    it('accepts any shared audience', async () => {
+      await expect(verifier().verify(token({ aud: ['broker', 'dataspace'] }))).resolves.toBeDefined();
+      await expect(verifier({ audience: ['broker', 'catalog'] }).verify(token())).rejects.toMatchObject({
+        code: 'invalid_claims',
+      });
+      await expect(verifier().verify(token({ aud: undefined }))).rejects.toMatchObject({ code: 'invalid_claims' });
+    });
+  });
+
+  describe('key rotation', () => {
+    const next = generateKeyPairSync('ed25519');
+    const rotated = new JwtSigner({
+      privateKey: next.privateKey,
+      issuer: 'idp',
+      audience: 'dataspace',
+      previousPublicKeys: [pem(ed25519.publicKey)],
+    });
+
+    it('accepts tokens signed before the rotation', async () => {
+      await expect(verifier({ keys: rotated }).verify(token())).resolves.toMatchObject({ iss: 'idp' });
+      await expect(verifier({ keys: rotated }).verify(token({}, rotated))).resolves.toMatchObject({ iss: 'idp' });
+    });
+
+    it('rejects them once the previous key is dropped', async () => {
+      const dropped = new JwtSigner({ privateKey: next.privateKey, issuer: 'idp', audience: 'dataspace' });
+
+      await expect(verifier({ keys: dropped }).verify(token())).rejects.toMatchObject({ code: 'unknown_key' });
+    });
+  });
+
+  describe('memo', () => {
+    it('checks each signature once', async () => {
+      const instance = verifier();
+      const valid = token();
+
+      const first = await instance.verify(valid);
+      const second = await instance.verify(valid);
+
+      expect(second).toBe(first);
+      expect(instance.getStats()).toMatchObject({ verified: 1, cacheHits: 1, cacheSize: 1 });
+    });
+
+    it('checks revocation on cache hits', async () => {
+      const revoked = new Set<string>();
+      const instance = verifier({ revocations: { isRevoked: (jti) => revoked.has(jti) } });
+      const signed = edSigner.sign({}, 60);
+      await instance.verify(signed.token);
+
+      revoked.add(signed.jti);
+
+      await expect(instance.verify(signed.token)).rejects.toMatchObject({ code: 'revoked' });
+      expect(instance.getStats()).toMatchObject({ revoked: 1, rejected: 0 });
+    });
+
+    it('requires a jti when revocations are checked', async () => {
+      const instance = verifier({ revocations: { isRevoked: () => false } });
+
+      await expect(instance.verify(token({ jti: undefined }))).rejects.toMatchObject({ code: 'invalid_claims' });
+      await expect(verifier().verify(token({ jti: undefined }))).resolves.toBeDefined();
+    });
+
+    it('can be disabled', async () => {
+      const instance = verifier({ cacheMaxEntries: 0 });
+      const valid = token();
+
+      await instance.verify(valid);
+      await instance.verify(valid);
+
+      expect(instance.getStats()).toMatchObject({ verified: 2, cacheHits: 0, cacheSize: 0 });
+    });
+  });
+});
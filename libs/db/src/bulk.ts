@@ -0,0 +1,116 @@
+/**
+ * Bulk multi-row insert/upsert
+ *
+ * Rows are written in chunks inside a single transaction, either as
+ * multi-row `INSERT ... VALUES (...), (...)` statements or, when column types
+ * are given, as one `INSERT ... SELECT FROM UNNEST($1::type[], ...)` per chunk.
+ */
+
+import { query, withTransaction } from './pool.js';
+import { execute, internStatement } from './statements.js';
+
+/**
+ * Postgres accepts at most 65535 bind parameters per statement
+ */
+const MAX_PARAMETERS = 65535;
+
+const DEFAULT_CHUNK_SIZE = 1000;
+
+/**
+ * Options for bulkInsert
+ */
+export interface BulkInsertOptions {
+  /** Columns to write, defaults to the keys of the first row */
+  columns?: string[];
+  /**
+   * Postgres array element type per column, e.g. `{ participant_id: 'uuid', name: 'text' }`.
+   * When given for every column, chunks are sent as UNNEST arrays: one
+   * parameter per column regardless of row count, and a statement text that
+   * is the same for every chunk so it is prepared once.
+   */
+  types?: Record<string, string>;
+  /** Conflict clause without the ON CONFLICT keyword, e.g. `(did) DO NOTHING` */
+  onConflict?: string;
+  /** Select list for RETURNING, e.g. `id, name` */
+  returning?: string;
+  /** Rows per statement, defaults to 1000 (VALUES chunks are capped by the parameter limit) */
+  chunkSize?: number;
+}
+
+/**
+ * Result of a bulk insert
+ */
+export interface BulkInsertResult<T = any> {
+  rowCount: number;
+  rows: T[];
+}
+
+/**
+ * Insert many rows with as few round trips as possible, atomically.
+ * Runs inside withTransaction(), joining the caller's transaction if there is one.
+ * @param table Table name
+ * @param rows Rows keyed by column name
+ * @param options Columns, UNNEST types, conflict handling and RETURNING list
+ * @returns Inserted row count and RETURNING rows
+ */
+export const bulkInsert = async <T = any>(
+  table: string,
+  rows: Record<string, unknown>[],
+  options: BulkInsertOptions = {}
+): Promise<BulkInsertResult<T>> => {
+  if (rows.length === 0) {
+    return { rowCount: 0, rows: [] };
+  }
+
+  const columns = options.columns || Object.keys(rows[0]);
+  const useUnnest = !!options.types && columns.every((column) => options.types![column]);
+  const chunkSize = useUnnest
+    ? options.chunkSize || DEFAULT_CHUNK_SIZE
+    : Math.min(options.chunkSize || DEFAULT_CHUNK_SIZE, Math.floor(MAX_PARAMETERS / columns.length));
+
+  const suffix = [
+    options.onConflict ? `ON CONFLICT ${options.onConflict}` : '',
+    options.returning ? `RETURNING ${options.returning}` : '',
+  ].join(' ');
+
+  return withTransaction(async () => {
+    const inserted: BulkInsertResult<T> = { rowCount: 0, rows: [] };
+
+    for (let offset = 0; offset < rows.length; offset += chunkSize) {
+      const chunk = rows.slice(offset, offset + chunkSize);
+      let result;
+
+      if (useUnnest) {
+        const arrays = columns.map((column) => chunk.map((row) => row[column] ?? null));
+        const casts = columns.map((column, i) => `$${i + 1}::${options.types![column]}[]`);
+        const statement = internStatement(
+          `${table}.bulkInsert`,
+          `INSERT INTO ${table} (${columns.join(', ')})
+           SELECT * FROM UNNEST(${casts.join(', ')})
+           ${suffix}`
+        );
+        result = await execute(statement, arrays);
+      } else {
+        const values: unknown[] = [];
+        const tuples = chunk.map((row) => {
+          const placeholders = columns.map((column) => {
+            values.push(row[column] ?? null);
+            return `$${values.length}`;
+          });
+          return `(${placeholders.join(', ')})`;
+        });
+        result = await query(
+          `INSERT INTO ${table} (${columns.join(', ')})
+           VALUES ${tuples.join(', ')}
+           ${suffix}`,
+          values as any[]
+        );
+      }
+
+      inserted.rowCount += result.rowCount || 0;
+      inserted.rows.push(...(result.rows as T[]));
+    }
+
+    return inserted;
+  });
+};
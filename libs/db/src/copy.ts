@@ -0,0 +1,63 @@
+/**
+ * Streaming COPY FROM STDIN
+ *
+ * Rows are encoded to COPY text format as they are pulled from the source and
+ * piped into the connection with backpressure, so memory stays flat no matter
+ * how many rows are loaded.
+ */
+
+import { Readable } from 'node:stream';
+import { pipeline } from 'node:stream/promises';
+import { from as copyFromStdin } from 'pg-copy-streams';
+import { getClient, getTransactionClient } from './pool.js';
+
+/**
+ * Escape one value for COPY text format (NULL is \N)
+ */
+const encodeCopyValue = (value: unknown): string => {
+  if (value === null || value === undefined) {
+    return '\\N';
+  }
+
+  const text =
+    value instanceof Date ? value.toISOString() : typeof value === 'object' ? JSON.stringify(value) : String(value);
+
+  return text
+    .replace(/\\/g, '\\\\')
+    .replace(/\t/g, '\\t')
+    .replace(/\n/g, '\\n')
+    .replace(/\r/g, '\\r');
+};
+
+async function* encodeCopyRows(rows: AsyncIterable<unknown[]> | Iterable<unknown[]>): AsyncGenerator<string> {
+  for await (const row of rows) {
+    yield `${row.map(encodeCopyValue).join('\t')}\n`;
+  }
+}
+
+/**
+ * Load rows into a table with COPY FROM STDIN.
+ * Inside withTransaction() the transaction's client is used.
+ * @param table Table name
+ * @param columns Column names, in the order values appear in each row
+ * @param rows Row values, pulled lazily
+ * @returns Number of rows copied
+ */
+export const copyFrom = async (
+  table: string,
+  columns: string[],
+  rows: AsyncIterable<unknown[]> | Iterable<unknown[]>
+): Promise<number> => {
+  const transactionClient = getTransactionClient();
+  const client = transactionClient || (await getClient());
+
+  try {
+    const copyStream = client.query(copyFromStdin(`COPY ${table} (${columns.join(', ')}) FROM STDIN`));
+    await pipeline(Readable.from(encodeCopyRows(rows)), copyStream);
+    return copyStream.rowCount ?? 0;
+  } finally {
+    if (!transactionClient) {
+      client.release();
+    }
+  }
+};
@@ -0,0 +1,162 @@
+/**
+ * Count strategies for offset-paginated list queries
+ *
+ * - exact:     total from a COUNT(*) OVER() window column on the page query
+ * - estimated: total from planner statistics (pg_class.reltuples / EXPLAIN)
+ * - none:      no total at all
+ */
+
+import { query } from './pool.js';
+import { execute, internStatement } from './statements.js';
+
+/**
+ * Hidden column carrying the window count in exact mode
+ */
+const TOTAL_COLUMN = '__total_count';
+
+/**
+ * How list queries compute their total
+ */
+export type CountStrategy = 'exact' | 'estimated' | 'none';
+
+const COUNT_STRATEGIES: CountStrategy[] = ['exact', 'estimated', 'none'];
+
+/**
+ * Offset page with an optional total
+ */
+export interface CountedPage<T> {
+  data: T[];
+  total: number | null;
+  page: number;
+  pageSize: number;
+  totalPages: number | null;
+}
+
+/**
+ * Options for a counted page query
+ */
+export interface PageQueryOptions {
+  /** Select list, e.g. `id, name, created_at as "createdAt"` */
+  columns: string;
+  /** Table to select from */
+  from: string;
+  /** Optional filter using placeholders $1..$n matching `params` */
+  where?: string;
+  params?: unknown[];
+  /** ORDER BY expression, defaults to `created_at DESC` */
+  orderBy?: string;
+  page: number;
+  pageSize: number;
+  count?: CountStrategy;
+}
+
+/**
+ * Parse a count strategy from a query string value
+ * @param value Raw value, e.g. request.query.count
+ * @param fallback Strategy used when no value is given
+ * @returns Count strategy
+ */
+export const parseCountStrategy = (
+  value: string | undefined,
+  fallback: CountStrategy = 'exact'
+): CountStrategy => {
+  if (value === undefined || value === '') {
+    return fallback;
+  }
+  if (!COUNT_STRATEGIES.includes(value as CountStrategy)) {
+    throw new Error('Invalid count strategy');
+  }
+  return value as CountStrategy;
+};
+
+/**
+ * Estimate the number of rows matching a filter from planner statistics.
+ * Unfiltered tables use pg_class.reltuples, filtered ones the EXPLAIN row estimate.
+ * @param from Table name
+ * @param where Optional filter
+ * @param params Filter parameters
+ * @returns Estimated row count
+ */
+export const estimateCount = async (
+  from: string,
+  where?: string,
+  params: unknown[] = []
+): Promise<number> => {
+  if (!where) {
+    const result = await query(
+      'SELECT reltuples::bigint AS estimate FROM pg_class WHERE oid = to_regclass($1)',
+      [from]
+    );
+    const estimate = result.rows.length > 0 ? parseInt(result.rows[0].estimate, 10) : -1;
+    // reltuples is -1 until the table has been vacuumed or analyzed
+    if (estimate >= 0) {
+      return estimate;
+    }
+  }
+
+  const result = await query(
+    `EXPLAIN (FORMAT JSON) SELECT 1 FROM ${from}${where ? ` WHERE ${where}` : ''}`,
+    params as any[]
+  );
+  const plan = result.rows[0]['QUERY PLAN'];
+  const parsed = typeof plan === 'string' ? JSON.parse(plan) : plan;
+
+  return Math.round(parsed[0].Plan['Plan Rows']);
+};
+
+/**
+ * Fetch one offset page and its total using the given count strategy,
+ * without a separate COUNT(*) round trip in exact mode.
+ * @param options Query options
+ * @param mapRow Row mapper
+ * @returns Page with total
+ */
+export const queryPage = async <T>(
+  options: PageQueryOptions,
+  mapRow: (row: any) => T
+): Promise<CountedPage<T>> => {
+  const { from, where, page, pageSize, count = 'exact' } = options;
+  const params = [...(options.params || [])];
+  const offset = (page - 1) * pageSize;
+  const totalColumn = count === 'exact' ? `, COUNT(*) OVER() as "${TOTAL_COLUMN}"` : '';
+
+  const statement = internStatement(
+    `${from}.page`,
+    `SELECT ${options.columns}${totalColumn}
+     FROM ${from}
+     ${where ? `WHERE ${where}` : ''}
+     ORDER BY ${options.orderBy || 'created_at DESC'}
+     LIMIT $${params.length + 1} OFFSET $${params.length + 2}`
+  );
+  const pagePromise = execute(statement, [...params, pageSize, offset]);
+  const estimatePromise = count === 'estimated' ? estimateCount(from, where, params) : null;
+
+  const [result, estimate] = await Promise.all([pagePromise, estimatePromise]);
+
+  let total: number | null = null;
+  if (count === 'exact') {
+    if (result.rows.length > 0) {
+      total = parseInt(result.rows[0][TOTAL_COLUMN], 10);
+    } else if (offset > 0) {
+      // Past the last page the window has no rows to report on
+      const countResult = await query(
+        `SELECT COUNT(*) FROM ${from}${where ? ` WHERE ${where}` : ''}`,
+        params as any[]
+      );
+      total = parseInt(countResult.rows[0].count, 10);
+    } else {
+      total = 0;
+    }
+  } else if (count === 'estimated' && estimate !== null) {
+    // A short page pins the total exactly; otherwise never report fewer rows than seen
+    const seen = offset + result.rows.length;
+    total = result.rows.length < pageSize && (result.rows.length > 0 || offset === 0)
+      ? seen
+      : Math.max(estimate, seen);
+  }
+
+  const data = result.rows.map(({ [TOTAL_COLUMN]: _total, ...row }) => mapRow(row));
+  const totalPages = total === null ? null : Math.ceil(total / pageSize);
+
+  return { data, total, page, pageSize, totalPages };
+};
@@ -0,0 +1,167 @@
+/**
+ * Generic table-descriptor-driven CRUD repository
+ *
+ * Mutations run as a single statement (INSERT/UPDATE/DELETE ... RETURNING),
+ * so callers no longer need a findById round trip before writing. Generated
+ * SQL is registered as named prepared statements.
+ */
+
+import type { Readable } from 'node:stream';
+import { exportQuery, type ExportFormat } from './export.js';
+import { execute, internStatement, type PreparedStatement } from './statements.js';
+
+/**
+ * Describes how an entity maps onto a table
+ */
+export interface TableDescriptor {
+  /** Table name */
+  table: string;
+  /** Primary key column, defaults to `id` */
+  idColumn?: string;
+  /** Select list used for SELECT and RETURNING, e.g. `id, name, created_at as "createdAt"` */
+  returning: string;
+  /** Writable fields, entity property -> column name */
+  columns: Record<string, string>;
+  /** Properties stored as JSON (serialized with JSON.stringify) */
+  jsonColumns?: string[];
+  /** Set updated_at = CURRENT_TIMESTAMP on update, defaults to true */
+  touchUpdatedAt?: boolean;
+}
+
+export class CrudRepository<T> {
+  /**
+   * Generated prepared statements keyed by statement kind and column set
+   */
+  private readonly statements = new Map<string, PreparedStatement>();
+
+  constructor(
+    private readonly descriptor: TableDescriptor,
+    private readonly mapRow: (row: any) => T
+  ) {}
+
+  /**
+   * Table name
+   */
+  get table(): string {
+    return this.descriptor.table;
+  }
+
+  /**
+   * Find a row by primary key
+   * @param id Primary key value
+   * @returns Mapped entity or null
+   */
+  async findById(id: string): Promise<T | null> {
+    const statement = this.cachedStatement('findById', () =>
+      `SELECT ${this.descriptor.returning} FROM ${this.descriptor.table} WHERE ${this.idColumn} = $1`
+    );
+    const result = await execute(statement, [id]);
+    return result.rows.length > 0 ? this.mapRow(result.rows[0]) : null;
+  }
+
+  /**
+   * Insert a row. Properties that are undefined or not in the descriptor are skipped.
+   * @param values Entity properties to write
+   * @returns Inserted entity
+   */
+  async insert(values: object): Promise<T> {
+    const { fields, params } = this.collect(values);
+    const statement = this.cachedStatement(`insert:${fields.join(',')}`, () => {
+      const columns = fields.map((field) => this.descriptor.columns[field]);
+      const placeholders = fields.map((_, i) => `$${i + 1}`);
+      return `INSERT INTO ${this.descriptor.table} (${columns.join(', ')})
+              VALUES (${placeholders.join(', ')})
+              RETURNING ${this.descriptor.returning}`;
+    });
+
+    const result = await execute(statement, params);
+    return this.mapRow(result.rows[0]);
+  }
+
+  /**
+   * Update a row in one round trip. Properties that are undefined or not in
+   * the descriptor are skipped; with nothing to write the current row is returned.
+   * @param id Primary key value
+   * @param changes Entity properties to write
+   * @returns Updated entity, or null when no row has this id
+   */
+  async update(id: string, changes: object): Promise<T | null> {
+    const { fields, params } = this.collect(changes);
+    if (fields.length === 0) {
+      return this.findById(id);
+    }
+
+    const statement = this.cachedStatement(`update:${fields.join(',')}`, () => {
+      const assignments = fields.map((field, i) => `${this.descriptor.columns[field]} = $${i + 1}`);
+      if (this.descriptor.touchUpdatedAt !== false) {
+        assignments.push('updated_at = CURRENT_TIMESTAMP');
+      }
+      return `UPDATE ${this.descriptor.table}
+              SET ${assignments.join(', ')}
+              WHERE ${this.idColumn} = $${fields.length + 1}
+              RETURNING ${this.descriptor.returning}`;
+    });
+
+    const result = await execute(statement, [...params, id]);
+    return result.rows.length > 0 ? this.mapRow(result.rows[0]) : null;
+  }
+
+  /**
+   * Delete a row in one round trip
+   * @param id Primary key value
+   * @returns Deleted entity, or null when no row has this id
+   */
+  async delete(id: string): Promise<T | null> {
+    const statement = this.cachedStatement('delete', () =>
+      `DELETE FROM ${this.descriptor.table} WHERE ${this.idColumn} = $1 RETURNING ${this.descriptor.returning}`
+    );
+    const result = await execute(statement, [id]);
+    return result.rows.length > 0 ? this.mapRow(result.rows[0]) : null;
+  }
+
+  /**
+   * Stream every row as CSV or NDJSON from a server-side cursor, newest first.
+   * @param format Export format
+   * @param columns Select list overriding `returning`; rows are then exported unmapped
+   * @returns Readable text stream
+   */
+  async export(format: ExportFormat, columns?: string): Promise<Readable> {
+    return exportQuery({
+      text: `SELECT ${columns || this.descriptor.returning} FROM ${this.descriptor.table}
+             ORDER BY created_at DESC, ${this.idColumn} DESC`,
+      format,
+      mapRow: columns ? undefined : (row) => this.mapRow(row) as Record<string, unknown>,
+    });
+  }
+
+  private get idColumn(): string {
+    return this.descriptor.idColumn || 'id';
+  }
+
+  /**
+   * Collect writable properties in descriptor order, so equal column sets share cached SQL
+   */
+  private collect(values: object): { fields: string[]; params: unknown[] } {
+    const fields: string[] = [];
+    const params: unknown[] = [];
+
+    for (const field of Object.keys(this.descriptor.columns)) {
+      const value = (values as Record<string, unknown>)[field];
+      if (value === undefined) continue;
+
+      fields.push(field);
+      params.push(this.descriptor.jsonColumns?.includes(field) ? JSON.stringify(value) : value);
+    }
+
+    return { fields, params };
+  }
+
+  private cachedStatement(key: string, build: () => string): PreparedStatement {
+    let statement = this.statements.get(key);
+    if (!statement) {
+      statement = internStatement(`${this.descriptor.table}.${key.split(':')[0]}`, build());
+      this.statements.set(key, statement);
+    }
+    return statement;
+  }
+}
@@ -0,0 +1,145 @@
+/**
+ * Streaming CSV/NDJSON export from a server-side cursor
+ *
+ * Rows are fetched in batches through a Postgres cursor and formatted as they
+ * are read. The returned stream only pulls the next batch when the consumer
+ * (usually the HTTP response) has drained, so memory stays flat for any table size.
+ */
+
+import { Transform, pipeline, type Readable } from 'node:stream';
+import QueryStream from 'pg-query-stream';
+import { getClient } from './pool.js';
+
+/**
+ * Rows fetched per cursor round trip
+ */
+const DEFAULT_BATCH_SIZE = 500;
+
+/**
+ * Export body format
+ */
+export type ExportFormat = 'csv' | 'ndjson';
+
+const EXPORT_FORMATS: ExportFormat[] = ['csv', 'ndjson'];
+
+/**
+ * Content-Type header value per export format
+ */
+export const EXPORT_CONTENT_TYPES: Record<ExportFormat, string> = {
+  csv: 'text/csv; charset=utf-8',
+  ndjson: 'application/x-ndjson; charset=utf-8',
+};
+
+/**
+ * Options for exportQuery
+ */
+export interface ExportQueryOptions {
+  /** SQL text with $n placeholders */
+  text: string;
+  params?: unknown[];
+  format: ExportFormat;
+  /** Row mapper applied before formatting */
+  mapRow?: (row: any) => Record<string, unknown>;
+  /** Rows fetched per cursor round trip, defaults to 500 */
+  batchSize?: number;
+}
+
+/**
+ * Parse an export format from a query string value
+ * @param value Raw value, e.g. request.query.format
+ * @param fallback Format used when no value is given
+ * @returns Export format
+ */
+export const parseExportFormat = (
+  value: string | undefined,
+  fallback: ExportFormat = 'ndjson'
+): ExportFormat => {
+  if (value === undefined || value === '') {
+    return fallback;
+  }
+  if (!EXPORT_FORMATS.includes(value as ExportFormat)) {
+    throw new Error('Invalid export format');
+  }
+  return value as ExportFormat;
+};
+
+const toCsvValue = (value: unknown): string => {
+  if (value === null || value === undefined) {
+    return '';
+  }
+
+  const text =
+    value instanceof Date ? value.toISOString() : typeof value === 'object' ? JSON.stringify(value) : String(value);
+
+  return /[",\r\n]/.test(text) ? `"${text.replace(/"/g, '""')}"` : text;
+};
+
+/**
+ * Transform turning row objects into CSV (header taken from the first row) or NDJSON lines
+ */
+const createFormatter = (
+  format: ExportFormat,
+  mapRow: (row: any) => Record<string, unknown>
+): Transform => {
+  let header: string[] | null = null;
+
+  return new Transform({
+    writableObjectMode: true,
+    transform(row, _encoding, callback) {
+      try {
+        const record = mapRow(row);
+
+        if (format === 'ndjson') {
+          callback(null, `${JSON.stringify(record)}\n`);
+          return;
+        }
+
+        let prefix = '';
+        if (!header) {
+          header = Object.keys(record);
+          prefix = `${header.map(toCsvValue).join(',')}\r\n`;
+        }
+        callback(null, `${prefix}${header.map((key) => toCsvValue(record[key])).join(',')}\r\n`);
+      } catch (error) {
+        callback(error as Error);
+      }
+    },
+  });
+};
+
+/**
+ * Stream the rows of a query as CSV or NDJSON.
+ * A dedicated pool client holds the cursor until the stream ends, fails or is destroyed.
+ * @param options Query, format and row mapper
+ * @returns Readable text stream, suitable for reply.send()
+ */
+export const exportQuery = async (options: ExportQueryOptions): Promise<Readable> => {
+  const client = await getClient();
+  const rows = client.query(
+    new QueryStream(options.text, options.params as any[] | undefined, {
+      batchSize: options.batchSize || DEFAULT_BATCH_SIZE,
+    })
+  );
+
+  let ended = false;
+  let released = false;
+  const release = (destroy: boolean) => {
+    if (!released) {
+      released = true;
+      client.release(destroy);
+    }
+  };
+
+  rows.on('end', () => {
+    ended = true;
+    release(false);
+  });
+  // An aborted or failed export leaves the portal open; discard the connection
+  rows.on('close', () => release(!ended));
+
+  return pipeline(rows, createFormatter(options.format, options.mapRow || ((row) => row)), (error) => {
+    if (error) {
+      release(true);
+    }
+  });
+};
@@ -1,65 +1,83 @@
-import { Pool } from 'pg';
-import type { PoolClient } from 'pg';
+export {
+  initializePool,
+  getPool,
+  getClient,
+  getTransactionClient,
+  query,
+  withTransaction,
+  afterCommit,
+  closePool,
+  Pool,
+  type PoolClient,
+} from './pool.js';
 
-/**
- * Database pool instance
- */
-let pool: Pool | null = null;
+export {
+  encodeCursor,
+  decodeCursor,
+  buildKeysetQuery,
+  toKeysetPage,
+  type Cursor,
+  type KeysetPage,
+  type KeysetQueryOptions,
+} from './pagination.js';
 
-/**
- * Initialize database pool
- * @param config Database configuration
- * @returns Pool instance
- */
-export const initializePool = (config: {
-  host: string;
-  port: number;
-  database: string;
-  user: string;
-  password: string;
-  max?: number;
-}): Pool => {
-  pool = new Pool(config);
-  return pool;
-};
+export {
+  parseCountStrategy,
+  estimateCount,
+  queryPage,
+  type CountStrategy,
+  type CountedPage,
+  type PageQueryOptions,
+} from './count.js';
 
-/**
- * Get database pool
- * @returns Pool instance
- */
-export const getPool = (): Pool => {
-  if (!pool) {
-    throw new Error('Database pool not initialized. Call initializePool first.');
-  }
-  return pool;
-};
+export { CrudRepository, type TableDescriptor } from './crud.js';
 
-/**
- * Get a client from the pool
- * @returns PoolClient
- */
-export const getClient = async (): Promise<PoolClient> => {
-  return getPool().connect();
-};
+export {
+  defineStatement,
+  internStatement,
+  execute,
+  listStatements,
+  getStatementStats,
+  resetStatementStats,
+  type PreparedStatement,
+  type StatementStats,
+} from './statements.js';
 
-/**
- * Execute a query
- * @param query SQL query string
- * @param params Query parameters
- * @returns Query result
- */
-export const query = async (query: string, params?: any[]) => {
-  return getPool().query(query, params);
-};
+export { bulkInsert, type BulkInsertOptions, type BulkInsertResult } from './bulk.js';
 
-/**
- * Close the database pool
- */
-export const closePool = async (): Promise<void> => {
-  if (pool) {
-    await pool.end();
-    pool = null;
-  }
-};
+export { copyFrom } from './copy.js';
 
-export { Pool, PoolClient };
+export {
+  parseExportFormat,
+  exportQuery,
+  EXPORT_CONTENT_TYPES,
+  type ExportFormat,
+  type ExportQueryOptions,
+} from './export.js';
+
+export {
+  SEARCH_CONFIG,
+  prefixTsQuery,
+  fullTextSearch,
+  parseSearchMode,
+  fuzzySearch,
+  searchPredicate,
+  escapeLike,
+  buildSuggestQuery,
+  type FullTextSearch,
+  type SearchMode,
+} from './search.js';
+
+export {
+  appendToOutbox,
+  appendToOutboxFrom,
+  drainOutbox,
+  purgeOutbox,
+  getOutboxBacklog,
+  outboxStore,
+  DEFAULT_OUTBOX_MAX_ATTEMPTS,
+  type OutboxEntry,
+  type OutboxRecord,
+  type OutboxBacklog,
+  type OutboxSourceParams,
+} from './outbox.js';
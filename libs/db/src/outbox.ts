@@ -0,0 +1,278 @@
+/**
+ * Transactional outbox
+ *
+ * Services append domain events to `event_outbox` in the same transaction as
+ * the entity change they describe, so an event is recorded if and only if the
+ * change commits. A relay (see OutboxRelay in @dataspace/kafka) drains the
+ * table to Kafka in batches, off the request path.
+ *
+ * One relay drains at a time (an advisory lock serialises replicas), so
+ * events leave in insertion order. An event that keeps failing on its own is
+ * moved aside as failed after `maxAttempts` so it cannot stall the rest.
+ */
+
+import { withTransaction } from './pool.js';
+import { defineStatement, execute } from './statements.js';
+
+/**
+ * One event to publish
+ */
+export interface OutboxEntry {
+  eventId: string;
+  topic: string;
+  /** Kafka message key, normally the aggregate id so its events stay ordered */
+  key: string;
+  eventType: string;
+  payload: Record<string, unknown>;
+  headers?: Record<string, string>;
+}
+
+/**
+ * An unpublished event claimed by a relay
+ */
+export interface OutboxRecord extends OutboxEntry {
+  id: string;
+  attempts: number;
+  createdAt: Date;
+}
+
+/**
+ * Pending events, the age of the oldest one, and events given up on
+ */
+export interface OutboxBacklog {
+  pending: number;
+  oldestAgeSeconds: number;
+  failed: number;
+}
+
+/**
+ * Attempts before an event that fails on its own is moved aside
+ */
+export const DEFAULT_OUTBOX_MAX_ATTEMPTS = 10;
+
+/**
+ * One statement per batch regardless of size, as UNNEST arrays
+ */
+const APPEND = defineStatement(
+  'event_outbox.append',
+  `INSERT INTO event_outbox (event_id, topic, message_key, event_type, payload, headers)
+   SELECT * FROM UNNEST($1::uuid[], $2::text[], $3::text[], $4::text[], $5::jsonb[], $6::jsonb[])`
+);
+
+/**
+ * Held until the draining transaction ends. Replicas that miss it skip the
+ * round instead of publishing newer events past a batch that is failing.
+ */
+const LOCK = defineStatement(
+  'event_outbox.lock',
+  `SELECT pg_try_advisory_xact_lock(hashtext('event_outbox')) AS locked`
+);
+
+const CLAIM = defineStatement(
+  'event_outbox.claim',
+  `SELECT id, event_id, topic, message_key, event_type, payload, headers, attempts, created_at
+   FROM event_outbox
+   WHERE published_at IS NULL AND failed_at IS NULL
+   ORDER BY id
+   LIMIT $1
+   FOR UPDATE`
+);
+
+const MARK_PUBLISHED = defineStatement(
+  'event_outbox.markPublished',
+  `UPDATE event_outbox SET published_at = CURRENT_TIMESTAMP WHERE id = ANY($1::bigint[])`
+);
+
+const MARK_FAILED = defineStatement(
+  'event_outbox.markFailed',
+  `UPDATE event_outbox SET attempts = attempts + 1, last_error = $2 WHERE id = ANY($1::bigint[])`
+);
+
+const MARK_DEAD = defineStatement(
+  'event_outbox.markDead',
+  `UPDATE event_outbox
+   SET attempts = attempts + 1, last_error = $2, failed_at = CURRENT_TIMESTAMP
+   WHERE id = $1::bigint`
+);
+
+const PURGE = defineStatement(
+  'event_outbox.purge',
+  `DELETE FROM event_outbox
+   WHERE published_at IS NOT NULL AND published_at < CURRENT_TIMESTAMP - make_interval(secs => $1)`
+);
+
+const BACKLOG = defineStatement(
+  'event_outbox.backlog',
+  `SELECT COUNT(*) FILTER (WHERE failed_at IS NULL) as pending,
+          COALESCE(EXTRACT(EPOCH FROM CURRENT_TIMESTAMP - MIN(created_at) FILTER (WHERE failed_at IS NULL)), 0) as oldest_age,
+          COUNT(*) FILTER (WHERE failed_at IS NOT NULL) as failed
+   FROM event_outbox
+   WHERE published_at IS NULL`
+);
+
+/**
+ * Record events for publishing. Call inside the withTransaction() that writes
+ * the entity change; outside a transaction the insert commits on its own.
+ * @param entries Events to append, in publish order
+ */
+export const appendToOutbox = async (entries: OutboxEntry | OutboxEntry[]): Promise<void> => {
+  const list = Array.isArray(entries) ? entries : [entries];
+  if (list.length === 0) {
+    return;
+  }
+
+  await execute(APPEND, [
+    list.map((entry) => entry.eventId),
+    list.map((entry) => entry.topic),
+    list.map((entry) => entry.key),
+    list.map((entry) => entry.eventType),
+    list.map((entry) => JSON.stringify(entry.payload)),
+    list.map((entry) => JSON.stringify(entry.headers || {})),
+  ]);
+};
+
+/**
+ * Placeholders, in the statement that embeds appendToOutboxFrom(), holding the
+ * topic, event type and aggregate type of every event
+ */
+export interface OutboxSourceParams {
+  topic: string;
+  eventType: string;
+  aggregateType: string;
+}
+
+/**
+ * SQL for a data-modifying CTE that records one event per row of `source`,
+ * for set-based writes whose rows never reach the application, e.g.
+ * `WITH ins AS (INSERT ... RETURNING ...), events AS (${appendToOutboxFrom(...)})`.
+ * `source` must yield `aggregate_id` (text) and `data` (jsonb). Payload and
+ * headers have the shape createDomainEvent() and toOutboxEntry() in
+ * @dataspace/kafka produce, with the statement time as the event timestamp.
+ * @param source Table, CTE name or parenthesised subquery
+ * @param params Placeholders for the topic, event type and aggregate type
+ */
+export const appendToOutboxFrom = (source: string, params: OutboxSourceParams): string => {
+  const eventType = `${params.eventType}::text`;
+  return `INSERT INTO event_outbox (event_id, topic, message_key, event_type, payload, headers)
+   SELECT e.event_id, ${params.topic}::text, e.aggregate_id, ${eventType},
+          jsonb_build_object(
+            'eventId', e.event_id,
+            'eventType', ${eventType},
+            'aggregateId', e.aggregate_id,
+            'aggregateType', ${params.aggregateType}::text,
+            'timestamp', to_char(CURRENT_TIMESTAMP AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS.MS"Z"'),
+            'version', 1,
+            'data', e.data
+          ),
+          jsonb_build_object('event-type', ${eventType}, 'event-id', e.event_id)
+   FROM (SELECT uuid_generate_v4() AS event_id, s.aggregate_id::text AS aggregate_id, s.data FROM ${source} s) e`;
+};
+
+/**
+ * Claim up to `limit` unpublished events in insertion order and hand them to
+ * `publish`. They are marked published only if publish resolves; otherwise
+ * the claim is released, the failure recorded and the error rethrown, so the
+ * same events are retried first on the next call.
+ *
+ * Once a batch has failed its events are retried one at a time, so an event
+ * that can never be sent is isolated. When it fails alone for the
+ * `maxAttempts`th time it is marked failed (failed_at, last_error) and no
+ * longer claimed; reset failed_at and attempts to requeue it.
+ * @param limit Maximum events per batch
+ * @param publish Sends the batch; must not resolve before the broker acknowledged it
+ * @param maxAttempts Attempts before a lone failing event is moved aside
+ * @returns Number of events published; 0 while another relay holds the outbox
+ */
+export const drainOutbox = async (
+  limit: number,
+  publish: (records: OutboxRecord[]) => Promise<void>,
+  maxAttempts: number = DEFAULT_OUTBOX_MAX_ATTEMPTS
+): Promise<number> => {
+  let claimed: OutboxRecord[] = [];
+
+  try {
+    return await withTransaction(async () => {
+      const lock = await execute(LOCK);
+      if (!lock.rows[0].locked) {
+        return 0;
+      }
+
+      const result = await execute(CLAIM, [limit]);
+      claimed = result.rows.map(mapRowToRecord);
+      if (claimed.length === 0) {
+        return 0;
+      }
+      if (claimed[0].attempts > 0) {
+        claimed = claimed.slice(0, 1);
+      }
+
+      await publish(claimed);
+      await execute(MARK_PUBLISHED, [claimed.map((record) => record.id)]);
+      return claimed.length;
+    });
+  } catch (error) {
+    if (claimed.length > 0) {
+      await recordFailure(claimed, error, maxAttempts).catch(() => undefined);
+    }
+    throw error;
+  }
+};
+
+const recordFailure = async (claimed: OutboxRecord[], error: unknown, maxAttempts: number): Promise<void> => {
+  const message = error instanceof Error ? error.message : String(error);
+  const [record] = claimed;
+
+  if (claimed.length === 1 && record.attempts + 1 >= maxAttempts) {
+    await execute(MARK_DEAD, [record.id, message]);
+    console.error(
+      `Outbox event ${record.eventId} (${record.eventType} on ${record.topic}) marked failed after ${record.attempts + 1} attempts: ${message}`
+    );
+    return;
+  }
+
+  await execute(MARK_FAILED, [claimed.map((entry) => entry.id), message]);
+};
+
+/**
+ * Delete published events older than the retention period
+ * @param retentionSeconds How long published events are kept for inspection
+ * @returns Number of rows deleted
+ */
+export const purgeOutbox = async (retentionSeconds: number): Promise<number> => {
+  const result = await execute(PURGE, [retentionSeconds]);
+  return result.rowCount ?? 0;
+};
+
+/**
+ * Size and age of the unpublished backlog
+ */
+export const getOutboxBacklog = async (): Promise<OutboxBacklog> => {
+  const result = await execute(BACKLOG);
+  const row = result.rows[0];
+  return {
+    pending: parseInt(row.pending, 10),
+    oldestAgeSeconds: Math.round(parseFloat(row.oldest_age)),
+    failed: parseInt(row.failed, 10),
+  };
+};
+
+/**
+ * Outbox storage in the shape OutboxRelay (@dataspace/kafka) expects
+ */
+export const outboxStore = {
+  drain: drainOutbox,
+  purge: purgeOutbox,
+  backlog: getOutboxBacklog,
+};
+
+const mapRowToRecord = (row: any): OutboxRecord => ({
+  id: String(row.id),
+  eventId: row.event_id,
+  topic: row.topic,
+  key: row.message_key,
+  eventType: row.event_type,
+  payload: row.payload,
+  headers: row.headers || {},
+  attempts: row.attempts,
+  createdAt: row.created_at,
+});
@@ -0,0 +1,138 @@
+/**
+ * Keyset (cursor) pagination helpers
+ *
+ * Pages are ordered by (created_at DESC, id DESC) and continued with a
+ * row-value comparison, so fetching page N costs the same as page 1.
+ */
+
+/**
+ * Hidden column carrying the full-precision created_at value of each row.
+ * JS Dates only keep milliseconds, so cursors are built from the text form.
+ */
+const CURSOR_COLUMN = '__cursor_created_at';
+
+/**
+ * Postgres text output of a timestamp / timestamptz, as written into cursors
+ */
+const CURSOR_TIMESTAMP = /^\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(?:\.\d{1,6})?(?:Z|[+-]\d{2}(?::?\d{2}){0,2})?$/;
+
+/**
+ * Row ids are UUIDs (or serial integers)
+ */
+const CURSOR_ID = /^(?:[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}|\d{1,19})$/i;
+
+/**
+ * Decoded cursor position
+ */
+export interface Cursor {
+  createdAt: string;
+  id: string;
+}
+
+/**
+ * Keyset page returned by repositories in cursor mode
+ */
+export interface KeysetPage<T> {
+  data: T[];
+  pageSize: number;
+  nextCursor: string | null;
+}
+
+/**
+ * Options for building a keyset query
+ */
+export interface KeysetQueryOptions {
+  /** Select list, e.g. `id, name, created_at as "createdAt"` */
+  columns: string;
+  /** Table (or table expression) to select from */
+  from: string;
+  /** Optional filter using placeholders $1..$n matching `params` */
+  where?: string;
+  params?: unknown[];
+  /** Opaque cursor from a previous page, or null for the first page */
+  after?: string | null;
+  pageSize: number;
+}
+
+/**
+ * Encode a cursor position into an opaque token
+ * @param cursor Cursor position
+ * @returns Opaque cursor string
+ */
+export const encodeCursor = (cursor: Cursor): string => {
+  return Buffer.from(JSON.stringify([cursor.createdAt, cursor.id])).toString('base64url');
+};
+
+/**
+ * Decode an opaque cursor token. Tokens that are malformed, or carry values
+ * the query could not compare, throw 'Invalid cursor' rather than reaching SQL.
+ * @param token Cursor string from a previous page
+ * @returns Cursor position
+ */
+export const decodeCursor = (token: string): Cursor => {
+  try {
+    const decoded = JSON.parse(Buffer.from(token, 'base64url').toString('utf8'));
+    if (
+      Array.isArray(decoded) &&
+      decoded.length === 2 &&
+      typeof decoded[0] === 'string' &&
+      typeof decoded[1] === 'string' &&
+      CURSOR_TIMESTAMP.test(decoded[0]) &&
+      CURSOR_ID.test(decoded[1])
+    ) {
+      return { createdAt: decoded[0], id: decoded[1] };
+    }
+  } catch {
+    // Fall through to the error below
+  }
+  throw new Error('Invalid cursor');
+};
+
+/**
+ * Build a keyset page query. One extra row is fetched to detect the last page.
+ * @param options Query options
+ * @returns SQL text and parameter values
+ */
+export const buildKeysetQuery = (options: KeysetQueryOptions): { text: string; values: unknown[] } => {
+  const values = [...(options.params || [])];
+  const conditions = options.where ? [`(${options.where})`] : [];
+
+  if (options.after) {
+    const cursor = decodeCursor(options.after);
+    values.push(cursor.createdAt, cursor.id);
+    conditions.push(`(created_at, id) < ($${values.length - 1}, $${values.length})`);
+  }
+
+  values.push(options.pageSize + 1);
+
+  const text = `SELECT ${options.columns}, created_at::text as "${CURSOR_COLUMN}"
+     FROM ${options.from}
+     ${conditions.length > 0 ? `WHERE ${conditions.join(' AND ')}` : ''}
+     ORDER BY created_at DESC, id DESC
+     LIMIT $${values.length}`;
+
+  return { text, values };
+};
+
+/**
+ * Turn the rows of a keyset query into a page with its next cursor
+ * @param rows Rows returned by a query from buildKeysetQuery
+ * @param pageSize Requested page size
+ * @param mapRow Row mapper
+ * @returns Keyset page
+ */
+export const toKeysetPage = <T>(
+  rows: any[],
+  pageSize: number,
+  mapRow: (row: any) => T
+): KeysetPage<T> => {
+  const hasMore = rows.length > pageSize;
+  const pageRows = hasMore ? rows.slice(0, pageSize) : rows;
+  const last = pageRows[pageRows.length - 1];
+
+  return {
+    data: pageRows.map(({ [CURSOR_COLUMN]: _cursor, ...row }) => mapRow(row)),
+    pageSize,
+    nextCursor: hasMore && last ? encodeCursor({ createdAt: last[CURSOR_COLUMN], id: String(last.id) }) : null,
+  };
+};
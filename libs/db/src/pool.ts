@@ -0,0 +1,150 @@
+import { AsyncLocalStorage } from 'node:async_hooks';
+import { Pool } from 'pg';
+import type { PoolClient } from 'pg';
+
+/**
+ * Database pool instance
+ */
+let pool: Pool | null = null;
+
+/**
+ * Client of the transaction running in the current async context, if any
+ */
+const transactionStorage = new AsyncLocalStorage<PoolClient>();
+
+/**
+ * Callbacks registered with afterCommit(), per transaction client
+ */
+const commitCallbacks = new WeakMap<PoolClient, Array<() => unknown>>();
+
+/**
+ * Initialize database pool
+ * @param config Database configuration
+ * @returns Pool instance
+ */
+export const initializePool = (config: {
+  host: string;
+  port: number;
+  database: string;
+  user: string;
+  password: string;
+  max?: number;
+}): Pool => {
+  pool = new Pool(config);
+  return pool;
+};
+
+/**
+ * Get database pool
+ * @returns Pool instance
+ */
+export const getPool = (): Pool => {
+  if (!pool) {
+    throw new Error('Database pool not initialized. Call initializePool first.');
+  }
+  return pool;
+};
+
+/**
+ * Get a client from the pool
+ * @returns PoolClient
+ */
+export const getClient = async (): Promise<PoolClient> => {
+  return getPool().connect();
+};
+
+/**
+ * Get the client of the transaction running in the current async context
+ * @returns PoolClient, or undefined outside withTransaction()
+ */
+export const getTransactionClient = (): PoolClient | undefined => {
+  return transactionStorage.getStore();
+};
+
+/**
+ * Execute a query. Inside withTransaction() the query runs on the transaction's client.
+ * @param query SQL query string
+ * @param params Query parameters
+ * @returns Query result
+ */
+export const query = async (query: string, params?: any[]) => {
+  const client = transactionStorage.getStore();
+  return client ? client.query(query, params) : getPool().query(query, params);
+};
+
+/**
+ * Run a function inside a transaction. Every query()/execute() made from within
+ * fn (including repository methods) uses the same client, so the writes commit
+ * or roll back together. Nested calls join the outer transaction.
+ * @param fn Work to run; receives the transaction client
+ * @returns Result of fn
+ */
+export const withTransaction = async <T>(fn: (client: PoolClient) => Promise<T>): Promise<T> => {
+  const current = transactionStorage.getStore();
+  if (current) {
+    return fn(current);
+  }
+
+  const client = await getClient();
+  let result: T;
+  let callbacks: Array<() => unknown>;
+  try {
+    await client.query('BEGIN');
+    result = await transactionStorage.run(client, () => fn(client));
+    await client.query('COMMIT');
+  } catch (error) {
+    await client.query('ROLLBACK');
+    throw error;
+  } finally {
+    callbacks = commitCallbacks.get(client) || [];
+    commitCallbacks.delete(client);
+    client.release();
+  }
+
+  for (const callback of callbacks) {
+    await runCommitCallback(callback);
+  }
+  return result;
+};
+
+/**
+ * Run a side effect once the current transaction commits, e.g. updating a
+ * projection that must not see rolled-back writes. Callbacks are dropped on
+ * rollback; outside withTransaction() the callback runs immediately. Errors
+ * are logged, since the writes they follow are already committed.
+ * @param callback Side effect to run
+ */
+export const afterCommit = async (callback: () => unknown): Promise<void> => {
+  const client = transactionStorage.getStore();
+  if (!client) {
+    await runCommitCallback(callback);
+    return;
+  }
+
+  const callbacks = commitCallbacks.get(client);
+  if (callbacks) {
+    callbacks.push(callback);
+  } else {
+    commitCallbacks.set(client, [callback]);
+  }
+};
+
+const runCommitCallback = async (callback: () => unknown): Promise<void> => {
+  try {
+    await callback();
+  } catch (error) {
+    console.error('afterCommit callback failed:', error);
+  }
+};
+
+/**
+ * Close the database pool
+ */
+export const closePool = async (): Promise<void> => {
+  if (pool) {
+    await pool.end();
+    pool = null;
+  }
+};
+
+export { Pool, PoolClient };
@@ -0,0 +1,133 @@
+/**
+ * Full-text and trigram search helpers
+ *
+ * Searchable tables carry a generated, GIN-indexed `search_vector tsvector`
+ * column. User input is tokenized by the same parser as the column and each
+ * token is matched as a prefix, so results update as the user types.
+ *
+ * Fuzzy mode matches short identifier-like columns (names, DIDs) through
+ * pg_trgm GIN indexes instead, tolerating typos and partial words.
+ */
+
+/**
+ * Text search configuration shared by the generated columns and queries.
+ * `simple` does no stemming, which suits names, identifiers and mixed languages.
+ */
+export const SEARCH_CONFIG = 'simple';
+
+/**
+ * How list endpoints match search text
+ */
+export type SearchMode = 'fulltext' | 'fuzzy';
+
+const SEARCH_MODES: SearchMode[] = ['fulltext', 'fuzzy'];
+
+/**
+ * SQL fragments for a ranked match
+ */
+export interface FullTextSearch {
+  /** Predicate for WHERE, uses the GIN index on the vector column */
+  where: string;
+  /** ts_rank expression for ORDER BY (higher is better) */
+  rank: string;
+}
+
+/**
+ * Build a prefix-matching tsquery expression for free text bound to a placeholder,
+ * e.g. `air qual` becomes `'air':* & 'qual':*`
+ * @param placeholder Parameter holding the raw search text, e.g. `$1`
+ * @returns SQL expression of type tsquery (NULL when the text has no tokens)
+ */
+export const prefixTsQuery = (placeholder: string): string => {
+  return `(SELECT to_tsquery('${SEARCH_CONFIG}', string_agg(quote_literal(lexeme) || ':*', ' & '))
+           FROM unnest(to_tsvector('${SEARCH_CONFIG}', ${placeholder})))`;
+};
+
+/**
+ * Build the predicate and rank for a full-text search on a tsvector column
+ * @param placeholder Parameter holding the raw search text, e.g. `$1`
+ * @param column tsvector column, defaults to `search_vector`
+ * @returns WHERE predicate and rank expression
+ */
+export const fullTextSearch = (placeholder: string, column: string = 'search_vector'): FullTextSearch => {
+  const tsQuery = prefixTsQuery(placeholder);
+  return {
+    where: `${column} @@ ${tsQuery}`,
+    rank: `ts_rank(${column}, ${tsQuery})`,
+  };
+};
+
+/**
+ * Parse a search mode from a query string value
+ * @param value Raw value, e.g. request.query.mode
+ * @param fallback Mode used when no value is given
+ * @returns Search mode
+ */
+export const parseSearchMode = (
+  value: string | undefined,
+  fallback: SearchMode = 'fulltext'
+): SearchMode => {
+  if (value === undefined || value === '') {
+    return fallback;
+  }
+  if (!SEARCH_MODES.includes(value as SearchMode)) {
+    throw new Error('Invalid search mode');
+  }
+  return value as SearchMode;
+};
+
+/**
+ * Build the predicate and rank for a trigram (pg_trgm) word-similarity match.
+ * `text <% column` is served by a gin_trgm_ops index on each column.
+ * @param placeholder Parameter holding the raw search text, e.g. `$1`
+ * @param columns Columns to match, each with its own trigram index
+ * @returns WHERE predicate and rank expression
+ */
+export const fuzzySearch = (placeholder: string, columns: string[]): FullTextSearch => {
+  const similarities = columns.map((column) => `word_similarity(${placeholder}, ${column})`);
+  return {
+    where: `(${columns.map((column) => `${placeholder} <% ${column}`).join(' OR ')})`,
+    rank: similarities.length > 1 ? `GREATEST(${similarities.join(', ')})` : similarities[0],
+  };
+};
+
+/**
+ * Build the predicate and rank for the given search mode
+ * @param mode Search mode
+ * @param placeholder Parameter holding the raw search text, e.g. `$1`
+ * @param fuzzyColumns Columns matched in fuzzy mode
+ * @returns WHERE predicate and rank expression
+ */
+export const searchPredicate = (
+  mode: SearchMode,
+  placeholder: string,
+  fuzzyColumns: string[]
+): FullTextSearch => {
+  return mode === 'fuzzy' ? fuzzySearch(placeholder, fuzzyColumns) : fullTextSearch(placeholder);
+};
+
+/**
+ * Escape LIKE/ILIKE wildcards in user input
+ * @param text Raw text
+ * @returns Text matching literally inside a LIKE pattern
+ */
+export const escapeLike = (text: string): string => {
+  return text.replace(/[\\%_]/g, '\\$&');
+};
+
+/**
+ * Build an index-driven autocomplete query: names starting with the text
+ * first, then trigram word-similarity matches, best first.
+ * Parameters are `[text, escapeLike(text) + '%', limit]`.
+ * @param table Table name
+ * @param column Name column (needs a gin_trgm_ops index)
+ * @param select Select list, e.g. `id, name`
+ * @returns SQL text
+ */
+export const buildSuggestQuery = (table: string, column: string, select: string): string => {
+  return `SELECT ${select}, word_similarity($1, ${column}) AS score
+          FROM ${table}
+          WHERE ${column} ILIKE $2 OR $1 <% ${column}
+          ORDER BY (${column} ILIKE $2) DESC, score DESC, ${column}
+          LIMIT $3`;
+};
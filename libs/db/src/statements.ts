@@ -0,0 +1,209 @@
+/**
+ * Named prepared-statement registry and per-statement instrumentation
+ *
+ * Statements are declared once with defineStatement() and run with execute().
+ * pg prepares a named statement on first use per connection and afterwards
+ * only sends Bind/Execute, so Postgres skips re-parsing and re-planning.
+ */
+
+import { createHash } from 'node:crypto';
+import { performance } from 'node:perf_hooks';
+import type { QueryResult } from 'pg';
+import { getClient, getTransactionClient } from './pool.js';
+
+/**
+ * Postgres truncates identifiers (including statement names) to 63 bytes
+ */
+const MAX_SERVER_NAME_LENGTH = 63;
+
+/**
+ * Latency samples kept per statement for percentile calculation
+ */
+const SAMPLE_WINDOW = 1024;
+
+/**
+ * Named statement declared in the registry
+ */
+export interface PreparedStatement {
+  /** Registry name, e.g. `credentials.findByClientId` */
+  name: string;
+  /** Name sent to Postgres (shortened when the registry name is too long) */
+  serverName: string;
+  text: string;
+}
+
+/**
+ * Snapshot of the instrumentation for one statement
+ */
+export interface StatementStats {
+  name: string;
+  calls: number;
+  errors: number;
+  rows: number;
+  meanMs: number;
+  p50Ms: number;
+  p95Ms: number;
+  p99Ms: number;
+  maxMs: number;
+  poolWaitMeanMs: number;
+  poolWaitMaxMs: number;
+}
+
+class StatementRecorder {
+  calls = 0;
+  errors = 0;
+  rows = 0;
+  totalMs = 0;
+  maxMs = 0;
+  poolWaitTotalMs = 0;
+  poolWaitMaxMs = 0;
+  private readonly samples: number[] = [];
+  private next = 0;
+
+  record(durationMs: number, poolWaitMs: number, rows: number, failed: boolean): void {
+    this.calls++;
+    if (failed) this.errors++;
+    this.rows += rows;
+    this.totalMs += durationMs;
+    this.maxMs = Math.max(this.maxMs, durationMs);
+    this.poolWaitTotalMs += poolWaitMs;
+    this.poolWaitMaxMs = Math.max(this.poolWaitMaxMs, poolWaitMs);
+
+    // Fixed-size ring buffer of recent latencies
+    if (this.samples.length < SAMPLE_WINDOW) {
+      this.samples.push(durationMs);
+    } else {
+      this.samples[this.next] = durationMs;
+      this.next = (this.next + 1) % SAMPLE_WINDOW;
+    }
+  }
+
+  snapshot(name: string): StatementStats {
+    const sorted = [...this.samples].sort((a, b) => a - b);
+    const percentile = (p: number): number =>
+      sorted.length > 0 ? sorted[Math.min(sorted.length - 1, Math.ceil((p / 100) * sorted.length) - 1)] : 0;
+
+    return {
+      name,
+      calls: this.calls,
+      errors: this.errors,
+      rows: this.rows,
+      meanMs: this.calls > 0 ? this.totalMs / this.calls : 0,
+      p50Ms: percentile(50),
+      p95Ms: percentile(95),
+      p99Ms: percentile(99),
+      maxMs: this.maxMs,
+      poolWaitMeanMs: this.calls > 0 ? this.poolWaitTotalMs / this.calls : 0,
+      poolWaitMaxMs: this.poolWaitMaxMs,
+    };
+  }
+}
+
+const registry = new Map<string, PreparedStatement>();
+const recorders = new Map<string, StatementRecorder>();
+
+const toServerName = (name: string): string => {
+  if (name.length <= MAX_SERVER_NAME_LENGTH) {
+    return name;
+  }
+  const hash = createHash('sha1').update(name).digest('hex').slice(0, 12);
+  return `${name.slice(0, MAX_SERVER_NAME_LENGTH - hash.length - 1)}#${hash}`;
+};
+
+/**
+ * Declare a named prepared statement. Declaring the same name twice with the
+ * same SQL returns the existing statement.
+ * @param name Unique statement name, e.g. `credentials.findByClientId`
+ * @param text SQL text with $n placeholders
+ * @returns Prepared statement
+ */
+export const defineStatement = (name: string, text: string): PreparedStatement => {
+  const existing = registry.get(name);
+  if (existing) {
+    if (existing.text !== text) {
+      throw new Error(`Statement ${name} is already defined with different SQL`);
+    }
+    return existing;
+  }
+
+  const statement: PreparedStatement = { name, serverName: toServerName(name), text };
+  registry.set(name, statement);
+  return statement;
+};
+
+/**
+ * Declare a statement for generated SQL, named by prefix plus a hash of the text.
+ * Used where the SQL is built at runtime from a small, fixed set of shapes.
+ * @param prefix Name prefix, e.g. `datasets.page`
+ * @param text SQL text with $n placeholders
+ * @returns Prepared statement
+ */
+export const internStatement = (prefix: string, text: string): PreparedStatement => {
+  const hash = createHash('sha1').update(text).digest('hex').slice(0, 8);
+  return defineStatement(`${prefix}#${hash}`, text);
+};
+
+/**
+ * Run a prepared statement and record its latency, rows and pool wait time
+ * @param statement Statement from defineStatement()
+ * @param params Query parameters
+ * @returns Query result
+ */
+export const execute = async (
+  statement: PreparedStatement,
+  params: unknown[] = []
+): Promise<QueryResult> => {
+  // Inside withTransaction() reuse the transaction's client instead of the pool
+  const transactionClient = getTransactionClient();
+  const waitStart = performance.now();
+  const client = transactionClient || (await getClient());
+  const start = performance.now();
+
+  let recorder = recorders.get(statement.name);
+  if (!recorder) {
+    recorder = new StatementRecorder();
+    recorders.set(statement.name, recorder);
+  }
+
+  try {
+    const result = await client.query({
+      name: statement.serverName,
+      text: statement.text,
+      values: params as any[],
+    });
+    recorder.record(performance.now() - start, start - waitStart, result.rows.length, false);
+    return result;
+  } catch (error) {
+    recorder.record(performance.now() - start, start - waitStart, 0, true);
+    throw error;
+  } finally {
+    if (!transactionClient) {
+      client.release();
+    }
+  }
+};
+
+/**
+ * Get all declared statements
+ * @returns Registered statements
+ */
+export const listStatements = (): PreparedStatement[] => {
+  return [...registry.values()];
+};
+
+/**
+ * Get instrumentation for every statement that has run, slowest p95 first
+ * @returns Statement stats
+ */
+export const getStatementStats = (): StatementStats[] => {
+  return [...recorders.entries()]
+    .map(([name, recorder]) => recorder.snapshot(name))
+    .sort((a, b) => b.p95Ms - a.p95Ms);
+};
+
+/**
+ * Reset all statement instrumentation
+ */
+export const resetStatementStats = (): void => {
+  recorders.clear();
+};
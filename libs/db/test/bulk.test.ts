@@ -0,0 +1,149 @@
+import { describe, it, expect } from 'vitest';
+import { bulkInsert } from '../src/bulk.js';
+import { withTransaction } from '../src/pool.js';
+import { useFakePool, sql } from './fake-pool.js';
+
+const rows = (count: number) => Array.from({ length: count }, (_, i) => ({ name: `row ${i}`, status: 'draft' }));
+
+const inserts = (queries: { text: string }[]) => queries.filter((query) => query.text.trim().startsWith('INSERT'));
+
+// Echo each inserted row back, as RETURNING would
+const echoRows = (text: string, values: unknown[]) => {
+  if (!text.trim().startsWith('INSERT')) return { rows: [] };
+  if (text.includes('UNNEST')) {
+    const [names] = values as string[][];
+    return { rows: names.map((name) => ({ name })) };
+  }
+  return { rows: values.filter((_, i) => i % 2 === 0).map((name) => ({ name })) };
+};
+
+describe('bulkInsert', () => {
+  it('sends nothing for no rows', async () => {
+    const queries = useFakePool();
+
+    expect(await bulkInsert('datasets', [])).toEqual({ rowCount: 0, rows: [] });
+    expect(queries).toHaveLength(0);
+  });
+
+  describe('multi-row VALUES', () => {
+    it('writes chunks of 1000 rows in one transaction', async () => {
+      const queries = useFakePool(echoRows);
+
+      const result = await bulkInsert('datasets', rows(2500), { returning: 'name' });
+
+      expect(queries.map((query) => query.text.trim().split(/\s/)[0])).toEqual([
+        'BEGIN',
+        'INSERT',
+        'INSERT',
+        'INSERT',
+        'COMMIT',
+      ]);
+      expect(inserts(queries).map((query: any) => query.values.length)).toEqual([2000, 2000, 1000]);
+      expect(result.rowCount).toBe(2500);
+      expect(result.rows.map((row) => row.name)).toEqual(rows(2500).map((row) => row.name));
+    });
+
+    it('numbers placeholders row by row and maps missing values to null', async () => {
+      const queries = useFakePool();
+
+      await bulkInsert('datasets', [{ name: 'a', status: 'draft' }, { name: 'b' }], {
+        onConflict: '(name) DO NOTHING',
+        returning: 'id',
+      });
+
+      const [insert] = inserts(queries) as any[];
+      expect(sql(insert.text)).toBe(
+        'INSERT INTO datasets (name, status) VALUES ($1, $2), ($3, $4) ON CONFLICT (name) DO NOTHING RETURNING id'
+      );
+      expect(insert.values).toEqual(['a', 'draft', 'b', null]);
+    });
+
+    it('keeps every statement under the bind parameter limit', async () => {
+      const columns = Array.from({ length: 100 }, (_, i) => `c${i}`);
+      const wide = Array.from({ length: 1000 }, () => Object.fromEntries(columns.map((column) => [column, 1])));
+      const queries = useFakePool();
+
+      await bulkInsert('wide', wide);
+
+      const counts = inserts(queries).map((query: any) => query.values.length);
+      expect(counts).toEqual([65500, 34500]);
+      counts.forEach((count) => expect(count).toBeLessThanOrEqual(65535));
+    });
+
+    it('honours a smaller chunk size', async () => {
+      const queries = useFakePool();
+
+      await bulkInsert('datasets', rows(5), { chunkSize: 2 });
+
+      expect(inserts(queries).map((query: any) => query.values.length)).toEqual([4, 4, 2]);
+    });
+  });
+
+  describe('UNNEST', () => {
+    const types = { name: 'text', status: 'text' };
+
+    it('sends one array per column and one prepared statement for every chunk', async () => {
+      const queries = useFakePool(echoRows);
+
+      const result = await bulkInsert('datasets', rows(2500), { types, returning: 'name' });
+
+      const statements = inserts(queries) as any[];
+      expect(statements).toHaveLength(3);
+      expect(sql(statements[0].text)).toBe(
+        'INSERT INTO datasets (name, status) SELECT * FROM UNNEST($1::text[], $2::text[]) RETURNING name'
+      );
+      expect(statements.map((statement) => statement.values[0].length)).toEqual([1000, 1000, 500]);
+      expect(new Set(statements.map((statement) => statement.name)).size).toBe(1);
+      expect(statements[0].name).toMatch(/^datasets\.bulkInsert#/);
+      expect(result.rowCount).toBe(2500);
+      expect(result.rows[2499]).toEqual({ name: 'row 2499' });
+    });
+
+    it('is not capped by the parameter limit', async () => {
+      const queries = useFakePool();
+
+      await bulkInsert('datasets', rows(50000), { types, chunkSize: 50000 });
+
+      expect(inserts(queries)).toHaveLength(1);
+    });
+
+    it('falls back to VALUES when a column has no type', async () => {
+      const queries = useFakePool();
+
+      await bulkInsert('datasets', rows(2), { types: { name: 'text' } });
+
+      expect(inserts(queries)[0].text).toContain('VALUES');
+    });
+  });
+
+  it('rolls back every chunk when one fails', async () => {
+    let insertsSeen = 0;
+    const queries = useFakePool((text) => {
+      if (text.trim().startsWith('INSERT') && ++insertsSeen === 2) {
+        throw new Error('duplicate key value violates unique constraint');
+      }
+      return { rows: [] };
+    });
+
+    await expect(bulkInsert('datasets', rows(1500))).rejects.toThrow('duplicate key');
+
+    expect(queries.map((query) => query.text.trim().split(/\s/)[0])).toEqual(['BEGIN', 'INSERT', 'INSERT', 'ROLLBACK']);
+  });
+
+  it("joins the caller's transaction", async () => {
+    const queries = useFakePool();
+
+    await withTransaction(async () => {
+      await bulkInsert('datasets', rows(1500));
+      await bulkInsert('datasets', rows(10));
+    });
+
+    expect(queries.map((query) => query.text.trim().split(/\s/)[0])).toEqual([
+      'BEGIN',
+      'INSERT',
+      'INSERT',
+      'INSERT',
+      'COMMIT',
+    ]);
+  });
+});
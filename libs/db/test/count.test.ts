@@ -0,0 +1,152 @@
+import { describe, it, expect } from 'vitest';
+import { parseCountStrategy, queryPage, type PageQueryOptions } from '../src/count.js';
+import { useFakePool, sql, type Responder } from './fake-pool.js';
+
+const rows = (count: number, total?: number) =>
+  Array.from({ length: count }, (_, i) => ({
+    id: `id-${i}`,
+    ...(total === undefined ? {} : { __total_count: String(total) }),
+  }));
+
+const options = (overrides: Partial<PageQueryOptions> = {}): PageQueryOptions => ({
+  columns: 'id',
+  from: 'datasets',
+  page: 1,
+  pageSize: 10,
+  ...overrides,
+});
+
+// Answers the page query with `page`, reltuples with `reltuples`, EXPLAIN with `planRows`
+// and the fallback COUNT(*) with `count`
+const respondWith =
+  (answers: { page: any[]; reltuples?: number; planRows?: number; count?: number }): Responder =>
+  (text) => {
+    if (text.includes('pg_class')) return { rows: answers.reltuples === undefined ? [] : [{ estimate: String(answers.reltuples) }] };
+    if (text.startsWith('EXPLAIN')) return { rows: [{ 'QUERY PLAN': [{ Plan: { 'Plan Rows': answers.planRows } }] }] };
+    if (text.startsWith('SELECT COUNT(*)')) return { rows: [{ count: String(answers.count) }] };
+    return { rows: answers.page };
+  };
+
+describe('parseCountStrategy', () => {
+  it('accepts every strategy', () => {
+    expect(parseCountStrategy('exact')).toBe('exact');
+    expect(parseCountStrategy('estimated')).toBe('estimated');
+    expect(parseCountStrategy('none')).toBe('none');
+  });
+
+  it('falls back when no value is given', () => {
+    expect(parseCountStrategy(undefined)).toBe('exact');
+    expect(parseCountStrategy('', 'none')).toBe('none');
+  });
+
+  it('rejects unknown strategies', () => {
+    expect(() => parseCountStrategy('approximate')).toThrow('Invalid count strategy');
+  });
+});
+
+describe('queryPage', () => {
+  describe('exact', () => {
+    it('reads the total from the window column in the same round trip', async () => {
+      const queries = useFakePool(respondWith({ page: rows(10, 42) }));
+
+      const page = await queryPage(options({ where: 'status = $1', params: ['draft'], page: 2 }), (row) => row);
+
+      expect(page).toEqual({
+        data: rows(10),
+        total: 42,
+        page: 2,
+        pageSize: 10,
+        totalPages: 5,
+      });
+      expect(queries).toHaveLength(1);
+      expect(sql(queries[0].text)).toBe(
+        'SELECT id, COUNT(*) OVER() as "__total_count" FROM datasets WHERE status = $1 ORDER BY created_at DESC LIMIT $2 OFFSET $3'
+      );
+      expect(queries[0].values).toEqual(['draft', 10, 10]);
+      expect(queries[0].name).toMatch(/^datasets\.page#[0-9a-f]{8}$/);
+    });
+
+    it('reports zero for an empty first page', async () => {
+      const queries = useFakePool(respondWith({ page: [] }));
+
+      const page = await queryPage(options(), (row) => row);
+
+      expect(page.total).toBe(0);
+      expect(page.totalPages).toBe(0);
+      expect(queries).toHaveLength(1);
+    });
+
+    it('counts separately past the last page', async () => {
+      const queries = useFakePool(respondWith({ page: [], count: 25 }));
+
+      const page = await queryPage(options({ where: 'status = $1', params: ['draft'], page: 9 }), (row) => row);
+
+      expect(page.total).toBe(25);
+      expect(queries).toHaveLength(2);
+      expect(sql(queries[1].text)).toBe('SELECT COUNT(*) FROM datasets WHERE status = $1');
+      expect(queries[1].values).toEqual(['draft']);
+    });
+  });
+
+  describe('none', () => {
+    it('returns no total and no count query', async () => {
+      const queries = useFakePool(respondWith({ page: rows(10) }));
+
+      const page = await queryPage(options({ count: 'none' }), (row) => row);
+
+      expect(page.total).toBeNull();
+      expect(page.totalPages).toBeNull();
+      expect(queries).toHaveLength(1);
+      expect(queries[0].text).not.toContain('COUNT');
+    });
+  });
+
+  describe('estimated', () => {
+    it('uses reltuples for an unfiltered table', async () => {
+      const queries = useFakePool(respondWith({ page: rows(10), reltuples: 1000 }));
+
+      const page = await queryPage(options({ count: 'estimated' }), (row) => row);
+
+      expect(page.total).toBe(1000);
+      expect(page.totalPages).toBe(100);
+      expect(queries.some((query) => query.text.includes('pg_class'))).toBe(true);
+      expect(queries.some((query) => query.text.startsWith('EXPLAIN'))).toBe(false);
+    });
+
+    it('uses the plan estimate for a filtered query', async () => {
+      const queries = useFakePool(respondWith({ page: rows(10), planRows: 321.4 }));
+
+      const page = await queryPage(options({ count: 'estimated', where: 'status = $1', params: ['draft'] }), (row) => row);
+
+      const explain = queries.find((query) => query.text.startsWith('EXPLAIN'))!;
+      expect(page.total).toBe(321);
+      expect(sql(explain.text)).toBe('EXPLAIN (FORMAT JSON) SELECT 1 FROM datasets WHERE status = $1');
+      expect(explain.values).toEqual(['draft']);
+    });
+
+    it('falls back to the plan estimate before the table is analyzed', async () => {
+      const queries = useFakePool(respondWith({ page: rows(10), reltuples: -1, planRows: 50 }));
+
+      const page = await queryPage(options({ count: 'estimated' }), (row) => row);
+
+      expect(page.total).toBe(50);
+      expect(queries.some((query) => query.text.startsWith('EXPLAIN'))).toBe(true);
+    });
+
+    it('pins the total exactly on a short page', async () => {
+      useFakePool(respondWith({ page: rows(4), reltuples: 1000 }));
+
+      const page = await queryPage(options({ count: 'estimated', page: 3 }), (row) => row);
+
+      expect(page.total).toBe(24);
+    });
+
+    it('never reports fewer rows than were seen', async () => {
+      useFakePool(respondWith({ page: rows(10), reltuples: 5 }));
+
+      const page = await queryPage(options({ count: 'estimated', page: 3 }), (row) => row);
+
+      expect(page.total).toBe(30);
+    });
+  });
+});
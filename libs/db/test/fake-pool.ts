@@ -0,0 +1,44 @@
+import { vi } from 'vitest';
+import { initializePool } from '../src/pool.js';
+
+/**
+ * A query the code under test sent, with the prepared statement name if it used one
+ */
+export interface RecordedQuery {
+  text: string;
+  values: unknown[];
+  name?: string;
+}
+
+export type Responder = (text: string, values: unknown[]) => { rows: any[]; rowCount?: number };
+
+/**
+ * Initialize the pool with query() and connect() answered in memory, so the
+ * real pool, transaction and statement code runs without a database.
+ * @param respond Result for each query; defaults to no rows
+ * @returns Every query sent, in order, including BEGIN/COMMIT/ROLLBACK
+ */
+export const useFakePool = (respond: Responder = () => ({ rows: [] })): RecordedQuery[] => {
+  const queries: RecordedQuery[] = [];
+
+  const query = async (textOrConfig: any, params?: unknown[]) => {
+    const config = typeof textOrConfig === 'string' ? { text: textOrConfig, values: params } : textOrConfig;
+    const recorded: RecordedQuery = { text: config.text, values: config.values || [] };
+    if (config.name) recorded.name = config.name;
+    queries.push(recorded);
+
+    const result = respond(recorded.text, recorded.values);
+    return { rowCount: result.rows.length, ...result };
+  };
+
+  const pool = initializePool({ host: 'localhost', port: 5432, database: 'test', user: 'test', password: 'test' });
+  vi.spyOn(pool, 'query').mockImplementation(query as any);
+  vi.spyOn(pool, 'connect').mockImplementation((async () => ({ query, release: () => undefined })) as any);
+
+  return queries;
+};
+
+/**
+ * Collapse whitespace so generated SQL can be compared as one line
+ */
+export const sql = (text: string): string => text.replace(/\s+/g, ' ').trim();
@@ -0,0 +1,119 @@
+import { describe, it, expect } from 'vitest';
+import { buildKeysetQuery, decodeCursor, encodeCursor, toKeysetPage } from '../src/pagination.js';
+import { sql } from './fake-pool.js';
+
+const ID = '3f2c1b7e-8a4d-4e0f-9b6a-2d5c7e1f0a93';
+const CREATED_AT = '2026-10-16 20:35:00.123456+00';
+
+const token = (value: unknown) => Buffer.from(JSON.stringify(value)).toString('base64url');
+
+describe('cursor codec', () => {
+  it('round-trips a cursor', () => {
+    const cursor = { createdAt: CREATED_AT, id: ID };
+    expect(decodeCursor(encodeCursor(cursor))).toEqual(cursor);
+  });
+
+  it('produces a URL-safe token', () => {
+    expect(encodeCursor({ createdAt: CREATED_AT, id: ID })).toMatch(/^[A-Za-z0-9_-]+$/);
+  });
+
+  it('accepts timestamps without time zone or fraction and serial ids', () => {
+    expect(decodeCursor(token(['2026-10-16 20:35:00', '42']))).toEqual({ createdAt: '2026-10-16 20:35:00', id: '42' });
+    expect(decodeCursor(token(['2026-10-16 20:35:00.5+05:30', ID.toUpperCase()])).id).toBe(ID.toUpperCase());
+  });
+
+  it.each([
+    ['an empty token', ''],
+    ['a token that is not base64 JSON', 'not-a-cursor'],
+    ['a JSON object', token({ createdAt: CREATED_AT, id: ID })],
+    ['a one-element array', token([CREATED_AT])],
+    ['a three-element array', token([CREATED_AT, ID, 'extra'])],
+    ['a numeric created_at', token([1760646900123, ID])],
+    ['a numeric id', token([CREATED_AT, 42])],
+    ['a created_at that is not a timestamp', token(['yesterday', ID])],
+    ['a created_at carrying SQL', token(["2026-10-16'; DROP TABLE datasets; --", ID])],
+    ['an id that is not a UUID', token([CREATED_AT, 'abc'])],
+    ['an id carrying SQL', token([CREATED_AT, `${ID}' OR '1'='1`])],
+  ])('rejects %s', (_, value) => {
+    expect(() => decodeCursor(value)).toThrow('Invalid cursor');
+  });
+});
+
+describe('buildKeysetQuery', () => {
+  const columns = 'id, name, created_at as "createdAt"';
+
+  it('builds the first page without a cursor condition', () => {
+    const { text, values } = buildKeysetQuery({ columns, from: 'datasets', pageSize: 20 });
+
+    expect(sql(text)).toBe(
+      `SELECT ${columns}, created_at::text as "__cursor_created_at" FROM datasets ORDER BY created_at DESC, id DESC LIMIT $1`
+    );
+    expect(values).toEqual([21]);
+  });
+
+  it('numbers cursor placeholders after the filter parameters', () => {
+    const after = encodeCursor({ createdAt: CREATED_AT, id: ID });
+    const { text, values } = buildKeysetQuery({
+      columns,
+      from: 'datasets',
+      where: 'participant_id = $1 OR status = $2',
+      params: ['p-1', 'draft'],
+      after,
+      pageSize: 10,
+    });
+
+    expect(sql(text)).toBe(
+      `SELECT ${columns}, created_at::text as "__cursor_created_at" FROM datasets ` +
+        'WHERE (participant_id = $1 OR status = $2) AND (created_at, id) < ($3, $4) ' +
+        'ORDER BY created_at DESC, id DESC LIMIT $5'
+    );
+    expect(values).toEqual(['p-1', 'draft', CREATED_AT, ID, 11]);
+  });
+
+  it('does not modify the caller parameters', () => {
+    const params = ['p-1'];
+    buildKeysetQuery({ columns, from: 'datasets', where: 'participant_id = $1', params, pageSize: 10 });
+    expect(params).toEqual(['p-1']);
+  });
+
+  it('rejects a malformed cursor before building SQL', () => {
+    expect(() => buildKeysetQuery({ columns, from: 'datasets', after: 'garbage', pageSize: 10 })).toThrow(
+      'Invalid cursor'
+    );
+  });
+});
+
+describe('toKeysetPage', () => {
+  const rows = (count: number) =>
+    Array.from({ length: count }, (_, i) => ({
+      id: `00000000-0000-4000-8000-00000000000${i}`,
+      name: `row ${i}`,
+      __cursor_created_at: `2026-10-16 20:35:0${i}.000001+00`,
+    }));
+
+  it('returns a cursor at the last row when an extra row was fetched', () => {
+    const page = toKeysetPage(rows(3), 2, (row) => row);
+
+    expect(page.data).toEqual([
+      { id: '00000000-0000-4000-8000-000000000000', name: 'row 0' },
+      { id: '00000000-0000-4000-8000-000000000001', name: 'row 1' },
+    ]);
+    expect(page.pageSize).toBe(2);
+    expect(decodeCursor(page.nextCursor!)).toEqual({
+      createdAt: '2026-10-16 20:35:01.000001+00',
+      id: '00000000-0000-4000-8000-000000000001',
+    });
+  });
+
+  it('returns no cursor on the last page', () => {
+    expect(toKeysetPage(rows(2), 2, (row) => row).nextCursor).toBeNull();
+    expect(toKeysetPage([], 2, (row) => row)).toEqual({ data: [], pageSize: 2, nextCursor: null });
+  });
+
+  it('continues where the previous page stopped', () => {
+    const page = toKeysetPage(rows(3), 2, (row) => row);
+    const { values } = buildKeysetQuery({ columns: 'id', from: 'datasets', after: page.nextCursor, pageSize: 2 });
+
+    expect(values).toEqual(['2026-10-16 20:35:01.000001+00', '00000000-0000-4000-8000-000000000001', 3]);
+  });
+});
@@ -1,8 +1,129 @@
-import { Kafka, Producer, Consumer, Admin } from 'kafkajs';
+import {
+  Kafka,
+  Producer,
+  Consumer,
+  Admin,
+  CompressionTypes,
+  CompressionCodecs,
+  Message,
+  IHeaders,
+} from 'kafkajs';
 import pino from 'pino';
+import { decodeEventMessage } from './event-codec';
 
 const logger = pino({ level: process.env.LOG_LEVEL || 'info' });
 
+type ProducerCompression = 'none' | 'gzip' | 'lz4';
+
+// Micro-batching of published messages: a buffer is flushed as one sendBatch
+// call, grouped per topic, once it holds `batchSize` messages or `lingerMs`
+// after its first message, whichever comes first.
+interface ProducerBatchConfig {
+  batchSize?: number; // Messages per sendBatch, default 500
+  lingerMs?: number; // Default 10
+  compression?: ProducerCompression; // Default 'gzip'; lz4 needs the optional kafkajs-lz4 package
+}
+
+interface EventMessage {
+  key: string;
+  value: Record<string, unknown> | Buffer; // Objects are sent as JSON, Buffers as they are
+  headers?: Record<string, string>;
+}
+
+interface ProducerStats {
+  messagesSent: number;
+  batchesSent: number;
+  bytesSent: number; // Uncompressed message values
+  failedBatches: number;
+  buffered: number;
+  avgBatchSize: number;
+  maxBatchSize: number;
+  messagesPerSecond: number; // Over the last THROUGHPUT_WINDOW_MS
+  compression: ProducerCompression;
+}
+
+interface ConsumedMessage {
+  topic: string;
+  partition: number;
+  offset: string;
+  key?: string;
+  value: any;
+  headers?: IHeaders;
+}
+
+interface ConsumedBatch {
+  topic: string;
+  partition: number;
+  messages: ConsumedMessage[];
+}
+
+interface BatchSubscriptionOptions {
+  fromBeginning?: boolean;
+  partitionsConsumedConcurrently?: number; // Default 3; order is kept within a partition
+  maxBatchMessages?: number; // Messages per handler call, default 500
+  commitIntervalMs?: number; // Offsets are committed at most this often, default 5000
+  commitThreshold?: number; // ... or after this many resolved messages, default 1000
+  decode?: (value: Buffer, headers?: IHeaders) => unknown; // Default decodeEventMessage (by content-type)
+}
+
+interface PartitionLag {
+  lag: number; // Messages between the last processed offset and the high watermark
+  highWatermark: string;
+  lastOffset: string;
+  updatedAt: string;
+}
+
+interface ConsumerGroupStats {
+  topics: string[];
+  messagesProcessed: number;
+  batchesProcessed: number;
+  avgBatchSize: number;
+  failedBatches: number;
+  totalLag: number;
+  partitions: Record<string, PartitionLag>; // Keyed by topic:partition
+}
+
+interface GroupCounters {
+  topics: string[];
+  messagesProcessed: number;
+  batchesProcessed: number;
+  failedBatches: number;
+  partitions: Record<string, PartitionLag>;
+}
+
+interface BufferedMessage {
+  topic: string;
+  message: Message;
+  resolve: () => void;
+  reject: (error: unknown) => void;
+}
+
+const THROUGHPUT_WINDOW_MS = 10000;
+
+const COMPRESSION_TYPES: Record<ProducerCompression, CompressionTypes> = {
+  none: CompressionTypes.None,
+  gzip: CompressionTypes.GZIP,
+  lz4: CompressionTypes.LZ4,
+};
+
+let lz4Registered: boolean | null = null;
+
+// kafkajs only ships gzip; lz4 is a codec registered from an optional package
+const registerLz4 = (): boolean => {
+  if (lz4Registered === null) {
+    try {
+      // eslint-disable-next-line @typescript-eslint/no-var-requires
+      const LZ4Codec = require('kafkajs-lz4');
+      CompressionCodecs[CompressionTypes.LZ4] = new LZ4Codec().codec;
+      lz4Registered = true;
+    } catch {
+      logger.warn('kafkajs-lz4 is not installed, falling back to gzip compression');
+      lz4Registered = false;
+    }
+  }
+  return lz4Registered;
+};
+
 interface KafkaConfig {
   brokers: string[];
   clientId: string;
@@ -13,15 +134,35 @@ interface KafkaConfig {
     username: string;
     password: string;
   };
+  producer?: ProducerBatchConfig;
 }
 
 class KafkaClient {
   private kafka: Kafka;
   private producer: Producer | null = null;
-  private consumer: Consumer | null = null;
+  private producerReady: Promise<Producer> | null = null;
+  private consumers = new Map<string, Consumer>();
+  private consumerStats = new Map<string, GroupCounters>();
   private admin: Admin | null = null;
+  private batchSize: number;
+  private lingerMs: number;
+  private compression: ProducerCompression;
+  private buffer: BufferedMessage[] = [];
+  private lingerTimer: NodeJS.Timeout | null = null;
+  // Tail of the send chain, resolving to the error of the last batch or null
+  private sending: Promise<unknown> = Promise.resolve(null);
+  private queuedBatches = 0;
+  private producerStats = { messagesSent: 0, batchesSent: 0, bytesSent: 0, failedBatches: 0, maxBatchSize: 0 };
+  private recentSends: Array<{ at: number; count: number }> = [];
 
   constructor(config: KafkaConfig) {
+    this.batchSize = config.producer?.batchSize || 500;
+    this.lingerMs = config.producer?.lingerMs ?? 10;
+    this.compression = config.producer?.compression || 'gzip';
+    if (this.compression === 'lz4' && !registerLz4()) {
+      this.compression = 'gzip';
+    }
+
     this.kafka = new Kafka({
       clientId: config.clientId,
       brokers: config.brokers,
@@ -40,30 +181,46 @@ class KafkaClient {
   }
 
   async getProducer(): Promise<Producer> {
-    if (!this.producer) {
-      this.producer = this.kafka.producer({
-        maxInFlightRequests: 5,
-        idempotent: true,
-        transactionalId: `producer-${Date.now()}`,
+    // Concurrent first publishes share one connection attempt
+    if (!this.producerReady) {
+      this.producerReady = (async () => {
+        const producer = this.kafka.producer({
+          maxInFlightRequests: 5,
+          idempotent: true,
+          transactionalId: `producer-${Date.now()}`,
+        });
+        await producer.connect();
+        this.producer = producer;
+        logger.info('Kafka Producer connected');
+        return producer;
+      })().catch((error) => {
+        this.producerReady = null;
+        throw error;
       });
-      await this.producer.connect();
-      logger.info('Kafka Producer connected');
     }
-    return this.producer;
+    return this.producerReady;
   }
 
+  // One consumer per consumer group; kafkajs allows a single run() per consumer
   async getConsumer(groupId: string): Promise<Consumer> {
-    if (!this.consumer) {
-      this.consumer = this.kafka.consumer({
+    let consumer = this.consumers.get(groupId);
+    if (!consumer) {
+      consumer = this.kafka.consumer({
         groupId,
         sessionTimeout: 30000,
         rebalanceTimeout: 60000,
         heartbeatInterval: 3000,
       });
-      await this.consumer.connect();
+      this.consumers.set(groupId, consumer);
+      try {
+        await consumer.connect();
+      } catch (error) {
+        this.consumers.delete(groupId);
+        throw error;
+      }
       logger.info(`Kafka Consumer connected for group: ${groupId}`);
     }
-    return this.consumer;
+    return consumer;
   }
 
   async getAdmin(): Promise<Admin> {
@@ -81,77 +238,271 @@ class KafkaClient {
     value: Record<string, unknown>,
     headers?: Record<string, string>
   ): Promise<void> {
-    const producer = await this.getProducer();
+    await this.publishEvents(topic, [{ key, value, headers }]);
+    logger.debug(`Event published to ${topic}: ${key}`);
+  }
 
-    try {
-      await producer.send({
-        topic,
-        messages: [
-          {
-            key,
-            value: JSON.stringify(value),
-            headers: {
-              'correlation-id': `${key}-${Date.now()}`,
-              timestamp: new Date().toISOString(),
-              ...headers,
+  /**
+   * Publish many events to one topic. Messages join the micro-batching buffer
+   * and go out with whatever else is pending, compressed, in as few sendBatch
+   * calls as possible.
+   * @returns Resolves once every message is acknowledged by the broker
+   */
+  async publishEvents(topic: string, events: EventMessage[]): Promise<void> {
+    if (events.length === 0) return;
+    await this.getProducer();
+
+    const timestamp = new Date().toISOString();
+    const delivered = events.map(
+      (event) =>
+        new Promise<void>((resolve, reject) => {
+          this.buffer.push({
+            topic,
+            message: {
+              key: event.key,
+              value: Buffer.isBuffer(event.value) ? event.value : JSON.stringify(event.value),
+              headers: {
+                'correlation-id': `${event.key}-${Date.now()}`,
+                timestamp,
+                ...event.headers,
+              },
             },
-          },
-        ],
-      });
+            resolve,
+            reject,
+          });
+        })
+    );
+
+    if (this.buffer.length >= this.batchSize) {
+      this.flush();
+    } else if (!this.lingerTimer) {
+      this.lingerTimer = setTimeout(() => this.flush(), this.lingerMs);
+    }
 
-      logger.info(`Event published to ${topic}: ${key}`);
+    try {
+      await Promise.all(delivered);
     } catch (error) {
-      logger.error(`Failed to publish event to ${topic}:`, error);
+      logger.error(`Failed to publish events to ${topic}:`, error);
       throw error;
     }
   }
 
+  /**
+   * Send everything buffered now, without waiting for the linger timer
+   */
+  async flushProducer(): Promise<void> {
+    this.flush();
+    await this.sending;
+  }
+
+  getProducerStats(): ProducerStats {
+    this.recordThroughput(0);
+    const recent = this.recentSends.reduce((total, send) => total + send.count, 0);
+    const { batchesSent, messagesSent } = this.producerStats;
+
+    return {
+      ...this.producerStats,
+      buffered: this.buffer.length,
+      avgBatchSize: batchesSent > 0 ? Math.round(messagesSent / batchesSent) : 0,
+      messagesPerSecond: Math.round(recent / (THROUGHPUT_WINDOW_MS / 1000)),
+      compression: this.compression,
+    };
+  }
+
+  // Drain the buffer into sendBatch calls of at most batchSize messages, sent
+  // one after another: kafkajs keeps no order across concurrent sendBatch
+  // calls. When a batch fails, the batches queued behind it fail with it, so
+  // none of them lands before the failed messages are retried.
+  private flush(): void {
+    if (this.lingerTimer) {
+      clearTimeout(this.lingerTimer);
+      this.lingerTimer = null;
+    }
+
+    if (this.queuedBatches === 0) {
+      this.sending = Promise.resolve(null);
+    }
+
+    while (this.buffer.length > 0) {
+      const batch = this.buffer.splice(0, this.batchSize);
+      this.queuedBatches++;
+      this.sending = this.sending.then(async (failed) => {
+        try {
+          return failed ? this.failBatch(batch, failed) : await this.sendBatch(batch);
+        } finally {
+          this.queuedBatches--;
+        }
+      });
+    }
+  }
+
+  private recordThroughput(count: number): void {
+    const now = Date.now();
+    if (count > 0) {
+      this.recentSends.push({ at: now, count });
+    }
+    while (this.recentSends.length > 0 && this.recentSends[0].at < now - THROUGHPUT_WINDOW_MS) {
+      this.recentSends.shift();
+    }
+  }
+
+  private failBatch(batch: BufferedMessage[], error: unknown): unknown {
+    this.producerStats.failedBatches++;
+    batch.forEach((entry) => entry.reject(error));
+    return error;
+  }
+
+  // Resolves to the error when the batch failed, null when it was acknowledged
+  private async sendBatch(batch: BufferedMessage[]): Promise<unknown> {
+    const byTopic = new Map<string, Message[]>();
+    let bytes = 0;
+    for (const { topic, message } of batch) {
+      const messages = byTopic.get(topic);
+      if (messages) {
+        messages.push(message);
+      } else {
+        byTopic.set(topic, [message]);
+      }
+      bytes += Buffer.byteLength(message.value as string | Buffer);
+    }
+
+    try {
+      const producer = await this.getProducer();
+      await producer.sendBatch({
+        topicMessages: [...byTopic].map(([topic, messages]) => ({ topic, messages })),
+        compression: COMPRESSION_TYPES[this.compression],
+      });
+
+      this.producerStats.messagesSent += batch.length;
+      this.producerStats.batchesSent++;
+      this.producerStats.bytesSent += bytes;
+      this.producerStats.maxBatchSize = Math.max(this.producerStats.maxBatchSize, batch.length);
+      this.recordThroughput(batch.length);
+      batch.forEach((entry) => entry.resolve());
+      return null;
+    } catch (error) {
+      return this.failBatch(batch, error);
+    }
+  }
+
+  /**
+   * Handle messages one at a time, in order within each partition. Built on
+   * subscribeBatch, so partitions are still consumed concurrently and offsets
+   * committed in batches.
+   */
   async subscribeToTopic(
-    topic: string,
+    topic: string | string[],
     groupId: string,
-    handler: (message: any) => Promise<void>,
+    handler: (message: ConsumedMessage) => Promise<void>,
     fromBeginning: boolean = false
   ): Promise<void> {
+    await this.subscribeBatch(
+      topic,
+      groupId,
+      async (batch) => {
+        for (const message of batch.messages) {
+          await handler(message);
+        }
+      },
+      { fromBeginning }
+    );
+  }
+
+  /**
+   * Consume with eachBatch: the handler receives up to maxBatchMessages decoded
+   * messages of one partition at a time, and several partitions are processed
+   * concurrently. Offsets are resolved after each successful handler call and
+   * committed in batches, so delivery is at-least-once; a failed call is
+   * retried from its first message.
+   */
+  async subscribeBatch(
+    topic: string | string[],
+    groupId: string,
+    handler: (batch: ConsumedBatch) => Promise<void>,
+    options: BatchSubscriptionOptions = {}
+  ): Promise<void> {
+    const topics = Array.isArray(topic) ? topic : [topic];
+    const maxBatchMessages = options.maxBatchMessages || 500;
+    const decode = options.decode || decodeEventMessage;
     const consumer = await this.getConsumer(groupId);
+    const stats: GroupCounters = { topics, messagesProcessed: 0, batchesProcessed: 0, failedBatches: 0, partitions: {} };
+    this.consumerStats.set(groupId, stats);
 
     try {
-      await consumer.subscribe({
-        topic,
-        fromBeginning,
-      });
+      // One consumer.run() per consumer, so several topics are subscribed together
+      await consumer.subscribe({ topics, fromBeginning: options.fromBeginning || false });
 
       await consumer.run({
-        eachMessage: async ({ topic, partition, message }: { topic: string; partition: number; message: any }) => {
-          try {
-            const value = message.value
-              ? JSON.parse(message.value.toString())
-              : null;
+        partitionsConsumedConcurrently: options.partitionsConsumedConcurrently || 3,
+        eachBatchAutoResolve: false,
+        autoCommitInterval: options.commitIntervalMs || 5000,
+        autoCommitThreshold: options.commitThreshold || 1000,
+        eachBatch: async ({ batch, resolveOffset, heartbeat, commitOffsetsIfNecessary, isRunning, isStale }) => {
+          const { topic, partition } = batch;
+
+          for (let start = 0; start < batch.messages.length; start += maxBatchMessages) {
+            if (!isRunning() || isStale()) break;
 
-            await handler({
+            const chunk = batch.messages.slice(start, start + maxBatchMessages);
+            const messages = chunk.map((message) => ({
               topic,
               partition,
               offset: message.offset,
               key: message.key?.toString(),
-              value,
+              value: message.value ? decode(message.value, message.headers) : null,
               headers: message.headers,
-            });
-          } catch (error) {
-            logger.error(
-              `Error processing message from ${topic}:`,
-              error
-            );
-            throw error;
+            }));
+
+            try {
+              await handler({ topic, partition, messages });
+            } catch (error) {
+              stats.failedBatches++;
+              logger.error(`Error processing batch from ${topic}[${partition}]:`, error);
+              throw error;
+            }
+
+            const lastOffset = chunk[chunk.length - 1].offset;
+            resolveOffset(lastOffset);
+            stats.messagesProcessed += chunk.length;
+            stats.batchesProcessed++;
+            stats.partitions[`${topic}:${partition}`] = {
+              lag: Math.max(0, Number(BigInt(batch.highWatermark) - BigInt(lastOffset) - 1n)),
+              highWatermark: batch.highWatermark,
+              lastOffset,
+              updatedAt: new Date().toISOString(),
+            };
+
+            await commitOffsetsIfNecessary();
+            await heartbeat();
           }
         },
       });
 
-      logger.info(`Subscribed to topic: ${topic}`);
+      logger.info(`Subscribed to topic: ${topics.join(', ')} (group ${groupId})`);
     } catch (error) {
-      logger.error(`Failed to subscribe to topic ${topic}:`, error);
+      logger.error(`Failed to subscribe to topic ${topics.join(', ')}:`, error);
       throw error;
     }
   }
 
+  /**
+   * Throughput and lag of every consumer group run by this client. Lag is
+   * measured against the high watermark seen in each partition's last batch.
+   */
+  getConsumerStats(): Record<string, ConsumerGroupStats> {
+    const result: Record<string, ConsumerGroupStats> = {};
+    this.consumerStats.forEach((stats, groupId) => {
+      const partitions = stats.partitions;
+      result[groupId] = {
+        ...stats,
+        partitions: { ...partitions },
+        avgBatchSize: stats.batchesProcessed > 0 ? Math.round(stats.messagesProcessed / stats.batchesProcessed) : 0,
+        totalLag: Object.values(partitions).reduce((total, partition) => total + partition.lag, 0),
+      };
+    });
+    return result;
+  }
+
   async createTopics(topics: Array<{ name: string; partitions?: number; replicationFactor?: number }>): Promise<void> {
     const admin = await this.getAdmin();
 
@@ -174,13 +525,17 @@ class KafkaClient {
 
   async disconnect(): Promise<void> {
     if (this.producer) {
+      await this.flushProducer();
       await this.producer.disconnect();
+      this.producer = null;
+      this.producerReady = null;
       logger.info('Kafka Producer disconnected');
     }
-    if (this.consumer) {
-      await this.consumer.disconnect();
-      logger.info('Kafka Consumer disconnected');
+    for (const [groupId, consumer] of this.consumers) {
+      await consumer.disconnect();
+      logger.info(`Kafka Consumer disconnected for group: ${groupId}`);
     }
+    this.consumers.clear();
     if (this.admin) {
       await this.admin.disconnect();
       logger.info('Kafka Admin disconnected');
@@ -188,4 +543,16 @@ class KafkaClient {
   }
 }
 
-export { KafkaClient, KafkaConfig };
+export {
+  KafkaClient,
+  KafkaConfig,
+  ProducerBatchConfig,
+  ProducerCompression,
+  EventMessage,
+  ProducerStats,
+  ConsumedMessage,
+  ConsumedBatch,
+  BatchSubscriptionOptions,
+  PartitionLag,
+  ConsumerGroupStats,
+};
@@ -0,0 +1,423 @@
+/**
+ * Binary and JSON encodings of DomainEvent messages
+ *
+ * The binary format is Avro-like: fields are written in schema order without
+ * names, integers as zig-zag varints, strings length-prefixed, timestamps as
+ * epoch milliseconds and event ids as 16 raw bytes. The `content-type` header
+ * tells consumers which encoding a message uses, so JSON stays supported.
+ *
+ * Decoding gives what JSON.parse(JSON.stringify(event)) gives: timestamps as
+ * ISO strings, null fields as null, absent fields absent. Values that could not
+ * come back that way - a number in a string field, a timestamp that is not in
+ * toISOString() form, a non-finite double - make encodeEventBinary throw, so
+ * encodeEvent publishes that event as JSON instead. The one difference is an
+ * event without a version, which decodes with version 1.
+ */
+
+import { IHeaders } from 'kafkajs';
+import { DomainEvent } from './events';
+import { EventSchema, EventSchemaRegistry, FieldSchema, eventSchemas } from './event-schemas';
+
+export type EventEncoding = 'json' | 'binary';
+
+export const EVENT_CONTENT_TYPES: Record<EventEncoding, string> = {
+  json: 'application/json',
+  binary: 'application/vnd.dataspace.event.v1+binary',
+};
+
+export interface EncodedEvent {
+  value: Buffer;
+  headers: Record<string, string>;
+}
+
+// Leading byte of every binary message, bumped if the envelope layout changes
+const ENVELOPE_V1 = 0x01;
+
+// Presence flag written before optional values
+const ABSENT = 0;
+const PRESENT = 1;
+const NULL = 2;
+
+// Only lowercase ids are packed, since unpacking yields lowercase hex
+const UUID_PATTERN = /^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$/;
+
+class BinaryWriter {
+  private buffer = Buffer.allocUnsafe(256);
+  private offset = 0;
+
+  private ensure(bytes: number): void {
+    if (this.offset + bytes <= this.buffer.length) return;
+    const next = Buffer.allocUnsafe(Math.max(this.buffer.length * 2, this.offset + bytes));
+    this.buffer.copy(next, 0, 0, this.offset);
+    this.buffer = next;
+  }
+
+  byte(value: number): void {
+    this.ensure(1);
+    this.buffer[this.offset++] = value;
+  }
+
+  // Unsigned varint; plain arithmetic keeps values above 2^31 exact up to 2^53
+  varint(value: number): void {
+    this.ensure(8);
+    while (value >= 0x80) {
+      this.buffer[this.offset++] = (value % 0x80) | 0x80;
+      value = Math.floor(value / 0x80);
+    }
+    this.buffer[this.offset++] = value;
+  }
+
+  long(value: number): void {
+    if (!Number.isSafeInteger(value)) throw new Error(`Not a safe integer: ${value}`);
+    if (Math.abs(value) < 2 ** 52) {
+      this.varint(value >= 0 ? value * 2 : -value * 2 - 1);
+      return;
+    }
+
+    // Zig-zag of the largest safe integers exceeds 2^53, so go through BigInt
+    let zigzag = value >= 0 ? BigInt(value) * 2n : BigInt(-value) * 2n - 1n;
+    this.ensure(8);
+    while (zigzag >= 0x80n) {
+      this.buffer[this.offset++] = Number(zigzag & 0x7fn) | 0x80;
+      zigzag >>= 7n;
+    }
+    this.buffer[this.offset++] = Number(zigzag);
+  }
+
+  double(value: number): void {
+    this.ensure(8);
+    this.offset = this.buffer.writeDoubleLE(value, this.offset);
+  }
+
+  string(value: string): void {
+    const length = Buffer.byteLength(value);
+    this.varint(length);
+    this.ensure(length);
+    this.offset += this.buffer.write(value, this.offset);
+  }
+
+  bytes(value: Buffer): void {
+    this.ensure(value.length);
+    this.offset += value.copy(this.buffer, this.offset);
+  }
+
+  toBuffer(): Buffer {
+    return this.buffer.subarray(0, this.offset);
+  }
+}
+
+class BinaryReader {
+  private offset = 0;
+
+  constructor(private buffer: Buffer) {}
+
+  byte(): number {
+    if (this.offset >= this.buffer.length) throw new Error('Truncated event message');
+    return this.buffer[this.offset++];
+  }
+
+  varint(): number {
+    let value = 0;
+    let scale = 1;
+    let byte: number;
+    do {
+      byte = this.byte();
+      value += (byte & 0x7f) * scale;
+      scale *= 0x80;
+    } while (byte & 0x80);
+    return value;
+  }
+
+  long(): number {
+    const start = this.offset;
+    const value = this.varint();
+    if (value <= Number.MAX_SAFE_INTEGER) {
+      return value % 2 === 0 ? value / 2 : -(value + 1) / 2;
+    }
+
+    this.offset = start;
+    let zigzag = 0n;
+    let shift = 0n;
+    let byte: number;
+    do {
+      byte = this.byte();
+      zigzag |= BigInt(byte & 0x7f) << shift;
+      shift += 7n;
+    } while (byte & 0x80);
+    return Number(zigzag & 1n ? -(zigzag + 1n) / 2n : zigzag / 2n);
+  }
+
+  double(): number {
+    const value = this.buffer.readDoubleLE(this.offset);
+    this.offset += 8;
+    return value;
+  }
+
+  string(): string {
+    const length = this.varint();
+    const value = this.buffer.toString('utf8', this.offset, this.offset + length);
+    this.offset += length;
+    return value;
+  }
+
+  bytes(length: number): Buffer {
+    const value = this.buffer.subarray(this.offset, this.offset + length);
+    this.offset += length;
+    return value;
+  }
+}
+
+// A Date, or the ISO string JSON.stringify makes of one
+const toMillis = (value: unknown): number => {
+  const ms = value instanceof Date ? value.getTime() : typeof value === 'string' ? Date.parse(value) : NaN;
+  if (Number.isNaN(ms) || (typeof value === 'string' && new Date(ms).toISOString() !== value)) {
+    throw new Error(`Invalid timestamp: ${String(value)}`);
+  }
+  return ms;
+};
+
+const mismatch = (field: FieldSchema, value: unknown) =>
+  new Error(`Field ${field.name} is not a ${field.type}: ${JSON.stringify(value)}`);
+
+const writeValue = (writer: BinaryWriter, field: FieldSchema, value: unknown): void => {
+  switch (field.type) {
+    case 'string':
+      if (typeof value !== 'string') throw mismatch(field, value);
+      writer.string(value);
+      break;
+    case 'int':
+      if (typeof value !== 'number' || !Number.isSafeInteger(value)) throw mismatch(field, value);
+      writer.long(value);
+      break;
+    case 'double':
+      if (typeof value !== 'number' || !Number.isFinite(value)) throw mismatch(field, value);
+      writer.double(value);
+      break;
+    case 'boolean':
+      if (typeof value !== 'boolean') throw mismatch(field, value);
+      writer.byte(value ? 1 : 0);
+      break;
+    case 'timestamp':
+      writer.long(toMillis(value));
+      break;
+    case 'json':
+      writer.string(JSON.stringify(value));
+      break;
+    case 'string[]': {
+      if (!Array.isArray(value) || !value.every((item) => typeof item === 'string')) throw mismatch(field, value);
+      writer.varint(value.length);
+      value.forEach((item) => writer.string(item));
+      break;
+    }
+  }
+};
+
+const readValue = (reader: BinaryReader, field: FieldSchema): unknown => {
+  switch (field.type) {
+    case 'string':
+      return reader.string();
+    case 'int':
+      return reader.long();
+    case 'double':
+      return reader.double();
+    case 'boolean':
+      return reader.byte() === 1;
+    case 'timestamp':
+      return new Date(reader.long()).toISOString();
+    case 'json':
+      return JSON.parse(reader.string());
+    case 'string[]': {
+      const length = reader.varint();
+      const items: string[] = [];
+      for (let i = 0; i < length; i++) items.push(reader.string());
+      return items;
+    }
+  }
+};
+
+// Returns false when there is no value to write after the flag
+const writePresence = (writer: BinaryWriter, value: unknown): boolean => {
+  const flag = value === undefined ? ABSENT : value === null ? NULL : PRESENT;
+  writer.byte(flag);
+  return flag === PRESENT;
+};
+
+const readPresence = (reader: BinaryReader): number => {
+  const flag = reader.byte();
+  if (flag !== ABSENT && flag !== PRESENT && flag !== NULL) {
+    throw new Error(`Invalid presence flag ${flag}`);
+  }
+  return flag;
+};
+
+const writeOptionalString = (writer: BinaryWriter, value: string | undefined | null) => {
+  if (writePresence(writer, value)) writer.string(value as string);
+};
+
+const readOptionalString = (reader: BinaryReader): string | null | undefined => {
+  const flag = readPresence(reader);
+  return flag === PRESENT ? reader.string() : flag === NULL ? null : undefined;
+};
+
+const writeEventId = (writer: BinaryWriter, eventId: string) => {
+  if (UUID_PATTERN.test(eventId)) {
+    writer.byte(1);
+    writer.bytes(Buffer.from(eventId.replace(/-/g, ''), 'hex'));
+  } else {
+    writer.byte(0);
+    writer.string(eventId);
+  }
+};
+
+const readEventId = (reader: BinaryReader): string => {
+  if (reader.byte() === 0) return reader.string();
+  const hex = reader.bytes(16).toString('hex');
+  return `${hex.slice(0, 8)}-${hex.slice(8, 12)}-${hex.slice(12, 16)}-${hex.slice(16, 20)}-${hex.slice(20)}`;
+};
+
+/**
+ * Encode an event with its registered schema
+ * @throws When no schema is registered for its eventType and version
+ */
+export const encodeEventBinary = (event: DomainEvent, registry: EventSchemaRegistry = eventSchemas): Buffer => {
+  const version = event.version || 1;
+  const schema = registry.get(event.eventType, version);
+  if (!schema) {
+    throw new Error(`No event schema registered for ${event.eventType}@${version}`);
+  }
+
+  const writer = new BinaryWriter();
+  writer.byte(ENVELOPE_V1);
+  writer.string(event.eventType);
+  writer.varint(version);
+  writeEventId(writer, event.eventId);
+  writer.string(event.aggregateId);
+  writer.string(event.aggregateType);
+  writer.long(toMillis(event.timestamp));
+  writeOptionalString(writer, event.userId);
+
+  const data = event.data || {};
+  const extras: Record<string, unknown> = { ...data };
+  for (const field of schema.fields) {
+    const value = data[field.name];
+    delete extras[field.name];
+
+    if (field.optional) {
+      if (!writePresence(writer, value)) continue;
+    } else if (value === undefined || value === null) {
+      throw new Error(`Missing required field ${field.name} for ${event.eventType}@${version}`);
+    }
+    writeValue(writer, field, value);
+  }
+
+  writeOptionalString(writer, Object.keys(extras).length > 0 ? JSON.stringify(extras) : undefined);
+  writeOptionalString(writer, event.metadata === undefined ? undefined : JSON.stringify(event.metadata));
+
+  return writer.toBuffer();
+};
+
+/**
+ * Decode a binary event. The schema comes from the eventType and version in the message.
+ */
+export const decodeEventBinary = (value: Buffer, registry: EventSchemaRegistry = eventSchemas): DomainEvent => {
+  const reader = new BinaryReader(value);
+  const format = reader.byte();
+  if (format !== ENVELOPE_V1) {
+    throw new Error(`Unsupported event envelope format ${format}`);
+  }
+
+  const eventType = reader.string();
+  const version = reader.varint();
+  const schema: EventSchema | undefined = registry.get(eventType, version);
+  if (!schema) {
+    throw new Error(`No event schema registered for ${eventType}@${version}`);
+  }
+
+  const eventId = readEventId(reader);
+  const aggregateId = reader.string();
+  const aggregateType = reader.string();
+  const timestamp = new Date(reader.long()).toISOString();
+  const userId = readOptionalString(reader);
+
+  const data: Record<string, unknown> = {};
+  for (const field of schema.fields) {
+    if (field.optional) {
+      const flag = readPresence(reader);
+      if (flag === ABSENT) continue;
+      if (flag === NULL) {
+        data[field.name] = null;
+        continue;
+      }
+    }
+    data[field.name] = readValue(reader, field);
+  }
+
+  const extras = readOptionalString(reader);
+  if (extras) Object.assign(data, JSON.parse(extras));
+  const metadata = readOptionalString(reader);
+
+  const event: DomainEvent = {
+    eventId,
+    eventType: eventType as DomainEvent['eventType'],
+    aggregateId,
+    aggregateType,
+    timestamp,
+    version,
+    data,
+  };
+  if (userId !== undefined) event.userId = userId as string;
+  if (typeof metadata === 'string') event.metadata = JSON.parse(metadata);
+  return event;
+};
+
+/**
+ * Encode an event for publishing. With 'binary', events without a registered
+ * schema fall back to JSON; the content-type header records what was used.
+ */
+export const encodeEvent = (
+  event: DomainEvent,
+  encoding: EventEncoding = 'json',
+  registry: EventSchemaRegistry = eventSchemas
+): EncodedEvent => {
+  const headers = {
+    'event-type': event.eventType,
+    'event-version': String(event.version || 1),
+  };
+
+  if (encoding === 'binary' && registry.get(event.eventType, event.version || 1)) {
+    try {
+      return {
+        value: encodeEventBinary(event, registry),
+        headers: { ...headers, 'content-type': EVENT_CONTENT_TYPES.binary },
+      };
+    } catch {
+      // Data that does not fit its schema is still published, as JSON
+    }
+  }
+
+  return {
+    value: Buffer.from(JSON.stringify(event)),
+    headers: { ...headers, 'content-type': EVENT_CONTENT_TYPES.json },
+  };
+};
+
+const headerValue = (headers: IHeaders | undefined, name: string): string | undefined => {
+  const value = headers?.[name];
+  if (value === undefined) return undefined;
+  const first = Array.isArray(value) ? value[0] : value;
+  return first === undefined ? undefined : first.toString();
+};
+
+/**
+ * Decode a consumed message by its content-type header; messages without one are JSON
+ */
+export const decodeEventMessage = (
+  value: Buffer,
+  headers?: IHeaders,
+  registry: EventSchemaRegistry = eventSchemas
+): unknown => {
+  if (headerValue(headers, 'content-type') === EVENT_CONTENT_TYPES.binary) {
+    return decodeEventBinary(value, registry);
+  }
+  return JSON.parse(value.toString());
+};
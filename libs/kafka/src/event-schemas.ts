@@ -0,0 +1,224 @@
+/**
+ * Schemas for the binary encoding of DomainEvent data, keyed by event type and version
+ */
+
+import { EventType } from './events';
+
+export type FieldType = 'string' | 'int' | 'double' | 'boolean' | 'timestamp' | 'json' | 'string[]';
+
+export interface FieldSchema {
+  name: string;
+  type: FieldType;
+  optional?: boolean;
+}
+
+/**
+ * Layout of `data` for one event type and version. Fields are written in
+ * order without names; data fields not listed here still round-trip, as a
+ * trailing JSON object, so a schema only needs to cover the common fields.
+ */
+export interface EventSchema {
+  eventType: string;
+  version: number;
+  fields: FieldSchema[];
+}
+
+const schemaKey = (eventType: string, version: number) => `${eventType}@${version}`;
+
+export class EventSchemaRegistry {
+  private schemas = new Map<string, EventSchema>();
+
+  /**
+   * Register a schema. A published eventType + version must never change;
+   * add a new version instead and bump DomainEvent.version in producers.
+   */
+  register(schema: EventSchema): this {
+    const key = schemaKey(schema.eventType, schema.version);
+    const existing = this.schemas.get(key);
+    if (existing && JSON.stringify(existing.fields) !== JSON.stringify(schema.fields)) {
+      throw new Error(`Event schema ${key} is already registered with different fields`);
+    }
+    this.schemas.set(key, schema);
+    return this;
+  }
+
+  get(eventType: string, version: number): EventSchema | undefined {
+    return this.schemas.get(schemaKey(eventType, version));
+  }
+
+  list(): EventSchema[] {
+    return [...this.schemas.values()];
+  }
+}
+
+const field = (name: string, type: FieldType, optional: boolean = false): FieldSchema =>
+  optional ? { name, type, optional } : { name, type };
+
+const registerAll = (registry: EventSchemaRegistry, eventTypes: EventType[], fields: FieldSchema[]) => {
+  eventTypes.forEach((eventType) => registry.register({ eventType, version: 1, fields }));
+};
+
+/**
+ * Registry with version 1 of every event the services publish
+ */
+export const eventSchemas = new EventSchemaRegistry();
+
+registerAll(
+  eventSchemas,
+  [EventType.PARTICIPANT_CREATED, EventType.PARTICIPANT_UPDATED, EventType.PARTICIPANT_DELETED],
+  [
+    field('participantId', 'string'),
+    field('did', 'string', true),
+    field('name', 'string', true),
+    field('description', 'string', true),
+    field('sector', 'string', true),
+    field('status', 'string', true),
+  ]
+);
+
+registerAll(
+  eventSchemas,
+  [EventType.DATASET_CREATED, EventType.DATASET_UPDATED, EventType.DATASET_PUBLISHED, EventType.DATASET_DELETED],
+  [
+    field('datasetId', 'string'),
+    field('participantId', 'string', true),
+    field('name', 'string', true),
+    field('description', 'string', true),
+    field('schema', 'string', true),
+    field('schemaRef', 'string', true),
+    field('category', 'string', true),
+    field('status', 'string', true),
+  ]
+);
+
+registerAll(
+  eventSchemas,
+  [EventType.SCHEMA_CREATED, EventType.SCHEMA_UPDATED, EventType.SCHEMA_DELETED],
+  [
+    field('schemaId', 'string'),
+    field('name', 'string', true),
+    field('namespace', 'string', true),
+    field('version', 'string', true),
+    field('format', 'string', true),
+    field('status', 'string', true),
+  ]
+);
+
+registerAll(
+  eventSchemas,
+  [EventType.VOCABULARY_CREATED, EventType.VOCABULARY_UPDATED, EventType.VOCABULARY_DELETED],
+  [
+    field('vocabularyId', 'string'),
+    field('name', 'string', true),
+    field('namespace', 'string', true),
+    field('version', 'string', true),
+    field('status', 'string', true),
+  ]
+);
+
+registerAll(
+  eventSchemas,
+  [
+    EventType.POLICY_CREATED,
+    EventType.POLICY_UPDATED,
+    EventType.POLICY_ACTIVATED,
+    EventType.POLICY_REVOKED,
+    EventType.POLICY_DELETED,
+  ],
+  [
+    field('policyId', 'string'),
+    field('name', 'string', true),
+    field('description', 'string', true),
+    field('status', 'string', true),
+    field('rules', 'json', true),
+  ]
+);
+
+registerAll(
+  eventSchemas,
+  [
+    EventType.CONTRACT_PROPOSED,
+    EventType.CONTRACT_ACCEPTED,
+    EventType.CONTRACT_REJECTED,
+    EventType.CONTRACT_TERMINATED,
+    EventType.CONTRACT_UPDATED,
+    EventType.CONTRACT_DELETED,
+  ],
+  [
+    field('contractId', 'string'),
+    field('proposer', 'string', true),
+    field('respondent', 'string', true),
+    field('name', 'string', true),
+    field('status', 'string', true),
+    field('terms', 'json', true),
+  ]
+);
+
+registerAll(
+  eventSchemas,
+  [EventType.TRANSACTION_INITIATED, EventType.TRANSACTION_COMPLETED, EventType.TRANSACTION_FAILED],
+  [
+    field('transactionId', 'string'),
+    field('amount', 'double', true),
+    field('currency', 'string', true),
+    field('parties', 'string[]', true),
+  ]
+);
+
+registerAll(
+  eventSchemas,
+  [EventType.CLEARING_INITIATED, EventType.CLEARING_COMPLETED],
+  [
+    field('clearingId', 'string'),
+    field('totalAmount', 'double', true),
+    field('settledTransactions', 'int', true),
+    field('date', 'timestamp', true),
+  ]
+);
+
+registerAll(
+  eventSchemas,
+  [
+    EventType.CREDENTIAL_CREATED,
+    EventType.CREDENTIAL_REVOKED,
+    EventType.CREDENTIAL_EXPIRED,
+    EventType.CREDENTIAL_SCOPE_CHANGED,
+  ],
+  [
+    field('credentialId', 'string'),
+    field('clientId', 'string', true),
+    field('participantId', 'string', true),
+    field('scope', 'string[]', true),
+    field('status', 'string', true),
+    field('expiresAt', 'string', true),
+    field('oldScopes', 'string[]', true),
+    field('newScopes', 'string[]', true),
+  ]
+);
+
+registerAll(
+  eventSchemas,
+  [EventType.TOKEN_ISSUED, EventType.TOKEN_REFRESHED, EventType.TOKEN_REVOKED, EventType.TOKEN_EXPIRED],
+  [
+    field('tokenId', 'string'),
+    field('credentialId', 'string', true),
+    field('tokenType', 'string', true),
+    field('scope', 'string[]', true),
+    field('issuedAt', 'string', true),
+    field('expiresAt', 'string', true),
+    field('previousTokenId', 'string', true),
+  ]
+);
+
+registerAll(
+  eventSchemas,
+  [EventType.APIKEY_CREATED, EventType.APIKEY_REVOKED, EventType.APIKEY_USED, EventType.APIKEY_EXPIRED],
+  [
+    field('apiKeyId', 'string'),
+    field('name', 'string', true),
+    field('participantId', 'string', true),
+    field('scope', 'string[]', true),
+    field('status', 'string', true),
+    field('expiresAt', 'string', true),
+  ]
+);
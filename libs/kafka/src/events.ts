@@ -2,6 +2,8 @@
  * Event types and schemas for dataspace domain events
  */
 
+import { randomUUID } from 'crypto';
+
 export enum EventType {
   // Participant Events
   PARTICIPANT_CREATED = 'participant.created',
@@ -12,18 +14,49 @@ export enum EventType {
   DATASET_CREATED = 'dataset.created',
   DATASET_UPDATED = 'dataset.updated',
   DATASET_PUBLISHED = 'dataset.published',
+  DATASET_DELETED = 'dataset.deleted',
+
+  // Schema & Vocabulary Events
+  SCHEMA_CREATED = 'schema.created',
+  SCHEMA_UPDATED = 'schema.updated',
+  SCHEMA_DELETED = 'schema.deleted',
+  VOCABULARY_CREATED = 'vocabulary.created',
+  VOCABULARY_UPDATED = 'vocabulary.updated',
+  VOCABULARY_DELETED = 'vocabulary.deleted',
 
   // Policy Events
   POLICY_CREATED = 'policy.created',
   POLICY_UPDATED = 'policy.updated',
   POLICY_ACTIVATED = 'policy.activated',
   POLICY_REVOKED = 'policy.revoked',
+  POLICY_DELETED = 'policy.deleted',
 
   // Contract Events
   CONTRACT_PROPOSED = 'contract.proposed',
   CONTRACT_ACCEPTED = 'contract.accepted',
   CONTRACT_REJECTED = 'contract.rejected',
   CONTRACT_TERMINATED = 'contract.terminated',
+  CONTRACT_UPDATED = 'contract.updated',
+  CONTRACT_DELETED = 'contract.deleted',
+
+  // App Store Events
+  APP_PUBLISHED = 'app.published',
+  APP_UPDATED = 'app.updated',
+  APP_REMOVED = 'app.removed',
+
+  // Identity Events
+  CREDENTIAL_CREATED = 'credential.created',
+  CREDENTIAL_REVOKED = 'credential.revoked',
+  CREDENTIAL_EXPIRED = 'credential.expired',
+  CREDENTIAL_SCOPE_CHANGED = 'credential.scope.changed',
+  TOKEN_ISSUED = 'token.issued',
+  TOKEN_REFRESHED = 'token.refreshed',
+  TOKEN_REVOKED = 'token.revoked',
+  TOKEN_EXPIRED = 'token.expired',
+  APIKEY_CREATED = 'apikey.created',
+  APIKEY_REVOKED = 'apikey.revoked',
+  APIKEY_USED = 'apikey.used',
+  APIKEY_EXPIRED = 'apikey.expired',
 
   // Compliance Events
   COMPLIANCE_AUDIT_STARTED = 'compliance.audit.started',
@@ -54,13 +87,33 @@ export interface DomainEvent {
   eventType: EventType;
   aggregateId: string;
   aggregateType: string;
-  timestamp: Date;
+  timestamp: Date | string; // ISO string once the event has been serialized
   version: number;
   userId?: string;
   data: Record<string, unknown>;
   metadata?: Record<string, unknown>;
 }
 
+/**
+ * Build a domain event envelope with a fresh id and the current time
+ */
+export const createDomainEvent = (
+  eventType: EventType,
+  aggregateType: string,
+  aggregateId: string,
+  data: Record<string, unknown>,
+  userId?: string
+): DomainEvent => ({
+  eventId: randomUUID(),
+  eventType,
+  aggregateId,
+  aggregateType,
+  timestamp: new Date(),
+  version: 1,
+  userId,
+  data,
+});
+
 export interface ParticipantCreatedEvent extends DomainEvent {
   data: {
     participantId: string;
@@ -121,6 +174,10 @@ export const EventTopics = {
   DATASETS: 'dataspace.datasets',
   POLICIES: 'dataspace.policies',
   CONTRACTS: 'dataspace.contracts',
+  SCHEMAS: 'dataspace.schemas',
+  VOCABULARIES: 'dataspace.vocabularies',
+  APPS: 'dataspace.apps',
+  IDENTITY: 'dataspace.identity',
   COMPLIANCE: 'dataspace.compliance',
   TRANSACTIONS: 'dataspace.transactions',
   DATA_EXCHANGE: 'dataspace.data-exchange',
@@ -133,6 +190,10 @@ export const TopicConfigs = [
   { name: EventTopics.DATASETS, partitions: 3, replicationFactor: 1 },
   { name: EventTopics.POLICIES, partitions: 1, replicationFactor: 1 },
   { name: EventTopics.CONTRACTS, partitions: 2, replicationFactor: 1 },
+  { name: EventTopics.SCHEMAS, partitions: 1, replicationFactor: 1 },
+  { name: EventTopics.VOCABULARIES, partitions: 1, replicationFactor: 1 },
+  { name: EventTopics.APPS, partitions: 1, replicationFactor: 1 },
+  { name: EventTopics.IDENTITY, partitions: 3, replicationFactor: 1 },
   { name: EventTopics.COMPLIANCE, partitions: 1, replicationFactor: 1 },
   { name: EventTopics.TRANSACTIONS, partitions: 3, replicationFactor: 1 },
   { name: EventTopics.DATA_EXCHANGE, partitions: 5, replicationFactor: 1 },
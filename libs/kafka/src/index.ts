@@ -1,8 +1,21 @@
-export { KafkaClient, type KafkaConfig } from './client';
+export {
+  KafkaClient,
+  type KafkaConfig,
+  type ProducerBatchConfig,
+  type ProducerCompression,
+  type EventMessage,
+  type ProducerStats,
+  type ConsumedMessage,
+  type ConsumedBatch,
+  type BatchSubscriptionOptions,
+  type PartitionLag,
+  type ConsumerGroupStats,
+} from './client';
 export {
   EventType,
   EventTopics,
   TopicConfigs,
+  createDomainEvent,
   type DomainEvent,
   type ParticipantCreatedEvent,
   type DatasetCreatedEvent,
@@ -11,3 +24,28 @@ export {
   type TransactionInitiatedEvent,
   type ClearingCompletedEvent,
 } from './events';
+export {
+  OutboxRelay,
+  toOutboxEntry,
+  outboxRelayOptionsFromEnv,
+  type OutboxMessage,
+  type OutboxStore,
+  type OutboxRelayOptions,
+  type OutboxRelayStats,
+} from './outbox-relay';
+export {
+  EventSchemaRegistry,
+  eventSchemas,
+  type EventSchema,
+  type FieldSchema,
+  type FieldType,
+} from './event-schemas';
+export {
+  EVENT_CONTENT_TYPES,
+  encodeEvent,
+  encodeEventBinary,
+  decodeEventBinary,
+  decodeEventMessage,
+  type EventEncoding,
+  type EncodedEvent,
+} from './event-codec';
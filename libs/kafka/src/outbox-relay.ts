@@ -0,0 +1,220 @@
+import pino from 'pino';
+import { KafkaClient, ProducerStats } from './client';
+import { DomainEvent } from './events';
+import { EventEncoding, encodeEvent } from './event-codec';
+
+const logger = pino({ level: process.env.LOG_LEVEL || 'info' });
+
+// An event as stored in the outbox table (see appendToOutbox in @dataspace/db)
+export interface OutboxMessage {
+  id: string;
+  eventId: string;
+  topic: string;
+  key: string;
+  eventType: string;
+  payload: Record<string, unknown>;
+  headers?: Record<string, string>;
+}
+
+// Storage the relay drains; @dataspace/db's outboxStore implements it
+export interface OutboxStore {
+  // Claim a batch, call publish, mark it published only if publish resolves.
+  // An event that has failed maxAttempts times on its own is set aside.
+  drain(
+    limit: number,
+    publish: (messages: OutboxMessage[]) => Promise<void>,
+    maxAttempts: number
+  ): Promise<number>;
+  purge?(retentionSeconds: number): Promise<number>;
+}
+
+export interface OutboxRelayOptions {
+  batchSize?: number; // Events per Kafka request, default 500
+  pollIntervalMs?: number; // Wait when the outbox is empty, default 500
+  maxBackoffMs?: number; // Cap for the retry delay after a failed batch, default 30000
+  maxAttempts?: number; // Failures of a lone event before it is marked failed, default 10
+  retentionSeconds?: number; // Published rows kept for inspection, default 7 days
+  purgeIntervalMs?: number; // Default 1 hour
+  encoding?: EventEncoding; // Wire format, default 'json'; see encodeEvent
+}
+
+export interface OutboxRelayStats {
+  running: boolean;
+  published: number;
+  batches: number;
+  failures: number;
+  consecutiveFailures: number;
+  lastPublishedAt: string | null;
+  lastError: string | null;
+  producer: ProducerStats;
+}
+
+// Relay settings from the environment: OUTBOX_BATCH_SIZE (default 500),
+// OUTBOX_POLL_INTERVAL_MS (default 500), OUTBOX_MAX_ATTEMPTS (default 10),
+// OUTBOX_RETENTION_SECONDS (default 7 days) and OUTBOX_EVENT_ENCODING (json
+// or binary, default json)
+export const outboxRelayOptionsFromEnv = (env: NodeJS.ProcessEnv = process.env): OutboxRelayOptions => ({
+  batchSize: parseInt(env.OUTBOX_BATCH_SIZE || '500'),
+  pollIntervalMs: parseInt(env.OUTBOX_POLL_INTERVAL_MS || '500'),
+  maxAttempts: parseInt(env.OUTBOX_MAX_ATTEMPTS || '10'),
+  retentionSeconds: parseInt(env.OUTBOX_RETENTION_SECONDS || String(7 * 24 * 3600)),
+  encoding: env.OUTBOX_EVENT_ENCODING === 'binary' ? 'binary' : 'json',
+});
+
+// Build the outbox entry for a domain event, keyed by its aggregate so events
+// of one aggregate land on one partition in order
+export const toOutboxEntry = (topic: string, event: DomainEvent) => ({
+  eventId: event.eventId,
+  topic,
+  key: event.aggregateId,
+  eventType: event.eventType,
+  payload: event as unknown as Record<string, unknown>,
+  headers: { 'event-type': event.eventType, 'event-id': event.eventId },
+});
+
+// Drains the transactional outbox to Kafka in the background. A batch is sent
+// through KafkaClient.publishEvents and only marked published once the broker
+// acknowledged it, so delivery is at-least-once: consumers dedupe on event-id.
+// The store lets one relay drain at a time, so a failed batch is retried, with
+// backoff and one event at a time, before anything newer is sent. An event
+// still failing after maxAttempts is marked failed and skipped; events of its
+// aggregate published after that are no longer ordered behind it.
+export class OutboxRelay {
+  private running = false;
+  private loop: Promise<void> | null = null;
+  private wake: (() => void) | null = null;
+  private lastPurge = 0;
+  private stats = {
+    published: 0,
+    batches: 0,
+    failures: 0,
+    consecutiveFailures: 0,
+    lastPublishedAt: null as string | null,
+    lastError: null as string | null,
+  };
+  private options: Required<OutboxRelayOptions>;
+
+  constructor(
+    private kafka: KafkaClient,
+    private store: OutboxStore,
+    options: OutboxRelayOptions = {}
+  ) {
+    this.options = {
+      batchSize: options.batchSize || 500,
+      pollIntervalMs: options.pollIntervalMs || 500,
+      maxBackoffMs: options.maxBackoffMs || 30000,
+      maxAttempts: options.maxAttempts || 10,
+      retentionSeconds: options.retentionSeconds || 7 * 24 * 3600,
+      purgeIntervalMs: options.purgeIntervalMs || 3600 * 1000,
+      encoding: options.encoding || 'json',
+    };
+  }
+
+  start(): void {
+    if (this.running) return;
+    this.running = true;
+    this.loop = this.run();
+    logger.info('Outbox relay started');
+  }
+
+  // Stop after the batch in flight, if any
+  async stop(): Promise<void> {
+    this.running = false;
+    this.wake?.();
+    await this.loop;
+    this.loop = null;
+    logger.info('Outbox relay stopped');
+  }
+
+  getStats(): OutboxRelayStats {
+    return { running: this.running, ...this.stats, producer: this.kafka.getProducerStats() };
+  }
+
+  private async run(): Promise<void> {
+    while (this.running) {
+      let published = 0;
+      try {
+        published = await this.store.drain(
+          this.options.batchSize,
+          (messages) => this.publish(messages),
+          this.options.maxAttempts
+        );
+        if (published > 0) {
+          this.stats.published += published;
+          this.stats.batches++;
+          this.stats.lastPublishedAt = new Date().toISOString();
+        }
+        this.stats.consecutiveFailures = 0;
+        await this.purge();
+      } catch (error) {
+        this.stats.failures++;
+        this.stats.consecutiveFailures++;
+        this.stats.lastError = error instanceof Error ? error.message : String(error);
+        logger.error('Outbox relay batch failed:', error);
+      }
+
+      // While events are going out more may be waiting (or a failed batch is
+      // being retried one event per drain), so drain again straight away
+      if (this.stats.consecutiveFailures > 0) {
+        await this.idle(
+          Math.min(this.options.pollIntervalMs * 2 ** this.stats.consecutiveFailures, this.options.maxBackoffMs)
+        );
+      } else if (published === 0) {
+        await this.idle(this.options.pollIntervalMs);
+      }
+    }
+  }
+
+  private async publish(messages: OutboxMessage[]): Promise<void> {
+    const byTopic = new Map<string, OutboxMessage[]>();
+    for (const message of messages) {
+      const list = byTopic.get(message.topic);
+      if (list) {
+        list.push(message);
+      } else {
+        byTopic.set(message.topic, [message]);
+      }
+    }
+
+    // The client's micro-batching buffer merges the per-topic calls into
+    // compressed sendBatch requests
+    await Promise.all(
+      [...byTopic].map(([topic, list]) =>
+        this.kafka.publishEvents(
+          topic,
+          list.map((message) => {
+            const encoded = encodeEvent(message.payload as unknown as DomainEvent, this.options.encoding);
+            return {
+              key: message.key,
+              value: encoded.value,
+              headers: { ...message.headers, ...encoded.headers, 'event-id': message.eventId },
+            };
+          })
+        )
+      )
+    );
+  }
+
+  private async purge(): Promise<void> {
+    if (!this.store.purge || Date.now() - this.lastPurge < this.options.purgeIntervalMs) return;
+    this.lastPurge = Date.now();
+    const purged = await this.store.purge(this.options.retentionSeconds);
+    if (purged > 0) {
+      logger.info(`Outbox relay purged ${purged} published events`);
+    }
+  }
+
+  private idle(ms: number): Promise<void> {
+    return new Promise((resolve) => {
+      const timer = setTimeout(() => {
+        this.wake = null;
+        resolve();
+      }, ms);
+      this.wake = () => {
+        clearTimeout(timer);
+        this.wake = null;
+        resolve();
+      };
+    });
+  }
+}
@@ -0,0 +1,99 @@
+import { describe, it, expect } from 'vitest';
+import { KafkaClient } from '../src/client';
+
+interface SentBatch {
+  keys: string[];
+  settle: (error?: Error) => void;
+}
+
+/**
+ * A client whose producer records each sendBatch call and leaves it pending
+ * until the test settles it
+ */
+const clientWithProducer = (batchSize: number) => {
+  const client = new KafkaClient({ brokers: ['localhost:9092'], clientId: 'test', producer: { batchSize, lingerMs: 1 } });
+  const sent: SentBatch[] = [];
+  const producer = {
+    sendBatch: ({ topicMessages }: any) =>
+      new Promise<void>((resolve, reject) => {
+        sent.push({
+          keys: topicMessages.flatMap((topic: any) => topic.messages.map((message: any) => message.key)),
+          settle: (error) => (error ? reject(error) : resolve()),
+        });
+      }),
+  };
+  client['producerReady'] = Promise.resolve(producer as any);
+  return { client, sent };
+};
+
+const events = (...keys: string[]) => keys.map((key) => ({ key, value: { key } }));
+
+const tick = () => new Promise((resolve) => setTimeout(resolve, 5));
+
+describe('KafkaClient producer batching', () => {
+  it('starts each sendBatch only after the previous one settled', async () => {
+    const { client, sent } = clientWithProducer(2);
+
+    const published = client.publishEvents('events', events('a', 'b', 'c', 'd', 'e'));
+    await tick();
+    expect(sent.map((batch) => batch.keys)).toEqual([['a', 'b']]);
+
+    sent[0].settle();
+    await tick();
+    expect(sent.map((batch) => batch.keys)).toEqual([['a', 'b'], ['c', 'd']]);
+
+    sent[1].settle();
+    await tick();
+    sent[2].settle();
+
+    await published;
+    expect(sent.map((batch) => batch.keys)).toEqual([['a', 'b'], ['c', 'd'], ['e']]);
+    expect(client.getProducerStats()).toMatchObject({ batchesSent: 3, messagesSent: 5, failedBatches: 0 });
+  });
+
+  it('fails the batches queued behind a failed one without sending them', async () => {
+    const { client, sent } = clientWithProducer(2);
+
+    const published = client.publishEvents('events', events('a', 'b', 'c', 'd'));
+    await tick();
+    sent[0].settle(new Error('broker unavailable'));
+
+    await expect(published).rejects.toThrow('broker unavailable');
+    expect(sent).toHaveLength(1);
+    expect(client.getProducerStats().failedBatches).toBe(2);
+  });
+
+  it('sends again after a failed chain has drained', async () => {
+    const { client, sent } = clientWithProducer(2);
+
+    const failed = client.publishEvents('events', events('a'));
+    await tick();
+    sent[0].settle(new Error('broker unavailable'));
+    await expect(failed).rejects.toThrow('broker unavailable');
+
+    const retried = client.publishEvents('events', events('a'));
+    await tick();
+    sent[1].settle();
+
+    await retried;
+    expect(sent.map((batch) => batch.keys)).toEqual([['a'], ['a']]);
+  });
+
+  it('waits for every queued batch in flushProducer', async () => {
+    const { client, sent } = clientWithProducer(1);
+    const published = client.publishEvents('events', events('a', 'b'));
+    let flushed = false;
+    await tick();
+
+    const flushing = client.flushProducer().then(() => (flushed = true));
+    await tick();
+    sent[0].settle();
+    await tick();
+    expect(flushed).toBe(false);
+
+    sent[1].settle();
+    await flushing;
+    await published;
+    expect(flushed).toBe(true);
+  });
+});
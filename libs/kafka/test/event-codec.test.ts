@@ -0,0 +1,204 @@
+import { describe, it, expect } from 'vitest';
+import {
+  EVENT_CONTENT_TYPES,
+  decodeEventBinary,
+  decodeEventMessage,
+  encodeEvent,
+  encodeEventBinary,
+} from '../src/event-codec';
+import { EventSchemaRegistry, eventSchemas, type EventSchema, type FieldType } from '../src/event-schemas';
+import { EventType, type DomainEvent } from '../src/events';
+
+const SAMPLES: Record<FieldType, unknown> = {
+  string: 'value with ünïcode',
+  int: -123456789012,
+  double: 1234.5,
+  boolean: true,
+  timestamp: '2026-06-01T12:34:56.789Z',
+  json: { nested: [1, 'two', null], flag: false },
+  'string[]': ['read', 'write'],
+};
+
+const event = (eventType: string, data: Record<string, unknown>, overrides: Partial<DomainEvent> = {}): DomainEvent => ({
+  eventId: '0f8fad5b-d9cb-469f-a165-70867728950e',
+  eventType: eventType as EventType,
+  aggregateId: 'aggregate-1',
+  aggregateType: 'aggregate',
+  timestamp: new Date('2026-06-01T00:00:00.000Z'),
+  version: 1,
+  data,
+  ...overrides,
+});
+
+const fullData = (schema: EventSchema) =>
+  Object.fromEntries(schema.fields.map((field) => [field.name, SAMPLES[field.type]]));
+
+// What a JSON consumer sees for the same event
+const viaJson = (value: DomainEvent) => JSON.parse(JSON.stringify(value));
+
+const roundTrip = (value: DomainEvent) => decodeEventBinary(encodeEventBinary(value));
+
+describe('binary event encoding', () => {
+  describe.each(eventSchemas.list().map((schema) => [`${schema.eventType}@${schema.version}`, schema] as const))(
+    '%s',
+    (_, schema) => {
+      it('round-trips every field', () => {
+        const original = event(schema.eventType, fullData(schema), { userId: 'user-1', metadata: { source: 'test' } });
+        expect(roundTrip(original)).toEqual(viaJson(original));
+      });
+
+      it('round-trips only the required fields', () => {
+        const data = Object.fromEntries(
+          schema.fields.filter((field) => !field.optional).map((field) => [field.name, SAMPLES[field.type]])
+        );
+        const original = event(schema.eventType, data);
+        expect(roundTrip(original)).toEqual(viaJson(original));
+      });
+
+      it('keeps null optional fields as null', () => {
+        const data = fullData(schema);
+        schema.fields.filter((field) => field.optional).forEach((field) => (data[field.name] = null));
+        const original = event(schema.eventType, data, { userId: null as unknown as string, metadata: null as any });
+
+        const decoded = roundTrip(original);
+        expect(decoded).toEqual(viaJson(original));
+        schema.fields
+          .filter((field) => field.optional)
+          .forEach((field) => expect(decoded.data[field.name]).toBeNull());
+      });
+
+      it('is smaller than JSON', () => {
+        const original = event(schema.eventType, fullData(schema));
+        expect(encodeEventBinary(original).length).toBeLessThan(Buffer.byteLength(JSON.stringify(original)));
+      });
+    }
+  );
+
+  it('carries data fields outside the schema as trailing JSON', () => {
+    const original = event(EventType.DATASET_CREATED, {
+      datasetId: 'dataset-1',
+      tags: ['energy', 'grid'],
+      size: 42,
+      owner: { id: 'p-1' },
+    });
+    expect(roundTrip(original)).toEqual(viaJson(original));
+  });
+
+  it('decodes timestamps as ISO strings', () => {
+    const decoded = roundTrip(event(EventType.DATASET_CREATED, { datasetId: 'dataset-1' }));
+    expect(decoded.timestamp).toBe('2026-06-01T00:00:00.000Z');
+  });
+
+  it('accepts an already serialized event', () => {
+    const original = viaJson(event(EventType.DATASET_CREATED, { datasetId: 'dataset-1', name: 'Grid load' }));
+    expect(roundTrip(original)).toEqual(original);
+  });
+
+  it('keeps event ids that are not lowercase UUIDs', () => {
+    for (const eventId of ['0F8FAD5B-D9CB-469F-A165-70867728950E', 'evt-42']) {
+      const decoded = roundTrip(event(EventType.DATASET_CREATED, { datasetId: 'dataset-1' }, { eventId }));
+      expect(decoded.eventId).toBe(eventId);
+    }
+  });
+
+  it('round-trips integers beyond 32 bits', () => {
+    for (const settledTransactions of [0, -1, 2 ** 31, -(2 ** 40), Number.MAX_SAFE_INTEGER, Number.MIN_SAFE_INTEGER]) {
+      const decoded = roundTrip(event(EventType.CLEARING_COMPLETED, { clearingId: 'c-1', settledTransactions }));
+      expect(decoded.data.settledTransactions).toBe(settledTransactions);
+    }
+  });
+
+  it('defaults a missing version to 1', () => {
+    const decoded = roundTrip(event(EventType.DATASET_CREATED, { datasetId: 'dataset-1' }, { version: undefined as any }));
+    expect(decoded.version).toBe(1);
+  });
+
+  describe('values that would not come back unchanged', () => {
+    it.each([
+      ['a number in a string field', { datasetId: 'dataset-1', name: 42 }],
+      ['a string in a double field', { transactionId: 't-1', amount: '10.5' }, EventType.TRANSACTION_INITIATED],
+      ['a non-finite double', { transactionId: 't-1', amount: Infinity }, EventType.TRANSACTION_INITIATED],
+      ['a fractional int', { clearingId: 'c-1', settledTransactions: 1.5 }, EventType.CLEARING_COMPLETED],
+      ['a non-string list item', { transactionId: 't-1', parties: ['a', 1] }, EventType.TRANSACTION_INITIATED],
+      ['a date that is not in ISO form', { clearingId: 'c-1', date: '2026-06-01' }, EventType.CLEARING_COMPLETED],
+      ['a missing required field', { name: 'no id' }],
+    ])('rejects %s', (_, data, eventType = EventType.DATASET_CREATED) => {
+      const original = event(eventType as string, data as Record<string, unknown>);
+      expect(() => encodeEventBinary(original)).toThrow();
+
+      const encoded = encodeEvent(original, 'binary');
+      expect(encoded.headers['content-type']).toBe(EVENT_CONTENT_TYPES.json);
+      expect(decodeEventMessage(encoded.value, encoded.headers)).toEqual(viaJson(original));
+    });
+
+    it('rejects an envelope timestamp that is not in ISO form', () => {
+      const original = event(EventType.DATASET_CREATED, { datasetId: 'dataset-1' }, { timestamp: 'June 1st' });
+      expect(() => encodeEventBinary(original)).toThrow('Invalid timestamp');
+    });
+  });
+
+  describe('decoding errors', () => {
+    it('rejects an unknown envelope format', () => {
+      const value = encodeEventBinary(event(EventType.DATASET_CREATED, { datasetId: 'dataset-1' }));
+      value[0] = 0x7f;
+      expect(() => decodeEventBinary(value)).toThrow('Unsupported event envelope format 127');
+    });
+
+    it('rejects a truncated message', () => {
+      const value = encodeEventBinary(event(EventType.DATASET_CREATED, { datasetId: 'dataset-1', name: 'x' }));
+      expect(() => decodeEventBinary(value.subarray(0, value.length - 3))).toThrow();
+    });
+
+    it('rejects an event type the registry does not know', () => {
+      const value = encodeEventBinary(event(EventType.DATASET_CREATED, { datasetId: 'dataset-1' }));
+      expect(() => decodeEventBinary(value, new EventSchemaRegistry())).toThrow(
+        'No event schema registered for dataset.created@1'
+      );
+    });
+  });
+});
+
+describe('encodeEvent', () => {
+  it('uses binary when asked and a schema is registered', () => {
+    const original = event(EventType.DATASET_CREATED, { datasetId: 'dataset-1', name: 'Grid load' });
+    const encoded = encodeEvent(original, 'binary');
+
+    expect(encoded.headers).toEqual({
+      'event-type': EventType.DATASET_CREATED,
+      'event-version': '1',
+      'content-type': EVENT_CONTENT_TYPES.binary,
+    });
+    expect(decodeEventMessage(encoded.value, encoded.headers)).toEqual(viaJson(original));
+  });
+
+  it('falls back to JSON for events without a schema', () => {
+    const original = event(EventType.SERVICE_HEALTH_CHANGED, { service: 'broker', healthy: false });
+    const encoded = encodeEvent(original, 'binary');
+
+    expect(encoded.headers['content-type']).toBe(EVENT_CONTENT_TYPES.json);
+    expect(decodeEventMessage(encoded.value, encoded.headers)).toEqual(viaJson(original));
+  });
+
+  it('uses JSON by default', () => {
+    const original = event(EventType.DATASET_CREATED, { datasetId: 'dataset-1' });
+    const encoded = encodeEvent(original);
+
+    expect(encoded.headers['content-type']).toBe(EVENT_CONTENT_TYPES.json);
+    expect(JSON.parse(encoded.value.toString())).toEqual(viaJson(original));
+  });
+});
+
+describe('decodeEventMessage', () => {
+  it('decodes messages without a content-type as JSON', () => {
+    const original = event(EventType.DATASET_CREATED, { datasetId: 'dataset-1' });
+    expect(decodeEventMessage(Buffer.from(JSON.stringify(original)))).toEqual(viaJson(original));
+  });
+
+  it('reads the content-type from Buffer header values', () => {
+    const original = event(EventType.DATASET_CREATED, { datasetId: 'dataset-1' });
+    const value = encodeEventBinary(original);
+    const headers = { 'content-type': Buffer.from(EVENT_CONTENT_TYPES.binary) };
+
+    expect(decodeEventMessage(value, headers)).toEqual(viaJson(original));
+  });
+});
@@ -1,18 +1,211 @@
+import { createHash, randomUUID } from 'crypto';
+import pino from 'pino';
 import { RedisClient } from './client';
+import { CacheCodec, jsonCodec } from './codec';
+import { LruCache } from './lru';
+
+const logger = pino({ level: process.env.LOG_LEVEL || 'info' });
 
 export interface CacheOptions {
   ttl?: number; // Time to live in seconds
+  tags?: string[]; // Tags the entry is invalidated by, see CacheTags
+}
+
+export interface GetOrSetOptions extends CacheOptions {
+  // Seconds a value counts as fresh. After that, until `ttl`, the stale value
+  // is served while one caller refreshes it in the background.
+  softTtl?: number;
+  lockTtlMs?: number; // Cross-process loader lock lifetime, default 5000
+  lockWaitMs?: number; // How long a lock loser waits for the winner's value, default 2000
+  tagsFor?: (value: any) => string[]; // Tags derived from the loaded value, added to `tags`
+}
+
+// Optional in-process tier in front of Redis. Values are held parsed and
+// returned by reference, so callers must treat cached objects as read-only.
+export interface LocalCacheOptions {
+  maxEntries?: number; // Default 1000
+  ttlSeconds?: number; // Default 60, also capped by the entry's own TTL
+}
+
+export interface CacheManagerOptions {
+  local?: LocalCacheOptions | boolean;
+  invalidationChannel?: string; // Pub/sub channel shared by all replicas
+  codec?: CacheCodec; // How values are serialized in Redis, default JSON
+}
+
+export interface CacheTierStats {
+  hits: number;
+  misses: number;
+}
+
+export interface LoaderStats {
+  loads: number; // Loader calls
+  coalesced: number; // Misses that joined an in-flight load in this process
+  lockWaits: number; // Misses served by another process's load
+  staleServes: number; // Stale values served during soft-TTL refresh
+  refreshErrors: number; // Failed background refreshes
+  discarded: number; // Loaded values not cached because a tag was invalidated during the load
+}
+
+// Redis memory used by values under one key prefix (the part before the first
+// ':'). The JSON size is measured on a sample of writes and extrapolated.
+export interface CodecPrefixStats {
+  writes: number;
+  storedBytes: number; // Encoded bytes written
+  jsonBytes: number; // Estimated bytes the same writes would take as JSON
+  savedBytes: number;
+  ratio: number; // storedBytes / jsonBytes
+}
+
+export interface CacheStats {
+  local: CacheTierStats & { enabled: boolean; size: number };
+  redis: CacheTierStats;
+  loader: LoaderStats;
+  codec: { name: string; prefixes: Record<string, CodecPrefixStats> };
 }
 
+interface PrefixSizes {
+  writes: number;
+  storedBytes: number;
+  sampledStoredBytes: number;
+  sampledJsonBytes: number;
+}
+
+// Value written by getOrSet with a softTtl
+interface SoftEntry<T> {
+  __softTtl: true;
+  value: T;
+  freshUntil: number;
+}
+
+const isSoftEntry = (value: unknown): value is SoftEntry<unknown> =>
+  typeof value === 'object' && value !== null && (value as SoftEntry<unknown>).__softTtl === true;
+
+const unwrap = <T>(value: unknown): T => (isSoftEntry(value) ? (value.value as T) : (value as T));
+
+const sleep = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms));
+
+// Published after every write so other replicas drop their local copies
+interface InvalidationMessage {
+  origin: string;
+  keys?: string[];
+  pattern?: string;
+  clear?: boolean;
+}
+
+const DEFAULT_TTL = 3600; // 1 hour
+const DEFAULT_INVALIDATION_CHANNEL = 'cache:invalidate';
+const LOCK_PREFIX = 'lock:';
+const DEFAULT_LOCK_TTL_MS = 5000;
+const DEFAULT_LOCK_WAIT_MS = 2000;
+const LOCK_POLL_MS = 50;
+
+// Release a lock only if this caller still holds it
+const RELEASE_LOCK_SCRIPT = `
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('DEL', KEYS[1])
+end
+return 0`;
+const TAG_PREFIX = 'tag:';
+const UNLINK_BATCH_SIZE = 500;
+const JSON_SIZE_SAMPLE_EVERY = 20; // Measure the JSON size of every 20th write per prefix
+
+// Invalidating a tag bumps a global epoch and records it against the tag for
+// INVALIDATED_MARK_TTL seconds. A load remembers the epoch it started at, and
+// its write is dropped if one of its tags was invalidated since, so a loader
+// that read the old row cannot put it back after the invalidation.
+const EPOCH_KEY = 'cache:epoch';
+const INVALIDATED_PREFIX = 'invalidated:';
+const INVALIDATED_MARK_TTL = 60;
+
+// Store the value and register it in each tag set in one atomic step. A tag set
+// lives as long as its longest-lived member, so its TTL is only ever extended.
+// With ARGV[3] (a load's starting epoch) nothing is written, and 0 returned,
+// when a tag was invalidated after that epoch.
+const SET_TAGGED_SCRIPT = `
+if ARGV[3] then
+  for i = 2, #KEYS do
+    local invalidated = redis.call('GET', ARGV[4] .. KEYS[i])
+    if invalidated and tonumber(invalidated) > tonumber(ARGV[3]) then
+      return 0
+    end
+  end
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+for i = 2, #KEYS do
+  redis.call('SADD', KEYS[i], KEYS[1])
+  if redis.call('TTL', KEYS[i]) < tonumber(ARGV[2]) then
+    redis.call('EXPIRE', KEYS[i], ARGV[2])
+  end
+end
+return 1`;
+
+// Unlink every key in a tag set, then the set itself, and mark the tag
+// invalidated at a new epoch; returns the unlinked keys
+const INVALIDATE_TAG_SCRIPT = `
+redis.call('SET', KEYS[3], redis.call('INCR', KEYS[2]), 'EX', ARGV[1])
+local keys = redis.call('SMEMBERS', KEYS[1])
+for i = 1, #keys, 500 do
+  redis.call('UNLINK', unpack(keys, i, math.min(i + 499, #keys)))
+end
+redis.call('UNLINK', KEYS[1])
+return keys`;
+
 export class CacheManager {
-  constructor(private redis: RedisClient) {}
+  private local: LruCache | null = null;
+  private channel: string;
+  private instanceId = randomUUID();
+  private subscription: Promise<void> | null = null;
+  private inflight = new Map<string, Promise<unknown>>();
+  private codec: CacheCodec;
+  private prefixSizes = new Map<string, PrefixSizes>();
+  private stats = {
+    local: { hits: 0, misses: 0 },
+    redis: { hits: 0, misses: 0 },
+    loader: { loads: 0, coalesced: 0, lockWaits: 0, staleServes: 0, refreshErrors: 0, discarded: 0 },
+  };
+
+  constructor(private redis: RedisClient, options: CacheManagerOptions = {}) {
+    this.channel = options.invalidationChannel || DEFAULT_INVALIDATION_CHANNEL;
+    this.codec = options.codec || jsonCodec;
+
+    if (options.local) {
+      const local = options.local === true ? {} : options.local;
+      this.local = new LruCache({
+        maxEntries: local.maxEntries || 1000,
+        ttlSeconds: local.ttlSeconds || 60,
+      });
+    }
+  }
 
   async get<T>(key: string): Promise<T | null> {
-    const value = await this.redis.get(key);
-    if (!value) return null;
+    const value = await this.read(key);
+    return value === null ? null : unwrap<T>(value);
+  }
+
+  private async read(key: string): Promise<unknown> {
+    if (this.local) {
+      this.ensureSubscribed();
+      const cached = this.local.get(key);
+      if (cached !== undefined) {
+        this.stats.local.hits++;
+        return cached;
+      }
+      this.stats.local.misses++;
+    }
+
+    const value = await this.redis.getBuffer(key);
+    if (!value) {
+      this.stats.redis.misses++;
+      return null;
+    }
     try {
-      return JSON.parse(value) as T;
+      const parsed: unknown = this.codec.decode(value);
+      this.stats.redis.hits++;
+      this.local?.set(key, parsed);
+      return parsed;
     } catch {
+      this.stats.redis.misses++;
       return null;
     }
   }
@@ -22,37 +215,358 @@ export class CacheManager {
     value: T,
     options: CacheOptions = {}
   ): Promise<void> {
-    const ttl = options.ttl || 3600; // Default 1 hour
-    await this.redis.set(key, JSON.stringify(value), ttl);
+    await this.write(key, value, options);
+  }
+
+  // Returns false when `epoch` is given and a tag was invalidated after it
+  private async write<T>(key: string, value: T, options: CacheOptions, epoch?: string): Promise<boolean> {
+    const ttl = options.ttl || DEFAULT_TTL;
+
+    if (options.tags && options.tags.length > 0) {
+      const args = [this.encode(key, value), String(ttl)];
+      if (epoch !== undefined) args.push(epoch, INVALIDATED_PREFIX);
+      const written = await this.redis.eval(
+        SET_TAGGED_SCRIPT,
+        [key, ...options.tags.map((tag) => TAG_PREFIX + tag)],
+        args
+      );
+      if (Number(written) === 0) return false;
+    } else {
+      await this.redis.set(key, this.encode(key, value), ttl);
+    }
+
+    if (this.local) {
+      this.ensureSubscribed();
+      this.local.set(key, value, ttl);
+      await this.broadcast({ keys: [key] });
+    }
+    return true;
+  }
+
+  // Read many keys in one round trip. `loader` is called once with only the
+  // keys that missed, and what it returns is cached with `options`.
+  async getMany<T>(
+    keys: string[],
+    loader?: (missing: string[]) => Promise<Record<string, T> | Map<string, T>>,
+    options: CacheOptions = {}
+  ): Promise<Map<string, T>> {
+    const found = new Map<string, T>();
+    let remote = [...new Set(keys)];
+
+    if (this.local) {
+      this.ensureSubscribed();
+      remote = remote.filter((key) => {
+        const cached = this.local!.get(key);
+        if (cached === undefined) {
+          this.stats.local.misses++;
+          return true;
+        }
+        this.stats.local.hits++;
+        found.set(key, unwrap<T>(cached));
+        return false;
+      });
+    }
+
+    const values = await this.redis.mgetBuffers(remote);
+    const missing: string[] = [];
+    values.forEach((value, i) => {
+      const key = remote[i];
+      if (value) {
+        try {
+          const parsed: unknown = this.codec.decode(value);
+          this.stats.redis.hits++;
+          this.local?.set(key, parsed);
+          found.set(key, unwrap<T>(parsed));
+          return;
+        } catch {
+          // Unparseable values count as misses
+        }
+      }
+      this.stats.redis.misses++;
+      missing.push(key);
+    });
+
+    if (loader && missing.length > 0) {
+      this.stats.loader.loads++;
+      const loaded = await loader(missing);
+      const entries = loaded instanceof Map ? loaded : new Map(Object.entries(loaded));
+      await this.setMany(entries, options);
+      entries.forEach((value, key) => found.set(key, value));
+    }
+
+    return found;
+  }
+
+  // Write many entries in one pipelined round trip
+  async setMany<T>(entries: Record<string, T> | Map<string, T>, options: CacheOptions = {}): Promise<void> {
+    const values = entries instanceof Map ? entries : new Map(Object.entries(entries));
+    if (values.size === 0) return;
+
+    const ttl = options.ttl || DEFAULT_TTL;
+    const tagKeys = (options.tags || []).map((tag) => TAG_PREFIX + tag);
+    const pipeline = this.redis.pipeline();
+
+    values.forEach((value, key) => {
+      const encoded = this.encode(key, value);
+      if (tagKeys.length > 0) {
+        pipeline.eval(SET_TAGGED_SCRIPT, [key, ...tagKeys], [encoded, String(ttl)]);
+      } else {
+        pipeline.set(key, encoded, ttl);
+      }
+    });
+    await pipeline.exec();
+
+    if (this.local) {
+      this.ensureSubscribed();
+      values.forEach((value, key) => this.local!.set(key, value, ttl));
+      await this.broadcast({ keys: [...values.keys()] });
+    }
   }
 
   async delete(key: string): Promise<void> {
+    this.local?.delete(key);
     await this.redis.delete(key);
+    await this.broadcast({ keys: [key] });
   }
 
-  async deletePattern(pattern: string): Promise<void> {
-    // Note: This method requires access to Redis client
-    // For now, we'll skip pattern deletion as client is private
-    // In production, consider using Redis SCAN for pattern matching
+  // Delete every entry tagged with `tag`; cost is proportional to the tag size
+  async invalidateTag(tag: string): Promise<number> {
+    const keys = (await this.redis.eval(
+      INVALIDATE_TAG_SCRIPT,
+      [TAG_PREFIX + tag, EPOCH_KEY, INVALIDATED_PREFIX + TAG_PREFIX + tag],
+      [String(INVALIDATED_MARK_TTL)]
+    )) as string[];
+    if (this.local && keys.length > 0) {
+      keys.forEach((key) => this.local!.delete(key));
+      await this.broadcast({ keys });
+    }
+    return keys.length;
+  }
+
+  async invalidateTags(tags: string[]): Promise<number> {
+    const counts = await Promise.all(tags.map((tag) => this.invalidateTag(tag)));
+    return counts.reduce((total, count) => total + count, 0);
+  }
+
+  // Delete keys matching a glob pattern, e.g. `datasets:*`. Uses SCAN and
+  // UNLINK in batches so the server is never blocked; prefer tags for hot paths.
+  async deletePattern(pattern: string): Promise<number> {
+    let deleted = 0;
+    let batch: string[] = [];
+
+    for await (const key of this.redis.scanKeys(pattern, UNLINK_BATCH_SIZE)) {
+      batch.push(key);
+      if (batch.length >= UNLINK_BATCH_SIZE) {
+        deleted += await this.redis.unlink(...batch);
+        batch = [];
+      }
+    }
+    if (batch.length > 0) {
+      deleted += await this.redis.unlink(...batch);
+    }
+
+    this.local?.deleteMatching(pattern);
+    await this.broadcast({ pattern });
+
+    return deleted;
   }
 
   async clear(): Promise<void> {
+    this.local?.clear();
     await this.redis.flushdb();
+    await this.broadcast({ clear: true });
+  }
+
+  getStats(): CacheStats {
+    return {
+      local: { ...this.stats.local, enabled: this.local !== null, size: this.local?.size ?? 0 },
+      redis: { ...this.stats.redis },
+      loader: { ...this.stats.loader },
+      codec: { name: this.codec.name, prefixes: this.getPrefixStats() },
+    };
+  }
+
+  private encode(key: string, value: unknown): Buffer {
+    const encoded = this.codec.encode(value);
+
+    const prefix = key.split(':', 1)[0];
+    let sizes = this.prefixSizes.get(prefix);
+    if (!sizes) {
+      sizes = { writes: 0, storedBytes: 0, sampledStoredBytes: 0, sampledJsonBytes: 0 };
+      this.prefixSizes.set(prefix, sizes);
+    }
+    if (sizes.writes % JSON_SIZE_SAMPLE_EVERY === 0) {
+      sizes.sampledStoredBytes += encoded.length;
+      sizes.sampledJsonBytes +=
+        this.codec === jsonCodec ? encoded.length : Buffer.byteLength(JSON.stringify(value), 'utf8');
+    }
+    sizes.writes++;
+    sizes.storedBytes += encoded.length;
+
+    return encoded;
+  }
+
+  private getPrefixStats(): Record<string, CodecPrefixStats> {
+    const prefixes: Record<string, CodecPrefixStats> = {};
+    this.prefixSizes.forEach((sizes, prefix) => {
+      const ratio = sizes.sampledJsonBytes > 0 ? sizes.sampledStoredBytes / sizes.sampledJsonBytes : 1;
+      const jsonBytes = Math.round(sizes.storedBytes / ratio);
+      prefixes[prefix] = {
+        writes: sizes.writes,
+        storedBytes: sizes.storedBytes,
+        jsonBytes,
+        savedBytes: jsonBytes - sizes.storedBytes,
+        ratio: Math.round(ratio * 1000) / 1000,
+      };
+    });
+    return prefixes;
+  }
+
+  // Subscribe to other replicas' invalidations the first time the local tier is used
+  private ensureSubscribed(): void {
+    if (this.subscription) return;
+
+    this.subscription = this.redis
+      .subscribe(this.channel, (message) => this.onInvalidation(message))
+      .catch((error) => {
+        logger.error('Failed to subscribe to cache invalidations:', error);
+        this.subscription = null;
+      });
+  }
+
+  private onInvalidation(raw: string): void {
+    if (!this.local) return;
+
+    let message: InvalidationMessage;
+    try {
+      message = JSON.parse(raw);
+    } catch {
+      return;
+    }
+    if (message.origin === this.instanceId) return;
+
+    if (message.clear) {
+      this.local.clear();
+    } else if (message.pattern) {
+      this.local.deleteMatching(message.pattern);
+    } else {
+      message.keys?.forEach((key) => this.local!.delete(key));
+    }
+  }
+
+  private async broadcast(message: Omit<InvalidationMessage, 'origin'>): Promise<void> {
+    if (!this.local) return;
+
+    try {
+      await this.redis.publish(this.channel, JSON.stringify({ origin: this.instanceId, ...message }));
+    } catch (error) {
+      // Peers fall back to their local TTL; the Redis write itself succeeded
+      logger.error('Failed to publish cache invalidation:', error);
+    }
   }
 
+  // Read-through with stampede protection: concurrent misses in this process
+  // share one loader call, and a short Redis lock makes other processes wait
+  // for that result instead of querying the source themselves.
   async getOrSet<T>(
     key: string,
     loader: () => Promise<T>,
-    options: CacheOptions = {}
+    options: GetOrSetOptions = {}
   ): Promise<T> {
-    const cached = await this.get<T>(key);
+    const cached = await this.read(key);
     if (cached !== null) {
-      return cached;
+      if (isSoftEntry(cached) && cached.freshUntil <= Date.now()) {
+        this.stats.loader.staleServes++;
+        if (!this.inflight.has(key)) {
+          this.load(key, loader, options, false).catch((error) => {
+            this.stats.loader.refreshErrors++;
+            logger.error(`Failed to refresh cache entry ${key}:`, error);
+          });
+        }
+      }
+      return unwrap<T>(cached);
+    }
+
+    return this.load(key, loader, options, true);
+  }
+
+  private load<T>(
+    key: string,
+    loader: () => Promise<T>,
+    options: GetOrSetOptions,
+    waitForPeer: boolean
+  ): Promise<T> {
+    const inflight = this.inflight.get(key);
+    if (inflight) {
+      this.stats.loader.coalesced++;
+      return inflight as Promise<T>;
+    }
+
+    const promise = this.loadWithLock(key, loader, options, waitForPeer).finally(() => {
+      this.inflight.delete(key);
+    });
+    this.inflight.set(key, promise);
+    return promise;
+  }
+
+  private async loadWithLock<T>(
+    key: string,
+    loader: () => Promise<T>,
+    options: GetOrSetOptions,
+    waitForPeer: boolean
+  ): Promise<T> {
+    const lockKey = LOCK_PREFIX + key;
+    const token = randomUUID();
+    const locked = await this.redis.setNx(lockKey, token, options.lockTtlMs || DEFAULT_LOCK_TTL_MS);
+
+    if (!locked) {
+      if (!waitForPeer) {
+        // Another process is already refreshing; keep serving the stale value
+        const current = await this.read(key);
+        if (current !== null) return unwrap<T>(current);
+      } else {
+        const deadline = Date.now() + (options.lockWaitMs || DEFAULT_LOCK_WAIT_MS);
+        while (Date.now() < deadline) {
+          await sleep(LOCK_POLL_MS);
+          const current = await this.read(key);
+          if (current !== null) {
+            this.stats.loader.lockWaits++;
+            return unwrap<T>(current);
+          }
+        }
+      }
+      // The lock holder is slow or gone; load without the lock rather than fail
     }
 
-    const fresh = await loader();
-    await this.set(key, fresh, options);
-    return fresh;
+    try {
+      this.stats.loader.loads++;
+      const epoch = (await this.redis.get(EPOCH_KEY)) || '0';
+      const fresh = await loader();
+
+      // Absence is not cached; a later create must be visible immediately
+      if (fresh === null || fresh === undefined) {
+        return fresh;
+      }
+
+      if (options.tagsFor) {
+        options = { ...options, tags: [...(options.tags || []), ...options.tagsFor(fresh)] };
+      }
+
+      const entry: SoftEntry<T> | T = options.softTtl
+        ? { __softTtl: true, value: fresh, freshUntil: Date.now() + options.softTtl * 1000 }
+        : fresh;
+      if (!(await this.write(key, entry, options, epoch))) {
+        this.stats.loader.discarded++;
+      }
+
+      return fresh;
+    } finally {
+      if (locked) {
+        await this.redis.eval(RELEASE_LOCK_SCRIPT, [lockKey], [token]).catch((error) => {
+          logger.warn(`Failed to release cache lock ${lockKey}:`, error);
+        });
+      }
+    }
   }
 }
 
@@ -68,7 +582,18 @@ export const CacheKeys = {
   policy: (id: string) => `policy:${id}`,
   contract: (id: string) => `contract:${id}`,
   credential: (id: string) => `credential:${id}`,
+  credentialByClientId: (clientId: string) => `credential:client:${clientId}`,
+  apiKey: (id: string) => `apikey:${id}`,
+  // Raw API keys are secrets, so only their hash appears in the key name
+  apiKeyByKey: (key: string) => `apikey:key:${createHash('sha256').update(key).digest('hex')}`,
   token: (token: string) => `token:${token}`,
   session: (sessionId: string) => `session:${sessionId}`,
   rateLimit: (clientId: string) => `ratelimit:${clientId}`,
 };
+
+// Cache tag builders, e.g. tags: [CacheTags.entity('participant', id), CacheTags.type('participant')]
+export const CacheTags = {
+  entity: (type: string, id: string) => `${type}:${id}`,
+  type: (type: string) => type,
+  participantDatasets: (participantId: string) => `participant-datasets:${participantId}`,
+};
@@ -1,4 +1,4 @@
-import { createClient, RedisClientType } from 'redis';
+import { createClient, commandOptions, RedisClientType } from 'redis';
 import pino from 'pino';
 
 const logger = pino({ level: process.env.LOG_LEVEL || 'info' });
@@ -12,8 +12,81 @@ interface RedisConfig {
   retryStrategy?: (retries: number) => number;
 }
 
+type RedisMulti = ReturnType<RedisClientType['multi']>;
+
+/**
+ * Command batch sent in one round trip. As a pipeline the commands run
+ * independently; as a multi they run atomically inside MULTI/EXEC.
+ */
+class RedisPipeline {
+  private queued = 0;
+
+  constructor(
+    private commands: RedisMulti,
+    private transactional: boolean
+  ) {}
+
+  get length(): number {
+    return this.queued;
+  }
+
+  get(key: string): this {
+    return this.add(['GET', key]);
+  }
+
+  set(key: string, value: string | Buffer, expirationSeconds?: number): this {
+    return this.add(expirationSeconds ? ['SET', key, value, 'EX', String(expirationSeconds)] : ['SET', key, value]);
+  }
+
+  del(...keys: string[]): this {
+    return this.add(['DEL', ...keys]);
+  }
+
+  expire(key: string, seconds: number): this {
+    return this.add(['EXPIRE', key, String(seconds)]);
+  }
+
+  incr(key: string): this {
+    return this.add(['INCR', key]);
+  }
+
+  sadd(key: string, ...members: string[]): this {
+    return this.add(['SADD', key, ...members]);
+  }
+
+  hset(key: string, field: string, value: string): this {
+    return this.add(['HSET', key, field, value]);
+  }
+
+  eval(script: string, keys: string[], args: (string | Buffer)[] = []): this {
+    return this.add(['EVAL', script, String(keys.length), ...keys, ...args]);
+  }
+
+  /**
+   * Queue any command by its raw arguments, e.g. ['ZADD', key, '1', member]
+   */
+  add(args: (string | Buffer)[]): this {
+    this.commands.addCommand(args);
+    this.queued++;
+    return this;
+  }
+
+  /**
+   * Send every queued command
+   * @returns One reply per command, in order
+   */
+  async exec(): Promise<unknown[]> {
+    if (this.queued === 0) return [];
+    const replies = this.transactional
+      ? await this.commands.exec()
+      : await this.commands.execAsPipeline();
+    return replies as unknown[];
+  }
+}
+
 class RedisClient {
   private client: RedisClientType | null = null;
+  private subscriber: RedisClientType | null = null;
   private config: RedisConfig;
 
   constructor(config: RedisConfig) {
@@ -55,6 +128,10 @@ class RedisClient {
   }
 
   async disconnect(): Promise<void> {
+    if (this.subscriber) {
+      await this.subscriber.disconnect();
+      this.subscriber = null;
+    }
     if (this.client) {
       await this.client.disconnect();
       logger.info('Redis disconnected');
@@ -66,9 +143,17 @@ class RedisClient {
     return this.client.get(key);
   }
 
+  /**
+   * Read a binary value, e.g. one written by a cache codec
+   */
+  async getBuffer(key: string): Promise<Buffer | null> {
+    if (!this.client) throw new Error('Redis client not connected');
+    return this.client.get(commandOptions({ returnBuffers: true }), key);
+  }
+
   async set(
     key: string,
-    value: string,
+    value: string | Buffer,
     expirationSeconds?: number
   ): Promise<void> {
     if (!this.client) throw new Error('Redis client not connected');
@@ -80,6 +165,63 @@ class RedisClient {
     }
   }
 
+  /**
+   * Set a key only if it does not exist, with a millisecond expiry (SET NX PX)
+   * @returns true when the key was set
+   */
+  async setNx(key: string, value: string, expirationMs: number): Promise<boolean> {
+    if (!this.client) throw new Error('Redis client not connected');
+    const result = await this.client.set(key, value, { NX: true, PX: expirationMs });
+    return result === 'OK';
+  }
+
+  async mget(keys: string[]): Promise<(string | null)[]> {
+    if (!this.client) throw new Error('Redis client not connected');
+    if (keys.length === 0) return [];
+    return this.client.mGet(keys);
+  }
+
+  async mgetBuffers(keys: string[]): Promise<(Buffer | null)[]> {
+    if (!this.client) throw new Error('Redis client not connected');
+    if (keys.length === 0) return [];
+    return this.client.mGet(commandOptions({ returnBuffers: true }), keys);
+  }
+
+  /**
+   * Set many keys in one round trip. MSET has no expiry option, so with a TTL
+   * the writes are sent as one pipeline of SET EX commands.
+   */
+  async mset(entries: Record<string, string>, expirationSeconds?: number): Promise<void> {
+    if (!this.client) throw new Error('Redis client not connected');
+    const keys = Object.keys(entries);
+    if (keys.length === 0) return;
+
+    if (!expirationSeconds) {
+      await this.client.mSet(entries);
+      return;
+    }
+
+    const pipeline = this.pipeline();
+    keys.forEach((key) => pipeline.set(key, entries[key], expirationSeconds));
+    await pipeline.exec();
+  }
+
+  /**
+   * Start a batch of commands sent in one round trip, not atomically
+   */
+  pipeline(): RedisPipeline {
+    if (!this.client) throw new Error('Redis client not connected');
+    return new RedisPipeline(this.client.multi(), false);
+  }
+
+  /**
+   * Start a MULTI/EXEC transaction
+   */
+  multi(): RedisPipeline {
+    if (!this.client) throw new Error('Redis client not connected');
+    return new RedisPipeline(this.client.multi(), true);
+  }
+
   async getJSON<T>(key: string): Promise<T | null> {
     const value = await this.get(key);
     return value ? JSON.parse(value) : null;
@@ -93,11 +235,44 @@ class RedisClient {
     await this.set(key, JSON.stringify(value), expirationSeconds);
   }
 
+  async getManyJSON<T>(keys: string[]): Promise<(T | null)[]> {
+    const values = await this.mget(keys);
+    return values.map((value) => (value ? (JSON.parse(value) as T) : null));
+  }
+
+  async setManyJSON<T>(entries: Record<string, T>, expirationSeconds?: number): Promise<void> {
+    const serialized: Record<string, string> = {};
+    Object.entries(entries).forEach(([key, value]) => {
+      serialized[key] = JSON.stringify(value);
+    });
+    await this.mset(serialized, expirationSeconds);
+  }
+
   async delete(key: string): Promise<number> {
     if (!this.client) throw new Error('Redis client not connected');
     return this.client.del(key);
   }
 
+  /**
+   * Delete keys without blocking the server; memory is reclaimed in the background
+   */
+  async unlink(...keys: string[]): Promise<number> {
+    if (!this.client) throw new Error('Redis client not connected');
+    if (keys.length === 0) return 0;
+    return this.client.unlink(keys);
+  }
+
+  /**
+   * Iterate keys matching a glob pattern with SCAN, which never blocks the
+   * server the way KEYS does. Keys may be yielded more than once.
+   */
+  async *scanKeys(pattern: string, count: number = 500): AsyncGenerator<string> {
+    if (!this.client) throw new Error('Redis client not connected');
+    for await (const key of this.client.scanIterator({ MATCH: pattern, COUNT: count })) {
+      yield key;
+    }
+  }
+
   async exists(key: string): Promise<boolean> {
     if (!this.client) throw new Error('Redis client not connected');
     return (await this.client.exists(key)) > 0;
@@ -200,6 +375,36 @@ class RedisClient {
     return this.client.sRem(key, member);
   }
 
+  /**
+   * Run a Lua script atomically on the server
+   */
+  async eval(script: string, keys: string[], args: (string | Buffer)[] = []): Promise<unknown> {
+    if (!this.client) throw new Error('Redis client not connected');
+    return this.client.eval(script, { keys, arguments: args });
+  }
+
+  async publish(channel: string, message: string): Promise<number> {
+    if (!this.client) throw new Error('Redis client not connected');
+    return this.client.publish(channel, message);
+  }
+
+  /**
+   * Listen on a pub/sub channel. A connection in subscriber mode cannot run
+   * other commands, so subscriptions share one dedicated duplicate connection.
+   */
+  async subscribe(channel: string, listener: (message: string) => void): Promise<void> {
+    if (!this.client) throw new Error('Redis client not connected');
+
+    if (!this.subscriber) {
+      this.subscriber = this.client.duplicate();
+      this.subscriber.on('error', (err) => logger.error('Redis subscriber error:', err));
+      await this.subscriber.connect();
+    }
+
+    await this.subscriber.subscribe(channel, listener);
+    logger.info(`Redis subscribed to ${channel}`);
+  }
+
   async flushdb(): Promise<void> {
     if (!this.client) throw new Error('Redis client not connected');
     await this.client.flushDb();
@@ -212,4 +417,4 @@ class RedisClient {
   }
 }
 
-export { RedisClient, RedisConfig };
+export { RedisClient, RedisConfig, RedisPipeline };
@@ -0,0 +1,112 @@
+import * as zlib from 'zlib';
+import { encode as packMsgpack, decode as unpackMsgpack } from '@msgpack/msgpack';
+
+// Cache values are stored as a one-byte format header followed by the payload.
+// The header bytes are control characters that can never start JSON text, so
+// values written before codecs existed (plain JSON, no header) still decode.
+export const CodecFormat = {
+  MSGPACK: 0x01,
+  MSGPACK_GZIP: 0x02,
+  MSGPACK_ZSTD: 0x03,
+} as const;
+
+export type CacheCompression = 'none' | 'gzip' | 'zstd';
+
+export interface CacheCodec {
+  name: string;
+  encode(value: unknown): Buffer;
+  decode(data: Buffer): unknown;
+}
+
+export interface MessagePackCodecOptions {
+  compression?: CacheCompression; // Default 'gzip'
+  compressAbove?: number; // Payloads smaller than this many bytes stay uncompressed, default 1024
+}
+
+// zstd ships with newer Node releases only; fall back to gzip when it is missing
+const zstd = zlib as typeof zlib & {
+  zstdCompressSync?: (data: Uint8Array) => Buffer;
+  zstdDecompressSync?: (data: Uint8Array) => Buffer;
+};
+
+export const isZstdAvailable = (): boolean =>
+  typeof zstd.zstdCompressSync === 'function' && typeof zstd.zstdDecompressSync === 'function';
+
+const DEFAULT_COMPRESS_ABOVE = 1024;
+
+const withHeader = (format: number, payload: Uint8Array): Buffer => {
+  const data = Buffer.allocUnsafe(payload.length + 1);
+  data[0] = format;
+  data.set(payload, 1);
+  return data;
+};
+
+// Decode a value written by any codec, or plain JSON from before codecs existed
+export const decodeCacheValue = (data: Buffer): unknown => {
+  if (data.length === 0) {
+    throw new Error('Empty cache value');
+  }
+
+  switch (data[0]) {
+    case CodecFormat.MSGPACK:
+      return unpackMsgpack(data.subarray(1));
+    case CodecFormat.MSGPACK_GZIP:
+      return unpackMsgpack(zlib.gunzipSync(data.subarray(1)));
+    case CodecFormat.MSGPACK_ZSTD:
+      if (!zstd.zstdDecompressSync) {
+        throw new Error('Cache value is zstd-compressed but zstd is not available in this Node.js runtime');
+      }
+      return unpackMsgpack(zstd.zstdDecompressSync(data.subarray(1)));
+    default:
+      return JSON.parse(data.toString('utf8'));
+  }
+};
+
+// The original format: JSON text with no header
+export const jsonCodec: CacheCodec = {
+  name: 'json',
+  encode: (value) => Buffer.from(JSON.stringify(value), 'utf8'),
+  decode: decodeCacheValue,
+};
+
+// MessagePack, compressed once the packed payload reaches `compressAbove` bytes.
+// Unlike JSON, Dates round-trip as Dates and binary values as Uint8Arrays.
+export const createMessagePackCodec = (options: MessagePackCodecOptions = {}): CacheCodec => {
+  let compression = options.compression || 'gzip';
+  if (compression === 'zstd' && !isZstdAvailable()) {
+    compression = 'gzip';
+  }
+  const compressAbove = options.compressAbove ?? DEFAULT_COMPRESS_ABOVE;
+
+  return {
+    name: compression === 'none' ? 'msgpack' : `msgpack+${compression}`,
+    encode: (value) => {
+      const packed = packMsgpack(value, { ignoreUndefined: true });
+
+      if (compression === 'none' || packed.length < compressAbove) {
+        return withHeader(CodecFormat.MSGPACK, packed);
+      }
+
+      const compressed =
+        compression === 'zstd' ? zstd.zstdCompressSync!(packed) : zlib.gzipSync(packed);
+
+      // Small or high-entropy payloads can grow when compressed
+      return compressed.length < packed.length
+        ? withHeader(compression === 'zstd' ? CodecFormat.MSGPACK_ZSTD : CodecFormat.MSGPACK_GZIP, compressed)
+        : withHeader(CodecFormat.MSGPACK, packed);
+    },
+    decode: decodeCacheValue,
+  };
+};
+
+// Build a codec by name, e.g. from CACHE_CODEC
+export const createCodec = (name: string = 'json', options: MessagePackCodecOptions = {}): CacheCodec => {
+  switch (name) {
+    case 'json':
+      return jsonCodec;
+    case 'msgpack':
+      return createMessagePackCodec(options);
+    default:
+      throw new Error(`Unknown cache codec: ${name}`);
+  }
+};
@@ -1,2 +1,33 @@
-export { RedisClient, type RedisConfig } from './client';
-export { CacheManager, CacheKeys, type CacheOptions } from './cache';
+export { RedisClient, RedisPipeline, type RedisConfig } from './client';
+export {
+  CacheManager,
+  CacheKeys,
+  CacheTags,
+  type CacheOptions,
+  type GetOrSetOptions,
+  type LoaderStats,
+  type CacheManagerOptions,
+  type LocalCacheOptions,
+  type CacheStats,
+  type CacheTierStats,
+  type CodecPrefixStats,
+} from './cache';
+export {
+  CodecFormat,
+  jsonCodec,
+  createMessagePackCodec,
+  createCodec,
+  decodeCacheValue,
+  isZstdAvailable,
+  type CacheCodec,
+  type CacheCompression,
+  type MessagePackCodecOptions,
+} from './codec';
+export { LruCache, type LruOptions } from './lru';
+export {
+  withReadThroughCache,
+  createCacheFromEnv,
+  type ReadThroughConfig,
+  type InvalidationScope,
+  type CacheEnvConfig,
+} from './read-through';
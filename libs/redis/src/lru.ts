@@ -0,0 +1,96 @@
+// Bounded in-process LRU with per-entry expiry. A Map keeps insertion order,
+// so re-inserting on read moves an entry to the most-recently-used end and
+// the first key is always the eviction candidate.
+
+interface LruEntry<T> {
+  value: T;
+  expiresAt: number;
+}
+
+export interface LruOptions {
+  maxEntries: number;
+  ttlSeconds: number;
+}
+
+export class LruCache<T = unknown> {
+  private entries = new Map<string, LruEntry<T>>();
+
+  constructor(private options: LruOptions) {}
+
+  get size(): number {
+    return this.entries.size;
+  }
+
+  get(key: string): T | undefined {
+    const entry = this.entries.get(key);
+    if (!entry) return undefined;
+
+    if (entry.expiresAt <= Date.now()) {
+      this.entries.delete(key);
+      return undefined;
+    }
+
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+    return entry.value;
+  }
+
+  // ttlSeconds caps the tier's own TTL, e.g. with the entry's Redis TTL
+  set(key: string, value: T, ttlSeconds?: number): void {
+    const ttl = Math.min(ttlSeconds ?? this.options.ttlSeconds, this.options.ttlSeconds);
+
+    this.entries.delete(key);
+    this.entries.set(key, { value, expiresAt: Date.now() + ttl * 1000 });
+
+    while (this.entries.size > this.options.maxEntries) {
+      const oldest = this.entries.keys().next().value as string;
+      this.entries.delete(oldest);
+    }
+  }
+
+  delete(key: string): boolean {
+    return this.entries.delete(key);
+  }
+
+  // Drop every key matching a Redis glob pattern (*, ? and [...] classes)
+  deleteMatching(pattern: string): number {
+    const regex = globToRegExp(pattern);
+    let deleted = 0;
+    for (const key of this.entries.keys()) {
+      if (regex.test(key)) {
+        this.entries.delete(key);
+        deleted++;
+      }
+    }
+    return deleted;
+  }
+
+  clear(): void {
+    this.entries.clear();
+  }
+}
+
+const globToRegExp = (pattern: string): RegExp => {
+  let source = '';
+  for (let i = 0; i < pattern.length; i++) {
+    const char = pattern[i];
+    if (char === '\\' && i + 1 < pattern.length) {
+      source += pattern[++i].replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
+    } else if (char === '*') {
+      source += '.*';
+    } else if (char === '?') {
+      source += '.';
+    } else if (char === '[') {
+      const end = pattern.indexOf(']', i + 1);
+      if (end === -1) {
+        source += '\\[';
+      } else {
+        source += `[${pattern.slice(i + 1, end)}]`;
+        i = end;
+      }
+    } else {
+      source += char.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
+    }
+  }
+  return new RegExp(`^${source}$`);
+};
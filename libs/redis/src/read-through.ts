@@ -0,0 +1,141 @@
+import pino from 'pino';
+import { CacheManager, CacheTags } from './cache';
+import { RedisClient } from './client';
+import { CacheCompression, createCodec } from './codec';
+
+const logger = pino({ level: process.env.LOG_LEVEL || 'info' });
+
+// How a mutating method invalidates cached lookups once it succeeds:
+// 'id' drops the entity whose id is the first argument, 'all' drops every
+// cached entity of this type (for bulk changes such as revokeByParticipantId).
+export type InvalidationScope = 'id' | 'all';
+
+export interface ReadThroughConfig {
+  cache: CacheManager;
+  entity: string; // Entity type used for tags, e.g. 'participant'
+  ttl?: number; // Seconds, default 300
+  lookups: Record<string, (...args: any[]) => string>; // Method -> cache key for its arguments
+  invalidateOn?: Record<string, InvalidationScope>; // Default { update: 'id', delete: 'id' }
+  // Defers invalidation until the surrounding transaction commits, e.g.
+  // afterCommit from @dataspace/db. Without it invalidation runs as soon as the
+  // method returns, which inside a transaction is before the change is visible.
+  afterCommit?: (callback: () => Promise<void>) => Promise<void>;
+}
+
+export interface CacheEnvConfig {
+  cache: CacheManager;
+  ttl: number;
+}
+
+const DEFAULT_READ_THROUGH_TTL = 300;
+
+// Wrap a repository so the configured lookup methods are served from the
+// cache and mutations invalidate them. Entries are tagged with the entity's id
+// (taken from the loaded value) and type, so a lookup by any key - id, client
+// id, API key - is invalidated by an update to that entity. Other methods pass
+// through untouched. Cache errors fall back to the repository.
+export const withReadThroughCache = <R extends object>(repository: R, config: ReadThroughConfig): R => {
+  const ttl = config.ttl || DEFAULT_READ_THROUGH_TTL;
+  const invalidateOn: Record<string, InvalidationScope> = config.invalidateOn || { update: 'id', delete: 'id' };
+
+  return new Proxy(repository, {
+    get(target, property, receiver) {
+      const value = Reflect.get(target, property, receiver);
+      if (typeof property !== 'string' || typeof value !== 'function') {
+        return value;
+      }
+
+      const method = value as (...args: any[]) => Promise<any>;
+      const keyFor = config.lookups[property];
+      const scope = invalidateOn[property];
+
+      if (keyFor) {
+        return async (...args: any[]) => {
+          let loadError: unknown;
+          const load = async () => {
+            try {
+              return await method.apply(target, args);
+            } catch (error) {
+              loadError = error;
+              throw error;
+            }
+          };
+
+          try {
+            return await config.cache.getOrSet(keyFor(...args), load, {
+              ttl,
+              tags: [CacheTags.type(config.entity)],
+              tagsFor: (entity) => (entity && entity.id ? [CacheTags.entity(config.entity, entity.id)] : []),
+            });
+          } catch (error) {
+            if (error === loadError) throw error;
+            logger.warn(`Read-through cache unavailable for ${config.entity}.${property}:`, error);
+            return method.apply(target, args);
+          }
+        };
+      }
+
+      if (scope) {
+        return async (...args: any[]) => {
+          const result = await method.apply(target, args);
+          const tag = scope === 'all' ? CacheTags.type(config.entity) : CacheTags.entity(config.entity, String(args[0]));
+          const invalidate = async () => {
+            try {
+              await config.cache.invalidateTag(tag);
+            } catch (error) {
+              logger.error(`Failed to invalidate cached ${config.entity} (${tag}):`, error);
+            }
+          };
+          await (config.afterCommit ? config.afterCommit(invalidate) : invalidate());
+          return result;
+        };
+      }
+
+      return method.bind(target);
+    },
+  });
+};
+
+// Build the read-through cache for a service from its environment, or null
+// when caching is off. Variables: CACHE_ENABLED (true to opt in),
+// REDIS_HOST, REDIS_PORT, REDIS_PASSWORD, CACHE_TTL_SECONDS (default 300),
+// CACHE_LOCAL_MAX_ENTRIES (0 disables the in-process tier, default 0),
+// CACHE_LOCAL_TTL_SECONDS (default 30), CACHE_CODEC (json or msgpack, default
+// json), CACHE_COMPRESSION (none, gzip or zstd, default gzip) and
+// CACHE_COMPRESS_ABOVE_BYTES (default 1024). Values written with any codec stay
+// readable, so the codec can be switched without flushing Redis.
+export const createCacheFromEnv = async (
+  env: NodeJS.ProcessEnv = process.env
+): Promise<CacheEnvConfig | null> => {
+  if (env.CACHE_ENABLED !== 'true') {
+    return null;
+  }
+
+  const redis = new RedisClient({
+    host: env.REDIS_HOST || 'localhost',
+    port: parseInt(env.REDIS_PORT || '6379'),
+    password: env.REDIS_PASSWORD || undefined,
+  });
+
+  try {
+    await redis.connect();
+  } catch (error) {
+    logger.error('Cache disabled, Redis unavailable:', error);
+    return null;
+  }
+
+  const localMaxEntries = parseInt(env.CACHE_LOCAL_MAX_ENTRIES || '0');
+  const codec = createCodec(env.CACHE_CODEC || 'json', {
+    compression: (env.CACHE_COMPRESSION || 'gzip') as CacheCompression,
+    compressAbove: parseInt(env.CACHE_COMPRESS_ABOVE_BYTES || '1024'),
+  });
+  const cache = new CacheManager(redis, {
+    codec,
+    local:
+      localMaxEntries > 0
+        ? { maxEntries: localMaxEntries, ttlSeconds: parseInt(env.CACHE_LOCAL_TTL_SECONDS || '30') }
+        : false,
+  });
+
+  return { cache, ttl: parseInt(env.CACHE_TTL_SECONDS || String(DEFAULT_READ_THROUGH_TTL)) };
+};
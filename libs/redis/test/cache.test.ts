@@ -0,0 +1,161 @@
+import { describe, it, expect } from 'vitest';
+import { CacheManager } from '../src/cache';
+import { createMessagePackCodec } from '../src/codec';
+import { FakeRedis } from './fake-redis';
+
+const dataset = { id: 'd-1', name: 'Weather observations', participantId: 'p-1' };
+
+/**
+ * A loader that counts its calls and resolves only when the test releases it
+ */
+const gatedLoader = <T>(value: T) => {
+  let release!: () => void;
+  const gate = new Promise<void>((resolve) => (release = resolve));
+  const loader = async () => {
+    loader.calls++;
+    await gate;
+    return value;
+  };
+  loader.calls = 0;
+  return { loader, release };
+};
+
+const tick = () => new Promise((resolve) => setTimeout(resolve, 0));
+
+describe('CacheManager', () => {
+  describe('getOrSet', () => {
+    it('loads a missing value once and caches it', async () => {
+      const redis = new FakeRedis();
+      const cache = new CacheManager(redis.asClient());
+      let calls = 0;
+      const loader = async () => {
+        calls++;
+        return dataset;
+      };
+
+      expect(await cache.getOrSet('dataset:d-1', loader)).toEqual(dataset);
+      expect(await cache.getOrSet('dataset:d-1', loader)).toEqual(dataset);
+
+      expect(calls).toBe(1);
+      expect(cache.getStats().loader).toMatchObject({ loads: 1, coalesced: 0 });
+      expect(redis.values.has('lock:dataset:d-1')).toBe(false);
+    });
+
+    it('coalesces concurrent misses onto one loader call', async () => {
+      const cache = new CacheManager(new FakeRedis().asClient());
+      const { loader, release } = gatedLoader(dataset);
+
+      const first = cache.getOrSet('dataset:d-1', loader);
+      const second = cache.getOrSet('dataset:d-1', loader);
+      const third = cache.getOrSet('dataset:d-1', loader);
+      await tick();
+      release();
+
+      expect(await Promise.all([first, second, third])).toEqual([dataset, dataset, dataset]);
+      expect(loader.calls).toBe(1);
+      expect(cache.getStats().loader).toMatchObject({ loads: 1, coalesced: 2 });
+    });
+
+    it('does not cache null', async () => {
+      const redis = new FakeRedis();
+      const cache = new CacheManager(redis.asClient());
+
+      expect(await cache.getOrSet('dataset:missing', async () => null)).toBeNull();
+      expect(redis.values.has('dataset:missing')).toBe(false);
+    });
+
+    it('discards a load that raced an invalidation of its tag', async () => {
+      const redis = new FakeRedis();
+      const cache = new CacheManager(redis.asClient());
+      const { loader, release } = gatedLoader({ ...dataset, name: 'Old name' });
+
+      const loading = cache.getOrSet('dataset:d-1', loader, { tags: ['dataset:d-1'] });
+      await tick();
+      // The row changes while the loader still holds the old version
+      await cache.invalidateTag('dataset:d-1');
+      release();
+
+      expect(await loading).toMatchObject({ name: 'Old name' });
+      expect(redis.values.has('dataset:d-1')).toBe(false);
+      expect(cache.getStats().loader.discarded).toBe(1);
+
+      const fresh = await cache.getOrSet('dataset:d-1', async () => dataset, { tags: ['dataset:d-1'] });
+      expect(fresh).toEqual(dataset);
+      expect(redis.values.has('dataset:d-1')).toBe(true);
+    });
+
+    it('keeps a load whose tags were invalidated before it started', async () => {
+      const redis = new FakeRedis();
+      const cache = new CacheManager(redis.asClient());
+      await cache.invalidateTag('dataset:d-1');
+
+      await cache.getOrSet('dataset:d-1', async () => dataset, { tags: ['dataset:d-1'] });
+
+      expect(redis.values.has('dataset:d-1')).toBe(true);
+      expect(cache.getStats().loader.discarded).toBe(0);
+    });
+
+    it('only discards loads tagged with the invalidated tag', async () => {
+      const redis = new FakeRedis();
+      const cache = new CacheManager(redis.asClient());
+      const { loader, release } = gatedLoader(dataset);
+
+      const loading = cache.getOrSet('dataset:d-1', loader, { tags: ['dataset:d-1'] });
+      await tick();
+      await cache.invalidateTag('dataset:d-2');
+      release();
+      await loading;
+
+      expect(redis.values.has('dataset:d-1')).toBe(true);
+    });
+  });
+
+  describe('invalidateTag', () => {
+    it('deletes every entry registered under the tag', async () => {
+      const redis = new FakeRedis();
+      const cache = new CacheManager(redis.asClient());
+      await cache.set('dataset:d-1', dataset, { tags: ['participant-datasets:p-1'] });
+      await cache.set('dataset:d-2', dataset, { tags: ['participant-datasets:p-1'] });
+      await cache.set('dataset:d-3', dataset, { tags: ['participant-datasets:p-2'] });
+
+      expect(await cache.invalidateTag('participant-datasets:p-1')).toBe(2);
+
+      expect(await cache.get('dataset:d-1')).toBeNull();
+      expect(await cache.get('dataset:d-2')).toBeNull();
+      expect(await cache.get('dataset:d-3')).toEqual(dataset);
+    });
+
+    it('drops invalidated entries from the local tier', async () => {
+      const redis = new FakeRedis();
+      const cache = new CacheManager(redis.asClient(), { local: true });
+      await cache.set('dataset:d-1', dataset, { tags: ['dataset:d-1'] });
+      expect(await cache.get('dataset:d-1')).toEqual(dataset);
+
+      await cache.invalidateTag('dataset:d-1');
+
+      expect(await cache.get('dataset:d-1')).toBeNull();
+      expect(redis.published[redis.published.length - 1].message).toContain('"keys":["dataset:d-1"]');
+    });
+  });
+
+  describe('codec', () => {
+    it('reads values stored as JSON after switching to MessagePack', async () => {
+      const redis = new FakeRedis();
+      await new CacheManager(redis.asClient()).set('dataset:d-1', dataset);
+
+      const cache = new CacheManager(redis.asClient(), { codec: createMessagePackCodec() });
+
+      expect(await cache.get('dataset:d-1')).toEqual(dataset);
+      expect(cache.getStats().redis.hits).toBe(1);
+    });
+
+    it('counts an unreadable value as a miss', async () => {
+      const redis = new FakeRedis();
+      redis.values.set('dataset:d-1', 'not json');
+      const cache = new CacheManager(redis.asClient());
+
+      expect(await cache.get('dataset:d-1')).toBeNull();
+      expect(cache.getStats().redis.misses).toBe(1);
+    });
+  });
+});
@@ -0,0 +1,102 @@
+import { describe, it, expect } from 'vitest';
+import { CodecFormat, createCodec, createMessagePackCodec, decodeCacheValue, jsonCodec } from '../src/codec';
+
+const record = {
+  id: '6f1c2b9e-2d3a-4c5b-8e7f-9a0b1c2d3e4f',
+  name: 'Weather observations',
+  tags: ['climate', 'open'],
+  size: 1024,
+  published: true,
+  owner: null,
+};
+
+// Repetitive enough to shrink well under compression
+const large = Array.from({ length: 200 }, (_, i) => ({ ...record, size: i }));
+
+describe('cache codecs', () => {
+  describe('jsonCodec', () => {
+    it('round-trips a value as plain JSON', () => {
+      const encoded = jsonCodec.encode(record);
+
+      expect(encoded.toString('utf8')).toBe(JSON.stringify(record));
+      expect(jsonCodec.decode(encoded)).toEqual(record);
+    });
+  });
+
+  describe('MessagePack', () => {
+    it('round-trips a value uncompressed below the threshold', () => {
+      const codec = createMessagePackCodec();
+      const encoded = codec.encode(record);
+
+      expect(encoded[0]).toBe(CodecFormat.MSGPACK);
+      expect(codec.decode(encoded)).toEqual(record);
+    });
+
+    it('compresses values at or above the threshold', () => {
+      const codec = createMessagePackCodec({ compression: 'gzip' });
+      const encoded = codec.encode(large);
+
+      expect(encoded[0]).toBe(CodecFormat.MSGPACK_GZIP);
+      expect(encoded.length).toBeLessThan(createMessagePackCodec({ compression: 'none' }).encode(large).length);
+      expect(codec.decode(encoded)).toEqual(large);
+    });
+
+    it('keeps a payload uncompressed when compression does not shrink it', () => {
+      const codec = createMessagePackCodec({ compressAbove: 0 });
+
+      expect(codec.encode('x')[0]).toBe(CodecFormat.MSGPACK);
+    });
+
+    it('round-trips Dates and binary values', () => {
+      const codec = createMessagePackCodec();
+      const value = { at: new Date('2026-06-01T12:00:00.000Z'), bytes: new Uint8Array([1, 2, 3]) };
+
+      const decoded = codec.decode(codec.encode(value)) as typeof value;
+
+      expect(decoded.at).toBeInstanceOf(Date);
+      expect(decoded.at.getTime()).toBe(value.at.getTime());
+      expect([...decoded.bytes]).toEqual([1, 2, 3]);
+    });
+
+    it('drops undefined properties', () => {
+      const codec = createMessagePackCodec();
+
+      expect(codec.decode(codec.encode({ id: 1, missing: undefined }))).toEqual({ id: 1 });
+    });
+
+    it('names itself after its compression', () => {
+      expect(createMessagePackCodec({ compression: 'none' }).name).toBe('msgpack');
+      expect(createMessagePackCodec({ compression: 'gzip' }).name).toBe('msgpack+gzip');
+    });
+  });
+
+  describe('decodeCacheValue', () => {
+    it('decodes values written as JSON before codecs existed', () => {
+      const legacy = Buffer.from(JSON.stringify(record), 'utf8');
+
+      expect(createMessagePackCodec().decode(legacy)).toEqual(record);
+      expect(decodeCacheValue(Buffer.from('"plain string"'))).toBe('plain string');
+      expect(decodeCacheValue(Buffer.from('[1,2]'))).toEqual([1, 2]);
+    });
+
+    it('decodes values from every codec whatever the configured one', () => {
+      const stored = [jsonCodec, createMessagePackCodec({ compression: 'none' }), createMessagePackCodec()].map(
+        (codec) => codec.encode(large)
+      );
+
+      stored.forEach((data) => expect(jsonCodec.decode(data)).toEqual(large));
+    });
+
+    it('rejects an empty value', () => {
+      expect(() => decodeCacheValue(Buffer.alloc(0))).toThrow('Empty cache value');
+    });
+  });
+
+  describe('createCodec', () => {
+    it('builds codecs by name', () => {
+      expect(createCodec()).toBe(jsonCodec);
+      expect(createCodec('msgpack', { compression: 'none' }).name).toBe('msgpack');
+      expect(() => createCodec('avro')).toThrow('Unknown cache codec: avro');
+    });
+  });
+});
@@ -0,0 +1,110 @@
+import type { RedisClient } from '../src/client';
+
+/**
+ * In-memory stand-in for the RedisClient calls CacheManager makes. The Lua
+ * scripts are recognised by the commands they contain and applied in JS with
+ * the same effect, so the tagging, epoch and lock logic runs unchanged.
+ */
+export class FakeRedis {
+  values = new Map<string, Buffer | string>();
+  sets = new Map<string, Set<string>>();
+  published: { channel: string; message: string }[] = [];
+
+  async get(key: string): Promise<string | null> {
+    const value = this.values.get(key);
+    return value === undefined ? null : value.toString();
+  }
+
+  async getBuffer(key: string): Promise<Buffer | null> {
+    const value = this.values.get(key);
+    return value === undefined ? null : Buffer.from(value);
+  }
+
+  async mgetBuffers(keys: string[]): Promise<(Buffer | null)[]> {
+    return Promise.all(keys.map((key) => this.getBuffer(key)));
+  }
+
+  async set(key: string, value: string | Buffer): Promise<void> {
+    this.values.set(key, value);
+  }
+
+  async setNx(key: string, value: string): Promise<boolean> {
+    if (this.values.has(key)) return false;
+    this.values.set(key, value);
+    return true;
+  }
+
+  async delete(key: string): Promise<number> {
+    return this.values.delete(key) ? 1 : 0;
+  }
+
+  async publish(channel: string, message: string): Promise<void> {
+    this.published.push({ channel, message });
+  }
+
+  async subscribe(): Promise<void> {}
+
+  async eval(script: string, keys: string[], args: (string | Buffer)[] = []): Promise<unknown> {
+    if (script.includes("'SADD'")) return this.setTagged(keys, args);
+    if (script.includes("'INCR'")) return this.invalidateTag(keys);
+    if (script.includes("'DEL'")) {
+      if (this.values.get(keys[0])?.toString() !== args[0]) return 0;
+      this.values.delete(keys[0]);
+      return 1;
+    }
+    throw new Error(`Unexpected script: ${script}`);
+  }
+
+  pipeline() {
+    const commands: (() => Promise<unknown>)[] = [];
+    const pipeline = {
+      set: (key: string, value: string | Buffer) => {
+        commands.push(() => this.set(key, value));
+        return pipeline;
+      },
+      eval: (script: string, keys: string[], args: (string | Buffer)[] = []) => {
+        commands.push(() => this.eval(script, keys, args));
+        return pipeline;
+      },
+      exec: async () => {
+        const results = [];
+        for (const command of commands) results.push(await command());
+        return results;
+      },
+    };
+    return pipeline;
+  }
+
+  asClient(): RedisClient {
+    return this as unknown as RedisClient;
+  }
+
+  // SET_TAGGED_SCRIPT: KEYS = [key, ...tagKeys], ARGV = [value, ttl, epoch?, invalidatedPrefix?]
+  private setTagged([key, ...tagKeys]: string[], [value, , epoch, prefix]: (string | Buffer)[]): number {
+    if (epoch !== undefined) {
+      for (const tagKey of tagKeys) {
+        const invalidated = this.values.get(`${prefix}${tagKey}`);
+        if (invalidated !== undefined && Number(invalidated) > Number(epoch)) return 0;
+      }
+    }
+    this.values.set(key, value);
+    for (const tagKey of tagKeys) {
+      const members = this.sets.get(tagKey) ?? new Set<string>();
+      members.add(key);
+      this.sets.set(tagKey, members);
+    }
+    return 1;
+  }
+
+  // INVALIDATE_TAG_SCRIPT: KEYS = [tagKey, epochKey, invalidatedKey]
+  private invalidateTag([tagKey, epochKey, invalidatedKey]: string[]): string[] {
+    const epoch = Number(this.values.get(epochKey) ?? 0) + 1;
+    this.values.set(epochKey, String(epoch));
+    this.values.set(invalidatedKey, String(epoch));
+
+    const keys = [...(this.sets.get(tagKey) ?? [])];
+    keys.forEach((key) => this.values.delete(key));
+    this.sets.delete(tagKey);
+    return keys;
+  }
+}
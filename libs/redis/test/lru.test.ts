@@ -0,0 +1,122 @@
+import { describe, it, expect, afterEach, vi } from 'vitest';
+import { LruCache } from '../src/lru';
+
+const T0 = new Date('2026-06-01T12:00:00.000Z').getTime();
+
+let clock: ReturnType<typeof vi.spyOn> | null = null;
+
+// Pin Date.now() at T0 + offsetMs
+const at = (offsetMs: number) => {
+  clock?.mockRestore();
+  clock = vi.spyOn(Date, 'now').mockImplementation(() => T0 + offsetMs);
+};
+
+afterEach(() => {
+  clock?.mockRestore();
+  clock = null;
+});
+
+const filled = (keys: string[], options = { maxEntries: 100, ttlSeconds: 60 }) => {
+  const cache = new LruCache<number>(options);
+  keys.forEach((key, i) => cache.set(key, i));
+  return cache;
+};
+
+describe('LruCache', () => {
+  describe('eviction', () => {
+    it('evicts the least recently set entry past maxEntries', () => {
+      const cache = filled(['a', 'b', 'c', 'd'], { maxEntries: 3, ttlSeconds: 60 });
+
+      expect(cache.size).toBe(3);
+      expect(cache.get('a')).toBeUndefined();
+      expect(cache.get('d')).toBe(3);
+    });
+
+    it('counts a read as a use', () => {
+      const cache = filled(['a', 'b', 'c'], { maxEntries: 3, ttlSeconds: 60 });
+
+      cache.get('a');
+      cache.set('d', 3);
+
+      expect(cache.get('a')).toBe(0);
+      expect(cache.get('b')).toBeUndefined();
+    });
+
+    it('moves an overwritten key to the recent end', () => {
+      const cache = filled(['a', 'b', 'c'], { maxEntries: 3, ttlSeconds: 60 });
+
+      cache.set('a', 10);
+      cache.set('d', 3);
+
+      expect(cache.get('a')).toBe(10);
+      expect(cache.get('b')).toBeUndefined();
+      expect(cache.size).toBe(3);
+    });
+  });
+
+  describe('expiry', () => {
+    it('expires entries after the tier TTL', () => {
+      at(0);
+      const cache = filled(['a']);
+
+      at(59 * 1000);
+      expect(cache.get('a')).toBe(0);
+
+      at(60 * 1000);
+      expect(cache.get('a')).toBeUndefined();
+      expect(cache.size).toBe(0);
+    });
+
+    it('caps the tier TTL with a shorter entry TTL', () => {
+      at(0);
+      const cache = new LruCache<string>({ maxEntries: 10, ttlSeconds: 60 });
+      cache.set('short', 'value', 5);
+      cache.set('long', 'value', 3600);
+
+      at(5 * 1000);
+      expect(cache.get('short')).toBeUndefined();
+      expect(cache.get('long')).toBe('value');
+
+      at(60 * 1000);
+      expect(cache.get('long')).toBeUndefined();
+    });
+  });
+
+  describe('deleteMatching', () => {
+    const keys = [
+      'dataset:1',
+      'dataset:12',
+      'dataset:a',
+      'datasets:p-1',
+      'participant:1',
+      'schema:v1.0',
+      'schema:v1x0',
+      'tag*:1',
+    ];
+
+    it.each([
+      ['dataset:*', ['dataset:1', 'dataset:12', 'dataset:a']],
+      ['dataset:?', ['dataset:1', 'dataset:a']],
+      ['dataset:[0-9]*', ['dataset:1', 'dataset:12']],
+      ['dataset:[^0-9]', ['dataset:a']],
+      ['*:1', ['dataset:1', 'participant:1', 'tag*:1']],
+      ['schema:v1.0', ['schema:v1.0']],
+      ['tag\\*:1', ['tag*:1']],
+      ['participant:1', ['participant:1']],
+    ])('matches %s as a Redis glob', (pattern, expected) => {
+      const cache = filled(keys);
+
+      const deleted = cache.deleteMatching(pattern);
+
+      expect(deleted).toBe(expected.length);
+      expect(keys.filter((key) => cache.get(key) === undefined)).toEqual(expected);
+    });
+
+    it('treats an unclosed [ as a literal', () => {
+      const cache = filled(['a[b', 'ab']);
+
+      expect(cache.deleteMatching('a[b')).toBe(1);
+      expect(cache.get('ab')).toBe(1);
+    });
+  });
+});
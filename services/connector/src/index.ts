@@ -2,6 +2,7 @@ import Fastify from 'fastify';
 import helmet from '@fastify/helmet';
 import cors from '@fastify/cors';
 import multipart from '@fastify/multipart';
+import { createJwtVerifierFromEnv, createRevocationListFromEnv, jwtAuth } from '@dataspace/auth';
 
 const app = Fastify({
   logger: true,
@@ -12,6 +13,17 @@ await app.register(helmet);
 await app.register(cors);
 await app.register(multipart);
 
+// Bearer tokens are verified locally against the IdP's published keys
+// Revoked token ids are replicated from Redis into memory, so checking one
+// costs a Map lookup rather than a round trip per request
+const revocations = await createRevocationListFromEnv();
+const verifier = createJwtVerifierFromEnv(revocations);
+await app.register(jwtAuth, {
+  verifier,
+  required: process.env.AUTH_REQUIRED === 'true',
+  publicPaths: ['/connector/health'],
+});
+
 // Health check endpoint
 app.get('/connector/health', async (request, reply) => {
   return { status: 'healthy', service: 'connector' };
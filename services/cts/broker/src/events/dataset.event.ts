@@ -1,27 +1,30 @@
 /**
  * Dataset Event Handler
- * Emits events when dataset actions occur
+ * Records dataset events in the transactional outbox, published to Kafka by the OutboxRelay
  */
 
+import { afterCommit, appendToOutbox } from '@dataspace/db';
+import { createDomainEvent, EventTopics, EventType, toOutboxEntry, type DomainEvent } from '@dataspace/kafka';
 import { Dataset } from '../types/dataset';
+import { SearchIndexer } from './search-indexer';
 
 export class DatasetEventHandler {
+  constructor(private readonly searchIndexer?: SearchIndexer) {}
+
   /**
    * Emitted when a dataset is created
    */
   async onDatasetCreated(dataset: Dataset) {
     console.log(`[Event] Dataset created: ${dataset.id} (${dataset.name})`);
-    // TODO: Emit to event bus/message queue
-    // eventBus.emit('dataset.created', { dataset });
+    await this.emit(EventType.DATASET_CREATED, dataset);
   }
 
   /**
    * Emitted when a dataset is updated
    */
-  async onDatasetUpdated(oldDataset: Dataset, newDataset: Dataset) {
-    console.log(`[Event] Dataset updated: ${newDataset.id} (${newDataset.name})`);
-    // TODO: Emit to event bus/message queue
-    // eventBus.emit('dataset.updated', { oldDataset, newDataset });
+  async onDatasetUpdated(dataset: Dataset) {
+    console.log(`[Event] Dataset updated: ${dataset.id} (${dataset.name})`);
+    await this.emit(EventType.DATASET_UPDATED, dataset);
   }
 
   /**
@@ -29,8 +32,7 @@ export class DatasetEventHandler {
    */
   async onDatasetDeleted(dataset: Dataset) {
     console.log(`[Event] Dataset deleted: ${dataset.id} (${dataset.name})`);
-    // TODO: Emit to event bus/message queue
-    // eventBus.emit('dataset.deleted', { dataset });
+    await this.emit(EventType.DATASET_DELETED, dataset);
   }
 
   /**
@@ -44,8 +46,7 @@ export class DatasetEventHandler {
     console.log(
       `[Event] Dataset status changed: ${dataset.id} from ${oldStatus} to ${newStatus}`
     );
-    // TODO: Emit to event bus/message queue
-    // eventBus.emit('dataset.status.changed', { dataset, oldStatus, newStatus });
+    await this.emit(EventType.DATASET_UPDATED, dataset);
   }
 
   /**
@@ -53,7 +54,40 @@ export class DatasetEventHandler {
    */
   async onDatasetPublished(dataset: Dataset) {
     console.log(`[Event] Dataset published: ${dataset.id} (${dataset.name})`);
-    // TODO: Emit to event bus/message queue
-    // eventBus.emit('dataset.published', { dataset });
+    await this.emit(EventType.DATASET_PUBLISHED, dataset);
+  }
+
+  /**
+   * Record the event with the change. Call inside the withTransaction() that
+   * writes it, so the event commits or rolls back with the change.
+   */
+  private async emit(eventType: EventType, dataset: Dataset) {
+    const event = createDomainEvent(eventType, 'dataset', dataset.id, {
+      datasetId: dataset.id,
+      participantId: dataset.participantId,
+      name: dataset.name,
+      description: dataset.description,
+      schemaRef: dataset.schemaRef,
+      status: dataset.status,
+    });
+
+    await appendToOutbox(toOutboxEntry(EventTopics.DATASETS, event));
+    await afterCommit(() => this.index(event));
+  }
+
+  /**
+   * Apply the change to the search index once it is committed. The index is a
+   * projection, so a failure is logged rather than failing the request.
+   */
+  private async index(event: DomainEvent) {
+    if (!this.searchIndexer) {
+      return;
+    }
+
+    try {
+      await this.searchIndexer.apply(event);
+    } catch (error) {
+      console.error('Error indexing dataset:', error);
+    }
   }
 }
@@ -4,3 +4,4 @@
 
 export { ParticipantEventHandler } from './participant.event';
 export { DatasetEventHandler } from './dataset.event';
+export { SearchIndexer, SEARCH_INDEX_TOPICS } from './search-indexer';
@@ -1,18 +1,22 @@
 /**
  * Participant Event Handler
- * Emits events when participant actions occur
+ * Records participant events in the transactional outbox, published to Kafka by the OutboxRelay
  */
 
+import { afterCommit, appendToOutbox } from '@dataspace/db';
+import { createDomainEvent, EventTopics, EventType, toOutboxEntry, type DomainEvent } from '@dataspace/kafka';
 import { Participant } from '../types/participant';
+import { SearchIndexer } from './search-indexer';
 
 export class ParticipantEventHandler {
+  constructor(private readonly searchIndexer?: SearchIndexer) {}
+
   /**
    * Emitted when a participant is created
    */
   async onParticipantCreated(participant: Participant) {
     console.log(`[Event] Participant created: ${participant.id} (${participant.name})`);
-    // TODO: Emit to event bus/message queue
-    // eventBus.emit('participant.created', { participant });
+    await this.emit(EventType.PARTICIPANT_CREATED, participant);
   }
 
   /**
@@ -20,8 +24,7 @@ export class ParticipantEventHandler {
    */
   async onParticipantUpdated(oldParticipant: Participant, newParticipant: Participant) {
     console.log(`[Event] Participant updated: ${newParticipant.id} (${newParticipant.name})`);
-    // TODO: Emit to event bus/message queue
-    // eventBus.emit('participant.updated', { oldParticipant, newParticipant });
+    await this.emit(EventType.PARTICIPANT_UPDATED, newParticipant);
   }
 
   /**
@@ -29,8 +32,7 @@ export class ParticipantEventHandler {
    */
   async onParticipantDeleted(participant: Participant) {
     console.log(`[Event] Participant deleted: ${participant.id} (${participant.name})`);
-    // TODO: Emit to event bus/message queue
-    // eventBus.emit('participant.deleted', { participant });
+    await this.emit(EventType.PARTICIPANT_DELETED, participant);
   }
 
   /**
@@ -44,7 +46,39 @@ export class ParticipantEventHandler {
     console.log(
       `[Event] Participant status changed: ${participant.id} from ${oldStatus} to ${newStatus}`
     );
-    // TODO: Emit to event bus/message queue
-    // eventBus.emit('participant.status.changed', { participant, oldStatus, newStatus });
+    await this.emit(EventType.PARTICIPANT_UPDATED, participant);
+  }
+
+  /**
+   * Record the event with the change. Call inside the withTransaction() that
+   * writes it, so the event commits or rolls back with the change.
+   */
+  private async emit(eventType: EventType, participant: Participant) {
+    const event = createDomainEvent(eventType, 'participant', participant.id, {
+      participantId: participant.id,
+      did: participant.did,
+      name: participant.name,
+      description: participant.description,
+      status: participant.status,
+    });
+
+    await appendToOutbox(toOutboxEntry(EventTopics.PARTICIPANTS, event));
+    await afterCommit(() => this.index(event));
+  }
+
+  /**
+   * Apply the change to the search index once it is committed. The index is a
+   * projection, so a failure is logged rather than failing the request.
+   */
+  private async index(event: DomainEvent) {
+    if (!this.searchIndexer) {
+      return;
+    }
+
+    try {
+      await this.searchIndexer.apply(event);
+    } catch (error) {
+      console.error('Error indexing participant:', error);
+    }
   }
 }
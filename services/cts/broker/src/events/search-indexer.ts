@@ -0,0 +1,126 @@
+/**
+ * Search Indexer
+ * Projects domain events from every service onto the unified search_documents index
+ */
+
+import { EventTopics, EventType, type DomainEvent, type KafkaClient } from '@dataspace/kafka';
+import SearchRepository from '../repositories/search-repository';
+import { SearchDocumentType } from '../types/search';
+
+const CONSUMER_GROUP = 'broker-search-indexer';
+
+/**
+ * Topics of aggregates owned by other services. The broker indexes its own
+ * participants and datasets in-process (see ParticipantEventHandler / DatasetEventHandler).
+ */
+export const SEARCH_INDEX_TOPICS = [
+  EventTopics.SCHEMAS,
+  EventTopics.VOCABULARIES,
+  EventTopics.POLICIES,
+  EventTopics.CONTRACTS,
+  EventTopics.APPS,
+];
+
+interface EventProjection {
+  type: SearchDocumentType;
+  action: 'upsert' | 'remove';
+  /** Status implied by the event itself, e.g. contract.accepted -> accepted, when the payload has none */
+  status?: string;
+}
+
+const PROJECTIONS: Partial<Record<EventType, EventProjection>> = {
+  [EventType.PARTICIPANT_CREATED]: { type: 'participant', action: 'upsert' },
+  [EventType.PARTICIPANT_UPDATED]: { type: 'participant', action: 'upsert' },
+  [EventType.PARTICIPANT_DELETED]: { type: 'participant', action: 'remove' },
+  [EventType.DATASET_CREATED]: { type: 'dataset', action: 'upsert' },
+  [EventType.DATASET_UPDATED]: { type: 'dataset', action: 'upsert' },
+  [EventType.DATASET_PUBLISHED]: { type: 'dataset', action: 'upsert', status: 'published' },
+  [EventType.DATASET_DELETED]: { type: 'dataset', action: 'remove' },
+  [EventType.SCHEMA_CREATED]: { type: 'schema', action: 'upsert' },
+  [EventType.SCHEMA_UPDATED]: { type: 'schema', action: 'upsert' },
+  [EventType.SCHEMA_DELETED]: { type: 'schema', action: 'remove' },
+  [EventType.VOCABULARY_CREATED]: { type: 'vocabulary', action: 'upsert' },
+  [EventType.VOCABULARY_UPDATED]: { type: 'vocabulary', action: 'upsert' },
+  [EventType.VOCABULARY_DELETED]: { type: 'vocabulary', action: 'remove' },
+  [EventType.POLICY_CREATED]: { type: 'policy', action: 'upsert' },
+  [EventType.POLICY_UPDATED]: { type: 'policy', action: 'upsert' },
+  [EventType.POLICY_ACTIVATED]: { type: 'policy', action: 'upsert', status: 'active' },
+  [EventType.POLICY_REVOKED]: { type: 'policy', action: 'upsert', status: 'revoked' },
+  [EventType.POLICY_DELETED]: { type: 'policy', action: 'remove' },
+  [EventType.CONTRACT_PROPOSED]: { type: 'contract', action: 'upsert', status: 'proposed' },
+  [EventType.CONTRACT_ACCEPTED]: { type: 'contract', action: 'upsert', status: 'accepted' },
+  [EventType.CONTRACT_REJECTED]: { type: 'contract', action: 'upsert', status: 'rejected' },
+  [EventType.CONTRACT_TERMINATED]: { type: 'contract', action: 'upsert', status: 'terminated' },
+  [EventType.CONTRACT_UPDATED]: { type: 'contract', action: 'upsert' },
+  [EventType.CONTRACT_DELETED]: { type: 'contract', action: 'remove' },
+  [EventType.APP_PUBLISHED]: { type: 'app', action: 'upsert', status: 'published' },
+  [EventType.APP_UPDATED]: { type: 'app', action: 'upsert' },
+  [EventType.APP_REMOVED]: { type: 'app', action: 'remove' },
+};
+
+/**
+ * Event payload fields copied into the document metadata, per type
+ */
+const METADATA_FIELDS: Record<SearchDocumentType, string[]> = {
+  participant: ['did', 'sector'],
+  dataset: ['participantId', 'category', 'schema', 'schemaRef'],
+  schema: ['version', 'format'],
+  vocabulary: ['namespace'],
+  policy: [],
+  contract: ['proposer', 'respondent'],
+  app: ['version', 'appType'],
+};
+
+export class SearchIndexer {
+  constructor(private readonly repository: SearchRepository) {}
+
+  /**
+   * Apply one domain event to the index. Events the index does not track are ignored.
+   */
+  async apply(event: DomainEvent) {
+    const projection = PROJECTIONS[event.eventType];
+    if (!projection) {
+      return;
+    }
+
+    const data = event.data || {};
+    const id = String(data[`${projection.type}Id`] ?? data.id ?? event.aggregateId);
+    const at = new Date(event.timestamp);
+
+    if (projection.action === 'remove') {
+      await this.repository.remove(projection.type, id, at);
+      return;
+    }
+
+    const metadata: Record<string, unknown> = {};
+    for (const field of METADATA_FIELDS[projection.type]) {
+      if (data[field] !== undefined) {
+        metadata[field] = data[field];
+      }
+    }
+
+    await this.repository.upsert(
+      {
+        type: projection.type,
+        id,
+        title: (data.name ?? data.title) as string,
+        body: data.description as string | undefined,
+        status: (data.status as string | undefined) ?? projection.status,
+        metadata,
+      },
+      at
+    );
+  }
+
+  /**
+   * Consume other services' domain events from Kafka and keep the index up to date
+   */
+  async start(kafka: KafkaClient) {
+    await kafka.subscribeToTopic(SEARCH_INDEX_TOPICS, CONSUMER_GROUP, async (message) => {
+      if (message.value) {
+        await this.apply(message.value as DomainEvent);
+      }
+    });
+    console.log(`[Search] Indexing events from ${SEARCH_INDEX_TOPICS.join(', ')}`);
+  }
+}
@@ -0,0 +1,212 @@
+/**
+ * Streaming record parsers for bulk import bodies
+ *
+ * Request bodies are consumed chunk by chunk and yielded one record at a
+ * time, so the payload is never buffered in full.
+ */
+
+import { createInterface } from 'node:readline';
+import type { Readable } from 'node:stream';
+import { ImportFormat, ImportRecord, ImportReject, ImportResult } from '../types/import';
+
+/**
+ * Content types accepted by the import endpoints
+ */
+export const IMPORT_CONTENT_TYPES = ['application/x-ndjson', 'application/ndjson', 'text/csv'];
+
+/**
+ * Rejects listed in the response; further rejects are only counted
+ */
+const MAX_REPORTED_REJECTS = 1000;
+
+/**
+ * Resolve the import format from an explicit ?format= value or the content type
+ * @returns Import format, or null when unsupported
+ */
+export function resolveImportFormat(contentType?: string, format?: string): ImportFormat | null {
+  if (format) {
+    return format === 'ndjson' || format === 'csv' ? format : null;
+  }
+
+  const mediaType = (contentType || '').split(';')[0].trim().toLowerCase();
+  if (mediaType === 'text/csv') return 'csv';
+  if (mediaType === 'application/x-ndjson' || mediaType === 'application/ndjson') return 'ndjson';
+  return null;
+}
+
+/**
+ * A byte order mark some editors write before the first line
+ */
+const BOM = '\uFEFF';
+
+/**
+ * Parse newline-delimited JSON, one object per line (blank lines are skipped)
+ */
+export async function* parseNdjson(stream: Readable): AsyncGenerator<ImportRecord> {
+  const lines = createInterface({ input: stream, crlfDelay: Infinity });
+  let row = 0;
+  let first = true;
+
+  for await (let line of lines) {
+    if (first) {
+      first = false;
+      if (line.startsWith(BOM)) line = line.slice(1);
+    }
+    if (line.trim().length === 0) continue;
+    row++;
+
+    try {
+      const data = JSON.parse(line);
+      if (typeof data !== 'object' || data === null || Array.isArray(data)) {
+        yield { row, error: 'Invalid input: expected object' };
+      } else {
+        yield { row, data };
+      }
+    } catch {
+      yield { row, error: 'Invalid JSON' };
+    }
+  }
+}
+
+/**
+ * Split an RFC 4180 CSV stream into field arrays (quoted fields may span lines)
+ */
+async function* parseCsvFields(stream: Readable): AsyncGenerator<string[]> {
+  let fields: string[] = [];
+  let field = '';
+  let inQuotes = false;
+  let quoteSeen = false;
+  let first = true;
+
+  stream.setEncoding('utf8');
+
+  for await (const chunk of stream) {
+    for (const char of chunk as string) {
+      if (first) {
+        first = false;
+        if (char === BOM) continue;
+      }
+
+      if (inQuotes) {
+        if (quoteSeen) {
+          quoteSeen = false;
+          if (char === '"') {
+            // "" inside a quoted field is a literal quote
+            field += char;
+            continue;
+          }
+          inQuotes = false;
+        } else if (char === '"') {
+          quoteSeen = true;
+          continue;
+        } else {
+          field += char;
+          continue;
+        }
+      }
+
+      if (char === '"' && field.length === 0) {
+        inQuotes = true;
+      } else if (char === ',') {
+        fields.push(field);
+        field = '';
+      } else if (char === '\n') {
+        fields.push(field);
+        yield fields;
+        fields = [];
+        field = '';
+      } else if (char !== '\r') {
+        field += char;
+      }
+    }
+  }
+
+  if (field.length > 0 || fields.length > 0) {
+    fields.push(field);
+    yield fields;
+  }
+}
+
+/**
+ * Parse CSV with a header row; empty cells are treated as absent
+ */
+export async function* parseCsv(stream: Readable): AsyncGenerator<ImportRecord> {
+  let header: string[] | null = null;
+  let row = 0;
+
+  for await (const fields of parseCsvFields(stream)) {
+    if (fields.length === 1 && fields[0] === '') continue;
+
+    if (!header) {
+      header = fields.map((name) => name.trim());
+      continue;
+    }
+
+    row++;
+    if (fields.length !== header.length) {
+      yield { row, error: `Invalid row: expected ${header.length} fields, got ${fields.length}` };
+      continue;
+    }
+
+    const data: Record<string, unknown> = {};
+    header.forEach((name, i) => {
+      if (fields[i] !== '') data[name] = fields[i];
+    });
+    yield { row, data };
+  }
+}
+
+/**
+ * Parse an import body in the given format
+ */
+export function parseImportRecords(stream: Readable, format: ImportFormat): AsyncGenerator<ImportRecord> {
+  return format === 'csv' ? parseCsv(stream) : parseNdjson(stream);
+}
+
+/**
+ * Collects rejected rows, keeping only the first MAX_REPORTED_REJECTS in memory
+ */
+export class ImportRejects {
+  private count = 0;
+  private readonly reported: ImportReject[] = [];
+
+  add(row: number, error: string): void {
+    this.count++;
+    if (this.reported.length < MAX_REPORTED_REJECTS) {
+      this.reported.push({ row, error });
+    }
+  }
+
+  toResult(imported: number): ImportResult {
+    return {
+      imported,
+      rejected: this.count,
+      rejects: [...this.reported].sort((a, b) => a.row - b.row),
+    };
+  }
+}
+
+/**
+ * Validate parsed records lazily, recording failures as rejects
+ * @param records Parsed records
+ * @param validate Row validator that throws on invalid input
+ * @param rejects Reject collector
+ */
+export async function* validateRecords<T>(
+  records: AsyncIterable<ImportRecord>,
+  validate: (data: unknown) => Promise<T>,
+  rejects: ImportRejects
+): AsyncGenerator<{ row: number; data: T }> {
+  for await (const record of records) {
+    if (record.error) {
+      rejects.add(record.row, record.error);
+      continue;
+    }
+
+    try {
+      yield { row: record.row, data: await validate(record.data) };
+    } catch (error: any) {
+      rejects.add(record.row, error.message);
+    }
+  }
+}
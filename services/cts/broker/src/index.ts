@@ -1,11 +1,18 @@
 import Fastify from 'fastify';
 import helmet from '@fastify/helmet';
 import cors from '@fastify/cors';
-import { initializePool } from '@dataspace/db';
+import { createJwtVerifierFromEnv, createRevocationListFromEnv, jwtAuth } from '@dataspace/auth';
+import { initializePool, getStatementStats, getOutboxBacklog, outboxStore, afterCommit } from '@dataspace/db';
+import { KafkaClient, OutboxRelay, outboxRelayOptionsFromEnv } from '@dataspace/kafka';
+import { CacheKeys, createCacheFromEnv, withReadThroughCache } from '@dataspace/redis';
 import ParticipantRepository from './repositories/participant-repository';
 import DatasetRepository from './repositories/dataset-repository';
+import SearchRepository from './repositories/search-repository';
+import { ParticipantEventHandler, DatasetEventHandler, SearchIndexer } from './events';
 import { registerParticipantRoutes } from './routes/participants';
 import { registerDatasetRoutes } from './routes/datasets';
+import { registerSearchRoutes } from './routes/search';
+import { IMPORT_CONTENT_TYPES } from './import/record-stream';
 
 const app = Fastify({
   logger: true,
@@ -20,6 +27,18 @@ await app.register(cors, {
   exposedHeaders: ['Content-Range', 'X-Content-Range'],
 });
 
+// Bearer tokens are verified locally against the IdP's published keys
+// Revoked token ids are replicated from Redis into memory, so checking one
+// costs a Map lookup rather than a round trip per request
+const revocations = await createRevocationListFromEnv();
+const verifier = createJwtVerifierFromEnv(revocations);
+await app.register(jwtAuth, { verifier, required: process.env.AUTH_REQUIRED === 'true' });
+
+// Bulk import bodies are passed to the route as a raw stream instead of being buffered
+app.addContentTypeParser(IMPORT_CONTENT_TYPES, (request, payload, done) => {
+  done(null, payload);
+});
+
 // Initialize database pool
 const dbConfig = {
   host: process.env.DB_HOST || 'localhost',
@@ -45,19 +64,93 @@ try {
   process.exit(1);
 }
 
+// Optional read-through cache for detail lookups (CACHE_ENABLED=true)
+const cacheConfig = await createCacheFromEnv();
+
 // Initialize repositories
-const participantRepository = new ParticipantRepository();
-const datasetRepository = new DatasetRepository();
+let participantRepository = new ParticipantRepository();
+let datasetRepository = new DatasetRepository();
+
+if (cacheConfig) {
+  participantRepository = withReadThroughCache(participantRepository, {
+    cache: cacheConfig.cache,
+    entity: 'participant',
+    ttl: cacheConfig.ttl,
+    afterCommit,
+    lookups: { findById: CacheKeys.participant },
+  });
+  datasetRepository = withReadThroughCache(datasetRepository, {
+    cache: cacheConfig.cache,
+    entity: 'dataset',
+    ttl: cacheConfig.ttl,
+    afterCommit,
+    lookups: { findById: CacheKeys.dataset },
+  });
+  console.log('Read-through cache enabled for participants and datasets');
+}
+const searchRepository = new SearchRepository();
+
+// Broker-owned aggregates are indexed in-process as they change
+const searchIndexer = new SearchIndexer(searchRepository);
 
 // Register routes
-await registerParticipantRoutes(app, participantRepository);
-await registerDatasetRoutes(app, datasetRepository);
+await registerParticipantRoutes(app, participantRepository, new ParticipantEventHandler(searchIndexer));
+await registerDatasetRoutes(app, datasetRepository, new DatasetEventHandler(searchIndexer));
+await registerSearchRoutes(app, participantRepository, datasetRepository, searchRepository);
+
+// With Kafka configured, the outbox is relayed to it and other services'
+// aggregates are indexed from their domain events. Without it, events wait
+// in the outbox until a relay runs.
+let kafka: KafkaClient | null = null;
+let outboxRelay: OutboxRelay | null = null;
+if (process.env.KAFKA_BROKERS) {
+  kafka = new KafkaClient({
+    brokers: process.env.KAFKA_BROKERS.split(','),
+    clientId: process.env.KAFKA_CLIENT_ID || 'cts-broker',
+  });
+
+  outboxRelay = new OutboxRelay(kafka, outboxStore, outboxRelayOptionsFromEnv());
+  outboxRelay.start();
+
+  searchIndexer.start(kafka).catch((error) => {
+    console.error('Failed to start search indexer:', error);
+  });
+}
 
 // Health check endpoint
 app.get('/health', async (request, reply) => {
   return { status: 'healthy', service: 'cts-broker' };
 });
 
+// Prepared statement metrics (calls, latency percentiles, rows, pool wait)
+app.get('/metrics/db', async (request, reply) => {
+  return { statements: getStatementStats() };
+});
+
+// Cache hit/miss metrics per tier
+app.get('/metrics/cache', async (request, reply) => {
+  return { enabled: cacheConfig !== null, stats: cacheConfig?.cache.getStats() ?? null };
+});
+
+// Access token verification counters
+app.get('/metrics/auth', async (request, reply) => {
+  return { verifier: verifier.getStats(), revocations: revocations.getStats() };
+});
+
+// Outbox relay progress and unpublished backlog
+app.get('/metrics/outbox', async (request, reply) => {
+  return { relay: outboxRelay?.getStats() ?? null, backlog: await getOutboxBacklog() };
+});
+
+// Kafka producer throughput and per-group consumer throughput and lag
+app.get('/metrics/kafka', async (request, reply) => {
+  return {
+    enabled: kafka !== null,
+    producer: kafka?.getProducerStats() ?? null,
+    consumers: kafka?.getConsumerStats() ?? {},
+  };
+});
+
 // Start server
 const start = async () => {
   try {
@@ -65,17 +158,28 @@ const start = async () => {
     console.log('Broker Service running on http://localhost:3001');
     console.log('Available endpoints:');
     console.log('  GET    /health');
+    console.log('  GET    /metrics/db');
+    console.log('  GET    /metrics/cache');
+    console.log('  GET    /metrics/auth');
+    console.log('  GET    /metrics/outbox');
+    console.log('  GET    /metrics/kafka');
     console.log('  GET    /participants');
+    console.log('  GET    /participants/export');
     console.log('  GET    /participants/:id');
     console.log('  POST   /participants');
+    console.log('  POST   /participants/import');
     console.log('  PUT    /participants/:id');
     console.log('  DELETE /participants/:id');
     console.log('  GET    /datasets');
+    console.log('  GET    /datasets/export');
     console.log('  GET    /datasets/:id');
     console.log('  GET    /participants/:participantId/datasets');
     console.log('  POST   /datasets');
+    console.log('  POST   /datasets/import');
     console.log('  PUT    /datasets/:id');
     console.log('  DELETE /datasets/:id');
+    console.log('  GET    /search');
+    console.log('  GET    /suggest');
   } catch (err) {
     app.log.error(err);
     process.exit(1);
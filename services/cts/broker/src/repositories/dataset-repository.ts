@@ -3,43 +3,112 @@
  * Handles all dataset data persistence operations
  */
 
-import { query } from '@dataspace/db';
+import type { Readable } from 'node:stream';
+import {
+  query,
+  queryPage,
+  buildKeysetQuery,
+  toKeysetPage,
+  searchPredicate,
+  buildSuggestQuery,
+  escapeLike,
+  bulkInsert,
+  copyFrom,
+  withTransaction,
+  appendToOutboxFrom,
+  defineStatement,
+  execute,
+  CrudRepository,
+  type CountStrategy,
+  type SearchMode,
+  type ExportFormat,
+  type CountedPage,
+  type KeysetPage,
+  type TableDescriptor,
+} from '@dataspace/db';
+import { EventTopics, EventType } from '@dataspace/kafka';
 import { Dataset, CreateDatasetRequest, UpdateDatasetRequest } from '../types/dataset';
+import { ImportReject, ImportRow } from '../types/import';
+import { SearchSuggestion } from '../types/search';
+import { indexDocumentsFrom } from './search-repository';
+
+const DATASET_TABLE: TableDescriptor = {
+  table: 'datasets',
+  returning: `id, participant_id as "participantId", name, description,
+              schema_ref as "schemaRef", status,
+              created_at as "createdAt", updated_at as "updatedAt"`,
+  columns: {
+    participantId: 'participant_id',
+    name: 'name',
+    description: 'description',
+    schemaRef: 'schema_ref',
+    status: 'status',
+  },
+};
+
+/**
+ * Columns matched in fuzzy (trigram) search mode, each backed by a gin_trgm_ops index
+ */
+const FUZZY_COLUMNS = ['name'];
+
+const SUGGEST = defineStatement('datasets.suggest', buildSuggestQuery('datasets', 'name', 'id, name'));
 
 class DatasetRepository {
+  private readonly crud = new CrudRepository<Dataset>(DATASET_TABLE, (row) => this.mapRowToDataset(row));
+
   /**
    * Find all datasets with pagination
    */
-  async findAll(page: number = 1, pageSize: number = 10): Promise<{
-    data: Dataset[];
-    total: number;
-    page: number;
-    pageSize: number;
-    totalPages: number;
-  }> {
+  async findAll(page: number = 1, pageSize: number = 10, count: CountStrategy = 'exact'): Promise<CountedPage<Dataset>> {
     try {
-      // Get total count
-      const countResult = await query('SELECT COUNT(*) FROM datasets');
-      const total = parseInt(countResult.rows[0].count, 10);
-
-      // Get paginated data
-      const offset = (page - 1) * pageSize;
-      const result = await query(
-        `SELECT id, participant_id as "participantId", name, description,
-                schema_ref as "schemaRef", status,
-                created_at as "createdAt", updated_at as "updatedAt"
-         FROM datasets
-         ORDER BY created_at DESC
-         LIMIT $1 OFFSET $2`,
-        [pageSize, offset]
+      return await queryPage(
+        {
+          columns: `id, participant_id as "participantId", name, description,
+                    schema_ref as "schemaRef", status,
+                    created_at as "createdAt", updated_at as "updatedAt"`,
+          from: 'datasets',
+          page,
+          pageSize,
+          count,
+        },
+        (row) => this.mapRowToDataset(row)
       );
+    } catch (error) {
+      console.error('Error fetching all datasets:', error);
+      throw error;
+    }
+  }
 
-      const data = result.rows.map((row: any) => this.mapRowToDataset(row));
-      const totalPages = Math.ceil(total / pageSize);
+  /**
+   * Find all datasets with keyset (cursor) pagination
+   */
+  async findAllAfter(after: string | null, pageSize: number = 10): Promise<KeysetPage<Dataset>> {
+    try {
+      const { text, values } = buildKeysetQuery({
+        columns: `id, participant_id as "participantId", name, description,
+                  schema_ref as "schemaRef", status,
+                  created_at as "createdAt", updated_at as "updatedAt"`,
+        from: 'datasets',
+        after,
+        pageSize,
+      });
+      const result = await query(text, values);
+
+      return toKeysetPage(result.rows, pageSize, (row) => this.mapRowToDataset(row));
+    } catch (error) {
+      console.error('Error fetching datasets by cursor:', error);
+      throw error;
+    }
+  }
 
-      return { data, total, page, pageSize, totalPages };
+  /**
+   * Stream all datasets as CSV or NDJSON
+   */
+  async exportAll(format: ExportFormat): Promise<Readable> {
+    try {
+      return await this.crud.export(format);
     } catch (error) {
-      console.error('Error fetching all datasets:', error);
+      console.error('Error exporting datasets:', error);
       throw error;
     }
   }
@@ -49,16 +118,7 @@ class DatasetRepository {
    */
   async findById(id: string): Promise<Dataset | null> {
     try {
-      const result = await query(
-        `SELECT id, participant_id as "participantId", name, description,
-                schema_ref as "schemaRef", status,
-                created_at as "createdAt", updated_at as "updatedAt"
-         FROM datasets
-         WHERE id = $1`,
-        [id]
-      );
-
-      return result.rows.length > 0 ? this.mapRowToDataset(result.rows[0]) : null;
+      return await this.crud.findById(id);
     } catch (error) {
       console.error('Error fetching dataset by ID:', error);
       throw error;
@@ -71,63 +131,193 @@ class DatasetRepository {
   async findByParticipantId(
     participantId: string,
     page: number = 1,
-    pageSize: number = 10
-  ): Promise<{
-    data: Dataset[];
-    total: number;
-    page: number;
-    pageSize: number;
-    totalPages: number;
-  }> {
+    pageSize: number = 10,
+    count: CountStrategy = 'exact'
+  ): Promise<CountedPage<Dataset>> {
     try {
-      // Get total count
-      const countResult = await query(
-        'SELECT COUNT(*) FROM datasets WHERE participant_id = $1',
-        [participantId]
-      );
-      const total = parseInt(countResult.rows[0].count, 10);
-
-      // Get paginated data
-      const offset = (page - 1) * pageSize;
-      const result = await query(
-        `SELECT id, participant_id as "participantId", name, description,
-                schema_ref as "schemaRef", status,
-                created_at as "createdAt", updated_at as "updatedAt"
-         FROM datasets
-         WHERE participant_id = $1
-         ORDER BY created_at DESC
-         LIMIT $2 OFFSET $3`,
-        [participantId, pageSize, offset]
+      return await queryPage(
+        {
+          columns: `id, participant_id as "participantId", name, description,
+                    schema_ref as "schemaRef", status,
+                    created_at as "createdAt", updated_at as "updatedAt"`,
+          from: 'datasets',
+          where: 'participant_id = $1',
+          params: [participantId],
+          page,
+          pageSize,
+          count,
+        },
+        (row) => this.mapRowToDataset(row)
       );
-
-      const data = result.rows.map((row: any) => this.mapRowToDataset(row));
-      const totalPages = Math.ceil(total / pageSize);
-
-      return { data, total, page, pageSize, totalPages };
     } catch (error) {
       console.error('Error fetching datasets by participant:', error);
       throw error;
     }
   }
 
+  /**
+   * Find datasets by participant ID with keyset (cursor) pagination
+   */
+  async findByParticipantIdAfter(
+    participantId: string,
+    after: string | null,
+    pageSize: number = 10
+  ): Promise<KeysetPage<Dataset>> {
+    try {
+      const { text, values } = buildKeysetQuery({
+        columns: `id, participant_id as "participantId", name, description,
+                  schema_ref as "schemaRef", status,
+                  created_at as "createdAt", updated_at as "updatedAt"`,
+        from: 'datasets',
+        where: 'participant_id = $1',
+        params: [participantId],
+        after,
+        pageSize,
+      });
+      const result = await query(text, values);
+
+      return toKeysetPage(result.rows, pageSize, (row) => this.mapRowToDataset(row));
+    } catch (error) {
+      console.error('Error fetching datasets by participant and cursor:', error);
+      throw error;
+    }
+  }
+
   /**
    * Create new dataset
    */
   async create(request: CreateDatasetRequest): Promise<Dataset> {
     try {
-      const result = await query(
-        `INSERT INTO datasets
-         (participant_id, name, description, schema_ref, status)
-         VALUES ($1, $2, $3, $4, $5)
-         RETURNING id, participant_id as "participantId", name, description,
-                   schema_ref as "schemaRef", status,
-                   created_at as "createdAt", updated_at as "updatedAt"`,
-        [request.participantId, request.name, request.description || null, request.schemaRef || null, 'draft']
+      return await this.crud.insert({
+        participantId: request.participantId,
+        name: request.name,
+        description: request.description || null,
+        schemaRef: request.schemaRef || null,
+        status: 'draft',
+      });
+    } catch (error) {
+      console.error('Error creating dataset:', error);
+      throw error;
+    }
+  }
+
+  /**
+   * Create many datasets in one transaction
+   */
+  async createMany(requests: CreateDatasetRequest[]): Promise<Dataset[]> {
+    try {
+      const result = await bulkInsert(
+        'datasets',
+        requests.map((request) => ({
+          participant_id: request.participantId,
+          name: request.name,
+          description: request.description || null,
+          schema_ref: request.schemaRef || null,
+          status: 'draft',
+        })),
+        {
+          types: {
+            participant_id: 'uuid',
+            name: 'text',
+            description: 'text',
+            schema_ref: 'text',
+            status: 'text',
+          },
+          returning: DATASET_TABLE.returning,
+        }
       );
 
-      return this.mapRowToDataset(result.rows[0]);
+      return result.rows.map((row) => this.mapRowToDataset(row));
     } catch (error) {
-      console.error('Error creating dataset:', error);
+      console.error('Error creating datasets:', error);
+      throw error;
+    }
+  }
+
+  /**
+   * Bulk import validated datasets with COPY through a temporary staging table.
+   * Rows whose participant does not exist are rejected; the rest are inserted as
+   * drafts. One statement also records a created event and a search document
+   * for each inserted row, so no row is loaded into memory whatever the size.
+   * @returns Number of datasets inserted and rejected rows
+   */
+  async importMany(
+    rows: AsyncIterable<ImportRow<CreateDatasetRequest>>
+  ): Promise<{ imported: number; rejects: ImportReject[] }> {
+    try {
+      return await withTransaction(async () => {
+        await query(
+          `CREATE TEMP TABLE datasets_import (
+             row_number integer NOT NULL,
+             participant_id uuid NOT NULL,
+             name text NOT NULL,
+             description text,
+             schema_ref text
+           ) ON COMMIT DROP`
+        );
+
+        await copyFrom(
+          'datasets_import',
+          ['row_number', 'participant_id', 'name', 'description', 'schema_ref'],
+          (async function* () {
+            for await (const { row, data } of rows) {
+              yield [row, data.participantId, data.name, data.description, data.schemaRef];
+            }
+          })()
+        );
+
+        const orphans = await query(
+          `SELECT s.row_number FROM datasets_import s
+           WHERE NOT EXISTS (SELECT 1 FROM participants p WHERE p.id = s.participant_id)
+           ORDER BY s.row_number`
+        );
+
+        const inserted = await query(
+          `WITH inserted AS (
+             INSERT INTO datasets (participant_id, name, description, schema_ref, status)
+             SELECT s.participant_id, s.name, s.description, s.schema_ref, 'draft'
+             FROM datasets_import s
+             WHERE EXISTS (SELECT 1 FROM participants p WHERE p.id = s.participant_id)
+             ORDER BY s.row_number
+             RETURNING id, participant_id, name, description, schema_ref, status
+           ),
+           events AS (
+             ${appendToOutboxFrom(
+               `(SELECT id AS aggregate_id,
+                        jsonb_build_object(
+                          'datasetId', id,
+                          'participantId', participant_id,
+                          'name', name,
+                          'description', description,
+                          'schemaRef', schema_ref,
+                          'status', status
+                        ) AS data
+                 FROM inserted)`,
+               { topic: '$1', eventType: '$2', aggregateType: '$3' }
+             )}
+           ),
+           indexed AS (
+             ${indexDocumentsFrom(
+               'dataset',
+               `(SELECT id AS doc_id, name AS title, description AS body, status,
+                        jsonb_strip_nulls(jsonb_build_object('participantId', participant_id, 'schemaRef', schema_ref)) AS metadata
+                 FROM inserted)`
+             )}
+           )
+           SELECT COUNT(*) AS imported FROM inserted`,
+          [EventTopics.DATASETS, EventType.DATASET_CREATED, 'dataset']
+        );
+
+        return {
+          imported: parseInt(inserted.rows[0].imported, 10),
+          rejects: orphans.rows.map((row) => ({
+            row: row.row_number,
+            error: 'Invalid participantId: participant not found',
+          })),
+        };
+      });
+    } catch (error) {
+      console.error('Error importing datasets:', error);
       throw error;
     }
   }
@@ -137,57 +327,17 @@ class DatasetRepository {
    */
   async update(id: string, request: UpdateDatasetRequest): Promise<Dataset> {
     try {
-      const dataset = await this.findById(id);
+      const dataset = await this.crud.update(id, {
+        name: request.name,
+        description: request.description,
+        schemaRef: request.schemaRef,
+        status: request.status,
+      });
       if (!dataset) {
         throw new Error(`Dataset with ID ${id} not found`);
       }
 
-      const updateFields: string[] = [];
-      const values: any[] = [];
-      let paramIndex = 1;
-
-      if (request.name !== undefined) {
-        updateFields.push(`name = $${paramIndex}`);
-        values.push(request.name);
-        paramIndex++;
-      }
-
-      if (request.description !== undefined) {
-        updateFields.push(`description = $${paramIndex}`);
-        values.push(request.description);
-        paramIndex++;
-      }
-
-      if (request.schemaRef !== undefined) {
-        updateFields.push(`schema_ref = $${paramIndex}`);
-        values.push(request.schemaRef);
-        paramIndex++;
-      }
-
-      if (request.status !== undefined) {
-        updateFields.push(`status = $${paramIndex}`);
-        values.push(request.status);
-        paramIndex++;
-      }
-
-      if (updateFields.length === 0) {
-        return dataset;
-      }
-
-      updateFields.push(`updated_at = CURRENT_TIMESTAMP`);
-      values.push(id);
-
-      const result = await query(
-        `UPDATE datasets
-         SET ${updateFields.join(', ')}
-         WHERE id = $${paramIndex}
-         RETURNING id, participant_id as "participantId", name, description,
-                   schema_ref as "schemaRef", status,
-                   created_at as "createdAt", updated_at as "updatedAt"`,
-        values
-      );
-
-      return this.mapRowToDataset(result.rows[0]);
+      return dataset;
     } catch (error) {
       console.error('Error updating dataset:', error);
       throw error;
@@ -197,15 +347,14 @@ class DatasetRepository {
   /**
    * Delete dataset
    */
-  async delete(id: string): Promise<boolean> {
+  async delete(id: string): Promise<Dataset> {
     try {
-      const dataset = await this.findById(id);
+      const dataset = await this.crud.delete(id);
       if (!dataset) {
         throw new Error(`Dataset with ID ${id} not found`);
       }
 
-      const result = await query('DELETE FROM datasets WHERE id = $1', [id]);
-      return result.rowCount ? result.rowCount > 0 : false;
+      return dataset;
     } catch (error) {
       console.error('Error deleting dataset:', error);
       throw error;
@@ -213,49 +362,86 @@ class DatasetRepository {
   }
 
   /**
-   * Search datasets by name or description
+   * Search datasets, best match first.
+   * fulltext: name or description words as prefixes; fuzzy: trigram similarity on name
    */
   async search(
     query_text: string,
     page: number = 1,
-    pageSize: number = 10
-  ): Promise<{
-    data: Dataset[];
-    total: number;
-    page: number;
-    pageSize: number;
-    totalPages: number;
-  }> {
+    pageSize: number = 10,
+    count: CountStrategy = 'exact',
+    mode: SearchMode = 'fulltext'
+  ): Promise<CountedPage<Dataset>> {
     try {
-      const searchQuery = `%${query_text}%`;
-
-      // Get total count
-      const countResult = await query(
-        `SELECT COUNT(*) FROM datasets
-         WHERE name ILIKE $1 OR description ILIKE $1`,
-        [searchQuery]
-      );
-      const total = parseInt(countResult.rows[0].count, 10);
-
-      // Get paginated search results
-      const offset = (page - 1) * pageSize;
-      const result = await query(
-        `SELECT id, participant_id as "participantId", name, description,
-                schema_ref as "schemaRef", status,
-                created_at as "createdAt", updated_at as "updatedAt"
-         FROM datasets
-         WHERE name ILIKE $1 OR description ILIKE $1
-         ORDER BY created_at DESC
-         LIMIT $2 OFFSET $3`,
-        [searchQuery, pageSize, offset]
+      const { where, rank } = searchPredicate(mode, '$1', FUZZY_COLUMNS);
+
+      return await queryPage(
+        {
+          columns: `id, participant_id as "participantId", name, description,
+                    schema_ref as "schemaRef", status,
+                    created_at as "createdAt", updated_at as "updatedAt"`,
+          from: 'datasets',
+          where,
+          params: [query_text],
+          orderBy: `${rank} DESC, created_at DESC`,
+          page,
+          pageSize,
+          count,
+        },
+        (row) => this.mapRowToDataset(row)
       );
+    } catch (error) {
+      console.error('Error searching datasets:', error);
+      throw error;
+    }
+  }
 
-      const data = result.rows.map((row: any) => this.mapRowToDataset(row));
-      const totalPages = Math.ceil(total / pageSize);
+  /**
+   * Search datasets with keyset (cursor) pagination, newest first
+   */
+  async searchAfter(
+    query_text: string,
+    after: string | null,
+    pageSize: number = 10,
+    mode: SearchMode = 'fulltext'
+  ): Promise<KeysetPage<Dataset>> {
+    try {
+      const { text, values } = buildKeysetQuery({
+        columns: `id, participant_id as "participantId", name, description,
+                  schema_ref as "schemaRef", status,
+                  created_at as "createdAt", updated_at as "updatedAt"`,
+        from: 'datasets',
+        where: searchPredicate(mode, '$1', FUZZY_COLUMNS).where,
+        params: [query_text],
+        after,
+        pageSize,
+      });
+      const result = await query(text, values);
+
+      return toKeysetPage(result.rows, pageSize, (row) => this.mapRowToDataset(row));
+    } catch (error) {
+      console.error('Error searching datasets by cursor:', error);
+      throw error;
+    }
+  }
 
-      return { data, total, page, pageSize, totalPages };
+  /**
+   * Autocomplete datasets by name: prefix matches first, then closest trigram matches
+   * @param text Partial name typed by the user
+   * @param limit Maximum number of suggestions
+   */
+  async suggest(text: string, limit: number = 5): Promise<SearchSuggestion[]> {
+    try {
+      const result = await execute(SUGGEST, [text, `${escapeLike(text)}%`, limit]);
+
+      return result.rows.map((row) => ({
+        type: 'dataset' as const,
+        id: row.id,
+        name: row.name,
+        score: Number(row.score),
+      }));
     } catch (error) {
-      console.error('Error searching datasets:', error);
+      console.error('Error suggesting datasets:', error);
       throw error;
     }
   }
@@ -3,43 +3,118 @@
  * Handles all participant data persistence operations
  */
 
-import { query } from '@dataspace/db';
+import type { Readable } from 'node:stream';
+import {
+  query,
+  queryPage,
+  buildKeysetQuery,
+  toKeysetPage,
+  searchPredicate,
+  buildSuggestQuery,
+  escapeLike,
+  bulkInsert,
+  copyFrom,
+  withTransaction,
+  appendToOutboxFrom,
+  defineStatement,
+  execute,
+  CrudRepository,
+  type CountStrategy,
+  type SearchMode,
+  type ExportFormat,
+  type CountedPage,
+  type KeysetPage,
+  type TableDescriptor,
+} from '@dataspace/db';
+import { EventTopics, EventType } from '@dataspace/kafka';
 import { Participant, CreateParticipantRequest, UpdateParticipantRequest } from '../types/participant';
+import { ImportReject, ImportRow } from '../types/import';
+import { SearchSuggestion } from '../types/search';
+import { indexDocumentsFrom } from './search-repository';
+
+const PARTICIPANT_TABLE: TableDescriptor = {
+  table: 'participants',
+  returning: `id, did, name, description, endpoint_url as "endpointUrl",
+              public_key as "publicKey", status, created_at as "createdAt",
+              updated_at as "updatedAt"`,
+  columns: {
+    did: 'did',
+    name: 'name',
+    description: 'description',
+    endpointUrl: 'endpoint_url',
+    publicKey: 'public_key',
+    status: 'status',
+  },
+};
+
+const FIND_BY_DID = defineStatement(
+  'participants.findByDid',
+  `SELECT ${PARTICIPANT_TABLE.returning} FROM participants WHERE did = $1`
+);
+
+/**
+ * Columns matched in fuzzy (trigram) search mode, each backed by a gin_trgm_ops index
+ */
+const FUZZY_COLUMNS = ['name', 'did'];
+
+const SUGGEST = defineStatement('participants.suggest', buildSuggestQuery('participants', 'name', 'id, name'));
 
 class ParticipantRepository {
+  private readonly crud = new CrudRepository<Participant>(PARTICIPANT_TABLE, (row) => this.mapRowToParticipant(row));
+
   /**
    * Find all participants with pagination
    */
-  async findAll(page: number = 1, pageSize: number = 10): Promise<{
-    data: Participant[];
-    total: number;
-    page: number;
-    pageSize: number;
-    totalPages: number;
-  }> {
+  async findAll(page: number = 1, pageSize: number = 10, count: CountStrategy = 'exact'): Promise<CountedPage<Participant>> {
     try {
-      // Get total count
-      const countResult = await query('SELECT COUNT(*) FROM participants');
-      const total = parseInt(countResult.rows[0].count, 10);
-
-      // Get paginated data
-      const offset = (page - 1) * pageSize;
-      const result = await query(
-        `SELECT id, did, name, description, endpoint_url as "endpointUrl",
-                public_key as "publicKey", status, created_at as "createdAt",
-                updated_at as "updatedAt"
-         FROM participants
-         ORDER BY created_at DESC
-         LIMIT $1 OFFSET $2`,
-        [pageSize, offset]
+      return await queryPage(
+        {
+          columns: `id, did, name, description, endpoint_url as "endpointUrl",
+                    public_key as "publicKey", status, created_at as "createdAt",
+                    updated_at as "updatedAt"`,
+          from: 'participants',
+          page,
+          pageSize,
+          count,
+        },
+        (row) => this.mapRowToParticipant(row)
       );
+    } catch (error) {
+      console.error('Error fetching all participants:', error);
+      throw error;
+    }
+  }
 
-      const data = result.rows.map((row: any) => this.mapRowToParticipant(row));
-      const totalPages = Math.ceil(total / pageSize);
+  /**
+   * Find all participants with keyset (cursor) pagination
+   */
+  async findAllAfter(after: string | null, pageSize: number = 10): Promise<KeysetPage<Participant>> {
+    try {
+      const { text, values } = buildKeysetQuery({
+        columns: `id, did, name, description, endpoint_url as "endpointUrl",
+                  public_key as "publicKey", status, created_at as "createdAt",
+                  updated_at as "updatedAt"`,
+        from: 'participants',
+        after,
+        pageSize,
+      });
+      const result = await query(text, values);
+
+      return toKeysetPage(result.rows, pageSize, (row) => this.mapRowToParticipant(row));
+    } catch (error) {
+      console.error('Error fetching participants by cursor:', error);
+      throw error;
+    }
+  }
 
-      return { data, total, page, pageSize, totalPages };
+  /**
+   * Stream all participants as CSV or NDJSON
+   */
+  async exportAll(format: ExportFormat): Promise<Readable> {
+    try {
+      return await this.crud.export(format);
     } catch (error) {
-      console.error('Error fetching all participants:', error);
+      console.error('Error exporting participants:', error);
       throw error;
     }
   }
@@ -49,16 +124,7 @@ class ParticipantRepository {
    */
   async findById(id: string): Promise<Participant | null> {
     try {
-      const result = await query(
-        `SELECT id, did, name, description, endpoint_url as "endpointUrl",
-                public_key as "publicKey", status, created_at as "createdAt",
-                updated_at as "updatedAt"
-         FROM participants
-         WHERE id = $1`,
-        [id]
-      );
-
-      return result.rows.length > 0 ? this.mapRowToParticipant(result.rows[0]) : null;
+      return await this.crud.findById(id);
     } catch (error) {
       console.error('Error fetching participant by ID:', error);
       throw error;
@@ -70,14 +136,7 @@ class ParticipantRepository {
    */
   async findByDid(did: string): Promise<Participant | null> {
     try {
-      const result = await query(
-        `SELECT id, did, name, description, endpoint_url as "endpointUrl",
-                public_key as "publicKey", status, created_at as "createdAt",
-                updated_at as "updatedAt"
-         FROM participants
-         WHERE did = $1`,
-        [did]
-      );
+      const result = await execute(FIND_BY_DID, [did]);
 
       return result.rows.length > 0 ? this.mapRowToParticipant(result.rows[0]) : null;
     } catch (error) {
@@ -97,19 +156,157 @@ class ParticipantRepository {
         throw new Error(`Participant with DID ${request.did} already exists`);
       }
 
-      const result = await query(
-        `INSERT INTO participants
-         (did, name, description, endpoint_url, public_key, status)
-         VALUES ($1, $2, $3, $4, $5, $6)
-         RETURNING id, did, name, description, endpoint_url as "endpointUrl",
-                   public_key as "publicKey", status, created_at as "createdAt",
-                   updated_at as "updatedAt"`,
-        [request.did, request.name, request.description || null, request.endpointUrl || null, request.publicKey || null, 'active']
+      return await this.crud.insert({
+        did: request.did,
+        name: request.name,
+        description: request.description || null,
+        endpointUrl: request.endpointUrl || null,
+        publicKey: request.publicKey || null,
+        status: 'active',
+      });
+    } catch (error) {
+      console.error('Error creating participant:', error);
+      throw error;
+    }
+  }
+
+  /**
+   * Create many participants in one transaction.
+   * Participants whose DID is already registered are skipped.
+   */
+  async createMany(requests: CreateParticipantRequest[]): Promise<Participant[]> {
+    try {
+      const result = await bulkInsert(
+        'participants',
+        requests.map((request) => ({
+          did: request.did,
+          name: request.name,
+          description: request.description || null,
+          endpoint_url: request.endpointUrl || null,
+          public_key: request.publicKey || null,
+          status: 'active',
+        })),
+        {
+          types: {
+            did: 'text',
+            name: 'text',
+            description: 'text',
+            endpoint_url: 'text',
+            public_key: 'text',
+            status: 'text',
+          },
+          onConflict: '(did) DO NOTHING',
+          returning: PARTICIPANT_TABLE.returning,
+        }
       );
 
-      return this.mapRowToParticipant(result.rows[0]);
+      return result.rows.map((row) => this.mapRowToParticipant(row));
     } catch (error) {
-      console.error('Error creating participant:', error);
+      console.error('Error creating participants:', error);
+      throw error;
+    }
+  }
+
+  /**
+   * Bulk import validated participants with COPY through a temporary staging table.
+   * DIDs that are already registered, or repeated within the import, are rejected.
+   * One statement also records a created event and a search document for each
+   * inserted row, so no row is loaded into memory whatever the size.
+   * @returns Number of participants inserted and rejected rows
+   */
+  async importMany(
+    rows: AsyncIterable<ImportRow<CreateParticipantRequest>>
+  ): Promise<{ imported: number; rejects: ImportReject[] }> {
+    try {
+      return await withTransaction(async () => {
+        await query(
+          `CREATE TEMP TABLE participants_import (
+             row_number integer NOT NULL,
+             did text NOT NULL,
+             name text NOT NULL,
+             description text,
+             endpoint_url text,
+             public_key text
+           ) ON COMMIT DROP`
+        );
+
+        await copyFrom(
+          'participants_import',
+          ['row_number', 'did', 'name', 'description', 'endpoint_url', 'public_key'],
+          (async function* () {
+            for await (const { row, data } of rows) {
+              yield [row, data.did, data.name, data.description, data.endpointUrl, data.publicKey];
+            }
+          })()
+        );
+        await query('CREATE INDEX ON participants_import (did, row_number)');
+        await query('ANALYZE participants_import');
+
+        const duplicates = await query(
+          `SELECT s.row_number,
+                  EXISTS (SELECT 1 FROM participants p WHERE p.did = s.did) AS registered
+           FROM participants_import s
+           WHERE EXISTS (SELECT 1 FROM participants p WHERE p.did = s.did)
+              OR EXISTS (
+                SELECT 1 FROM participants_import d
+                WHERE d.did = s.did AND d.row_number < s.row_number
+              )
+           ORDER BY s.row_number`
+        );
+
+        // First occurrence of each DID wins; ON CONFLICT covers concurrent registrations
+        const inserted = await query(
+          `WITH inserted AS (
+             INSERT INTO participants (did, name, description, endpoint_url, public_key, status)
+             SELECT did, name, description, endpoint_url, public_key, 'active'
+             FROM (
+               SELECT DISTINCT ON (did) *
+               FROM participants_import
+               ORDER BY did, row_number
+             ) s
+             WHERE NOT EXISTS (SELECT 1 FROM participants p WHERE p.did = s.did)
+             ORDER BY s.row_number
+             ON CONFLICT (did) DO NOTHING
+             RETURNING id, did, name, description, status
+           ),
+           events AS (
+             ${appendToOutboxFrom(
+               `(SELECT id AS aggregate_id,
+                        jsonb_build_object(
+                          'participantId', id,
+                          'did', did,
+                          'name', name,
+                          'description', description,
+                          'status', status
+                        ) AS data
+                 FROM inserted)`,
+               { topic: '$1', eventType: '$2', aggregateType: '$3' }
+             )}
+           ),
+           indexed AS (
+             ${indexDocumentsFrom(
+               'participant',
+               `(SELECT id AS doc_id, name AS title, description AS body, status,
+                        jsonb_build_object('did', did) AS metadata
+                 FROM inserted)`
+             )}
+           )
+           SELECT COUNT(*) AS imported FROM inserted`,
+          [EventTopics.PARTICIPANTS, EventType.PARTICIPANT_CREATED, 'participant']
+        );
+
+        return {
+          imported: parseInt(inserted.rows[0].imported, 10),
+          rejects: duplicates.rows.map((row) => ({
+            row: row.row_number,
+            error: row.registered
+              ? 'Invalid DID: participant already registered'
+              : 'Invalid DID: duplicate within import',
+          })),
+        };
+      });
+    } catch (error) {
+      console.error('Error importing participants:', error);
       throw error;
     }
   }
@@ -119,63 +316,18 @@ class ParticipantRepository {
    */
   async update(id: string, request: UpdateParticipantRequest): Promise<Participant> {
     try {
-      const participant = await this.findById(id);
+      const participant = await this.crud.update(id, {
+        name: request.name,
+        description: request.description,
+        endpointUrl: request.endpointUrl,
+        publicKey: request.publicKey,
+        status: request.status,
+      });
       if (!participant) {
         throw new Error(`Participant with ID ${id} not found`);
       }
 
-      const updateFields: string[] = [];
-      const values: any[] = [];
-      let paramIndex = 1;
-
-      if (request.name !== undefined) {
-        updateFields.push(`name = $${paramIndex}`);
-        values.push(request.name);
-        paramIndex++;
-      }
-
-      if (request.description !== undefined) {
-        updateFields.push(`description = $${paramIndex}`);
-        values.push(request.description);
-        paramIndex++;
-      }
-
-      if (request.endpointUrl !== undefined) {
-        updateFields.push(`endpoint_url = $${paramIndex}`);
-        values.push(request.endpointUrl);
-        paramIndex++;
-      }
-
-      if (request.publicKey !== undefined) {
-        updateFields.push(`public_key = $${paramIndex}`);
-        values.push(request.publicKey);
-        paramIndex++;
-      }
-
-      if (request.status !== undefined) {
-        updateFields.push(`status = $${paramIndex}`);
-        values.push(request.status);
-        paramIndex++;
-      }
-
-      if (updateFields.length === 0) {
-        return participant;
-      }
-
-      updateFields.push(`updated_at = CURRENT_TIMESTAMP`);
-      values.push(id);
-
-      const result = await query(
-        `UPDATE participants
-         SET ${updateFields.join(', ')}
-         WHERE id = $${paramIndex}
-         RETURNING id, did, name, description, endpoint_url as "endpointUrl",
-                   public_key as "publicKey", status, created_at as "createdAt",
-                   updated_at as "updatedAt"`,
-        values
-      );
-
-      return this.mapRowToParticipant(result.rows[0]);
+      return participant;
     } catch (error) {
       console.error('Error updating participant:', error);
       throw error;
@@ -187,13 +339,12 @@ class ParticipantRepository {
    */
   async delete(id: string): Promise<boolean> {
     try {
-      const participant = await this.findById(id);
+      const participant = await this.crud.delete(id);
       if (!participant) {
         throw new Error(`Participant with ID ${id} not found`);
       }
 
-      const result = await query('DELETE FROM participants WHERE id = $1', [id]);
-      return result.rowCount ? result.rowCount > 0 : false;
+      return true;
     } catch (error) {
       console.error('Error deleting participant:', error);
       throw error;
@@ -201,45 +352,86 @@ class ParticipantRepository {
   }
 
   /**
-   * Search participants by query
+   * Search participants, best match first.
+   * fulltext: name, DID or description words as prefixes; fuzzy: trigram similarity on name or DID
    */
-  async search(query_text: string, page: number = 1, pageSize: number = 10): Promise<{
-    data: Participant[];
-    total: number;
-    page: number;
-    pageSize: number;
-    totalPages: number;
-  }> {
+  async search(
+    query_text: string,
+    page: number = 1,
+    pageSize: number = 10,
+    count: CountStrategy = 'exact',
+    mode: SearchMode = 'fulltext'
+  ): Promise<CountedPage<Participant>> {
     try {
-      const searchQuery = `%${query_text}%`;
-
-      // Get total count
-      const countResult = await query(
-        `SELECT COUNT(*) FROM participants
-         WHERE name ILIKE $1 OR did ILIKE $1 OR description ILIKE $1`,
-        [searchQuery]
-      );
-      const total = parseInt(countResult.rows[0].count, 10);
-
-      // Get paginated search results
-      const offset = (page - 1) * pageSize;
-      const result = await query(
-        `SELECT id, did, name, description, endpoint_url as "endpointUrl",
-                public_key as "publicKey", status, created_at as "createdAt",
-                updated_at as "updatedAt"
-         FROM participants
-         WHERE name ILIKE $1 OR did ILIKE $1 OR description ILIKE $1
-         ORDER BY created_at DESC
-         LIMIT $2 OFFSET $3`,
-        [searchQuery, pageSize, offset]
+      const { where, rank } = searchPredicate(mode, '$1', FUZZY_COLUMNS);
+
+      return await queryPage(
+        {
+          columns: `id, did, name, description, endpoint_url as "endpointUrl",
+                    public_key as "publicKey", status, created_at as "createdAt",
+                    updated_at as "updatedAt"`,
+          from: 'participants',
+          where,
+          params: [query_text],
+          orderBy: `${rank} DESC, created_at DESC`,
+          page,
+          pageSize,
+          count,
+        },
+        (row) => this.mapRowToParticipant(row)
       );
+    } catch (error) {
+      console.error('Error searching participants:', error);
+      throw error;
+    }
+  }
 
-      const data = result.rows.map((row: any) => this.mapRowToParticipant(row));
-      const totalPages = Math.ceil(total / pageSize);
+  /**
+   * Search participants with keyset (cursor) pagination, newest first
+   */
+  async searchAfter(
+    query_text: string,
+    after: string | null,
+    pageSize: number = 10,
+    mode: SearchMode = 'fulltext'
+  ): Promise<KeysetPage<Participant>> {
+    try {
+      const { text, values } = buildKeysetQuery({
+        columns: `id, did, name, description, endpoint_url as "endpointUrl",
+                  public_key as "publicKey", status, created_at as "createdAt",
+                  updated_at as "updatedAt"`,
+        from: 'participants',
+        where: searchPredicate(mode, '$1', FUZZY_COLUMNS).where,
+        params: [query_text],
+        after,
+        pageSize,
+      });
+      const result = await query(text, values);
+
+      return toKeysetPage(result.rows, pageSize, (row) => this.mapRowToParticipant(row));
+    } catch (error) {
+      console.error('Error searching participants by cursor:', error);
+      throw error;
+    }
+  }
 
-      return { data, total, page, pageSize, totalPages };
+  /**
+   * Autocomplete participants by name: prefix matches first, then closest trigram matches
+   * @param text Partial name typed by the user
+   * @param limit Maximum number of suggestions
+   */
+  async suggest(text: string, limit: number = 5): Promise<SearchSuggestion[]> {
+    try {
+      const result = await execute(SUGGEST, [text, `${escapeLike(text)}%`, limit]);
+
+      return result.rows.map((row) => ({
+        type: 'participant' as const,
+        id: row.id,
+        name: row.name,
+        score: Number(row.score),
+      }));
     } catch (error) {
-      console.error('Error searching participants:', error);
+      console.error('Error suggesting participants:', error);
       throw error;
     }
   }
@@ -0,0 +1,182 @@
+/**
+ * Search Repository - PostgreSQL Database
+ * Maintains the unified search_documents index and serves ranked cross-service search
+ */
+
+import {
+  queryPage,
+  searchPredicate,
+  defineStatement,
+  internStatement,
+  execute,
+  type CountStrategy,
+  type SearchMode,
+  type CountedPage,
+} from '@dataspace/db';
+import { SearchDocument, SearchDocumentType, SearchHit } from '../types/search';
+
+/**
+ * Columns matched in fuzzy (trigram) search mode, backed by a gin_trgm_ops index
+ */
+const FUZZY_COLUMNS = ['title'];
+
+/**
+ * Only events newer than the last applied one change a document; a missing
+ * title keeps the indexed one, so partial update payloads are safe.
+ */
+const UPSERT = defineStatement(
+  'search_documents.upsert',
+  `INSERT INTO search_documents (doc_type, doc_id, title, body, status, metadata, source_updated_at, deleted_at)
+   VALUES ($1, $2, COALESCE($3, $2), $4, $5, $6, $7, NULL)
+   ON CONFLICT (doc_type, doc_id) DO UPDATE SET
+     title = COALESCE($3, search_documents.title),
+     body = COALESCE(EXCLUDED.body, search_documents.body),
+     status = COALESCE(EXCLUDED.status, search_documents.status),
+     metadata = COALESCE(search_documents.metadata, '{}'::jsonb) || EXCLUDED.metadata,
+     source_updated_at = EXCLUDED.source_updated_at,
+     deleted_at = NULL
+   WHERE search_documents.source_updated_at <= EXCLUDED.source_updated_at`
+);
+
+/**
+ * Deletes leave a tombstone so a late create/update event cannot resurrect the document
+ */
+const REMOVE = defineStatement(
+  'search_documents.remove',
+  `INSERT INTO search_documents (doc_type, doc_id, title, source_updated_at, deleted_at)
+   VALUES ($1, $2, $2, $3, $3)
+   ON CONFLICT (doc_type, doc_id) DO UPDATE SET
+     source_updated_at = EXCLUDED.source_updated_at,
+     deleted_at = EXCLUDED.deleted_at
+   WHERE search_documents.source_updated_at <= EXCLUDED.source_updated_at`
+);
+
+/**
+ * SQL for a data-modifying CTE that indexes every row of `source` as `type`,
+ * for set-based writes such as bulk imports. `source` must yield doc_id,
+ * title, body, status and metadata (jsonb); the statement time is the
+ * document's source_updated_at, with the same conflict rules as UPSERT.
+ * @param type Document type, inlined as a literal
+ * @param source Table, CTE name or parenthesised subquery
+ */
+export const indexDocumentsFrom = (type: SearchDocumentType, source: string): string =>
+  `INSERT INTO search_documents (doc_type, doc_id, title, body, status, metadata, source_updated_at, deleted_at)
+   SELECT '${type}', d.doc_id::text, COALESCE(d.title, d.doc_id::text), d.body, d.status, d.metadata, CURRENT_TIMESTAMP, NULL
+   FROM ${source} d
+   ON CONFLICT (doc_type, doc_id) DO UPDATE SET
+     title = EXCLUDED.title,
+     body = COALESCE(EXCLUDED.body, search_documents.body),
+     status = COALESCE(EXCLUDED.status, search_documents.status),
+     metadata = COALESCE(search_documents.metadata, '{}'::jsonb) || EXCLUDED.metadata,
+     source_updated_at = EXCLUDED.source_updated_at,
+     deleted_at = NULL
+   WHERE search_documents.source_updated_at <= EXCLUDED.source_updated_at`;
+
+class SearchRepository {
+  /**
+   * Insert or update a document from an event that happened at `at`
+   */
+  async upsert(document: SearchDocument, at: Date = new Date()): Promise<void> {
+    try {
+      await execute(UPSERT, [
+        document.type,
+        document.id,
+        document.title || null,
+        document.body ?? null,
+        document.status ?? null,
+        JSON.stringify(document.metadata || {}),
+        at,
+      ]);
+    } catch (error) {
+      console.error('Error indexing search document:', error);
+      throw error;
+    }
+  }
+
+  /**
+   * Remove a document from search results as of `at`
+   */
+  async remove(type: SearchDocumentType, id: string, at: Date = new Date()): Promise<void> {
+    try {
+      await execute(REMOVE, [type, id, at]);
+    } catch (error) {
+      console.error('Error removing search document:', error);
+      throw error;
+    }
+  }
+
+  /**
+   * Ranked search across every indexed entity, optionally limited to some types
+   */
+  async search(
+    query_text: string,
+    types: SearchDocumentType[] = [],
+    page: number = 1,
+    pageSize: number = 20,
+    count: CountStrategy = 'exact',
+    mode: SearchMode = 'fulltext'
+  ): Promise<CountedPage<SearchHit>> {
+    try {
+      const { where, rank } = searchPredicate(mode, '$1', FUZZY_COLUMNS);
+      const typeFilter = types.length > 0 ? ' AND doc_type = ANY($2)' : '';
+
+      return await queryPage(
+        {
+          columns: `doc_type, doc_id, title, body, status, metadata,
+                    source_updated_at as "updatedAt", ${rank} as score`,
+          from: 'search_documents',
+          where: `deleted_at IS NULL AND ${where}${typeFilter}`,
+          params: types.length > 0 ? [query_text, types] : [query_text],
+          orderBy: 'score DESC, source_updated_at DESC',
+          page,
+          pageSize,
+          count,
+        },
+        (row) => this.mapRowToHit(row)
+      );
+    } catch (error) {
+      console.error('Error searching documents:', error);
+      throw error;
+    }
+  }
+
+  /**
+   * Number of matches per entity type, ignoring any type filter
+   */
+  async countByType(query_text: string, mode: SearchMode = 'fulltext'): Promise<Record<string, number>> {
+    try {
+      const { where } = searchPredicate(mode, '$1', FUZZY_COLUMNS);
+      const statement = internStatement(
+        'search_documents.countByType',
+        `SELECT doc_type, COUNT(*) as count
+         FROM search_documents
+         WHERE deleted_at IS NULL AND ${where}
+         GROUP BY doc_type`
+      );
+      const result = await execute(statement, [query_text]);
+
+      return Object.fromEntries(result.rows.map((row) => [row.doc_type, parseInt(row.count, 10)]));
+    } catch (error) {
+      console.error('Error counting search documents:', error);
+      throw error;
+    }
+  }
+
+  /**
+   * Map database row to SearchHit object
+   */
+  private mapRowToHit(row: any): SearchHit {
+    return {
+      type: row.doc_type,
+      id: row.doc_id,
+      title: row.title,
+      body: row.body,
+      status: row.status,
+      metadata: row.metadata || {},
+      score: parseFloat(row.score),
+      updatedAt: row.updatedAt,
+    };
+  }
+}
+
+export default SearchRepository;
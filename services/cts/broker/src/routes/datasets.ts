@@ -2,31 +2,65 @@
  * Dataset Routes - CRUD Endpoints
  */
 
+import { Readable } from 'node:stream';
 import { FastifyInstance } from 'fastify';
+import {
+  parseCountStrategy,
+  parseExportFormat,
+  parseSearchMode,
+  withTransaction,
+  EXPORT_CONTENT_TYPES,
+} from '@dataspace/db';
 import DatasetRepository from '../repositories/dataset-repository';
 import { validateCreateDataset, validateUpdateDataset } from '../validators/dataset.validator';
+import { ImportRejects, parseImportRecords, resolveImportFormat, validateRecords } from '../import/record-stream';
 import { DatasetEventHandler } from '../events/dataset.event';
 import { CreateDatasetRequest, UpdateDatasetRequest } from '../types/dataset';
 
-export async function registerDatasetRoutes(app: FastifyInstance, repository: DatasetRepository) {
+export async function registerDatasetRoutes(
+  app: FastifyInstance,
+  repository: DatasetRepository,
+  eventHandler: DatasetEventHandler = new DatasetEventHandler()
+) {
   /**
    * GET /datasets
    * List all datasets with pagination and optional search
-   * Query params: page, pageSize, search
+   * Query params: page, pageSize, search, mode (fulltext|fuzzy), cursor (or after) for keyset pagination
    */
-  app.get<{ Querystring: { page?: string; pageSize?: string; search?: string } }>(
+  app.get<{
+    Querystring: {
+      page?: string;
+      pageSize?: string;
+      search?: string;
+      mode?: string;
+      cursor?: string;
+      after?: string;
+      count?: string;
+    };
+  }>(
     '/datasets',
     async (request, reply) => {
       try {
         const page = parseInt(request.query.page || '1') || 1;
         const pageSize = parseInt(request.query.pageSize || '10') || 10;
         const search = request.query.search || '';
+        const cursor = request.query.cursor ?? request.query.after;
+        const count = parseCountStrategy(request.query.count);
+        const mode = parseSearchMode(request.query.mode);
+
+        if (cursor !== undefined) {
+          const keysetResult = search
+            ? await repository.searchAfter(search, cursor || null, pageSize, mode)
+            : await repository.findAllAfter(cursor || null, pageSize);
+
+          return reply.send(keysetResult);
+        }
 
         let result;
         if (search) {
-          result = await repository.search(search, page, pageSize);
+          result = await repository.search(search, page, pageSize, count, mode);
         } else {
-          result = await repository.findAll(page, pageSize);
+          result = await repository.findAll(page, pageSize, count);
         }
 
         return reply.send({
@@ -36,8 +70,23 @@ export async function registerDatasetRoutes(app: FastifyInstance, repository: Da
           pageSize: result.pageSize,
           totalPages: result.totalPages,
         });
-      } catch (error) {
+      } catch (error: any) {
         app.log.error(error);
+
+        if (
+          error.message &&
+          (error.message.includes('Invalid cursor') ||
+            error.message.includes('Invalid count strategy') ||
+            error.message.includes('Invalid search mode'))
+        ) {
+          return reply.status(400).send({
+            error: {
+              code: 'VALIDATION_ERROR',
+              message: error.message,
+            },
+          });
+        }
+
         return reply.status(500).send({
           error: {
             code: 'INTERNAL_SERVER_ERROR',
@@ -48,6 +97,41 @@ export async function registerDatasetRoutes(app: FastifyInstance, repository: Da
     }
   );
 
+  /**
+   * GET /datasets/export
+   * Stream all datasets as CSV or NDJSON from a server-side cursor
+   * Query params: format (csv|ndjson, default ndjson)
+   */
+  app.get<{ Querystring: { format?: string } }>('/datasets/export', async (request, reply) => {
+    try {
+      const format = parseExportFormat(request.query.format);
+      const stream = await repository.exportAll(format);
+
+      return reply
+        .header('Content-Type', EXPORT_CONTENT_TYPES[format])
+        .header('Content-Disposition', `attachment; filename="datasets.${format}"`)
+        .send(stream);
+    } catch (error: any) {
+      app.log.error(error);
+
+      if (error.message === 'Invalid export format') {
+        return reply.status(400).send({
+          error: {
+            code: 'VALIDATION_ERROR',
+            message: error.message,
+          },
+        });
+      }
+
+      return reply.status(500).send({
+        error: {
+          code: 'INTERNAL_SERVER_ERROR',
+          message: 'Failed to export datasets',
+        },
+      });
+    }
+  });
+
   /**
    * GET /datasets/:id
    * Get a specific dataset by ID
@@ -82,15 +166,26 @@ export async function registerDatasetRoutes(app: FastifyInstance, repository: Da
    * GET /participants/:participantId/datasets
    * Get all datasets for a specific participant
    */
-  app.get<{ Params: { participantId: string }; Querystring: { page?: string; pageSize?: string } }>(
+  app.get<{
+    Params: { participantId: string };
+    Querystring: { page?: string; pageSize?: string; cursor?: string; after?: string; count?: string };
+  }>(
     '/participants/:participantId/datasets',
     async (request, reply) => {
       try {
         const { participantId } = request.params;
         const page = parseInt(request.query.page || '1') || 1;
         const pageSize = parseInt(request.query.pageSize || '10') || 10;
+        const cursor = request.query.cursor ?? request.query.after;
+        const count = parseCountStrategy(request.query.count);
+
+        if (cursor !== undefined) {
+          return reply.send(
+            await repository.findByParticipantIdAfter(participantId, cursor || null, pageSize)
+          );
+        }
 
-        const result = await repository.findByParticipantId(participantId, page, pageSize);
+        const result = await repository.findByParticipantId(participantId, page, pageSize, count);
 
         return reply.send({
           data: result.data,
@@ -99,8 +194,21 @@ export async function registerDatasetRoutes(app: FastifyInstance, repository: Da
           pageSize: result.pageSize,
           totalPages: result.totalPages,
         });
-      } catch (error) {
+      } catch (error: any) {
         app.log.error(error);
+
+        if (
+          error.message &&
+          (error.message.includes('Invalid cursor') || error.message.includes('Invalid count strategy'))
+        ) {
+          return reply.status(400).send({
+            error: {
+              code: 'VALIDATION_ERROR',
+              message: error.message,
+            },
+          });
+        }
+
         return reply.status(500).send({
           error: {
             code: 'INTERNAL_SERVER_ERROR',
@@ -120,11 +228,12 @@ export async function registerDatasetRoutes(app: FastifyInstance, repository: Da
       // Validate input
       const validated = await validateCreateDataset(request.body);
 
-      const dataset = await repository.create(validated);
-
-      // Emit event
-      const eventHandler = new DatasetEventHandler();
-      await eventHandler.onDatasetCreated(dataset);
+      // The event is recorded in the same transaction as the change
+      const dataset = await withTransaction(async () => {
+        const created = await repository.create(validated);
+        await eventHandler.onDatasetCreated(created);
+        return created;
+      });
 
       return reply.status(201).send({ data: dataset });
     } catch (error: any) {
@@ -148,6 +257,45 @@ export async function registerDatasetRoutes(app: FastifyInstance, repository: Da
     }
   });
 
+  /**
+   * POST /datasets/import
+   * Bulk import datasets from an NDJSON (application/x-ndjson) or CSV (text/csv) body.
+   * The body is streamed through validation into COPY; rejected rows are reported by row number.
+   * Each inserted row is recorded as a created event in the same transaction.
+   * Query params: format (ndjson|csv) to override the content type
+   */
+  app.post<{ Querystring: { format?: string } }>('/datasets/import', async (request, reply) => {
+    try {
+      const format = resolveImportFormat(request.headers['content-type'], request.query.format);
+      const body = request.body as Readable | undefined;
+
+      if (!format || !body || typeof body.pipe !== 'function') {
+        return reply.status(400).send({
+          error: {
+            code: 'VALIDATION_ERROR',
+            message: 'Invalid import body: send application/x-ndjson or text/csv',
+          },
+        });
+      }
+
+      const rejects = new ImportRejects();
+      const rows = validateRecords(parseImportRecords(body, format), validateCreateDataset, rejects);
+      const { imported, rejects: conflicts } = await repository.importMany(rows);
+      conflicts.forEach((reject) => rejects.add(reject.row, reject.error));
+
+      return reply.status(200).send({ data: rejects.toResult(imported) });
+    } catch (error: any) {
+      app.log.error(error);
+
+      return reply.status(500).send({
+        error: {
+          code: 'INTERNAL_SERVER_ERROR',
+          message: 'Failed to import datasets',
+        },
+      });
+    }
+  });
+
   /**
    * PUT /datasets/:id
    * Update a dataset
@@ -159,7 +307,11 @@ export async function registerDatasetRoutes(app: FastifyInstance, repository: Da
         const { id } = request.params;
         const updates = request.body;
 
-        const dataset = await repository.update(id, updates);
+        const dataset = await withTransaction(async () => {
+          const updated = await repository.update(id, updates);
+          await eventHandler.onDatasetUpdated(updated);
+          return updated;
+        });
 
         return reply.send({ data: dataset });
       } catch (error: any) {
@@ -192,7 +344,10 @@ export async function registerDatasetRoutes(app: FastifyInstance, repository: Da
     try {
       const { id } = request.params;
 
-      await repository.delete(id);
+      await withTransaction(async () => {
+        const dataset = await repository.delete(id);
+        await eventHandler.onDatasetDeleted(dataset);
+      });
 
       return reply.status(204).send();
     } catch (error: any) {
@@ -2,31 +2,65 @@
  * Participant Routes - CRUD Endpoints
  */
 
+import { Readable } from 'node:stream';
 import { FastifyInstance } from 'fastify';
+import {
+  parseCountStrategy,
+  parseExportFormat,
+  parseSearchMode,
+  withTransaction,
+  EXPORT_CONTENT_TYPES,
+} from '@dataspace/db';
 import ParticipantRepository from '../repositories/participant-repository';
 import { validateCreateParticipant, validateUpdateParticipant } from '../validators/participant.validator';
+import { ImportRejects, parseImportRecords, resolveImportFormat, validateRecords } from '../import/record-stream';
 import { ParticipantEventHandler } from '../events/participant.event';
 import { CreateParticipantRequest, UpdateParticipantRequest } from '../types/participant';
 
-export async function registerParticipantRoutes(app: FastifyInstance, repository: ParticipantRepository) {
+export async function registerParticipantRoutes(
+  app: FastifyInstance,
+  repository: ParticipantRepository,
+  eventHandler: ParticipantEventHandler = new ParticipantEventHandler()
+) {
   /**
    * GET /participants
    * List all participants with pagination and optional search
-   * Query params: page, pageSize, search
+   * Query params: page, pageSize, search, mode (fulltext|fuzzy), cursor (or after) for keyset pagination
    */
-  app.get<{ Querystring: { page?: string; pageSize?: string; search?: string } }>(
+  app.get<{
+    Querystring: {
+      page?: string;
+      pageSize?: string;
+      search?: string;
+      mode?: string;
+      cursor?: string;
+      after?: string;
+      count?: string;
+    };
+  }>(
     '/participants',
     async (request, reply) => {
       try {
         const page = parseInt(request.query.page || '1') || 1;
         const pageSize = parseInt(request.query.pageSize || '10') || 10;
         const search = request.query.search || '';
+        const cursor = request.query.cursor ?? request.query.after;
+        const count = parseCountStrategy(request.query.count);
+        const mode = parseSearchMode(request.query.mode);
+
+        if (cursor !== undefined) {
+          const keysetResult = search
+            ? await repository.searchAfter(search, cursor || null, pageSize, mode)
+            : await repository.findAllAfter(cursor || null, pageSize);
+
+          return reply.send(keysetResult);
+        }
 
         let result;
         if (search) {
-          result = await repository.search(search, page, pageSize);
+          result = await repository.search(search, page, pageSize, count, mode);
         } else {
-          result = await repository.findAll(page, pageSize);
+          result = await repository.findAll(page, pageSize, count);
         }
 
         return reply.send({
@@ -36,8 +70,23 @@ export async function registerParticipantRoutes(app: FastifyInstance, repository
           pageSize: result.pageSize,
           totalPages: result.totalPages,
         });
-      } catch (error) {
+      } catch (error: any) {
         app.log.error(error);
+
+        if (
+          error.message &&
+          (error.message.includes('Invalid cursor') ||
+            error.message.includes('Invalid count strategy') ||
+            error.message.includes('Invalid search mode'))
+        ) {
+          return reply.status(400).send({
+            error: {
+              code: 'VALIDATION_ERROR',
+              message: error.message,
+            },
+          });
+        }
+
         return reply.status(500).send({
           error: {
             code: 'INTERNAL_SERVER_ERROR',
@@ -48,6 +97,41 @@ export async function registerParticipantRoutes(app: FastifyInstance, repository
     }
   );
 
+  /**
+   * GET /participants/export
+   * Stream all participants as CSV or NDJSON from a server-side cursor
+   * Query params: format (csv|ndjson, default ndjson)
+   */
+  app.get<{ Querystring: { format?: string } }>('/participants/export', async (request, reply) => {
+    try {
+      const format = parseExportFormat(request.query.format);
+      const stream = await repository.exportAll(format);
+
+      return reply
+        .header('Content-Type', EXPORT_CONTENT_TYPES[format])
+        .header('Content-Disposition', `attachment; filename="participants.${format}"`)
+        .send(stream);
+    } catch (error: any) {
+      app.log.error(error);
+
+      if (error.message === 'Invalid export format') {
+        return reply.status(400).send({
+          error: {
+            code: 'VALIDATION_ERROR',
+            message: error.message,
+          },
+        });
+      }
+
+      return reply.status(500).send({
+        error: {
+          code: 'INTERNAL_SERVER_ERROR',
+          message: 'Failed to export participants',
+        },
+      });
+    }
+  });
+
   /**
    * GET /participants/:id
    * Get a specific participant by ID
@@ -87,11 +171,12 @@ export async function registerParticipantRoutes(app: FastifyInstance, repository
       // Validate input
       const validated = await validateCreateParticipant(request.body);
 
-      const participant = await repository.create(validated);
-
-      // Emit event
-      const eventHandler = new ParticipantEventHandler();
-      await eventHandler.onParticipantCreated(participant);
+      // The event is recorded in the same transaction as the change
+      const participant = await withTransaction(async () => {
+        const created = await repository.create(validated);
+        await eventHandler.onParticipantCreated(created);
+        return created;
+      });
 
       return reply.status(201).send({ data: participant });
     } catch (error: any) {
@@ -124,6 +209,45 @@ export async function registerParticipantRoutes(app: FastifyInstance, repository
     }
   });
 
+  /**
+   * POST /participants/import
+   * Bulk import participants from an NDJSON (application/x-ndjson) or CSV (text/csv) body.
+   * The body is streamed through validation into COPY; rejected rows are reported by row number.
+   * Each inserted row is recorded as a created event in the same transaction.
+   * Query params: format (ndjson|csv) to override the content type
+   */
+  app.post<{ Querystring: { format?: string } }>('/participants/import', async (request, reply) => {
+    try {
+      const format = resolveImportFormat(request.headers['content-type'], request.query.format);
+      const body = request.body as Readable | undefined;
+
+      if (!format || !body || typeof body.pipe !== 'function') {
+        return reply.status(400).send({
+          error: {
+            code: 'VALIDATION_ERROR',
+            message: 'Invalid import body: send application/x-ndjson or text/csv',
+          },
+        });
+      }
+
+      const rejects = new ImportRejects();
+      const rows = validateRecords(parseImportRecords(body, format), validateCreateParticipant, rejects);
+      const { imported, rejects: conflicts } = await repository.importMany(rows);
+      conflicts.forEach((reject) => rejects.add(reject.row, reject.error));
+
+      return reply.status(200).send({ data: rejects.toResult(imported) });
+    } catch (error: any) {
+      app.log.error(error);
+
+      return reply.status(500).send({
+        error: {
+          code: 'INTERNAL_SERVER_ERROR',
+          message: 'Failed to import participants',
+        },
+      });
+    }
+  });
+
   /**
    * PUT /participants/:id
    * Update a participant
@@ -145,11 +269,11 @@ export async function registerParticipantRoutes(app: FastifyInstance, repository
           });
         }
 
-        const participant = await repository.update(id, validated);
-
-        // Emit event
-        const eventHandler = new ParticipantEventHandler();
-        await eventHandler.onParticipantUpdated(oldParticipant, participant);
+        const participant = await withTransaction(async () => {
+          const updated = await repository.update(id, validated);
+          await eventHandler.onParticipantUpdated(oldParticipant, updated);
+          return updated;
+        });
 
         return reply.send({ data: participant });
       } catch (error: any) {
@@ -201,11 +325,10 @@ export async function registerParticipantRoutes(app: FastifyInstance, repository
         });
       }
 
-      await repository.delete(id);
-
-      // Emit event
-      const eventHandler = new ParticipantEventHandler();
-      await eventHandler.onParticipantDeleted(participant);
+      await withTransaction(async () => {
+        await repository.delete(id);
+        await eventHandler.onParticipantDeleted(participant);
+      });
 
       return reply.status(204).send();
     } catch (error: any) {
@@ -0,0 +1,142 @@
+/**
+ * Search Routes - Unified search and autocomplete
+ */
+
+import { FastifyInstance } from 'fastify';
+import { parseCountStrategy, parseSearchMode } from '@dataspace/db';
+import ParticipantRepository from '../repositories/participant-repository';
+import DatasetRepository from '../repositories/dataset-repository';
+import SearchRepository from '../repositories/search-repository';
+import { SEARCH_DOCUMENT_TYPES, SearchDocumentType } from '../types/search';
+
+const DEFAULT_SUGGEST_LIMIT = 5;
+const MAX_SUGGEST_LIMIT = 20;
+const MAX_SEARCH_PAGE_SIZE = 100;
+
+/**
+ * Parse a comma-separated list of document types, e.g. `dataset,schema`
+ */
+const parseSearchTypes = (value: string | undefined): SearchDocumentType[] => {
+  if (!value) {
+    return [];
+  }
+
+  const types = value.split(',').map((type) => type.trim()).filter(Boolean);
+  const unknown = types.find((type) => !SEARCH_DOCUMENT_TYPES.includes(type as SearchDocumentType));
+  if (unknown) {
+    throw new Error(`Invalid search type: ${unknown}`);
+  }
+
+  return types as SearchDocumentType[];
+};
+
+export async function registerSearchRoutes(
+  app: FastifyInstance,
+  participantRepository: ParticipantRepository,
+  datasetRepository: DatasetRepository,
+  searchRepository: SearchRepository
+) {
+  /**
+   * GET /search
+   * Ranked, paginated search across participants, datasets, schemas,
+   * vocabularies, policies, contracts and apps from the unified index
+   * Query params: q, type (comma-separated), mode (fulltext|fuzzy), page, pageSize, count
+   */
+  app.get<{
+    Querystring: {
+      q?: string;
+      type?: string;
+      mode?: string;
+      page?: string;
+      pageSize?: string;
+      count?: string;
+    };
+  }>('/search', async (request, reply) => {
+    try {
+      const text = (request.query.q || '').trim();
+      const page = parseInt(request.query.page || '1') || 1;
+      const pageSize = Math.min(parseInt(request.query.pageSize || '20') || 20, MAX_SEARCH_PAGE_SIZE);
+      const types = parseSearchTypes(request.query.type);
+      const mode = parseSearchMode(request.query.mode);
+      const count = parseCountStrategy(request.query.count);
+
+      if (!text) {
+        return reply.send({ data: [], total: 0, page, pageSize, totalPages: 0, facets: {} });
+      }
+
+      const [result, facets] = await Promise.all([
+        searchRepository.search(text, types, page, pageSize, count, mode),
+        searchRepository.countByType(text, mode),
+      ]);
+
+      return reply.send({
+        data: result.data,
+        total: result.total,
+        page: result.page,
+        pageSize: result.pageSize,
+        totalPages: result.totalPages,
+        facets,
+      });
+    } catch (error: any) {
+      app.log.error(error);
+
+      if (
+        error.message &&
+        (error.message.includes('Invalid search type') ||
+          error.message.includes('Invalid count strategy') ||
+          error.message.includes('Invalid search mode'))
+      ) {
+        return reply.status(400).send({
+          error: {
+            code: 'VALIDATION_ERROR',
+            message: error.message,
+          },
+        });
+      }
+
+      return reply.status(500).send({
+        error: {
+          code: 'INTERNAL_SERVER_ERROR',
+          message: 'Failed to search',
+        },
+      });
+    }
+  });
+
+  /**
+   * GET /suggest
+   * Top participant and dataset names for type-ahead, best match first
+   * Query params: q, limit (default 5, max 20)
+   */
+  app.get<{ Querystring: { q?: string; limit?: string } }>('/suggest', async (request, reply) => {
+    try {
+      const text = (request.query.q || '').trim();
+      const limit = Math.min(
+        parseInt(request.query.limit || String(DEFAULT_SUGGEST_LIMIT)) || DEFAULT_SUGGEST_LIMIT,
+        MAX_SUGGEST_LIMIT
+      );
+
+      if (!text) {
+        return reply.send({ data: [] });
+      }
+
+      const [participants, datasets] = await Promise.all([
+        participantRepository.suggest(text, limit),
+        datasetRepository.suggest(text, limit),
+      ]);
+
+      const data = [...participants, ...datasets].sort((a, b) => b.score - a.score).slice(0, limit);
+
+      return reply.send({ data });
+    } catch (error: any) {
+      app.log.error(error);
+
+      return reply.status(500).send({
+        error: {
+          code: 'INTERNAL_SERVER_ERROR',
+          message: 'Failed to fetch suggestions',
+        },
+      });
+    }
+  });
+}
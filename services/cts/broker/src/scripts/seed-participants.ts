@@ -3,8 +3,8 @@
  * Jalankan: npx tsx src/scripts/seed-participants.ts
  */
 
-import { query, initializePool } from '@dataspace/db';
-import { randomUUID } from 'crypto';
+import { query, initializePool, withTransaction } from '@dataspace/db';
+import ParticipantRepository from '../repositories/participant-repository';
 
 const seedParticipants = async () => {
   try {
@@ -22,14 +22,6 @@ const seedParticipants = async () => {
     initializePool(dbConfig);
     console.log('✅ Database pool initialized');
 
-    // Clear existing participants
-    console.log('\n🗑️  Clearing existing participants...');
-    await query('DELETE FROM participants');
-    console.log('✅ Participants cleared');
-
-    // Insert seed data
-    console.log('\n🌱 Adding seed participants...');
-
     const participants = [
       {
         did: 'did:example:participant1',
@@ -89,26 +81,23 @@ const seedParticipants = async () => {
       },
     ];
 
-    for (const participant of participants) {
-      const result = await query(
-        `INSERT INTO participants (id, did, name, description, endpoint_url, public_key, status)
-         VALUES ($1, $2, $3, $4, $5, $6, $7)
-         RETURNING id`,
-        [
-          randomUUID(),
-          participant.did,
-          participant.name,
-          participant.description,
-          participant.endpointUrl,
-          participant.publicKey,
-          'active',
-        ]
-      );
+    // Clear and re-insert in one transaction, so a failed seed leaves the table untouched
+    const participantRepository = new ParticipantRepository();
+    const created = await withTransaction(async () => {
+      console.log('\n🗑️  Clearing existing participants...');
+      await query('DELETE FROM participants');
+      console.log('✅ Participants cleared');
+
+      console.log('\n🌱 Adding seed participants...');
+      return participantRepository.createMany(participants);
+    });
+
+    for (const participant of created) {
       console.log(`  ✅ ${participant.name} (${participant.did})`);
     }
 
     console.log('\n✅ Seed completed successfully!');
-    console.log(`✅ Total ${participants.length} participants added`);
+    console.log(`✅ Total ${created.length} participants added`);
 
     process.exit(0);
   } catch (error) {
@@ -0,0 +1,33 @@
+/**
+ * Bulk Import Type Definitions
+ */
+
+export type ImportFormat = 'ndjson' | 'csv';
+
+/**
+ * One parsed record from an import body (row numbers start at 1)
+ */
+export interface ImportRecord {
+  row: number;
+  data?: Record<string, unknown>;
+  error?: string;
+}
+
+/**
+ * A validated row ready to be copied
+ */
+export interface ImportRow<T> {
+  row: number;
+  data: T;
+}
+
+export interface ImportReject {
+  row: number;
+  error: string;
+}
+
+export interface ImportResult {
+  imported: number;
+  rejected: number;
+  rejects: ImportReject[];
+}
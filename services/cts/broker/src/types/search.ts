@@ -0,0 +1,52 @@
+/**
+ * Search Type Definitions
+ */
+
+export interface SearchSuggestion {
+  type: 'participant' | 'dataset';
+  id: string;
+  name: string;
+  score: number;
+}
+
+/**
+ * Entity kinds held in the unified search index
+ */
+export type SearchDocumentType =
+  | 'participant'
+  | 'dataset'
+  | 'schema'
+  | 'vocabulary'
+  | 'policy'
+  | 'contract'
+  | 'app';
+
+export const SEARCH_DOCUMENT_TYPES: SearchDocumentType[] = [
+  'participant',
+  'dataset',
+  'schema',
+  'vocabulary',
+  'policy',
+  'contract',
+  'app',
+];
+
+/**
+ * Denormalized copy of an entity from any service, as stored in search_documents
+ */
+export interface SearchDocument {
+  type: SearchDocumentType;
+  id: string;
+  title: string;
+  body?: string | null;
+  status?: string | null;
+  metadata?: Record<string, unknown>;
+}
+
+/**
+ * Ranked /search result
+ */
+export interface SearchHit extends SearchDocument {
+  score: number;
+  updatedAt: string;
+}
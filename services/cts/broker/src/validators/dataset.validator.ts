@@ -2,6 +2,8 @@
  * Dataset Input Validators
  */
 
+const UUID_PATTERN = /^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$/i;
+
 export async function validateCreateDataset(data: unknown) {
   // Validate required fields
   if (typeof data !== 'object' || data === null) {
@@ -15,6 +17,10 @@ export async function validateCreateDataset(data: unknown) {
     throw new Error('Invalid participantId: must be a non-empty string');
   }
 
+  if (!UUID_PATTERN.test(obj.participantId)) {
+    throw new Error('Invalid participantId: must be a UUID');
+  }
+
   // Validate name (required)
   if (typeof obj.name !== 'string' || obj.name.trim().length === 0) {
     throw new Error('Invalid name: must be a non-empty string');
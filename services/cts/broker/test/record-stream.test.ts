@@ -0,0 +1,246 @@
+import { describe, it, expect } from 'vitest';
+import { PassThrough, Readable } from 'node:stream';
+import {
+  ImportRejects,
+  parseCsv,
+  parseImportRecords,
+  parseNdjson,
+  resolveImportFormat,
+  validateRecords,
+} from '../src/import/record-stream';
+import type { ImportRecord } from '../src/types/import';
+
+/**
+ * A byte stream delivering each argument as a separate chunk, like a request body
+ */
+const body = (...chunks: (string | Buffer)[]): Readable => {
+  const stream = new PassThrough();
+  chunks.forEach((chunk) => stream.write(chunk));
+  stream.end();
+  return stream;
+};
+
+/**
+ * The same text delivered one byte at a time, splitting multi-byte characters
+ */
+const byteByByte = (text: string): Readable => {
+  const bytes = Buffer.from(text);
+  return body(...Array.from(bytes, (_, i) => bytes.subarray(i, i + 1)));
+};
+
+const collect = async <T>(records: AsyncIterable<T>): Promise<T[]> => {
+  const out: T[] = [];
+  for await (const record of records) out.push(record);
+  return out;
+};
+
+describe('resolveImportFormat', () => {
+  it('prefers an explicit format', () => {
+    expect(resolveImportFormat('text/csv', 'ndjson')).toBe('ndjson');
+    expect(resolveImportFormat(undefined, 'csv')).toBe('csv');
+    expect(resolveImportFormat('text/csv', 'xml')).toBeNull();
+  });
+
+  it('reads the media type and ignores parameters', () => {
+    expect(resolveImportFormat('text/csv; charset=utf-8')).toBe('csv');
+    expect(resolveImportFormat('Application/X-NDJSON')).toBe('ndjson');
+    expect(resolveImportFormat('application/ndjson')).toBe('ndjson');
+    expect(resolveImportFormat('application/json')).toBeNull();
+    expect(resolveImportFormat()).toBeNull();
+  });
+});
+
+describe('parseCsv', () => {
+  it('maps rows onto the header and treats empty cells as absent', async () => {
+    const records = await collect(parseCsv(body(' name , status,description\nWeather,draft,\nTraffic,,daily\n')));
+
+    expect(records).toEqual([
+      { row: 1, data: { name: 'Weather', status: 'draft' } },
+      { row: 2, data: { name: 'Traffic', description: 'daily' } },
+    ]);
+  });
+
+  it('reads quoted fields with commas and doubled quotes', async () => {
+    const records = await collect(parseCsv(body('name,description\n"Rain, hourly","the ""raw"" feed"\n"",x\n')));
+
+    expect(records).toEqual([
+      { row: 1, data: { name: 'Rain, hourly', description: 'the "raw" feed' } },
+      { row: 2, data: { description: 'x' } },
+    ]);
+  });
+
+  it('keeps newlines inside quoted fields', async () => {
+    const records = await collect(parseCsv(body('name,description\r\nA,"line one\nline two"\r\nB,"crlf\r\nkept"\r\nC,plain\r\n')));
+
+    expect(records).toEqual([
+      { row: 1, data: { name: 'A', description: 'line one\nline two' } },
+      { row: 2, data: { name: 'B', description: 'crlf\r\nkept' } },
+      { row: 3, data: { name: 'C', description: 'plain' } },
+    ]);
+  });
+
+  it('drops CR from CRLF line endings', async () => {
+    const records = await collect(parseCsv(body('name,status\r\nA,draft\r\n')));
+
+    expect(records).toEqual([{ row: 1, data: { name: 'A', status: 'draft' } }]);
+  });
+
+  it('strips a leading byte order mark', async () => {
+    expect(await collect(parseCsv(body('\uFEFFname\nA\n')))).toEqual([{ row: 1, data: { name: 'A' } }]);
+    expect(await collect(parseCsv(body('\uFEFF"name"\nA\n')))).toEqual([{ row: 1, data: { name: 'A' } }]);
+  });
+
+  it('skips blank lines without numbering them', async () => {
+    const records = await collect(parseCsv(body('\nname\n\nA\r\n\r\n\nB\n\n')));
+
+    expect(records).toEqual([
+      { row: 1, data: { name: 'A' } },
+      { row: 2, data: { name: 'B' } },
+    ]);
+  });
+
+  it('reports rows with the wrong field count and keeps numbering', async () => {
+    const records = await collect(parseCsv(body('name,status\nA\nB,draft,extra\nC,draft\n')));
+
+    expect(records).toEqual([
+      { row: 1, error: 'Invalid row: expected 2 fields, got 1' },
+      { row: 2, error: 'Invalid row: expected 2 fields, got 3' },
+      { row: 3, data: { name: 'C', status: 'draft' } },
+    ]);
+  });
+
+  it('reads a last row without a trailing newline', async () => {
+    expect(await collect(parseCsv(body('name,status\nA,draft')))).toEqual([{ row: 1, data: { name: 'A', status: 'draft' } }]);
+  });
+
+  it('yields nothing for a header-only or empty body', async () => {
+    expect(await collect(parseCsv(body('name,status\n')))).toEqual([]);
+    expect(await collect(parseCsv(body()))).toEqual([]);
+  });
+
+  it('does not depend on chunk boundaries', async () => {
+    const text = '\uFEFFname,description\r\n"Säo ""Paulo""","multi\r\nline, ✓"\r\n\r\nB,x\r\n';
+
+    expect(await collect(parseCsv(byteByByte(text)))).toEqual(await collect(parseCsv(body(text))));
+    expect(await collect(parseCsv(byteByByte(text)))).toEqual([
+      { row: 1, data: { name: 'Säo "Paulo"', description: 'multi\r\nline, ✓' } },
+      { row: 2, data: { name: 'B', description: 'x' } },
+    ]);
+  });
+});
+
+describe('parseNdjson', () => {
+  it('yields one object per line', async () => {
+    const records = await collect(parseNdjson(body('{"name":"A"}\n{"name":"B","tags":["x"]}\n')));
+
+    expect(records).toEqual([
+      { row: 1, data: { name: 'A' } },
+      { row: 2, data: { name: 'B', tags: ['x'] } },
+    ]);
+  });
+
+  it('skips blank lines without numbering them and accepts CRLF', async () => {
+    const records = await collect(parseNdjson(body('\r\n{"name":"A"}\r\n   \r\n\n{"name":"B"}')));
+
+    expect(records).toEqual([
+      { row: 1, data: { name: 'A' } },
+      { row: 2, data: { name: 'B' } },
+    ]);
+  });
+
+  it('strips a leading byte order mark', async () => {
+    expect(await collect(parseNdjson(body('\uFEFF{"name":"A"}\n')))).toEqual([{ row: 1, data: { name: 'A' } }]);
+  });
+
+  it('reports invalid lines and keeps numbering', async () => {
+    const records = await collect(parseNdjson(body('{"name":\n[1]\nnull\n42\n{"name":"A"}\n')));
+
+    expect(records).toEqual([
+      { row: 1, error: 'Invalid JSON' },
+      { row: 2, error: 'Invalid input: expected object' },
+      { row: 3, error: 'Invalid input: expected object' },
+      { row: 4, error: 'Invalid input: expected object' },
+      { row: 5, data: { name: 'A' } },
+    ]);
+  });
+
+  it('does not depend on chunk boundaries', async () => {
+    expect(await collect(parseNdjson(byteByByte('{"name":"Säo ✓"}\r\n{"name":"B"}\n')))).toEqual([
+      { row: 1, data: { name: 'Säo ✓' } },
+      { row: 2, data: { name: 'B' } },
+    ]);
+  });
+});
+
+describe('parseImportRecords', () => {
+  it('picks the parser for the format', async () => {
+    expect(await collect(parseImportRecords(body('name\nA\n'), 'csv'))).toEqual([{ row: 1, data: { name: 'A' } }]);
+    expect(await collect(parseImportRecords(body('{"name":"A"}\n'), 'ndjson'))).toEqual([{ row: 1, data: { name: 'A' } }]);
+  });
+});
+
+describe('ImportRejects', () => {
+  it('counts every reject but lists only the first 1000', () => {
+    const rejects = new ImportRejects();
+    for (let row = 1; row <= 1500; row++) rejects.add(row, 'Invalid JSON');
+
+    const result = rejects.toResult(20);
+
+    expect(result.imported).toBe(20);
+    expect(result.rejected).toBe(1500);
+    expect(result.rejects).toHaveLength(1000);
+    expect(result.rejects[0]).toEqual({ row: 1, error: 'Invalid JSON' });
+    expect(result.rejects[999]).toEqual({ row: 1000, error: 'Invalid JSON' });
+  });
+
+  it('lists rejects by row', () => {
+    const rejects = new ImportRejects();
+    rejects.add(7, 'b');
+    rejects.add(3, 'a');
+
+    expect(rejects.toResult(0)).toEqual({
+      imported: 0,
+      rejected: 2,
+      rejects: [
+        { row: 3, error: 'a' },
+        { row: 7, error: 'b' },
+      ],
+    });
+  });
+});
+
+describe('validateRecords', () => {
+  async function* records(...items: ImportRecord[]) {
+    yield* items;
+  }
+
+  const validate = async (data: any) => {
+    if (!data.name) throw new Error('name is required');
+    return { name: String(data.name).toUpperCase() };
+  };
+
+  it('yields valid rows and records parse and validation failures with their row', async () => {
+    const rejects = new ImportRejects();
+
+    const valid = await collect(
+      validateRecords(
+        records({ row: 1, data: { name: 'a' } }, { row: 2, error: 'Invalid JSON' }, { row: 3, data: {} }, { row: 4, data: { name: 'b' } }),
+        validate,
+        rejects
+      )
+    );
+
+    expect(valid).toEqual([
+      { row: 1, data: { name: 'A' } },
+      { row: 4, data: { name: 'B' } },
+    ]);
+    expect(rejects.toResult(valid.length)).toEqual({
+      imported: 2,
+      rejected: 2,
+      rejects: [
+        { row: 2, error: 'Invalid JSON' },
+        { row: 3, error: 'name is required' },
+      ],
+    });
+  });
+});
@@ -1,7 +1,8 @@
 import Fastify from 'fastify';
 import cors from '@fastify/cors';
 import helmet from '@fastify/helmet';
-import { query, initializePool } from '@dataspace/db';
+import { createJwtVerifierFromEnv, createRevocationListFromEnv, jwtAuth } from '@dataspace/auth';
+import { query, initializePool, buildKeysetQuery, toKeysetPage } from '@dataspace/db';
 import { v4 as uuidv4 } from 'uuid';
 
 const PORT = parseInt(process.env.PORT || '3009', 10);
@@ -51,6 +52,13 @@ async function start() {
   await fastify.register(cors);
   await fastify.register(helmet);
 
+  // Bearer tokens are verified locally against the IdP's published keys
+  // Revoked token ids are replicated from Redis into memory, so checking one
+  // costs a Map lookup rather than a round trip per request
+  const revocations = await createRevocationListFromEnv();
+  const verifier = createJwtVerifierFromEnv(revocations);
+  await fastify.register(jwtAuth, { verifier, required: process.env.AUTH_REQUIRED === 'true' });
+
   fastify.get('/health', async (request, reply) => {
     return { status: 'ok' };
   });
@@ -59,12 +67,30 @@ async function start() {
    * GET /connectors
    * List all connectors with pagination
    */
-  fastify.get<{ Querystring: { page?: string; pageSize?: string } }>(
+  fastify.get<{ Querystring: { page?: string; pageSize?: string; cursor?: string; after?: string } }>(
     '/connectors',
     async (request, reply) => {
       try {
         const page = parseInt(request.query.page || '1') || 1;
         const pageSize = parseInt(request.query.pageSize || '10') || 10;
+        const cursor = request.query.cursor ?? request.query.after;
+
+        if (cursor !== undefined) {
+          const { text, values } = buildKeysetQuery({
+            columns: `id, name, description, connector_type as "connectorType", config,
+                      status, created_at as "createdAt", updated_at as "updatedAt"`,
+            from: 'connectors',
+            after: cursor || null,
+            pageSize,
+          });
+          const keysetResult = await query(text, values);
+          return reply.send(
+            toKeysetPage(keysetResult.rows, pageSize, (row: any) => ({
+              ...row,
+              config: typeof row.config === 'string' ? JSON.parse(row.config) : row.config,
+            }))
+          );
+        }
 
         const countResult = await query('SELECT COUNT(*) FROM connectors');
         const total = parseInt(countResult.rows[0].count, 10);
@@ -91,6 +117,14 @@ async function start() {
           totalPages,
         });
       } catch (error) {
+        if (error instanceof Error && error.message === 'Invalid cursor') {
+          return reply.status(400).send({
+            error: {
+              code: 'VALIDATION_ERROR',
+              message: error.message,
+            },
+          });
+        }
         fastify.log.error(error);
         return reply.status(500).send({
           error: {
@@ -1,11 +1,39 @@
+import { appendToOutbox } from '@dataspace/db';
+import { createDomainEvent, EventTopics, EventType, toOutboxEntry } from '@dataspace/kafka';
 import { Schema } from '../types';
 
+// Events are recorded in the transactional outbox and published to Kafka by
+// the OutboxRelay; call these inside the withTransaction() that writes the change.
 export class SchemaEventHandler {
   async onSchemaCreated(schema: Schema) {
     console.log(`[Event] Schema created: ${schema.id} (${schema.name})`);
+    await this.emit(EventType.SCHEMA_CREATED, schema);
+  }
+
+  async onSchemaUpdated(schema: Schema) {
+    console.log(`[Event] Schema updated: ${schema.id}`);
+    await this.emit(EventType.SCHEMA_UPDATED, schema);
   }
 
   async onSchemaPublished(schema: Schema) {
     console.log(`[Event] Schema published: ${schema.id}`);
+    await this.emit(EventType.SCHEMA_UPDATED, schema);
+  }
+
+  async onSchemaDeleted(schema: Schema) {
+    console.log(`[Event] Schema deleted: ${schema.id}`);
+    await this.emit(EventType.SCHEMA_DELETED, schema);
+  }
+
+  private async emit(eventType: EventType, schema: Schema) {
+    const event = createDomainEvent(eventType, 'schema', schema.id, {
+      schemaId: schema.id,
+      name: schema.name,
+      namespace: schema.namespace,
+      version: schema.version,
+      format: schema.format,
+      status: schema.status,
+    });
+    await appendToOutbox(toOutboxEntry(EventTopics.SCHEMAS, event));
   }
 }
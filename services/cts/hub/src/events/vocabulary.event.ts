@@ -1,11 +1,38 @@
+import { appendToOutbox } from '@dataspace/db';
+import { createDomainEvent, EventTopics, EventType, toOutboxEntry } from '@dataspace/kafka';
 import { Vocabulary } from '../types';
 
+// Events are recorded in the transactional outbox and published to Kafka by
+// the OutboxRelay; call these inside the withTransaction() that writes the change.
 export class VocabularyEventHandler {
   async onVocabularyCreated(vocab: Vocabulary) {
     console.log(`[Event] Vocabulary created: ${vocab.id} (${vocab.name})`);
+    await this.emit(EventType.VOCABULARY_CREATED, vocab);
+  }
+
+  async onVocabularyUpdated(vocab: Vocabulary) {
+    console.log(`[Event] Vocabulary updated: ${vocab.id}`);
+    await this.emit(EventType.VOCABULARY_UPDATED, vocab);
   }
 
   async onVocabularyPublished(vocab: Vocabulary) {
     console.log(`[Event] Vocabulary published: ${vocab.id}`);
+    await this.emit(EventType.VOCABULARY_UPDATED, vocab);
+  }
+
+  async onVocabularyDeleted(vocab: Vocabulary) {
+    console.log(`[Event] Vocabulary deleted: ${vocab.id}`);
+    await this.emit(EventType.VOCABULARY_DELETED, vocab);
+  }
+
+  private async emit(eventType: EventType, vocab: Vocabulary) {
+    const event = createDomainEvent(eventType, 'vocabulary', vocab.id, {
+      vocabularyId: vocab.id,
+      name: vocab.name,
+      namespace: vocab.namespace,
+      version: vocab.version,
+      status: vocab.status,
+    });
+    await appendToOutbox(toOutboxEntry(EventTopics.VOCABULARIES, event));
   }
 }
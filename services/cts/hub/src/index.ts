@@ -1,7 +1,10 @@
 import Fastify from 'fastify';
 import helmet from '@fastify/helmet';
 import cors from '@fastify/cors';
-import { initializePool } from '@dataspace/db';
+import { createJwtVerifierFromEnv, createRevocationListFromEnv, jwtAuth } from '@dataspace/auth';
+import { initializePool, getStatementStats, getOutboxBacklog, outboxStore, afterCommit } from '@dataspace/db';
+import { KafkaClient, OutboxRelay, outboxRelayOptionsFromEnv } from '@dataspace/kafka';
+import { CacheKeys, createCacheFromEnv, withReadThroughCache } from '@dataspace/redis';
 import SchemaRepository from './repositories/schema-repository';
 import VocabularyRepository from './repositories/vocabulary-repository';
 import { registerRoutes } from './routes';
@@ -11,6 +14,13 @@ const app = Fastify({ logger: true });
 await app.register(helmet, { contentSecurityPolicy: false });
 await app.register(cors);
 
+// Bearer tokens are verified locally against the IdP's published keys
+// Revoked token ids are replicated from Redis into memory, so checking one
+// costs a Map lookup rather than a round trip per request
+const revocations = await createRevocationListFromEnv();
+const verifier = createJwtVerifierFromEnv(revocations);
+await app.register(jwtAuth, { verifier, required: process.env.AUTH_REQUIRED === 'true' });
+
 // Initialize database pool
 const dbConfig = {
   host: process.env.DB_HOST || 'localhost',
@@ -36,19 +46,72 @@ try {
   process.exit(1);
 }
 
-const schemaRepo = new SchemaRepository();
-const vocabRepo = new VocabularyRepository();
+// Optional read-through cache for detail lookups (CACHE_ENABLED=true)
+const cacheConfig = await createCacheFromEnv();
+
+let schemaRepo = new SchemaRepository();
+let vocabRepo = new VocabularyRepository();
+
+if (cacheConfig) {
+  schemaRepo = withReadThroughCache(schemaRepo, {
+    cache: cacheConfig.cache,
+    entity: 'schema',
+    ttl: cacheConfig.ttl,
+    afterCommit,
+    lookups: { findById: CacheKeys.schema },
+  });
+  vocabRepo = withReadThroughCache(vocabRepo, {
+    cache: cacheConfig.cache,
+    entity: 'vocabulary',
+    ttl: cacheConfig.ttl,
+    afterCommit,
+    lookups: { findById: CacheKeys.vocabulary },
+  });
+  console.log('Read-through cache enabled for schemas and vocabularies');
+}
 await registerRoutes(app, schemaRepo, vocabRepo);
 
+// Domain events are written to the outbox with each change and relayed to
+// Kafka when it is configured; otherwise they wait in the outbox.
+let outboxRelay: OutboxRelay | null = null;
+if (process.env.KAFKA_BROKERS) {
+  const kafka = new KafkaClient({
+    brokers: process.env.KAFKA_BROKERS.split(','),
+    clientId: process.env.KAFKA_CLIENT_ID || 'cts-hub',
+  });
+  outboxRelay = new OutboxRelay(kafka, outboxStore, outboxRelayOptionsFromEnv());
+  outboxRelay.start();
+}
+
 app.get('/health', async (request, reply) => {
   return { status: 'healthy', service: 'cts-hub', timestamp: new Date().toISOString() };
 });
 
+// Prepared statement metrics (calls, latency percentiles, rows, pool wait)
+app.get('/metrics/db', async (request, reply) => {
+  return { statements: getStatementStats() };
+});
+
+// Cache hit/miss metrics per tier
+app.get('/metrics/cache', async (request, reply) => {
+  return { enabled: cacheConfig !== null, stats: cacheConfig?.cache.getStats() ?? null };
+});
+
+// Access token verification counters
+app.get('/metrics/auth', async (request, reply) => {
+  return { verifier: verifier.getStats(), revocations: revocations.getStats() };
+});
+
+// Outbox relay progress and unpublished backlog
+app.get('/metrics/outbox', async (request, reply) => {
+  return { relay: outboxRelay?.getStats() ?? null, backlog: await getOutboxBacklog() };
+});
+
 const start = async () => {
   try {
     await app.listen({ port: 3002, host: '0.0.0.0' });
     console.log('Hub Service running on http://localhost:3002');
-    console.log('Endpoints: GET /schemas, POST /schemas, GET /vocabularies, POST /vocabularies');
+    console.log('Endpoints: GET /schemas, POST /schemas, GET /vocabularies, POST /vocabularies, GET /suggest');
   } catch (err) {
     app.log.error(err);
     process.exit(1);
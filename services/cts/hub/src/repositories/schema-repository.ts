@@ -3,54 +3,160 @@
  * Handles all schema data persistence operations
  */
 
-import { query } from '@dataspace/db';
-import { Schema, CreateSchemaRequest, UpdateSchemaRequest } from '../types';
+import type { Readable } from 'node:stream';
+import {
+  query,
+  queryPage,
+  buildKeysetQuery,
+  toKeysetPage,
+  fuzzySearch,
+  escapeLike,
+  buildSuggestQuery,
+  defineStatement,
+  execute,
+  CrudRepository,
+  type CountStrategy,
+  type SearchMode,
+  type ExportFormat,
+  type KeysetPage,
+  type TableDescriptor,
+} from '@dataspace/db';
+import { Schema, CreateSchemaRequest, UpdateSchemaRequest, SearchSuggestion } from '../types';
+
+const SCHEMA_TABLE: TableDescriptor = {
+  table: 'schemas',
+  returning: `id, name, version, type as format, definition as content, description,
+              status, created_at as "createdAt", updated_at as "updatedAt"`,
+  columns: {
+    name: 'name',
+    version: 'version',
+    format: 'type',
+    content: 'definition',
+    description: 'description',
+    status: 'status',
+  },
+  jsonColumns: ['content'],
+};
+
+const SUGGEST = defineStatement('schemas.suggest', buildSuggestQuery('schemas', 'name', 'id, name'));
 
 class SchemaRepository {
+  private readonly crud = new CrudRepository<Schema>(SCHEMA_TABLE, (row) => this.mapRowToSchema(row));
+
   /**
    * Find all schemas with pagination
    */
-  async findAll(page: number = 1, pageSize: number = 10) {
+  async findAll(page: number = 1, pageSize: number = 10, count: CountStrategy = 'exact') {
     try {
-      // Get total count
-      const countResult = await query('SELECT COUNT(*) FROM schemas');
-      const total = parseInt(countResult.rows[0].count, 10);
-
-      // Get paginated data
-      const offset = (page - 1) * pageSize;
-      const result = await query(
-        `SELECT id, name, version, type as format, definition as content, description,
-                status, created_at as "createdAt", updated_at as "updatedAt"
-         FROM schemas
-         ORDER BY created_at DESC
-         LIMIT $1 OFFSET $2`,
-        [pageSize, offset]
+      return await queryPage(
+        {
+          columns: `id, name, version, type as format, definition as content, description,
+                    status, created_at as "createdAt", updated_at as "updatedAt"`,
+          from: 'schemas',
+          page,
+          pageSize,
+          count,
+        },
+        (row) => this.mapRowToSchema(row)
       );
+    } catch (error) {
+      console.error('Error fetching all schemas:', error);
+      throw error;
+    }
+  }
 
-      const data = result.rows.map((row: any) => this.mapRowToSchema(row));
-      const totalPages = Math.ceil(total / pageSize);
+  /**
+   * Find all schemas with keyset (cursor) pagination
+   */
+  async findAllAfter(after: string | null, pageSize: number = 10): Promise<KeysetPage<Schema>> {
+    try {
+      const { text, values } = buildKeysetQuery({
+        columns: `id, name, version, type as format, definition as content, description,
+                  status, created_at as "createdAt", updated_at as "updatedAt"`,
+        from: 'schemas',
+        after,
+        pageSize,
+      });
+      const result = await query(text, values);
 
-      return { data, total, page, pageSize, totalPages };
+      return toKeysetPage(result.rows, pageSize, (row) => this.mapRowToSchema(row));
     } catch (error) {
-      console.error('Error fetching all schemas:', error);
+      console.error('Error fetching schemas by cursor:', error);
       throw error;
     }
   }
 
   /**
-   * Find schema by ID
+   * Search schemas by name, best match first. The default mode matches substrings,
+   * fuzzy mode tolerates typos; both are served by the trigram index on name.
    */
-  async findById(id: string): Promise<Schema | null> {
+  async search(
+    text: string,
+    page: number = 1,
+    pageSize: number = 10,
+    count: CountStrategy = 'exact',
+    mode: SearchMode = 'fulltext'
+  ) {
     try {
-      const result = await query(
-        `SELECT id, name, version, type as format, definition as content, description,
-                status, created_at as "createdAt", updated_at as "updatedAt"
-         FROM schemas
-         WHERE id = $1`,
-        [id]
+      const fuzzy = fuzzySearch('$1', ['name']);
+
+      return await queryPage(
+        {
+          columns: `id, name, version, type as format, definition as content, description,
+                    status, created_at as "createdAt", updated_at as "updatedAt"`,
+          from: 'schemas',
+          where: mode === 'fuzzy' ? fuzzy.where : 'name ILIKE $2',
+          params: mode === 'fuzzy' ? [text] : [text, `%${escapeLike(text)}%`],
+          orderBy: `${fuzzy.rank} DESC, created_at DESC`,
+          page,
+          pageSize,
+          count,
+        },
+        (row) => this.mapRowToSchema(row)
       );
+    } catch (error) {
+      console.error('Error searching schemas:', error);
+      throw error;
+    }
+  }
+
+  /**
+   * Autocomplete schemas by name: prefix matches first, then closest trigram matches
+   */
+  async suggest(text: string, limit: number = 5): Promise<SearchSuggestion[]> {
+    try {
+      const result = await execute(SUGGEST, [text, `${escapeLike(text)}%`, limit]);
 
-      return result.rows.length > 0 ? this.mapRowToSchema(result.rows[0]) : null;
+      return result.rows.map((row) => ({
+        type: 'schema' as const,
+        id: row.id,
+        name: row.name,
+        score: Number(row.score),
+      }));
+    } catch (error) {
+      console.error('Error suggesting schemas:', error);
+      throw error;
+    }
+  }
+
+  /**
+   * Stream all schemas as CSV or NDJSON
+   */
+  async exportAll(format: ExportFormat): Promise<Readable> {
+    try {
+      return await this.crud.export(format);
+    } catch (error) {
+      console.error('Error exporting schemas:', error);
+      throw error;
+    }
+  }
+
+  /**
+   * Find schema by ID
+   */
+  async findById(id: string): Promise<Schema | null> {
+    try {
+      return await this.crud.findById(id);
     } catch (error) {
       console.error('Error fetching schema by ID:', error);
       throw error;
@@ -60,31 +166,22 @@ class SchemaRepository {
   /**
    * Find schemas by type/format
    */
-  async findByType(type: string, page: number = 1, pageSize: number = 10) {
+  async findByType(type: string, page: number = 1, pageSize: number = 10, count: CountStrategy = 'exact') {
     try {
-      // Get total count
-      const countResult = await query(
-        'SELECT COUNT(*) FROM schemas WHERE type = $1',
-        [type]
-      );
-      const total = parseInt(countResult.rows[0].count, 10);
-
-      // Get paginated data
-      const offset = (page - 1) * pageSize;
-      const result = await query(
-        `SELECT id, name, version, type as format, definition as content, description,
-                status, created_at as "createdAt", updated_at as "updatedAt"
-         FROM schemas
-         WHERE type = $1
-         ORDER BY version DESC
-         LIMIT $2 OFFSET $3`,
-        [type, pageSize, offset]
+      return await queryPage(
+        {
+          columns: `id, name, version, type as format, definition as content, description,
+                    status, created_at as "createdAt", updated_at as "updatedAt"`,
+          from: 'schemas',
+          where: 'type = $1',
+          params: [type],
+          orderBy: 'version DESC',
+          page,
+          pageSize,
+          count,
+        },
+        (row) => this.mapRowToSchema(row)
       );
-
-      const data = result.rows.map((row: any) => this.mapRowToSchema(row));
-      const totalPages = Math.ceil(total / pageSize);
-
-      return { data, total, page, pageSize, totalPages };
     } catch (error) {
       console.error('Error fetching schemas by type:', error);
       throw error;
@@ -96,16 +193,14 @@ class SchemaRepository {
    */
   async create(request: CreateSchemaRequest): Promise<Schema> {
     try {
-      const result = await query(
-        `INSERT INTO schemas
-         (name, version, type, definition, description, status)
-         VALUES ($1, $2, $3, $4, $5, $6)
-         RETURNING id, name, version, type as format, definition as content, description,
-                   status, created_at as "createdAt", updated_at as "updatedAt"`,
-        [request.name, request.version, request.format, JSON.stringify(request.content), '', 'draft']
-      );
-
-      return this.mapRowToSchema(result.rows[0]);
+      return await this.crud.insert({
+        name: request.name,
+        version: request.version,
+        format: request.format,
+        content: request.content,
+        description: '',
+        status: 'draft',
+      });
     } catch (error) {
       console.error('Error creating schema:', error);
       throw error;
@@ -117,44 +212,15 @@ class SchemaRepository {
    */
   async update(id: string, request: UpdateSchemaRequest): Promise<Schema> {
     try {
-      const schema = await this.findById(id);
+      const schema = await this.crud.update(id, {
+        status: request.status,
+        content: request.content,
+      });
       if (!schema) {
         throw new Error(`Schema with ID ${id} not found`);
       }
 
-      const updateFields: string[] = [];
-      const values: any[] = [];
-      let paramIndex = 1;
-
-      if (request.status !== undefined) {
-        updateFields.push(`status = $${paramIndex}`);
-        values.push(request.status);
-        paramIndex++;
-      }
-
-      if (request.content !== undefined) {
-        updateFields.push(`definition = $${paramIndex}`);
-        values.push(JSON.stringify(request.content));
-        paramIndex++;
-      }
-
-      if (updateFields.length === 0) {
-        return schema;
-      }
-
-      updateFields.push(`updated_at = CURRENT_TIMESTAMP`);
-      values.push(id);
-
-      const result = await query(
-        `UPDATE schemas
-         SET ${updateFields.join(', ')}
-         WHERE id = $${paramIndex}
-         RETURNING id, name, version, type as format, definition as content, description,
-                   status, created_at as "createdAt", updated_at as "updatedAt"`,
-        values
-      );
-
-      return this.mapRowToSchema(result.rows[0]);
+      return schema;
     } catch (error) {
       console.error('Error updating schema:', error);
       throw error;
@@ -164,14 +230,13 @@ class SchemaRepository {
   /**
    * Delete schema
    */
-  async delete(id: string): Promise<void> {
+  async delete(id: string): Promise<Schema> {
     try {
-      const schema = await this.findById(id);
+      const schema = await this.crud.delete(id);
       if (!schema) {
         throw new Error(`Schema with ID ${id} not found`);
       }
-
-      await query('DELETE FROM schemas WHERE id = $1', [id]);
+      return schema;
     } catch (error) {
       console.error('Error deleting schema:', error);
       throw error;
@@ -3,54 +3,159 @@
  * Handles all vocabulary data persistence operations
  */
 
-import { query } from '@dataspace/db';
-import { Vocabulary, CreateVocabularyRequest, UpdateVocabularyRequest } from '../types';
+import type { Readable } from 'node:stream';
+import {
+  query,
+  queryPage,
+  buildKeysetQuery,
+  toKeysetPage,
+  fuzzySearch,
+  escapeLike,
+  buildSuggestQuery,
+  defineStatement,
+  execute,
+  CrudRepository,
+  type CountStrategy,
+  type SearchMode,
+  type ExportFormat,
+  type KeysetPage,
+  type TableDescriptor,
+} from '@dataspace/db';
+import { Vocabulary, CreateVocabularyRequest, UpdateVocabularyRequest, SearchSuggestion } from '../types';
+
+const VOCABULARY_TABLE: TableDescriptor = {
+  table: 'vocabularies',
+  returning: `id, name, namespace, terms, description, status,
+              created_at as "createdAt", updated_at as "updatedAt"`,
+  columns: {
+    name: 'name',
+    namespace: 'namespace',
+    terms: 'terms',
+    description: 'description',
+    status: 'status',
+  },
+  jsonColumns: ['terms'],
+};
+
+const SUGGEST = defineStatement('vocabularies.suggest', buildSuggestQuery('vocabularies', 'name', 'id, name'));
 
 class VocabularyRepository {
+  private readonly crud = new CrudRepository<Vocabulary>(VOCABULARY_TABLE, (row) => this.mapRowToVocabulary(row));
+
   /**
    * Find all vocabularies with pagination
    */
-  async findAll(page: number = 1, pageSize: number = 10) {
+  async findAll(page: number = 1, pageSize: number = 10, count: CountStrategy = 'exact') {
     try {
-      // Get total count
-      const countResult = await query('SELECT COUNT(*) FROM vocabularies');
-      const total = parseInt(countResult.rows[0].count, 10);
-
-      // Get paginated data
-      const offset = (page - 1) * pageSize;
-      const result = await query(
-        `SELECT id, name, namespace, terms, status, description,
-                created_at as "createdAt", updated_at as "updatedAt"
-         FROM vocabularies
-         ORDER BY created_at DESC
-         LIMIT $1 OFFSET $2`,
-        [pageSize, offset]
+      return await queryPage(
+        {
+          columns: `id, name, namespace, terms, status, description,
+                    created_at as "createdAt", updated_at as "updatedAt"`,
+          from: 'vocabularies',
+          page,
+          pageSize,
+          count,
+        },
+        (row) => this.mapRowToVocabulary(row)
       );
+    } catch (error) {
+      console.error('Error fetching all vocabularies:', error);
+      throw error;
+    }
+  }
 
-      const data = result.rows.map((row: any) => this.mapRowToVocabulary(row));
-      const totalPages = Math.ceil(total / pageSize);
+  /**
+   * Find all vocabularies with keyset (cursor) pagination
+   */
+  async findAllAfter(after: string | null, pageSize: number = 10): Promise<KeysetPage<Vocabulary>> {
+    try {
+      const { text, values } = buildKeysetQuery({
+        columns: `id, name, namespace, terms, status, description,
+                  created_at as "createdAt", updated_at as "updatedAt"`,
+        from: 'vocabularies',
+        after,
+        pageSize,
+      });
+      const result = await query(text, values);
 
-      return { data, total, page, pageSize, totalPages };
+      return toKeysetPage(result.rows, pageSize, (row) => this.mapRowToVocabulary(row));
     } catch (error) {
-      console.error('Error fetching all vocabularies:', error);
+      console.error('Error fetching vocabularies by cursor:', error);
       throw error;
     }
   }
 
   /**
-   * Find vocabulary by ID
+   * Search vocabularies by name, best match first. The default mode matches substrings,
+   * fuzzy mode tolerates typos; both are served by the trigram index on name.
    */
-  async findById(id: string): Promise<Vocabulary | null> {
+  async search(
+    text: string,
+    page: number = 1,
+    pageSize: number = 10,
+    count: CountStrategy = 'exact',
+    mode: SearchMode = 'fulltext'
+  ) {
     try {
-      const result = await query(
-        `SELECT id, name, namespace, terms, status, description,
-                created_at as "createdAt", updated_at as "updatedAt"
-         FROM vocabularies
-         WHERE id = $1`,
-        [id]
+      const fuzzy = fuzzySearch('$1', ['name']);
+
+      return await queryPage(
+        {
+          columns: `id, name, namespace, terms, status, description,
+                    created_at as "createdAt", updated_at as "updatedAt"`,
+          from: 'vocabularies',
+          where: mode === 'fuzzy' ? fuzzy.where : 'name ILIKE $2',
+          params: mode === 'fuzzy' ? [text] : [text, `%${escapeLike(text)}%`],
+          orderBy: `${fuzzy.rank} DESC, created_at DESC`,
+          page,
+          pageSize,
+          count,
+        },
+        (row) => this.mapRowToVocabulary(row)
       );
+    } catch (error) {
+      console.error('Error searching vocabularies:', error);
+      throw error;
+    }
+  }
+
+  /**
+   * Autocomplete vocabularies by name: prefix matches first, then closest trigram matches
+   */
+  async suggest(text: string, limit: number = 5): Promise<SearchSuggestion[]> {
+    try {
+      const result = await execute(SUGGEST, [text, `${escapeLike(text)}%`, limit]);
 
-      return result.rows.length > 0 ? this.mapRowToVocabulary(result.rows[0]) : null;
+      return result.rows.map((row) => ({
+        type: 'vocabulary' as const,
+        id: row.id,
+        name: row.name,
+        score: Number(row.score),
+      }));
+    } catch (error) {
+      console.error('Error suggesting vocabularies:', error);
+      throw error;
+    }
+  }
+
+  /**
+   * Stream all vocabularies as CSV or NDJSON
+   */
+  async exportAll(format: ExportFormat): Promise<Readable> {
+    try {
+      return await this.crud.export(format);
+    } catch (error) {
+      console.error('Error exporting vocabularies:', error);
+      throw error;
+    }
+  }
+
+  /**
+   * Find vocabulary by ID
+   */
+  async findById(id: string): Promise<Vocabulary | null> {
+    try {
+      return await this.crud.findById(id);
     } catch (error) {
       console.error('Error fetching vocabulary by ID:', error);
       throw error;
@@ -60,31 +165,21 @@ class VocabularyRepository {
   /**
    * Find vocabularies by namespace
    */
-  async findByNamespace(namespace: string, page: number = 1, pageSize: number = 10) {
+  async findByNamespace(namespace: string, page: number = 1, pageSize: number = 10, count: CountStrategy = 'exact') {
     try {
-      // Get total count
-      const countResult = await query(
-        'SELECT COUNT(*) FROM vocabularies WHERE namespace = $1',
-        [namespace]
-      );
-      const total = parseInt(countResult.rows[0].count, 10);
-
-      // Get paginated data
-      const offset = (page - 1) * pageSize;
-      const result = await query(
-        `SELECT id, name, namespace, terms, status, description,
-                created_at as "createdAt", updated_at as "updatedAt"
-         FROM vocabularies
-         WHERE namespace = $1
-         ORDER BY created_at DESC
-         LIMIT $2 OFFSET $3`,
-        [namespace, pageSize, offset]
+      return await queryPage(
+        {
+          columns: `id, name, namespace, terms, status, description,
+                    created_at as "createdAt", updated_at as "updatedAt"`,
+          from: 'vocabularies',
+          where: 'namespace = $1',
+          params: [namespace],
+          page,
+          pageSize,
+          count,
+        },
+        (row) => this.mapRowToVocabulary(row)
       );
-
-      const data = result.rows.map((row: any) => this.mapRowToVocabulary(row));
-      const totalPages = Math.ceil(total / pageSize);
-
-      return { data, total, page, pageSize, totalPages };
     } catch (error) {
       console.error('Error fetching vocabularies by namespace:', error);
       throw error;
@@ -96,16 +191,13 @@ class VocabularyRepository {
    */
   async create(request: CreateVocabularyRequest): Promise<Vocabulary> {
     try {
-      const result = await query(
-        `INSERT INTO vocabularies
-         (name, namespace, terms, description, status)
-         VALUES ($1, $2, $3, $4, $5)
-         RETURNING id, name, namespace, terms, description, status,
-                   created_at as "createdAt", updated_at as "updatedAt"`,
-        [request.name, request.namespace, JSON.stringify(request.terms || []), request.name, 'draft']
-      );
-
-      return this.mapRowToVocabulary(result.rows[0]);
+      return await this.crud.insert({
+        name: request.name,
+        namespace: request.namespace,
+        terms: request.terms || [],
+        description: request.name,
+        status: 'draft',
+      });
     } catch (error) {
       console.error('Error creating vocabulary:', error);
       throw error;
@@ -117,44 +209,15 @@ class VocabularyRepository {
    */
   async update(id: string, request: UpdateVocabularyRequest): Promise<Vocabulary> {
     try {
-      const vocab = await this.findById(id);
+      const vocab = await this.crud.update(id, {
+        status: request.status,
+        terms: request.terms,
+      });
       if (!vocab) {
         throw new Error(`Vocabulary with ID ${id} not found`);
       }
 
-      const updateFields: string[] = [];
-      const values: any[] = [];
-      let paramIndex = 1;
-
-      if (request.status !== undefined) {
-        updateFields.push(`status = $${paramIndex}`);
-        values.push(request.status);
-        paramIndex++;
-      }
-
-      if (request.terms !== undefined) {
-        updateFields.push(`terms = $${paramIndex}`);
-        values.push(JSON.stringify(request.terms));
-        paramIndex++;
-      }
-
-      if (updateFields.length === 0) {
-        return vocab;
-      }
-
-      updateFields.push(`updated_at = CURRENT_TIMESTAMP`);
-      values.push(id);
-
-      const result = await query(
-        `UPDATE vocabularies
-         SET ${updateFields.join(', ')}
-         WHERE id = $${paramIndex}
-         RETURNING id, name, namespace, terms, description, status,
-                   created_at as "createdAt", updated_at as "updatedAt"`,
-        values
-      );
-
-      return this.mapRowToVocabulary(result.rows[0]);
+      return vocab;
     } catch (error) {
       console.error('Error updating vocabulary:', error);
       throw error;
@@ -164,14 +227,13 @@ class VocabularyRepository {
   /**
    * Delete vocabulary
    */
-  async delete(id: string): Promise<void> {
+  async delete(id: string): Promise<Vocabulary> {
     try {
-      const vocab = await this.findById(id);
+      const vocab = await this.crud.delete(id);
       if (!vocab) {
         throw new Error(`Vocabulary with ID ${id} not found`);
       }
-
-      await query('DELETE FROM vocabularies WHERE id = $1', [id]);
+      return vocab;
     } catch (error) {
       console.error('Error deleting vocabulary:', error);
       throw error;
@@ -3,8 +3,10 @@ import SchemaRepository from '../repositories/schema-repository';
 import VocabularyRepository from '../repositories/vocabulary-repository';
 import { registerSchemaRoutes } from './schemas';
 import { registerVocabularyRoutes } from './vocabularies';
+import { registerSearchRoutes } from './search';
 
 export async function registerRoutes(app: FastifyInstance, schemaRepo: SchemaRepository, vocabRepo: VocabularyRepository) {
   await registerSchemaRoutes(app, schemaRepo);
   await registerVocabularyRoutes(app, vocabRepo);
+  await registerSearchRoutes(app, schemaRepo, vocabRepo);
 }
@@ -0,0 +1,22 @@
+import { FastifyInstance } from 'fastify';
+import SchemaRepository from '../repositories/schema-repository';
+import VocabularyRepository from '../repositories/vocabulary-repository';
+
+const DEFAULT_SUGGEST_LIMIT = 5;
+const MAX_SUGGEST_LIMIT = 20;
+
+export async function registerSearchRoutes(app: FastifyInstance, schemaRepo: SchemaRepository, vocabRepo: VocabularyRepository) {
+  // Top schema and vocabulary names for type-ahead, best match first
+  app.get<{ Querystring: { q?: string; limit?: string } }>('/suggest', async (req, reply) => {
+    const text = (req.query.q || '').trim();
+    const limit = Math.min(parseInt(req.query.limit || '') || DEFAULT_SUGGEST_LIMIT, MAX_SUGGEST_LIMIT);
+    if (!text) return reply.send({ data: [] });
+
+    const [schemas, vocabularies] = await Promise.all([
+      schemaRepo.suggest(text, limit),
+      vocabRepo.suggest(text, limit),
+    ]);
+    const data = [...schemas, ...vocabularies].sort((a, b) => b.score - a.score).slice(0, limit);
+    return reply.send({ data });
+  });
+}
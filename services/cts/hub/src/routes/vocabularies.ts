@@ -1,13 +1,65 @@
 import { FastifyInstance } from 'fastify';
+import {
+  parseCountStrategy,
+  parseExportFormat,
+  parseSearchMode,
+  withTransaction,
+  EXPORT_CONTENT_TYPES,
+} from '@dataspace/db';
 import VocabularyRepository from '../repositories/vocabulary-repository';
 import { VocabularyEventHandler } from '../events/vocabulary.event';
 import { CreateVocabularyRequest, UpdateVocabularyRequest } from '../types';
 
-export async function registerVocabularyRoutes(app: FastifyInstance, repo: VocabularyRepository) {
-  app.get<{ Querystring: { page?: string; pageSize?: string } }>('/vocabularies', async (req, reply) => {
+export async function registerVocabularyRoutes(
+  app: FastifyInstance,
+  repo: VocabularyRepository,
+  events: VocabularyEventHandler = new VocabularyEventHandler()
+) {
+  app.get<{
+    Querystring: {
+      page?: string;
+      pageSize?: string;
+      search?: string;
+      mode?: string;
+      cursor?: string;
+      after?: string;
+      count?: string;
+    };
+  }>('/vocabularies', async (req, reply) => {
     const page = parseInt(req.query.page || '1') || 1;
     const pageSize = parseInt(req.query.pageSize || '10') || 10;
-    return reply.send(await repo.findAll(page, pageSize));
+    const cursor = req.query.cursor ?? req.query.after;
+    try {
+      const count = parseCountStrategy(req.query.count);
+      const mode = parseSearchMode(req.query.mode);
+      if (req.query.search) return reply.send(await repo.search(req.query.search, page, pageSize, count, mode));
+      if (cursor !== undefined) return reply.send(await repo.findAllAfter(cursor || null, pageSize));
+      return reply.send(await repo.findAll(page, pageSize, count));
+    } catch (error: any) {
+      if (
+        error.message === 'Invalid cursor' ||
+        error.message === 'Invalid count strategy' ||
+        error.message === 'Invalid search mode'
+      ) {
+        return reply.status(400).send({ error: error.message });
+      }
+      throw error;
+    }
+  });
+
+  app.get<{ Querystring: { format?: string } }>('/vocabularies/export', async (req, reply) => {
+    try {
+      const format = parseExportFormat(req.query.format);
+      return reply
+        .header('Content-Type', EXPORT_CONTENT_TYPES[format])
+        .header('Content-Disposition', `attachment; filename="vocabularies.${format}"`)
+        .send(await repo.exportAll(format));
+    } catch (error: any) {
+      if (error.message === 'Invalid export format') {
+        return reply.status(400).send({ error: error.message });
+      }
+      throw error;
+    }
   });
 
   app.get<{ Params: { id: string } }>('/vocabularies/:id', async (req, reply) => {
@@ -16,18 +68,33 @@ export async function registerVocabularyRoutes(app: FastifyInstance, repo: Vocab
   });
 
   app.post<{ Body: CreateVocabularyRequest }>('/vocabularies', async (req, reply) => {
-    const vocab = await repo.create(req.body);
-    new VocabularyEventHandler().onVocabularyCreated(vocab);
+    // The event is recorded in the same transaction as the change
+    const vocab = await withTransaction(async () => {
+      const created = await repo.create(req.body);
+      await events.onVocabularyCreated(created);
+      return created;
+    });
     return reply.status(201).send({ data: vocab });
   });
 
   app.put<{ Params: { id: string }; Body: UpdateVocabularyRequest }>('/vocabularies/:id', async (req, reply) => {
-    const vocab = await repo.update(req.params.id, req.body);
+    const vocab = await withTransaction(async () => {
+      const updated = await repo.update(req.params.id, req.body);
+      if (req.body.status === 'published') {
+        await events.onVocabularyPublished(updated);
+      } else {
+        await events.onVocabularyUpdated(updated);
+      }
+      return updated;
+    });
     return reply.send({ data: vocab });
   });
 
   app.delete<{ Params: { id: string } }>('/vocabularies/:id', async (req, reply) => {
-    await repo.delete(req.params.id);
+    await withTransaction(async () => {
+      const deleted = await repo.delete(req.params.id);
+      await events.onVocabularyDeleted(deleted);
+    });
     return reply.status(204).send();
   });
 }
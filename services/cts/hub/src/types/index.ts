@@ -49,3 +49,10 @@ export interface UpdateVocabularyRequest {
   terms?: Record<string, string>;
   status?: 'draft' | 'published' | 'deprecated';
 }
+
+export interface SearchSuggestion {
+  type: 'schema' | 'vocabulary';
+  id: string;
+  name: string;
+  score: number;
+}
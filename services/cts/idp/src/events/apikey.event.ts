@@ -1,27 +1,46 @@
 /**
  * API Key Event Handler
+ * Records API key events in the transactional outbox, published to Kafka by the OutboxRelay
  */
 
+import { appendToOutbox } from '@dataspace/db';
+import { createDomainEvent, EventTopics, EventType, toOutboxEntry } from '@dataspace/kafka';
 import { ApiKey } from '../types';
 
 export class ApiKeyEventHandler {
   async onApiKeyCreated(apiKey: ApiKey) {
     console.log(`[Event] API Key created: ${apiKey.id} (${apiKey.name})`);
-    // TODO: Emit to event bus
+    await this.emit(EventType.APIKEY_CREATED, apiKey);
   }
 
   async onApiKeyRevoked(apiKey: ApiKey) {
     console.log(`[Event] API Key revoked: ${apiKey.id} (${apiKey.name})`);
-    // TODO: Emit to event bus
+    await this.emit(EventType.APIKEY_REVOKED, apiKey);
   }
 
   async onApiKeyUsed(apiKey: ApiKey) {
     console.log(`[Event] API Key used: ${apiKey.id} at ${new Date().toISOString()}`);
-    // TODO: Emit to event bus (for audit trail)
+    await this.emit(EventType.APIKEY_USED, apiKey); // Audit trail
   }
 
   async onApiKeyExpired(apiKey: ApiKey) {
     console.log(`[Event] API Key expired: ${apiKey.id} (${apiKey.name})`);
-    // TODO: Emit to event bus
+    await this.emit(EventType.APIKEY_EXPIRED, apiKey);
+  }
+
+  /**
+   * Call inside the withTransaction() that writes the change. The key itself
+   * is never part of the event.
+   */
+  private async emit(eventType: EventType, apiKey: ApiKey) {
+    const event = createDomainEvent(eventType, 'apikey', apiKey.id, {
+      apiKeyId: apiKey.id,
+      name: apiKey.name,
+      participantId: apiKey.participantId,
+      scope: apiKey.scope,
+      status: apiKey.status,
+      expiresAt: apiKey.expiresAt,
+    });
+    await appendToOutbox(toOutboxEntry(EventTopics.IDENTITY, event));
   }
 }
@@ -1,27 +1,47 @@
 /**
  * Credential Event Handler
+ * Records credential events in the transactional outbox, published to Kafka by the OutboxRelay
  */
 
+import { appendToOutbox } from '@dataspace/db';
+import { createDomainEvent, EventTopics, EventType, toOutboxEntry } from '@dataspace/kafka';
 import { Credential } from '../types';
 
 export class CredentialEventHandler {
   async onCredentialCreated(credential: Credential) {
     console.log(`[Event] Credential created: ${credential.id} (${credential.clientId})`);
-    // TODO: Emit to event bus
+    await this.emit(EventType.CREDENTIAL_CREATED, credential);
   }
 
   async onCredentialRevoked(credential: Credential) {
     console.log(`[Event] Credential revoked: ${credential.id} (${credential.clientId})`);
-    // TODO: Emit to event bus
+    await this.emit(EventType.CREDENTIAL_REVOKED, credential);
   }
 
   async onCredentialExpired(credential: Credential) {
     console.log(`[Event] Credential expired: ${credential.id} (${credential.clientId})`);
-    // TODO: Emit to event bus
+    await this.emit(EventType.CREDENTIAL_EXPIRED, credential);
   }
 
   async onScopeChanged(credential: Credential, oldScopes: string[], newScopes: string[]) {
     console.log(`[Event] Credential scope changed: ${credential.id}`);
-    // TODO: Emit to event bus
+    await this.emit(EventType.CREDENTIAL_SCOPE_CHANGED, credential, { oldScopes, newScopes });
+  }
+
+  /**
+   * Call inside the withTransaction() that writes the change. The client
+   * secret is never part of the event.
+   */
+  private async emit(eventType: EventType, credential: Credential, extra: Record<string, unknown> = {}) {
+    const event = createDomainEvent(eventType, 'credential', credential.id, {
+      credentialId: credential.id,
+      clientId: credential.clientId,
+      participantId: credential.participantId,
+      scope: credential.scope,
+      status: credential.status,
+      expiresAt: credential.expiresAt,
+      ...extra,
+    });
+    await appendToOutbox(toOutboxEntry(EventTopics.IDENTITY, event));
   }
 }
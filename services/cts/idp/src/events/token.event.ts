@@ -1,27 +1,47 @@
 /**
  * Token Event Handler
+ * Records token events in the outbox, published to Kafka by the OutboxRelay
  */
 
+import { appendToOutbox } from '@dataspace/db';
+import { createDomainEvent, EventTopics, EventType, toOutboxEntry } from '@dataspace/kafka';
 import { Token } from '../types';
 
 export class TokenEventHandler {
   async onTokenIssued(token: Token) {
     console.log(`[Event] Token issued: ${token.id} (expires at ${token.expiresAt})`);
-    // TODO: Emit to event bus
+    await this.emit(EventType.TOKEN_ISSUED, token);
   }
 
   async onTokenRefreshed(oldToken: Token, newToken: Token) {
     console.log(`[Event] Token refreshed: ${oldToken.id} -> ${newToken.id}`);
-    // TODO: Emit to event bus
+    await this.emit(EventType.TOKEN_REFRESHED, newToken, { previousTokenId: oldToken.id });
   }
 
   async onTokenRevoked(token: Token) {
     console.log(`[Event] Token revoked: ${token.id}`);
-    // TODO: Emit to event bus
+    await this.emit(EventType.TOKEN_REVOKED, token);
   }
 
   async onTokenExpired(token: Token) {
     console.log(`[Event] Token expired: ${token.id}`);
-    // TODO: Emit to event bus
+    await this.emit(EventType.TOKEN_EXPIRED, token);
+  }
+
+  /**
+   * Access and refresh tokens are bearer secrets and never part of the event.
+   * Call inside the withTransaction() that stores the refresh token, if any.
+   */
+  private async emit(eventType: EventType, token: Token, extra: Record<string, unknown> = {}) {
+    const event = createDomainEvent(eventType, 'token', token.id, {
+      tokenId: token.id,
+      credentialId: token.credentialId,
+      tokenType: token.tokenType,
+      scope: token.scope,
+      issuedAt: token.issuedAt,
+      expiresAt: token.expiresAt,
+      ...extra,
+    });
+    await appendToOutbox(toOutboxEntry(EventTopics.IDENTITY, event));
   }
 }
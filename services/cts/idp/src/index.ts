@@ -1,9 +1,21 @@
 import Fastify from 'fastify';
 import helmet from '@fastify/helmet';
 import cors from '@fastify/cors';
-import { initializePool } from '@dataspace/db';
+import {
+  ApiKeyAuthenticator,
+  createJwtSignerFromEnv,
+  createRevocationListFromEnv,
+  createSecretHasherFromEnv,
+  DEFAULT_PUBLIC_PATHS,
+  jwtAuth,
+  JwtVerifier,
+} from '@dataspace/auth';
+import { initializePool, getStatementStats, getOutboxBacklog, outboxStore, afterCommit } from '@dataspace/db';
+import { KafkaClient, OutboxRelay, outboxRelayOptionsFromEnv } from '@dataspace/kafka';
+import { CacheKeys, createCacheFromEnv, withReadThroughCache } from '@dataspace/redis';
 import CredentialRepository from './repositories/credential-repository';
 import ApiKeyRepository from './repositories/apikey-repository';
+import RefreshTokenRepository from './repositories/refresh-token-repository';
 import { registerRoutes } from './routes';
 
 const app = Fastify({
@@ -42,12 +54,96 @@ try {
   process.exit(1);
 }
 
+// Optional read-through cache for credential and API key lookups (CACHE_ENABLED=true)
+const cacheConfig = await createCacheFromEnv();
+
 // Initialize repositories
-const credentialRepository = new CredentialRepository();
-const apiKeyRepository = new ApiKeyRepository();
+let credentialRepository = new CredentialRepository();
+let apiKeyRepository = new ApiKeyRepository();
+
+if (cacheConfig) {
+  credentialRepository = withReadThroughCache(credentialRepository, {
+    cache: cacheConfig.cache,
+    entity: 'credential',
+    ttl: cacheConfig.ttl,
+    afterCommit,
+    lookups: { findById: CacheKeys.credential, findWithSecretByClientId: CacheKeys.credentialByClientId },
+    invalidateOn: { update: 'id', updateSecretHash: 'id', delete: 'id', revokeByParticipantId: 'all' },
+  });
+  // updateLastUsed/updateLastUsedBatch do not invalidate: lastUsedAt may lag
+  // by up to the TTL rather than evicting the key on every authenticated request
+  apiKeyRepository = withReadThroughCache(apiKeyRepository, {
+    cache: cacheConfig.cache,
+    entity: 'apikey',
+    ttl: cacheConfig.ttl,
+    afterCommit,
+    lookups: { findById: CacheKeys.apiKey, findByKey: CacheKeys.apiKeyByKey },
+    invalidateOn: { update: 'id', delete: 'id', revokeByParticipantId: 'all' },
+  });
+  console.log('Read-through cache enabled for credentials and API keys');
+}
+
+// Access tokens are signed JWTs. The IdP verifies them with its own keys;
+// other services fetch the public keys from /.well-known/jwks.json.
+const signer = createJwtSignerFromEnv();
+// Revocations are published through Redis to every service's in-memory list
+const revocations = await createRevocationListFromEnv();
+const verifier = new JwtVerifier({ keys: signer, issuer: signer.issuer, audience: signer.audience, revocations });
+// API keys (X-API-Key) are checked against a Bloom filter of key hashes and a
+// small LRU before Postgres; last_used_at is written in batches
+const apiKeys = new ApiKeyAuthenticator(apiKeyRepository);
+await apiKeys.start();
+
+await app.register(jwtAuth, {
+  verifier,
+  apiKeys,
+  required: process.env.AUTH_REQUIRED === 'true',
+  publicPaths: [...DEFAULT_PUBLIC_PATHS, '/token*'],
+});
+
+// Client secrets are scrypt hashes, computed on worker threads
+const hasher = createSecretHasherFromEnv();
+
+// Secrets stored in plaintext before hashing was introduced are hashed in the
+// background at startup. Each update only applies if the row still holds the
+// plaintext, so several instances can run this at once.
+const hashLegacySecrets = async () => {
+  let upgraded = 0;
+  for (;;) {
+    const legacy = await credentialRepository.findLegacySecrets(100);
+    if (legacy.length === 0) break;
+    for (const { id, clientSecretHash: plaintext } of legacy) {
+      if (await credentialRepository.updateSecretHash(id, await hasher.hash(plaintext), plaintext)) upgraded++;
+    }
+  }
+  if (upgraded > 0) app.log.info(`Hashed ${upgraded} plaintext client secrets`);
+};
+hashLegacySecrets().catch((error) => app.log.error(error, 'Failed to hash plaintext client secrets'));
 
 // Register routes
-await registerRoutes(app, credentialRepository, apiKeyRepository);
+await registerRoutes(
+  app,
+  credentialRepository,
+  apiKeyRepository,
+  new RefreshTokenRepository(),
+  signer,
+  verifier,
+  revocations,
+  hasher,
+  apiKeys
+);
+
+// Domain events are written to the outbox with each change and relayed to
+// Kafka when it is configured; otherwise they wait in the outbox.
+let outboxRelay: OutboxRelay | null = null;
+if (process.env.KAFKA_BROKERS) {
+  const kafka = new KafkaClient({
+    brokers: process.env.KAFKA_BROKERS.split(','),
+    clientId: process.env.KAFKA_CLIENT_ID || 'cts-idp',
+  });
+  outboxRelay = new OutboxRelay(kafka, outboxStore, outboxRelayOptionsFromEnv());
+  outboxRelay.start();
+}
 
 // Health check endpoint
 app.get('/health', async (request, reply) => {
@@ -58,6 +154,31 @@ app.get('/health', async (request, reply) => {
   };
 });
 
+// Prepared statement metrics (calls, latency percentiles, rows, pool wait)
+app.get('/metrics/db', async (request, reply) => {
+  return { statements: getStatementStats() };
+});
+
+// Cache hit/miss metrics per tier
+app.get('/metrics/cache', async (request, reply) => {
+  return { enabled: cacheConfig !== null, stats: cacheConfig?.cache.getStats() ?? null };
+});
+
+// Access token verification counters
+app.get('/metrics/auth', async (request, reply) => {
+  return {
+    verifier: verifier.getStats(),
+    revocations: revocations.getStats(),
+    secretHasher: hasher.getStats(),
+    apiKeys: apiKeys.getStats(),
+  };
+});
+
+// Outbox relay progress and unpublished backlog
+app.get('/metrics/outbox', async (request, reply) => {
+  return { relay: outboxRelay?.getStats() ?? null, backlog: await getOutboxBacklog() };
+});
+
 // Start server
 const start = async () => {
   try {
@@ -65,6 +186,11 @@ const start = async () => {
     console.log('IDP Service running on http://localhost:3000');
     console.log('Available endpoints:');
     console.log('  GET    /health');
+    console.log('  GET    /metrics/db');
+    console.log('  GET    /metrics/cache');
+    console.log('  GET    /metrics/auth');
+    console.log('  GET    /metrics/outbox');
+    console.log('  GET    /.well-known/jwks.json');
     console.log('  GET    /credentials');
     console.log('  GET    /credentials/:id');
     console.log('  POST   /credentials');
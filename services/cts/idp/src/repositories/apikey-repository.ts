@@ -3,59 +3,138 @@
  * Handles all API key data persistence operations
  */
 
-import { query } from '@dataspace/db';
+import type { Readable } from 'node:stream';
+import {
+  query,
+  queryPage,
+  buildKeysetQuery,
+  toKeysetPage,
+  defineStatement,
+  execute,
+  CrudRepository,
+  type CountStrategy,
+  type ExportFormat,
+  type KeysetPage,
+  type TableDescriptor,
+} from '@dataspace/db';
+import { apiKeyPrefix, generateApiKey, hashApiKey, type ApiKeyStore, type ApiKeyUsage } from '@dataspace/auth';
 import { ApiKey, CreateApiKeyRequest, UpdateApiKeyRequest } from '../types';
-import { randomUUID } from 'crypto';
 
-class ApiKeyRepository {
+const API_KEY_TABLE: TableDescriptor = {
+  table: 'api_keys',
+  returning: `id, key_prefix as "keyPrefix", name, participant_id as "participantId",
+              scope, status, created_at as "createdAt",
+              updated_at as "updatedAt", last_used_at as "lastUsedAt",
+              expires_at as "expiresAt"`,
+  columns: {
+    keyPrefix: 'key_prefix',
+    keyHash: 'key_hash',
+    name: 'name',
+    participantId: 'participant_id',
+    scope: 'scope',
+    status: 'status',
+    expiresAt: 'expires_at',
+  },
+};
+
+// Keys are stored as a SHA-256 hash under a unique index; see migration 007
+const FIND_BY_HASH = defineStatement(
+  'api_keys.findByHash',
+  `SELECT ${API_KEY_TABLE.returning} FROM api_keys WHERE key_hash = $1`
+);
+
+const LIST_HASHES = defineStatement(
+  'api_keys.listHashes',
+  `SELECT key_hash, created_at FROM api_keys WHERE $1::timestamptz IS NULL OR created_at > $1`
+);
+
+const UPDATE_LAST_USED = defineStatement(
+  'api_keys.updateLastUsed',
+  'UPDATE api_keys SET last_used_at = CURRENT_TIMESTAMP WHERE id = $1'
+);
+
+// One statement per flush; an older buffered timestamp never overwrites a newer one
+const UPDATE_LAST_USED_BATCH = defineStatement(
+  'api_keys.updateLastUsedBatch',
+  `UPDATE api_keys AS k SET last_used_at = u.used_at
+   FROM UNNEST($1::uuid[], $2::timestamptz[]) AS u(id, used_at)
+   WHERE k.id = u.id AND (k.last_used_at IS NULL OR k.last_used_at < u.used_at)`
+);
+
+class ApiKeyRepository implements ApiKeyStore<ApiKey> {
+  private readonly crud = new CrudRepository<ApiKey>(API_KEY_TABLE, (row) => this.mapRowToApiKey(row));
+
   /**
    * Find all API keys with pagination
    */
-  async findAll(page: number = 1, pageSize: number = 10) {
+  async findAll(page: number = 1, pageSize: number = 10, count: CountStrategy = 'exact') {
     try {
-      // Get total count
-      const countResult = await query('SELECT COUNT(*) FROM api_keys');
-      const total = parseInt(countResult.rows[0].count, 10);
-
-      // Get paginated data
-      const offset = (page - 1) * pageSize;
-      const result = await query(
-        `SELECT id, key, name, participant_id as "participantId",
-                scope, status, created_at as "createdAt",
-                updated_at as "updatedAt", last_used_at as "lastUsedAt",
-                expires_at as "expiresAt"
-         FROM api_keys
-         ORDER BY created_at DESC
-         LIMIT $1 OFFSET $2`,
-        [pageSize, offset]
+      return await queryPage(
+        {
+          columns: `id, key_prefix as "keyPrefix", name, participant_id as "participantId",
+                    scope, status, created_at as "createdAt",
+                    updated_at as "updatedAt", last_used_at as "lastUsedAt",
+                    expires_at as "expiresAt"`,
+          from: 'api_keys',
+          page,
+          pageSize,
+          count,
+        },
+        (row) => this.mapRowToApiKey(row)
       );
+    } catch (error) {
+      console.error('Error fetching all API keys:', error);
+      throw error;
+    }
+  }
 
-      const data = result.rows.map((row: any) => this.mapRowToApiKey(row));
-      const totalPages = Math.ceil(total / pageSize);
+  /**
+   * Find all API keys with keyset (cursor) pagination
+   */
+  async findAllAfter(after: string | null, pageSize: number = 10): Promise<KeysetPage<ApiKey>> {
+    try {
+      const { text, values } = buildKeysetQuery({
+        columns: `id, key_prefix as "keyPrefix", name, participant_id as "participantId",
+                  scope, status, created_at as "createdAt",
+                  updated_at as "updatedAt", last_used_at as "lastUsedAt",
+                  expires_at as "expiresAt"`,
+        from: 'api_keys',
+        after,
+        pageSize,
+      });
+      const result = await query(text, values);
 
-      return { data, total, page, pageSize, totalPages };
+      return toKeysetPage(result.rows, pageSize, (row) => this.mapRowToApiKey(row));
     } catch (error) {
-      console.error('Error fetching all API keys:', error);
+      console.error('Error fetching API keys by cursor:', error);
       throw error;
     }
   }
 
   /**
-   * Find API key by ID
+   * Stream all API keys as CSV or NDJSON
    */
-  async findById(id: string): Promise<ApiKey | null> {
+  async exportAll(format: ExportFormat): Promise<Readable> {
     try {
-      const result = await query(
-        `SELECT id, key, name, participant_id as "participantId",
-                scope, status, created_at as "createdAt",
-                updated_at as "updatedAt", last_used_at as "lastUsedAt",
-                expires_at as "expiresAt"
-         FROM api_keys
-         WHERE id = $1`,
-        [id]
+      return await this.crud.export(
+        format,
+        // Secrets are never exported
+        `id, key_prefix as "keyPrefix", name, participant_id as "participantId", scope, status,
+         created_at as "createdAt", updated_at as "updatedAt",
+         last_used_at as "lastUsedAt", expires_at as "expiresAt"`
       );
+    } catch (error) {
+      console.error('Error exporting API keys:', error);
+      throw error;
+    }
+  }
 
-      return result.rows.length > 0 ? this.mapRowToApiKey(result.rows[0]) : null;
+  /**
+   * Find API key by ID
+   */
+  async findById(id: string): Promise<ApiKey | null> {
+    try {
+      return await this.crud.findById(id);
     } catch (error) {
       console.error('Error fetching API key by ID:', error);
       throw error;
@@ -66,80 +145,117 @@ class ApiKeyRepository {
    * Find API key by key value
    */
   async findByKey(key: string): Promise<ApiKey | null> {
+    return this.findByHash(hashApiKey(key));
+  }
+
+  /**
+   * Find API key by the SHA-256 hash of its value
+   */
+  async findByHash(keyHash: string): Promise<ApiKey | null> {
     try {
-      const result = await query(
-        `SELECT id, key, name, participant_id as "participantId",
-                scope, status, created_at as "createdAt",
-                updated_at as "updatedAt", last_used_at as "lastUsedAt",
-                expires_at as "expiresAt"
-         FROM api_keys
-         WHERE key = $1`,
-        [key]
-      );
+      const result = await execute(FIND_BY_HASH, [keyHash]);
 
       return result.rows.length > 0 ? this.mapRowToApiKey(result.rows[0]) : null;
     } catch (error) {
-      console.error('Error fetching API key by key:', error);
+      console.error('Error fetching API key by hash:', error);
       throw error;
     }
   }
 
   /**
-   * Find API keys by participant ID
+   * Hashes of keys created after `since` (every key when null), for the
+   * authenticator's Bloom filter
    */
-  async findByParticipantId(participantId: string, page: number = 1, pageSize: number = 10) {
+  async listHashes(since: Date | null): Promise<{ hashes: string[]; latest: Date | null }> {
     try {
-      // Get total count
-      const countResult = await query(
-        'SELECT COUNT(*) FROM api_keys WHERE participant_id = $1',
-        [participantId]
-      );
-      const total = parseInt(countResult.rows[0].count, 10);
+      const result = await execute(LIST_HASHES, [since]);
+      let latest: Date | null = null;
+      const hashes = result.rows.map((row) => {
+        if (!latest || row.created_at > latest) latest = row.created_at;
+        return row.key_hash as string;
+      });
 
-      // Get paginated data
-      const offset = (page - 1) * pageSize;
-      const result = await query(
-        `SELECT id, key, name, participant_id as "participantId",
-                scope, status, created_at as "createdAt",
-                updated_at as "updatedAt", last_used_at as "lastUsedAt",
-                expires_at as "expiresAt"
-         FROM api_keys
-         WHERE participant_id = $1
-         ORDER BY created_at DESC
-         LIMIT $2 OFFSET $3`,
-        [participantId, pageSize, offset]
+      return { hashes, latest };
+    } catch (error) {
+      console.error('Error listing API key hashes:', error);
+      throw error;
+    }
+  }
+
+  /**
+   * Find API keys by participant ID
+   */
+  async findByParticipantId(participantId: string, page: number = 1, pageSize: number = 10, count: CountStrategy = 'exact') {
+    try {
+      return await queryPage(
+        {
+          columns: `id, key_prefix as "keyPrefix", name, participant_id as "participantId",
+                    scope, status, created_at as "createdAt",
+                    updated_at as "updatedAt", last_used_at as "lastUsedAt",
+                    expires_at as "expiresAt"`,
+          from: 'api_keys',
+          where: 'participant_id = $1',
+          params: [participantId],
+          page,
+          pageSize,
+          count,
+        },
+        (row) => this.mapRowToApiKey(row)
       );
+    } catch (error) {
+      console.error('Error fetching API keys by participant:', error);
+      throw error;
+    }
+  }
 
-      const data = result.rows.map((row: any) => this.mapRowToApiKey(row));
-      const totalPages = Math.ceil(total / pageSize);
+  /**
+   * Find API keys by participant ID with keyset (cursor) pagination
+   */
+  async findByParticipantIdAfter(
+    participantId: string,
+    after: string | null,
+    pageSize: number = 10
+  ): Promise<KeysetPage<ApiKey>> {
+    try {
+      const { text, values } = buildKeysetQuery({
+        columns: `id, key_prefix as "keyPrefix", name, participant_id as "participantId",
+                  scope, status, created_at as "createdAt",
+                  updated_at as "updatedAt", last_used_at as "lastUsedAt",
+                  expires_at as "expiresAt"`,
+        from: 'api_keys',
+        where: 'participant_id = $1',
+        params: [participantId],
+        after,
+        pageSize,
+      });
+      const result = await query(text, values);
 
-      return { data, total, page, pageSize, totalPages };
+      return toKeysetPage(result.rows, pageSize, (row) => this.mapRowToApiKey(row));
     } catch (error) {
-      console.error('Error fetching API keys by participant:', error);
+      console.error('Error fetching API keys by participant and cursor:', error);
       throw error;
     }
   }
 
   /**
-   * Create new API key
+   * Create new API key. Only its hash is stored, so the returned `key` is
+   * the one time the value is available.
    */
   async create(request: CreateApiKeyRequest): Promise<ApiKey> {
     try {
-      const apiKeyValue = `key_${randomUUID().replace(/-/g, '')}`;
+      const apiKeyValue = generateApiKey();
       const expiresAt = new Date(Date.now() + 365 * 24 * 60 * 60 * 1000);
 
-      const result = await query(
-        `INSERT INTO api_keys
-         (key, name, participant_id, scope, status, expires_at)
-         VALUES ($1, $2, $3, $4, $5, $6)
-         RETURNING id, key, name, participant_id as "participantId",
-                   scope, status, created_at as "createdAt",
-                   updated_at as "updatedAt", last_used_at as "lastUsedAt",
-                   expires_at as "expiresAt"`,
-        [apiKeyValue, request.name, request.participantId, request.scope || ['read:*'], 'active', expiresAt]
-      );
-
-      return this.mapRowToApiKey(result.rows[0]);
+      const apiKey = await this.crud.insert({
+        keyPrefix: apiKeyPrefix(apiKeyValue),
+        keyHash: hashApiKey(apiKeyValue),
+        name: request.name,
+        participantId: request.participantId,
+        scope: request.scope || ['read:*'],
+        status: 'active',
+        expiresAt,
+      });
+      return { ...apiKey, key: apiKeyValue };
     } catch (error) {
       console.error('Error creating API key:', error);
       throw error;
@@ -151,52 +267,16 @@ class ApiKeyRepository {
    */
   async update(id: string, request: UpdateApiKeyRequest): Promise<ApiKey> {
     try {
-      const apiKey = await this.findById(id);
+      const apiKey = await this.crud.update(id, {
+        name: request.name,
+        scope: request.scope,
+        status: request.status,
+      });
       if (!apiKey) {
         throw new Error(`API Key with ID ${id} not found`);
       }
 
-      const updateFields: string[] = [];
-      const values: any[] = [];
-      let paramIndex = 1;
-
-      if (request.name !== undefined) {
-        updateFields.push(`name = $${paramIndex}`);
-        values.push(request.name);
-        paramIndex++;
-      }
-
-      if (request.scope !== undefined) {
-        updateFields.push(`scope = $${paramIndex}`);
-        values.push(request.scope);
-        paramIndex++;
-      }
-
-      if (request.status !== undefined) {
-        updateFields.push(`status = $${paramIndex}`);
-        values.push(request.status);
-        paramIndex++;
-      }
-
-      if (updateFields.length === 0) {
-        return apiKey;
-      }
-
-      updateFields.push(`updated_at = CURRENT_TIMESTAMP`);
-      values.push(id);
-
-      const result = await query(
-        `UPDATE api_keys
-         SET ${updateFields.join(', ')}
-         WHERE id = $${paramIndex}
-         RETURNING id, key, name, participant_id as "participantId",
-                   scope, status, created_at as "createdAt",
-                   updated_at as "updatedAt", last_used_at as "lastUsedAt",
-                   expires_at as "expiresAt"`,
-        values
-      );
-
-      return this.mapRowToApiKey(result.rows[0]);
+      return apiKey;
     } catch (error) {
       console.error('Error updating API key:', error);
       throw error;
@@ -208,12 +288,10 @@ class ApiKeyRepository {
    */
   async delete(id: string): Promise<void> {
     try {
-      const apiKey = await this.findById(id);
+      const apiKey = await this.crud.delete(id);
       if (!apiKey) {
         throw new Error(`API Key with ID ${id} not found`);
       }
-
-      await query('DELETE FROM api_keys WHERE id = $1', [id]);
     } catch (error) {
       console.error('Error deleting API key:', error);
       throw error;
@@ -225,16 +303,29 @@ class ApiKeyRepository {
    */
   async updateLastUsed(id: string): Promise<void> {
     try {
-      await query(
-        'UPDATE api_keys SET last_used_at = CURRENT_TIMESTAMP WHERE id = $1',
-        [id]
-      );
+      await execute(UPDATE_LAST_USED, [id]);
     } catch (error) {
       console.error('Error updating last used:', error);
       throw error;
     }
   }
 
+  /**
+   * Write buffered last-used timestamps for many keys at once
+   */
+  async updateLastUsedBatch(usage: ApiKeyUsage[]): Promise<void> {
+    if (usage.length === 0) {
+      return;
+    }
+
+    try {
+      await execute(UPDATE_LAST_USED_BATCH, [usage.map((u) => u.id), usage.map((u) => u.usedAt)]);
+    } catch (error) {
+      console.error('Error updating last used batch:', error);
+      throw error;
+    }
+  }
+
   /**
    * Revoke all API keys for a participant
    */
@@ -257,7 +348,7 @@ class ApiKeyRepository {
   private mapRowToApiKey(row: any): ApiKey {
     return {
       id: row.id,
-      key: row.key,
+      keyPrefix: row.keyPrefix,
       name: row.name,
       participantId: row.participantId,
       scope: row.scope || ['read:*'],
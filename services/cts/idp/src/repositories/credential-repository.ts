@@ -3,58 +3,136 @@
  * Handles all credential data persistence operations
  */
 
-import { query } from '@dataspace/db';
-import { Credential, CreateCredentialRequest, UpdateCredentialRequest } from '../types';
+import type { Readable } from 'node:stream';
+import {
+  query,
+  queryPage,
+  buildKeysetQuery,
+  toKeysetPage,
+  defineStatement,
+  execute,
+  CrudRepository,
+  type CountStrategy,
+  type ExportFormat,
+  type KeysetPage,
+  type TableDescriptor,
+} from '@dataspace/db';
+import { Credential, CredentialWithSecret, CreateCredentialRequest, UpdateCredentialRequest } from '../types';
+
+const CREDENTIAL_TABLE: TableDescriptor = {
+  table: 'credentials',
+  returning: `id, client_id as "clientId", participant_id as "participantId", scope, status,
+              created_at as "createdAt", updated_at as "updatedAt",
+              expires_at as "expiresAt"`,
+  columns: {
+    clientId: 'client_id',
+    clientSecretHash: 'client_secret_hash',
+    userId: 'user_id',
+    participantId: 'participant_id',
+    scope: 'scope',
+    status: 'status',
+    expiresAt: 'expires_at',
+  },
+};
+
+const FIND_BY_CLIENT_ID = defineStatement(
+  'credentials.findByClientId',
+  `SELECT ${CREDENTIAL_TABLE.returning} FROM credentials WHERE client_id = $1`
+);
+
+// The secret hash is only read on the token path, never by the read API
+const FIND_WITH_SECRET_BY_CLIENT_ID = defineStatement(
+  'credentials.findWithSecretByClientId',
+  `SELECT ${CREDENTIAL_TABLE.returning}, client_secret_hash as "clientSecretHash"
+   FROM credentials WHERE client_id = $1`
+);
+
+// Compare-and-set, so concurrent upgrades of one secret cannot overwrite each other
+const UPDATE_SECRET_HASH = defineStatement(
+  'credentials.updateSecretHash',
+  `UPDATE credentials SET client_secret_hash = $2, updated_at = CURRENT_TIMESTAMP
+   WHERE id = $1 AND client_secret_hash = $3`
+);
+
+// Secrets written before hashing was introduced are stored in plaintext
+const FIND_LEGACY_SECRETS = defineStatement(
+  'credentials.findLegacySecrets',
+  `SELECT id, client_secret_hash as "clientSecretHash" FROM credentials
+   WHERE client_secret_hash NOT LIKE '$scrypt$%'
+   LIMIT $1`
+);
 
 class CredentialRepository {
+  private readonly crud = new CrudRepository<Credential>(CREDENTIAL_TABLE, (row) => this.mapRowToCredential(row));
+
   /**
    * Find all credentials with pagination
    */
-  async findAll(page: number = 1, pageSize: number = 10) {
+  async findAll(page: number = 1, pageSize: number = 10, count: CountStrategy = 'exact') {
     try {
-      // Get total count
-      const countResult = await query('SELECT COUNT(*) FROM credentials');
-      const total = parseInt(countResult.rows[0].count, 10);
-
-      // Get paginated data
-      const offset = (page - 1) * pageSize;
-      const result = await query(
-        `SELECT id, client_id as "clientId", client_secret_hash as "clientSecret",
-                participant_id as "participantId", scope, status,
-                created_at as "createdAt", updated_at as "updatedAt",
-                expires_at as "expiresAt"
-         FROM credentials
-         ORDER BY created_at DESC
-         LIMIT $1 OFFSET $2`,
-        [pageSize, offset]
+      return await queryPage(
+        {
+          columns: `id, client_id as "clientId", participant_id as "participantId", scope, status,
+                    created_at as "createdAt", updated_at as "updatedAt",
+                    expires_at as "expiresAt"`,
+          from: 'credentials',
+          page,
+          pageSize,
+          count,
+        },
+        (row) => this.mapRowToCredential(row)
       );
+    } catch (error) {
+      console.error('Error fetching all credentials:', error);
+      throw error;
+    }
+  }
 
-      const data = result.rows.map((row: any) => this.mapRowToCredential(row));
-      const totalPages = Math.ceil(total / pageSize);
+  /**
+   * Find all credentials with keyset (cursor) pagination
+   */
+  async findAllAfter(after: string | null, pageSize: number = 10): Promise<KeysetPage<Credential>> {
+    try {
+      const { text, values } = buildKeysetQuery({
+        columns: `id, client_id as "clientId", participant_id as "participantId", scope, status,
+                  created_at as "createdAt", updated_at as "updatedAt",
+                  expires_at as "expiresAt"`,
+        from: 'credentials',
+        after,
+        pageSize,
+      });
+      const result = await query(text, values);
 
-      return { data, total, page, pageSize, totalPages };
+      return toKeysetPage(result.rows, pageSize, (row) => this.mapRowToCredential(row));
     } catch (error) {
-      console.error('Error fetching all credentials:', error);
+      console.error('Error fetching credentials by cursor:', error);
       throw error;
     }
   }
 
   /**
-   * Find credential by ID
+   * Stream all credentials as CSV or NDJSON
    */
-  async findById(id: string): Promise<Credential | null> {
+  async exportAll(format: ExportFormat): Promise<Readable> {
     try {
-      const result = await query(
-        `SELECT id, client_id as "clientId", client_secret_hash as "clientSecret",
-                participant_id as "participantId", scope, status,
-                created_at as "createdAt", updated_at as "updatedAt",
-                expires_at as "expiresAt"
-         FROM credentials
-         WHERE id = $1`,
-        [id]
+      return await this.crud.export(
+        format,
+        // Secrets are never exported
+        `id, client_id as "clientId", participant_id as "participantId", scope, status,
+         created_at as "createdAt", updated_at as "updatedAt", expires_at as "expiresAt"`
       );
+    } catch (error) {
+      console.error('Error exporting credentials:', error);
+      throw error;
+    }
+  }
 
-      return result.rows.length > 0 ? this.mapRowToCredential(result.rows[0]) : null;
+  /**
+   * Find credential by ID
+   */
+  async findById(id: string): Promise<Credential | null> {
+    try {
+      return await this.crud.findById(id);
     } catch (error) {
       console.error('Error fetching credential by ID:', error);
       throw error;
@@ -66,15 +144,7 @@ class CredentialRepository {
    */
   async findByClientId(clientId: string): Promise<Credential | null> {
     try {
-      const result = await query(
-        `SELECT id, client_id as "clientId", client_secret_hash as "clientSecret",
-                participant_id as "participantId", scope, status,
-                created_at as "createdAt", updated_at as "updatedAt",
-                expires_at as "expiresAt"
-         FROM credentials
-         WHERE client_id = $1`,
-        [clientId]
-      );
+      const result = await execute(FIND_BY_CLIENT_ID, [clientId]);
 
       return result.rows.length > 0 ? this.mapRowToCredential(result.rows[0]) : null;
     } catch (error) {
@@ -84,66 +154,99 @@ class CredentialRepository {
   }
 
   /**
-   * Find credentials by participant ID
+   * Find credential by client ID together with its stored secret hash, for
+   * authenticating the client. Never return the result from the API.
    */
-  async findByParticipantId(participantId: string, page: number = 1, pageSize: number = 10) {
+  async findWithSecretByClientId(clientId: string): Promise<CredentialWithSecret | null> {
     try {
-      // Get total count
-      const countResult = await query(
-        'SELECT COUNT(*) FROM credentials WHERE participant_id = $1',
-        [participantId]
-      );
-      const total = parseInt(countResult.rows[0].count, 10);
+      const result = await execute(FIND_WITH_SECRET_BY_CLIENT_ID, [clientId]);
+      if (result.rows.length === 0) {
+        return null;
+      }
 
-      // Get paginated data
-      const offset = (page - 1) * pageSize;
-      const result = await query(
-        `SELECT id, client_id as "clientId", client_secret_hash as "clientSecret",
-                participant_id as "participantId", scope, status,
-                created_at as "createdAt", updated_at as "updatedAt",
-                expires_at as "expiresAt"
-         FROM credentials
-         WHERE participant_id = $1
-         ORDER BY created_at DESC
-         LIMIT $2 OFFSET $3`,
-        [participantId, pageSize, offset]
+      const row = result.rows[0];
+      return { ...this.mapRowToCredential(row), clientSecretHash: row.clientSecretHash };
+    } catch (error) {
+      console.error('Error fetching credential secret by client ID:', error);
+      throw error;
+    }
+  }
+
+  /**
+   * Find credentials by participant ID
+   */
+  async findByParticipantId(participantId: string, page: number = 1, pageSize: number = 10, count: CountStrategy = 'exact') {
+    try {
+      return await queryPage(
+        {
+          columns: `id, client_id as "clientId", participant_id as "participantId", scope, status,
+                    created_at as "createdAt", updated_at as "updatedAt",
+                    expires_at as "expiresAt"`,
+          from: 'credentials',
+          where: 'participant_id = $1',
+          params: [participantId],
+          page,
+          pageSize,
+          count,
+        },
+        (row) => this.mapRowToCredential(row)
       );
+    } catch (error) {
+      console.error('Error fetching credentials by participant:', error);
+      throw error;
+    }
+  }
 
-      const data = result.rows.map((row: any) => this.mapRowToCredential(row));
-      const totalPages = Math.ceil(total / pageSize);
+  /**
+   * Find credentials by participant ID with keyset (cursor) pagination
+   */
+  async findByParticipantIdAfter(
+    participantId: string,
+    after: string | null,
+    pageSize: number = 10
+  ): Promise<KeysetPage<Credential>> {
+    try {
+      const { text, values } = buildKeysetQuery({
+        columns: `id, client_id as "clientId", participant_id as "participantId", scope, status,
+                  created_at as "createdAt", updated_at as "updatedAt",
+                  expires_at as "expiresAt"`,
+        from: 'credentials',
+        where: 'participant_id = $1',
+        params: [participantId],
+        after,
+        pageSize,
+      });
+      const result = await query(text, values);
 
-      return { data, total, page, pageSize, totalPages };
+      return toKeysetPage(result.rows, pageSize, (row) => this.mapRowToCredential(row));
     } catch (error) {
-      console.error('Error fetching credentials by participant:', error);
+      console.error('Error fetching credentials by participant and cursor:', error);
       throw error;
     }
   }
 
   /**
    * Create new credential
+   * @param clientSecretHash Hash of the generated client secret (see SecretHasher)
    */
-  async create(request: CreateCredentialRequest): Promise<Credential> {
+  async create(request: CreateCredentialRequest, clientSecretHash: string): Promise<Credential> {
     try {
       const existing = await this.findByClientId(request.clientId);
       if (existing) {
         throw new Error(`Credential with clientId ${request.clientId} already exists`);
       }
 
-      const clientSecret = `secret-${Date.now()}`;
       const expiresAt = new Date(Date.now() + 365 * 24 * 60 * 60 * 1000);
 
-      const result = await query(
-        `INSERT INTO credentials
-         (client_id, client_secret_hash, user_id, participant_id, scope, status, expires_at)
-         VALUES ($1, $2, $3, $4, $5, $6, $7)
-         RETURNING id, client_id as "clientId", client_secret_hash as "clientSecret",
-                   participant_id as "participantId", scope, status,
-                   created_at as "createdAt", updated_at as "updatedAt",
-                   expires_at as "expiresAt"`,
-        [request.clientId, clientSecret, request.participantId, request.participantId, request.scope || ['read:*'], 'active', expiresAt]
-      );
-
-      return this.mapRowToCredential(result.rows[0]);
+      return await this.crud.insert({
+        clientId: request.clientId,
+        clientSecretHash,
+        userId: request.participantId,
+        participantId: request.participantId,
+        scope: request.scope || ['read:*'],
+        status: 'active',
+        expiresAt,
+      });
     } catch (error) {
       console.error('Error creating credential:', error);
       throw error;
@@ -155,48 +258,45 @@ class CredentialRepository {
    */
   async update(id: string, request: UpdateCredentialRequest): Promise<Credential> {
     try {
-      const credential = await this.findById(id);
+      const credential = await this.crud.update(id, {
+        scope: request.scope,
+        status: request.status,
+      });
       if (!credential) {
         throw new Error(`Credential with ID ${id} not found`);
       }
 
-      const updateFields: string[] = [];
-      const values: any[] = [];
-      let paramIndex = 1;
-
-      if (request.scope !== undefined) {
-        updateFields.push(`scope = $${paramIndex}`);
-        values.push(request.scope);
-        paramIndex++;
-      }
-
-      if (request.status !== undefined) {
-        updateFields.push(`status = $${paramIndex}`);
-        values.push(request.status);
-        paramIndex++;
-      }
-
-      if (updateFields.length === 0) {
-        return credential;
-      }
-
-      updateFields.push(`updated_at = CURRENT_TIMESTAMP`);
-      values.push(id);
+      return credential;
+    } catch (error) {
+      console.error('Error updating credential:', error);
+      throw error;
+    }
+  }
 
-      const result = await query(
-        `UPDATE credentials
-         SET ${updateFields.join(', ')}
-         WHERE id = $${paramIndex}
-         RETURNING id, client_id as "clientId", client_secret_hash as "clientSecret",
-                   participant_id as "participantId", scope, status,
-                   created_at as "createdAt", updated_at as "updatedAt",
-                   expires_at as "expiresAt"`,
-        values
-      );
+  /**
+   * Replace the stored client secret hash, e.g. to upgrade a legacy plaintext secret
+   * @param previousHash Value the row must still hold; otherwise nothing changes
+   * @returns Whether the row was updated
+   */
+  async updateSecretHash(id: string, clientSecretHash: string, previousHash: string): Promise<boolean> {
+    try {
+      const result = await execute(UPDATE_SECRET_HASH, [id, clientSecretHash, previousHash]);
+      return (result.rowCount || 0) > 0;
+    } catch (error) {
+      console.error('Error updating credential secret:', error);
+      throw error;
+    }
+  }
 
-      return this.mapRowToCredential(result.rows[0]);
+  /**
+   * Credentials whose secret is still stored in plaintext
+   */
+  async findLegacySecrets(limit: number = 100): Promise<{ id: string; clientSecretHash: string }[]> {
+    try {
+      const result = await execute(FIND_LEGACY_SECRETS, [limit]);
+      return result.rows.map((row) => ({ id: row.id, clientSecretHash: row.clientSecretHash }));
     } catch (error) {
-      console.error('Error updating credential:', error);
+      console.error('Error fetching legacy credential secrets:', error);
       throw error;
     }
   }
@@ -206,12 +306,10 @@ class CredentialRepository {
    */
   async delete(id: string): Promise<void> {
     try {
-      const credential = await this.findById(id);
+      const credential = await this.crud.delete(id);
       if (!credential) {
         throw new Error(`Credential with ID ${id} not found`);
       }
-
-      await query('DELETE FROM credentials WHERE id = $1', [id]);
     } catch (error) {
       console.error('Error deleting credential:', error);
       throw error;
@@ -241,7 +339,6 @@ class CredentialRepository {
     return {
       id: row.id,
       clientId: row.clientId,
-      clientSecret: row.clientSecret,
       participantId: row.participantId,
       scope: row.scope || ['read:*'],
       status: row.status,
@@ -0,0 +1,71 @@
+/**
+ * Refresh Token Repository - PostgreSQL Database
+ * Refresh tokens are stored as a SHA-256 hash and can be redeemed once
+ */
+
+import { createHash } from 'crypto';
+import { defineStatement, execute } from '@dataspace/db';
+
+// Refresh tokens are 256 random bits (generateSecret), so a single SHA-256
+// is a safe way to store them; see migration 008
+export const hashRefreshToken = (token: string): string => createHash('sha256').update(token).digest('hex');
+
+export interface RefreshTokenGrant {
+  id: string;
+  credentialId: string;
+  accessTokenId: string;
+  scope: string[];
+}
+
+const CREATE = defineStatement(
+  'refresh_tokens.create',
+  `INSERT INTO refresh_tokens (token_hash, credential_id, access_token_id, scope, expires_at)
+   VALUES ($1, $2, $3, $4, $5)`
+);
+
+// Marking the row used in the same statement that finds it means two
+// concurrent redemptions of one token cannot both succeed
+const REDEEM = defineStatement(
+  'refresh_tokens.redeem',
+  `UPDATE refresh_tokens SET used_at = CURRENT_TIMESTAMP
+   WHERE token_hash = $1 AND used_at IS NULL AND expires_at > CURRENT_TIMESTAMP
+   RETURNING id, credential_id as "credentialId", access_token_id as "accessTokenId", scope`
+);
+
+class RefreshTokenRepository {
+  /**
+   * Store a newly issued refresh token
+   * @param token Refresh token value; only its hash is stored
+   */
+  async create(
+    token: string,
+    credentialId: string,
+    accessTokenId: string,
+    scope: string[],
+    expiresAt: Date
+  ): Promise<void> {
+    try {
+      await execute(CREATE, [hashRefreshToken(token), credentialId, accessTokenId, scope, expiresAt]);
+    } catch (error) {
+      console.error('Error creating refresh token:', error);
+      throw error;
+    }
+  }
+
+  /**
+   * Mark a refresh token used and return what it grants, or null when it is
+   * unknown, expired or already used
+   */
+  async redeem(token: string): Promise<RefreshTokenGrant | null> {
+    try {
+      const result = await execute(REDEEM, [hashRefreshToken(token)]);
+
+      return result.rows.length > 0 ? (result.rows[0] as RefreshTokenGrant) : null;
+    } catch (error) {
+      console.error('Error redeeming refresh token:', error);
+      throw error;
+    }
+  }
+}
+
+export default RefreshTokenRepository;
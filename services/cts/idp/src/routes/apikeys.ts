@@ -3,41 +3,93 @@
  */
 
 import { FastifyInstance } from 'fastify';
+import { ApiKeyAuthenticator } from '@dataspace/auth';
+import { parseCountStrategy, parseExportFormat, withTransaction, EXPORT_CONTENT_TYPES } from '@dataspace/db';
 import ApiKeyRepository from '../repositories/apikey-repository';
 import { validateCreateApiKey, validateUpdateApiKey } from '../validators/apikey.validator';
 import { ApiKeyEventHandler } from '../events/apikey.event';
+import { ApiKey } from '../types';
 
 export async function registerApiKeyRoutes(
   app: FastifyInstance,
-  repository: ApiKeyRepository
+  repository: ApiKeyRepository,
+  authenticator: ApiKeyAuthenticator<ApiKey>
 ) {
   /**
    * GET /apikeys
    * List all API keys
    */
-  app.get<{ Querystring: { page?: string; pageSize?: string; participantId?: string } }>(
+  app.get<{
+    Querystring: {
+      page?: string;
+      pageSize?: string;
+      participantId?: string;
+      cursor?: string;
+      after?: string;
+      count?: string;
+    };
+  }>(
     '/apikeys',
     async (request, reply) => {
       try {
         const page = parseInt(request.query.page || '1') || 1;
         const pageSize = parseInt(request.query.pageSize || '10') || 10;
         const participantId = request.query.participantId;
+        const cursor = request.query.cursor ?? request.query.after;
+        const count = parseCountStrategy(request.query.count);
+
+        if (cursor !== undefined) {
+          const keysetResult = participantId
+            ? await repository.findByParticipantIdAfter(participantId, cursor || null, pageSize)
+            : await repository.findAllAfter(cursor || null, pageSize);
+
+          return reply.send(keysetResult);
+        }
 
         let result;
         if (participantId) {
-          result = await repository.findByParticipantId(participantId, page, pageSize);
+          result = await repository.findByParticipantId(participantId, page, pageSize, count);
         } else {
-          result = await repository.findAll(page, pageSize);
+          result = await repository.findAll(page, pageSize, count);
         }
 
         return reply.send(result);
-      } catch (error) {
+      } catch (error: any) {
         app.log.error(error);
+
+        if (error.message?.includes('Invalid cursor') || error.message?.includes('Invalid count strategy')) {
+          return reply.status(400).send({ error: error.message });
+        }
+
         return reply.status(500).send({ error: 'Failed to fetch API keys' });
       }
     }
   );
 
+  /**
+   * GET /apikeys/export
+   * Stream all API keys as CSV or NDJSON (secrets excluded)
+   */
+  app.get<{ Querystring: { format?: string } }>('/apikeys/export', async (request, reply) => {
+    try {
+      const format = parseExportFormat(request.query.format);
+      const stream = await repository.exportAll(format);
+
+      return reply
+        .header('Content-Type', EXPORT_CONTENT_TYPES[format])
+        .header('Content-Disposition', `attachment; filename="apikeys.${format}"`)
+        .send(stream);
+    } catch (error: any) {
+      app.log.error(error);
+
+      if (error.message === 'Invalid export format') {
+        return reply.status(400).send({ error: error.message });
+      }
+
+      return reply.status(500).send({ error: 'Failed to export API keys' });
+    }
+  });
+
   /**
    * GET /apikeys/:id
    * Get a specific API key
@@ -57,15 +109,20 @@ export async function registerApiKeyRoutes(
 
   /**
    * POST /apikeys
-   * Create a new API key
+   * Create a new API key. The response carries the only copy of the key.
    */
   app.post<{ Body: any }>('/apikeys', async (request, reply) => {
     try {
       const validated = await validateCreateApiKey(request.body);
-      const apiKey = await repository.create(validated);
-
       const eventHandler = new ApiKeyEventHandler();
-      await eventHandler.onApiKeyCreated(apiKey);
+
+      // The event is recorded in the same transaction as the change
+      const apiKey = await withTransaction(async () => {
+        const created = await repository.create(validated);
+        await eventHandler.onApiKeyCreated(created);
+        return created;
+      });
+      authenticator.register(apiKey.key!);
 
       return reply.status(201).send({ data: apiKey });
     } catch (error: any) {
@@ -89,6 +146,7 @@ export async function registerApiKeyRoutes(
       try {
         const validated = await validateUpdateApiKey(request.body);
         const apiKey = await repository.update(request.params.id, validated);
+        authenticator.forget();
 
         return reply.send({ data: apiKey });
       } catch (error: any) {
@@ -117,10 +175,12 @@ export async function registerApiKeyRoutes(
         return reply.status(404).send({ error: 'API Key not found' });
       }
 
-      await repository.delete(request.params.id);
-
       const eventHandler = new ApiKeyEventHandler();
-      await eventHandler.onApiKeyRevoked(apiKey);
+      await withTransaction(async () => {
+        await repository.delete(request.params.id);
+        await eventHandler.onApiKeyRevoked(apiKey);
+      });
+      authenticator.forget();
 
       return reply.status(204).send();
     } catch (error: any) {
@@ -3,41 +3,92 @@
  */
 
 import { FastifyInstance } from 'fastify';
+import { generateSecret, SecretHasher } from '@dataspace/auth';
+import { parseCountStrategy, parseExportFormat, withTransaction, EXPORT_CONTENT_TYPES } from '@dataspace/db';
 import CredentialRepository from '../repositories/credential-repository';
 import { validateCreateCredential, validateUpdateCredential } from '../validators/credential.validator';
 import { CredentialEventHandler } from '../events/credential.event';
 
 export async function registerCredentialRoutes(
   app: FastifyInstance,
-  repository: CredentialRepository
+  repository: CredentialRepository,
+  hasher: SecretHasher
 ) {
   /**
    * GET /credentials
    * List all credentials
    */
-  app.get<{ Querystring: { page?: string; pageSize?: string; participantId?: string } }>(
+  app.get<{
+    Querystring: {
+      page?: string;
+      pageSize?: string;
+      participantId?: string;
+      cursor?: string;
+      after?: string;
+      count?: string;
+    };
+  }>(
     '/credentials',
     async (request, reply) => {
       try {
         const page = parseInt(request.query.page || '1') || 1;
         const pageSize = parseInt(request.query.pageSize || '10') || 10;
         const participantId = request.query.participantId;
+        const cursor = request.query.cursor ?? request.query.after;
+        const count = parseCountStrategy(request.query.count);
+
+        if (cursor !== undefined) {
+          const keysetResult = participantId
+            ? await repository.findByParticipantIdAfter(participantId, cursor || null, pageSize)
+            : await repository.findAllAfter(cursor || null, pageSize);
+
+          return reply.send(keysetResult);
+        }
 
         let result;
         if (participantId) {
-          result = await repository.findByParticipantId(participantId, page, pageSize);
+          result = await repository.findByParticipantId(participantId, page, pageSize, count);
         } else {
-          result = await repository.findAll(page, pageSize);
+          result = await repository.findAll(page, pageSize, count);
         }
 
         return reply.send(result);
-      } catch (error) {
+      } catch (error: any) {
         app.log.error(error);
+
+        if (error.message?.includes('Invalid cursor') || error.message?.includes('Invalid count strategy')) {
+          return reply.status(400).send({ error: error.message });
+        }
+
         return reply.status(500).send({ error: 'Failed to fetch credentials' });
       }
     }
   );
 
+  /**
+   * GET /credentials/export
+   * Stream all credentials as CSV or NDJSON (secrets excluded)
+   */
+  app.get<{ Querystring: { format?: string } }>('/credentials/export', async (request, reply) => {
+    try {
+      const format = parseExportFormat(request.query.format);
+      const stream = await repository.exportAll(format);
+
+      return reply
+        .header('Content-Type', EXPORT_CONTENT_TYPES[format])
+        .header('Content-Disposition', `attachment; filename="credentials.${format}"`)
+        .send(stream);
+    } catch (error: any) {
+      app.log.error(error);
+
+      if (error.message === 'Invalid export format') {
+        return reply.status(400).send({ error: error.message });
+      }
+
+      return reply.status(500).send({ error: 'Failed to export credentials' });
+    }
+  });
+
   /**
    * GET /credentials/:id
    * Get a specific credential
@@ -57,17 +108,24 @@ export async function registerCredentialRoutes(
 
   /**
    * POST /credentials
-   * Create a new credential
+   * Create a new credential. The client secret is only stored hashed, so
+   * this response is the one place it is ever returned.
    */
   app.post<{ Body: any }>('/credentials', async (request, reply) => {
     try {
       const validated = await validateCreateCredential(request.body);
-      const credential = await repository.create(validated);
-
       const eventHandler = new CredentialEventHandler();
-      await eventHandler.onCredentialCreated(credential);
+      const clientSecret = generateSecret();
+      const clientSecretHash = await hasher.hash(clientSecret);
+
+      // The event is recorded in the same transaction as the change
+      const credential = await withTransaction(async () => {
+        const created = await repository.create(validated, clientSecretHash);
+        await eventHandler.onCredentialCreated(created);
+        return created;
+      });
 
-      return reply.status(201).send({ data: credential });
+      return reply.status(201).send({ data: { ...credential, clientSecret } });
     } catch (error: any) {
       app.log.error(error);
 
@@ -97,12 +155,14 @@ export async function registerCredentialRoutes(
           return reply.status(404).send({ error: 'Credential not found' });
         }
 
-        const credential = await repository.update(request.params.id, validated);
-
         const eventHandler = new CredentialEventHandler();
-        if (oldCredential.scope !== credential.scope) {
-          await eventHandler.onScopeChanged(credential, oldCredential.scope, credential.scope);
-        }
+        const credential = await withTransaction(async () => {
+          const updated = await repository.update(request.params.id, validated);
+          if ([...oldCredential.scope].sort().join(' ') !== [...updated.scope].sort().join(' ')) {
+            await eventHandler.onScopeChanged(updated, oldCredential.scope, updated.scope);
+          }
+          return updated;
+        });
 
         return reply.send({ data: credential });
       } catch (error: any) {
@@ -131,10 +191,11 @@ export async function registerCredentialRoutes(
         return reply.status(404).send({ error: 'Credential not found' });
       }
 
-      await repository.delete(request.params.id);
-
       const eventHandler = new CredentialEventHandler();
-      await eventHandler.onCredentialRevoked(credential);
+      await withTransaction(async () => {
+        await repository.delete(request.params.id);
+        await eventHandler.onCredentialRevoked(credential);
+      });
 
       return reply.status(204).send();
     } catch (error: any) {
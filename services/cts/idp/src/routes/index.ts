@@ -3,20 +3,29 @@
  */
 
 import { FastifyInstance } from 'fastify';
+import { ApiKeyAuthenticator, JwtSigner, JwtVerifier, RevocationList, SecretHasher } from '@dataspace/auth';
 import CredentialRepository from '../repositories/credential-repository';
 import ApiKeyRepository from '../repositories/apikey-repository';
+import RefreshTokenRepository from '../repositories/refresh-token-repository';
 import { registerCredentialRoutes } from './credentials';
 import { registerApiKeyRoutes } from './apikeys';
 import { registerTokenRoutes } from './tokens';
 import { registerUserRoutes } from './users';
+import { ApiKey } from '../types';
 
 export async function registerRoutes(
   app: FastifyInstance,
   credentialRepo: CredentialRepository,
-  apiKeyRepo: ApiKeyRepository
+  apiKeyRepo: ApiKeyRepository,
+  refreshTokenRepo: RefreshTokenRepository,
+  signer: JwtSigner,
+  verifier: JwtVerifier,
+  revocations: RevocationList,
+  hasher: SecretHasher,
+  apiKeys: ApiKeyAuthenticator<ApiKey>
 ) {
-  await registerCredentialRoutes(app, credentialRepo);
-  await registerApiKeyRoutes(app, apiKeyRepo);
-  await registerTokenRoutes(app, credentialRepo);
-  await registerUserRoutes(app);
+  await registerCredentialRoutes(app, credentialRepo, hasher);
+  await registerApiKeyRoutes(app, apiKeyRepo, apiKeys);
+  await registerTokenRoutes(app, credentialRepo, refreshTokenRepo, signer, verifier, revocations, hasher);
+  await registerUserRoutes(app, hasher);
 }
@@ -3,15 +3,92 @@
  */
 
 import { FastifyInstance } from 'fastify';
+import {
+  generateSecret,
+  hasScope,
+  JwtError,
+  JwtSigner,
+  JwtVerifier,
+  RevocationList,
+  SecretHasher,
+} from '@dataspace/auth';
+import { withTransaction } from '@dataspace/db';
 import CredentialRepository from '../repositories/credential-repository';
+import RefreshTokenRepository from '../repositories/refresh-token-repository';
 import { validateIssueToken } from '../validators/credential.validator';
 import { TokenEventHandler } from '../events/token.event';
-import { Token, TokenResponse } from '../types';
+import { Credential, Token, TokenResponse } from '../types';
+
+const ACCESS_TOKEN_TTL_SECONDS = parseInt(process.env.JWT_ACCESS_TOKEN_TTL_SECONDS || '3600');
+const REFRESH_TOKEN_TTL_SECONDS = parseInt(process.env.REFRESH_TOKEN_TTL_SECONDS || '2592000');
+
+// Active and not past its expiry
+const isUsable = (credential: Credential): boolean =>
+  credential.status === 'active' && (!credential.expiresAt || new Date(credential.expiresAt) > new Date());
 
 export async function registerTokenRoutes(
   app: FastifyInstance,
-  credentialRepository: CredentialRepository
+  credentialRepository: CredentialRepository,
+  refreshTokenRepository: RefreshTokenRepository,
+  signer: JwtSigner,
+  verifier: JwtVerifier,
+  revocations: RevocationList,
+  hasher: SecretHasher
 ) {
+  /**
+   * Sign an access token for a credential and, when the credential may
+   * refresh, store a new refresh token with it. Call inside withTransaction().
+   */
+  const issueTokens = async (credential: Credential, scope: string[]): Promise<Token> => {
+    const signed = signer.sign(
+      {
+        sub: credential.clientId,
+        client_id: credential.clientId,
+        participant_id: credential.participantId,
+        credential_id: credential.id,
+        scope: scope.join(' '),
+      },
+      ACCESS_TOKEN_TTL_SECONDS
+    );
+    const token: Token = {
+      id: signed.jti,
+      accessToken: signed.token,
+      tokenType: 'Bearer',
+      credentialId: credential.id,
+      issuedAt: signed.issuedAt.toISOString(),
+      expiresAt: signed.expiresAt.toISOString(),
+      scope,
+    };
+
+    if (scope.includes('refresh') || credential.scope.includes('refresh')) {
+      token.refreshToken = generateSecret();
+      await refreshTokenRepository.create(
+        token.refreshToken,
+        credential.id,
+        signed.jti,
+        scope,
+        new Date(Date.now() + REFRESH_TOKEN_TTL_SECONDS * 1000)
+      );
+    }
+    return token;
+  };
+
+  const toResponse = (token: Token): TokenResponse => ({
+    accessToken: token.accessToken,
+    refreshToken: token.refreshToken,
+    tokenType: token.tokenType,
+    expiresIn: ACCESS_TOKEN_TTL_SECONDS,
+    scope: token.scope,
+  });
+
+  /**
+   * GET /.well-known/jwks.json
+   * Public keys for verifying issued tokens (see jwtAuth in @dataspace/auth)
+   */
+  app.get('/.well-known/jwks.json', async (request, reply) => {
+    return reply.header('Cache-Control', 'public, max-age=300').send(signer.getJwks());
+  });
+
   /**
    * POST /token
    * Issue a new access token
@@ -21,53 +98,49 @@ export async function registerTokenRoutes(
     try {
       const validated = await validateIssueToken(request.body);
 
-      // Find credential by clientId
-      const credential = await credentialRepository.findByClientId(validated.clientId);
+      // Find credential by clientId (served from the read-through cache when enabled)
+      const credential = await credentialRepository.findWithSecretByClientId(validated.clientId);
       if (!credential) {
         return reply.status(401).send({ error: 'Invalid client credentials' });
       }
 
-      // Verify client secret (in production, use bcrypt/argon2)
-      if (credential.clientSecret !== validated.clientSecret) {
+      // Inactive and expired credentials are turned away before any secret work
+      if (!isUsable(credential)) {
+        return reply.status(403).send({ error: 'Credential is not active' });
+      }
+
+      // scrypt runs on the hasher's worker threads, off the event loop
+      const storedHash = credential.clientSecretHash;
+      if (!(await hasher.verify(validated.clientSecret, storedHash))) {
         return reply.status(401).send({ error: 'Invalid client credentials' });
       }
 
-      // Check credential status
-      if (credential.status !== 'active') {
-        return reply.status(403).send({ error: 'Credential is not active' });
+      // Hashes with an older cost are upgraded after a successful login,
+      // without delaying the response
+      if (hasher.needsRehash(storedHash)) {
+        hasher
+          .hash(validated.clientSecret)
+          .then((hash) => credentialRepository.updateSecretHash(credential.id, hash, storedHash))
+          .catch((error) => app.log.error(error, 'Failed to upgrade client secret hash'));
       }
 
-      // Generate token (mock implementation)
-      const now = new Date();
-      const expiresIn = 3600; // 1 hour
-      const token: Token = {
-        id: `token_${Date.now()}`,
-        accessToken: `eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.${Date.now()}.${Math.random()}`,
-        tokenType: 'Bearer',
-        credentialId: credential.id,
-        issuedAt: now.toISOString(),
-        expiresAt: new Date(now.getTime() + expiresIn * 1000).toISOString(),
-        scope: validated.scope || credential.scope,
-      };
-
-      // Generate refresh token if scope allows
-      if (validated.scope?.includes('refresh') || credential.scope.includes('refresh')) {
-        token.refreshToken = `refresh_${Date.now()}.${Math.random()}`;
+      // A token may narrow the credential's scopes but never widen them
+      const scope = validated.scope || credential.scope;
+      const granted = { scope: credential.scope.join(' ') };
+      if (!scope.every((requested: string) => hasScope(granted, requested))) {
+        return reply.status(400).send({ error: 'Invalid scope: not granted to this client' });
       }
 
-      // Emit event
+      // Signed JWT access token, verifiable by any service against the JWKS;
+      // the refresh token and the event are written in one transaction
       const eventHandler = new TokenEventHandler();
-      await eventHandler.onTokenIssued(token);
-
-      const response: TokenResponse = {
-        accessToken: token.accessToken,
-        refreshToken: token.refreshToken,
-        tokenType: token.tokenType,
-        expiresIn,
-        scope: token.scope,
-      };
+      const token = await withTransaction(async () => {
+        const issued = await issueTokens(credential, scope);
+        await eventHandler.onTokenIssued(issued);
+        return issued;
+      });
 
-      return reply.send(response);
+      return reply.send(toResponse(token));
     } catch (error: any) {
       app.log.error(error);
 
@@ -81,44 +154,38 @@ export async function registerTokenRoutes(
 
   /**
    * POST /token/refresh
-   * Refresh an access token
+   * Exchange a refresh token for a new access token and refresh token. Each
+   * refresh token is redeemed once; the credential must still be active.
    */
   app.post<{ Body: { refreshToken: string } }>('/token/refresh', async (request, reply) => {
     try {
-      if (!request.body.refreshToken) {
+      if (typeof request.body?.refreshToken !== 'string' || !request.body.refreshToken) {
         return reply.status(400).send({ error: 'refreshToken is required' });
       }
 
-      // In production, validate and decode the refresh token from database
-      // For now, just mock the behavior
-      const now = new Date();
-      const expiresIn = 3600;
-      const newToken: Token = {
-        id: `token_${Date.now()}`,
-        accessToken: `eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.${Date.now()}.${Math.random()}`,
-        refreshToken: `refresh_${Date.now()}.${Math.random()}`,
-        tokenType: 'Bearer',
-        credentialId: 'credential-id',
-        issuedAt: now.toISOString(),
-        expiresAt: new Date(now.getTime() + expiresIn * 1000).toISOString(),
-        scope: ['read:*'],
-      };
-
       const eventHandler = new TokenEventHandler();
-      await eventHandler.onTokenRefreshed(
-        { ...newToken, accessToken: request.body.refreshToken },
-        newToken
-      );
-
-      const response: TokenResponse = {
-        accessToken: newToken.accessToken,
-        refreshToken: newToken.refreshToken,
-        tokenType: newToken.tokenType,
-        expiresIn,
-        scope: newToken.scope,
-      };
+      // Redeeming and reissuing share a transaction, so a failure leaves the
+      // presented refresh token usable
+      const token = await withTransaction(async () => {
+        const grant = await refreshTokenRepository.redeem(request.body.refreshToken);
+        if (!grant) return null;
+
+        const credential = await credentialRepository.findById(grant.credentialId);
+        if (!credential || !isUsable(credential)) return null;
+
+        // Scopes removed from the credential since are not carried over
+        const granted = { scope: credential.scope.join(' ') };
+        const scope = grant.scope.filter((requested) => hasScope(granted, requested));
+
+        const issued = await issueTokens(credential, scope);
+        await eventHandler.onTokenRefreshed({ ...issued, id: grant.accessTokenId }, issued);
+        return issued;
+      });
 
-      return reply.send(response);
+      if (!token) {
+        return reply.status(400).send({ error: 'Invalid refresh token' });
+      }
+      return reply.send(toResponse(token));
     } catch (error: any) {
       app.log.error(error);
       return reply.status(500).send({ error: 'Failed to refresh token' });
@@ -127,7 +194,9 @@ export async function registerTokenRoutes(
 
   /**
    * POST /token/revoke
-   * Revoke an access token
+   * Revoke an access token. Every service rejects it within a second, until
+   * it would have expired. As in RFC 7009, tokens that are invalid, expired or
+   * already revoked get the same 204.
    */
   app.post<{ Body: { token: string } }>('/token/revoke', async (request, reply) => {
     try {
@@ -135,16 +204,28 @@ export async function registerTokenRoutes(
         return reply.status(400).send({ error: 'token is required' });
       }
 
-      // In production, find and invalidate the token
+      let claims;
+      try {
+        claims = await verifier.verify(request.body.token);
+      } catch (error) {
+        if (error instanceof JwtError) return reply.status(204).send();
+        throw error;
+      }
+      if (!claims.jti || !claims.exp) {
+        return reply.status(204).send();
+      }
+
+      await revocations.revoke(claims.jti, claims.exp);
+
       const eventHandler = new TokenEventHandler();
       await eventHandler.onTokenRevoked({
-        id: 'token-id',
+        id: claims.jti,
         accessToken: request.body.token,
         tokenType: 'Bearer',
-        credentialId: 'credential-id',
-        issuedAt: new Date().toISOString(),
-        expiresAt: new Date().toISOString(),
-        scope: [],
+        credentialId: (claims.credential_id as string) || '',
+        issuedAt: new Date((claims.iat ?? 0) * 1000).toISOString(),
+        expiresAt: new Date(claims.exp * 1000).toISOString(),
+        scope: claims.scope ? claims.scope.split(' ') : [],
       });
 
       return reply.status(204).send();
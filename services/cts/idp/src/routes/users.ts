@@ -1,4 +1,5 @@
 import { FastifyInstance, FastifyRequest, FastifyReply } from 'fastify';
+import { generateSecret, SecretHasher } from '@dataspace/auth';
 import CredentialRepository from '../repositories/credential-repository.js';
 
 /**
@@ -6,7 +7,7 @@ import CredentialRepository from '../repositories/credential-repository.js';
  * Handles user profile and user management endpoints
  */
 
-export async function registerUserRoutes(app: FastifyInstance) {
+export async function registerUserRoutes(app: FastifyInstance, hasher: SecretHasher) {
   const credentialRepository = new CredentialRepository();
 
   /**
@@ -65,12 +66,15 @@ export async function registerUserRoutes(app: FastifyInstance) {
         });
       }
 
-      // Create new credential
-      const newCredential = await credentialRepository.create({
-        clientId,
-        participantId,
-        scope: scope || ['read:data'],
-      });
+      // Create new credential; as before, its secret is not returned here
+      const newCredential = await credentialRepository.create(
+        {
+          clientId,
+          participantId,
+          scope: scope || ['read:data'],
+        },
+        await hasher.hash(generateSecret())
+      );
 
       return reply.status(201).send({
         id: newCredential.id,
@@ -6,7 +6,6 @@
 export interface Credential {
   id: string;
   clientId: string;
-  clientSecret: string;
   participantId: string;
   scope: string[];
   status: 'active' | 'revoked' | 'expired';
@@ -15,6 +14,11 @@ export interface Credential {
   expiresAt?: string;
 }
 
+// Only loaded to authenticate a client; never returned by the API
+export interface CredentialWithSecret extends Credential {
+  clientSecretHash: string; // scrypt hash (see SecretHasher)
+}
+
 export interface CreateCredentialRequest {
   clientId: string;
   participantId: string;
@@ -57,7 +61,8 @@ export interface TokenResponse {
 // ============= API Keys =============
 export interface ApiKey {
   id: string;
-  key: string;
+  key?: string; // Only returned when the key is created; stored as a hash
+  keyPrefix: string; // First characters of the key, to tell keys apart
   name: string;
   participantId: string;
   scope: string[];
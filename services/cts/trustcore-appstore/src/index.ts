@@ -1,6 +1,7 @@
 import Fastify from 'fastify';
 import helmet from '@fastify/helmet';
 import cors from '@fastify/cors';
+import { createJwtVerifierFromEnv, createRevocationListFromEnv, jwtAuth } from '@dataspace/auth';
 import { registerAppstoreRoutes } from './routes/apps-routes.js';
 
 const app = Fastify({
@@ -11,6 +12,13 @@ const app = Fastify({
 await app.register(helmet);
 await app.register(cors);
 
+// Bearer tokens are verified locally against the IdP's published keys
+// Revoked token ids are replicated from Redis into memory, so checking one
+// costs a Map lookup rather than a round trip per request
+const revocations = await createRevocationListFromEnv();
+const verifier = createJwtVerifierFromEnv(revocations);
+await app.register(jwtAuth, { verifier, required: process.env.AUTH_REQUIRED === 'true' });
+
 // Health check endpoint
 app.get('/health', async (request, reply) => {
   return { status: 'healthy', service: 'trustcore-appstore' };
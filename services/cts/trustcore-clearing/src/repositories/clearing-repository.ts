@@ -1,56 +1,92 @@
 // Repository - PostgreSQL Database
-import { query } from '@dataspace/db';
+import type { Readable } from 'node:stream';
+import {
+  query,
+  queryPage,
+  buildKeysetQuery,
+  toKeysetPage,
+  CrudRepository,
+  type CountStrategy,
+  type ExportFormat,
+  type KeysetPage,
+  type TableDescriptor,
+} from '@dataspace/db';
 import type { Clearing, CreateClearingInput, UpdateClearingInput } from '../types/clearing.js';
 
+const CLEARING_TABLE: TableDescriptor = {
+  table: 'trustcore_clearing',
+  returning: `id, name, description, rules, status,
+              created_at as "createdAt", updated_at as "updatedAt"`,
+  columns: { name: 'name', description: 'description', rules: 'rules', status: 'status' },
+  jsonColumns: ['rules'],
+};
+
 export class ClearingRepository {
+  private readonly crud = new CrudRepository<Clearing>(CLEARING_TABLE, (row) => this.mapRowToClearing(row));
+
   async create(input: CreateClearingInput): Promise<Clearing> {
     try {
-      const result = await query(
-        `INSERT INTO trustcore_clearing
-         (name, description, rules, status)
-         VALUES ($1, $2, $3, $4)
-         RETURNING id, name, description, rules, status,
-                   created_at as "createdAt", updated_at as "updatedAt"`,
-        [input.name, input.description, JSON.stringify(input.rules), input.status || 'draft']
-      );
-      return this.mapRowToClearing(result.rows[0]);
+      return await this.crud.insert({
+        name: input.name,
+        description: input.description,
+        rules: input.rules,
+        status: input.status || 'draft',
+      });
     } catch (error) {
       console.error('Error creating clearing:', error);
       throw error;
     }
   }
 
-  async findAll(page: number = 1, pageSize: number = 10): Promise<{ data: Clearing[]; total: number }> {
+  async findAll(page: number = 1, pageSize: number = 10, count: CountStrategy = 'exact'): Promise<{ data: Clearing[]; total: number | null }> {
     try {
-      const countResult = await query('SELECT COUNT(*) FROM trustcore_clearing');
-      const total = parseInt(countResult.rows[0].count, 10);
-      const offset = (page - 1) * pageSize;
-      const result = await query(
-        `SELECT id, name, description, rules, status,
-                created_at as "createdAt", updated_at as "updatedAt"
-         FROM trustcore_clearing
-         ORDER BY created_at DESC
-         LIMIT $1 OFFSET $2`,
-        [pageSize, offset]
+      const result = await queryPage(
+        {
+          columns: `id, name, description, rules, status,
+                    created_at as "createdAt", updated_at as "updatedAt"`,
+          from: 'trustcore_clearing',
+          page,
+          pageSize,
+          count,
+        },
+        (row) => this.mapRowToClearing(row)
       );
-      const data = result.rows.map((row: any) => this.mapRowToClearing(row));
-      return { data, total };
+
+      return { data: result.data, total: result.total };
     } catch (error) {
       console.error('Error fetching clearing policies:', error);
       throw error;
     }
   }
 
+  async findAllAfter(after: string | null, pageSize: number = 10): Promise<KeysetPage<Clearing>> {
+    try {
+      const { text, values } = buildKeysetQuery({
+        columns: `id, name, description, rules, status, created_at as "createdAt", updated_at as "updatedAt"`,
+        from: 'trustcore_clearing',
+        after,
+        pageSize,
+      });
+      const result = await query(text, values);
+      return toKeysetPage(result.rows, pageSize, (row) => this.mapRowToClearing(row));
+    } catch (error) {
+      console.error('Error fetching clearing records by cursor:', error);
+      throw error;
+    }
+  }
+
+  async exportAll(format: ExportFormat): Promise<Readable> {
+    try {
+      return await this.crud.export(format);
+    } catch (error) {
+      console.error('Error exporting clearing records:', error);
+      throw error;
+    }
+  }
+
   async findById(id: string): Promise<Clearing | null> {
     try {
-      const result = await query(
-        `SELECT id, name, description, rules, status,
-                created_at as "createdAt", updated_at as "updatedAt"
-         FROM trustcore_clearing
-         WHERE id = $1`,
-        [id]
-      );
-      return result.rows.length > 0 ? this.mapRowToClearing(result.rows[0]) : null;
+      return await this.crud.findById(id);
     } catch (error) {
       console.error('Error fetching clearing:', error);
       throw error;
@@ -59,43 +95,7 @@ export class ClearingRepository {
 
   async update(id: string, input: UpdateClearingInput): Promise<Clearing | null> {
     try {
-      const clearing = await this.findById(id);
-      if (!clearing) return null;
-      const updateFields: string[] = [];
-      const values: any[] = [];
-      let paramIndex = 1;
-      if (input.name !== undefined) {
-        updateFields.push(`name = $${paramIndex}`);
-        values.push(input.name);
-        paramIndex++;
-      }
-      if (input.description !== undefined) {
-        updateFields.push(`description = $${paramIndex}`);
-        values.push(input.description);
-        paramIndex++;
-      }
-      if (input.rules !== undefined) {
-        updateFields.push(`rules = $${paramIndex}`);
-        values.push(JSON.stringify(input.rules));
-        paramIndex++;
-      }
-      if (input.status !== undefined) {
-        updateFields.push(`status = $${paramIndex}`);
-        values.push(input.status);
-        paramIndex++;
-      }
-      if (updateFields.length === 0) return clearing;
-      updateFields.push(`updated_at = CURRENT_TIMESTAMP`);
-      values.push(id);
-      const result = await query(
-        `UPDATE trustcore_clearing
-         SET ${updateFields.join(', ')}
-         WHERE id = $${paramIndex}
-         RETURNING id, name, description, rules, status,
-                   created_at as "createdAt", updated_at as "updatedAt"`,
-        values
-      );
-      return this.mapRowToClearing(result.rows[0]);
+      return await this.crud.update(id, input);
     } catch (error) {
       console.error('Error updating clearing:', error);
       throw error;
@@ -104,10 +104,7 @@ export class ClearingRepository {
 
   async delete(id: string): Promise<boolean> {
     try {
-      const clearing = await this.findById(id);
-      if (!clearing) return false;
-      const result = await query('DELETE FROM trustcore_clearing WHERE id = $1', [id]);
-      return result.rowCount ? result.rowCount > 0 : false;
+      return (await this.crud.delete(id)) !== null;
     } catch (error) {
       console.error('Error deleting clearing:', error);
       throw error;
@@ -1,4 +1,5 @@
 import type { FastifyInstance } from 'fastify';
+import { parseCountStrategy, parseExportFormat, EXPORT_CONTENT_TYPES } from '@dataspace/db';
 import { ClearingRepository } from '../repositories/clearing-repository.js';
 import { ClearingValidator } from '../validators/clearing-validator.js';
 import { clearingEventEmitter } from '../events/clearing-events.js';
@@ -9,20 +10,57 @@ export async function registerClearingRoutes(app: FastifyInstance): Promise<void
 
   // GET /clearing-records - List all policies with pagination
   app.get<{
-    Querystring: { page?: string; pageSize?: string };
+    Querystring: { page?: string; pageSize?: string; cursor?: string; after?: string; count?: string };
   }>('/clearing-records', async (request, reply) => {
     try {
       const page = request.query.page ? parseInt(request.query.page) : 1;
       const pageSize = request.query.pageSize ? parseInt(request.query.pageSize) : 10;
+      const cursor = request.query.cursor ?? request.query.after;
+      // The list body carries no total, so counting is opt-in via ?count=
+      const count = parseCountStrategy(request.query.count, 'none');
 
-      const result = await repository.findAll(page, pageSize);
+      if (cursor !== undefined) {
+        const keysetPage = await repository.findAllAfter(cursor || null, pageSize);
+        return reply.send(keysetPage);
+      }
+
+      const result = await repository.findAll(page, pageSize, count);
+      if (result.total !== null) {
+        reply.header('X-Total-Count', String(result.total));
+      }
       return reply.send(result.data);
     } catch (error) {
+      if (
+        error instanceof Error &&
+        (error.message === 'Invalid cursor' || error.message === 'Invalid count strategy')
+      ) {
+        return reply.status(400).send({ error: error.message });
+      }
       const message = error instanceof Error ? error.message : 'Failed to list policies';
       return reply.status(500).send({ error: message });
     }
   });
 
+  // GET /clearing-records/export - Stream all clearing records as CSV or NDJSON
+  app.get<{
+    Querystring: { format?: string };
+  }>('/clearing-records/export', async (request, reply) => {
+    try {
+      const format = parseExportFormat(request.query.format);
+      const stream = await repository.exportAll(format);
+      return reply
+        .header('Content-Type', EXPORT_CONTENT_TYPES[format])
+        .header('Content-Disposition', `attachment; filename="clearing-records.${format}"`)
+        .send(stream);
+    } catch (error) {
+      if (error instanceof Error && error.message === 'Invalid export format') {
+        return reply.status(400).send({ error: error.message });
+      }
+      const message = error instanceof Error ? error.message : 'Failed to export clearing records';
+      return reply.status(500).send({ error: message });
+    }
+  });
+
   // POST /clearing-records - Create a new clearing
   app.post<{ Body: any }>('/clearing-records', async (request, reply) => {
     try {
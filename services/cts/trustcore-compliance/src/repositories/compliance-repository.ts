@@ -1,56 +1,92 @@
 // Repository - PostgreSQL Database
-import { query } from '@dataspace/db';
+import type { Readable } from 'node:stream';
+import {
+  query,
+  queryPage,
+  buildKeysetQuery,
+  toKeysetPage,
+  CrudRepository,
+  type CountStrategy,
+  type ExportFormat,
+  type KeysetPage,
+  type TableDescriptor,
+} from '@dataspace/db';
 import type { Compliance, CreateComplianceInput, UpdateComplianceInput } from '../types/compliance.js';
 
+const COMPLIANCE_TABLE: TableDescriptor = {
+  table: 'trustcore_compliance',
+  returning: `id, name, description, rules, status,
+              created_at as "createdAt", updated_at as "updatedAt"`,
+  columns: { name: 'name', description: 'description', rules: 'rules', status: 'status' },
+  jsonColumns: ['rules'],
+};
+
 export class ComplianceRepository {
+  private readonly crud = new CrudRepository<Compliance>(COMPLIANCE_TABLE, (row) => this.mapRowToCompliance(row));
+
   async create(input: CreateComplianceInput): Promise<Compliance> {
     try {
-      const result = await query(
-        `INSERT INTO trustcore_compliance
-         (name, description, rules, status)
-         VALUES ($1, $2, $3, $4)
-         RETURNING id, name, description, rules, status,
-                   created_at as "createdAt", updated_at as "updatedAt"`,
-        [input.name, input.description, JSON.stringify(input.rules), input.status || 'draft']
-      );
-      return this.mapRowToCompliance(result.rows[0]);
+      return await this.crud.insert({
+        name: input.name,
+        description: input.description,
+        rules: input.rules,
+        status: input.status || 'draft',
+      });
     } catch (error) {
       console.error('Error creating compliance:', error);
       throw error;
     }
   }
 
-  async findAll(page: number = 1, pageSize: number = 10): Promise<{ data: Compliance[]; total: number }> {
+  async findAll(page: number = 1, pageSize: number = 10, count: CountStrategy = 'exact'): Promise<{ data: Compliance[]; total: number | null }> {
     try {
-      const countResult = await query('SELECT COUNT(*) FROM trustcore_compliance');
-      const total = parseInt(countResult.rows[0].count, 10);
-      const offset = (page - 1) * pageSize;
-      const result = await query(
-        `SELECT id, name, description, rules, status,
-                created_at as "createdAt", updated_at as "updatedAt"
-         FROM trustcore_compliance
-         ORDER BY created_at DESC
-         LIMIT $1 OFFSET $2`,
-        [pageSize, offset]
+      const result = await queryPage(
+        {
+          columns: `id, name, description, rules, status,
+                    created_at as "createdAt", updated_at as "updatedAt"`,
+          from: 'trustcore_compliance',
+          page,
+          pageSize,
+          count,
+        },
+        (row) => this.mapRowToCompliance(row)
       );
-      const data = result.rows.map((row: any) => this.mapRowToCompliance(row));
-      return { data, total };
+
+      return { data: result.data, total: result.total };
     } catch (error) {
       console.error('Error fetching compliance policies:', error);
       throw error;
     }
   }
 
+  async findAllAfter(after: string | null, pageSize: number = 10): Promise<KeysetPage<Compliance>> {
+    try {
+      const { text, values } = buildKeysetQuery({
+        columns: `id, name, description, rules, status, created_at as "createdAt", updated_at as "updatedAt"`,
+        from: 'trustcore_compliance',
+        after,
+        pageSize,
+      });
+      const result = await query(text, values);
+      return toKeysetPage(result.rows, pageSize, (row) => this.mapRowToCompliance(row));
+    } catch (error) {
+      console.error('Error fetching compliance records by cursor:', error);
+      throw error;
+    }
+  }
+
+  async exportAll(format: ExportFormat): Promise<Readable> {
+    try {
+      return await this.crud.export(format);
+    } catch (error) {
+      console.error('Error exporting compliance policies:', error);
+      throw error;
+    }
+  }
+
   async findById(id: string): Promise<Compliance | null> {
     try {
-      const result = await query(
-        `SELECT id, name, description, rules, status,
-                created_at as "createdAt", updated_at as "updatedAt"
-         FROM trustcore_compliance
-         WHERE id = $1`,
-        [id]
-      );
-      return result.rows.length > 0 ? this.mapRowToCompliance(result.rows[0]) : null;
+      return await this.crud.findById(id);
     } catch (error) {
       console.error('Error fetching compliance:', error);
       throw error;
@@ -59,43 +95,7 @@ export class ComplianceRepository {
 
   async update(id: string, input: UpdateComplianceInput): Promise<Compliance | null> {
     try {
-      const compliance = await this.findById(id);
-      if (!compliance) return null;
-      const updateFields: string[] = [];
-      const values: any[] = [];
-      let paramIndex = 1;
-      if (input.name !== undefined) {
-        updateFields.push(`name = $${paramIndex}`);
-        values.push(input.name);
-        paramIndex++;
-      }
-      if (input.description !== undefined) {
-        updateFields.push(`description = $${paramIndex}`);
-        values.push(input.description);
-        paramIndex++;
-      }
-      if (input.rules !== undefined) {
-        updateFields.push(`rules = $${paramIndex}`);
-        values.push(JSON.stringify(input.rules));
-        paramIndex++;
-      }
-      if (input.status !== undefined) {
-        updateFields.push(`status = $${paramIndex}`);
-        values.push(input.status);
-        paramIndex++;
-      }
-      if (updateFields.length === 0) return compliance;
-      updateFields.push(`updated_at = CURRENT_TIMESTAMP`);
-      values.push(id);
-      const result = await query(
-        `UPDATE trustcore_compliance
-         SET ${updateFields.join(', ')}
-         WHERE id = $${paramIndex}
-         RETURNING id, name, description, rules, status,
-                   created_at as "createdAt", updated_at as "updatedAt"`,
-        values
-      );
-      return this.mapRowToCompliance(result.rows[0]);
+      return await this.crud.update(id, input);
     } catch (error) {
       console.error('Error updating compliance:', error);
       throw error;
@@ -104,10 +104,7 @@ export class ComplianceRepository {
 
   async delete(id: string): Promise<boolean> {
     try {
-      const compliance = await this.findById(id);
-      if (!compliance) return false;
-      const result = await query('DELETE FROM trustcore_compliance WHERE id = $1', [id]);
-      return result.rowCount ? result.rowCount > 0 : false;
+      return (await this.crud.delete(id)) !== null;
     } catch (error) {
       console.error('Error deleting compliance:', error);
       throw error;
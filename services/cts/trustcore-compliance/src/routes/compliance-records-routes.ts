@@ -1,4 +1,5 @@
 import type { FastifyInstance } from 'fastify';
+import { parseCountStrategy, parseExportFormat, EXPORT_CONTENT_TYPES } from '@dataspace/db';
 import { ComplianceRepository } from '../repositories/compliance-repository.js';
 import { ComplianceValidator } from '../validators/compliance-validator.js';
 import { complianceEventEmitter } from '../events/compliance-events.js';
@@ -9,20 +10,57 @@ export async function registerComplianceRoutes(app: FastifyInstance): Promise<vo
 
   // GET /compliance-records - List all policies with pagination
   app.get<{
-    Querystring: { page?: string; pageSize?: string };
+    Querystring: { page?: string; pageSize?: string; cursor?: string; after?: string; count?: string };
   }>('/compliance-records', async (request, reply) => {
     try {
       const page = request.query.page ? parseInt(request.query.page) : 1;
       const pageSize = request.query.pageSize ? parseInt(request.query.pageSize) : 10;
+      const cursor = request.query.cursor ?? request.query.after;
+      // The list body carries no total, so counting is opt-in via ?count=
+      const count = parseCountStrategy(request.query.count, 'none');
 
-      const result = await repository.findAll(page, pageSize);
+      if (cursor !== undefined) {
+        const keysetPage = await repository.findAllAfter(cursor || null, pageSize);
+        return reply.send(keysetPage);
+      }
+
+      const result = await repository.findAll(page, pageSize, count);
+      if (result.total !== null) {
+        reply.header('X-Total-Count', String(result.total));
+      }
       return reply.send(result.data);
     } catch (error) {
+      if (
+        error instanceof Error &&
+        (error.message === 'Invalid cursor' || error.message === 'Invalid count strategy')
+      ) {
+        return reply.status(400).send({ error: error.message });
+      }
       const message = error instanceof Error ? error.message : 'Failed to list policies';
       return reply.status(500).send({ error: message });
     }
   });
 
+  // GET /compliance-records/export - Stream all compliance records as CSV or NDJSON
+  app.get<{
+    Querystring: { format?: string };
+  }>('/compliance-records/export', async (request, reply) => {
+    try {
+      const format = parseExportFormat(request.query.format);
+      const stream = await repository.exportAll(format);
+      return reply
+        .header('Content-Type', EXPORT_CONTENT_TYPES[format])
+        .header('Content-Disposition', `attachment; filename="compliance-records.${format}"`)
+        .send(stream);
+    } catch (error) {
+      if (error instanceof Error && error.message === 'Invalid export format') {
+        return reply.status(400).send({ error: error.message });
+      }
+      const message = error instanceof Error ? error.message : 'Failed to export compliance records';
+      return reply.status(500).send({ error: message });
+    }
+  });
+
   // POST /compliance-records - Create a new compliance
   app.post<{ Body: any }>('/compliance-records', async (request, reply) => {
     try {
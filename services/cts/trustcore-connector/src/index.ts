@@ -1,7 +1,8 @@
 import Fastify from 'fastify';
 import helmet from '@fastify/helmet';
 import cors from '@fastify/cors';
-import { initializePool } from '@dataspace/db';
+import { createJwtVerifierFromEnv, createRevocationListFromEnv, jwtAuth } from '@dataspace/auth';
+import { initializePool, getStatementStats } from '@dataspace/db';
 import { registerConnectorRoutes } from './routes/connectors-routes.js';
 
 const app = Fastify({
@@ -17,6 +18,13 @@ await app.register(cors, {
   exposedHeaders: ['Content-Range', 'X-Content-Range'],
 });
 
+// Bearer tokens are verified locally against the IdP's published keys
+// Revoked token ids are replicated from Redis into memory, so checking one
+// costs a Map lookup rather than a round trip per request
+const revocations = await createRevocationListFromEnv();
+const verifier = createJwtVerifierFromEnv(revocations);
+await app.register(jwtAuth, { verifier, required: process.env.AUTH_REQUIRED === 'true' });
+
 // Initialize database pool
 const dbConfig = {
   host: process.env.DB_HOST || 'localhost',
@@ -47,6 +55,16 @@ app.get('/health', async (request, reply) => {
   return { status: 'healthy', service: 'trustcore-connector' };
 });
 
+// Prepared statement metrics (calls, latency percentiles, rows, pool wait)
+app.get('/metrics/db', async (request, reply) => {
+  return { statements: getStatementStats() };
+});
+
+// Access token verification counters
+app.get('/metrics/auth', async (request, reply) => {
+  return { verifier: verifier.getStats(), revocations: revocations.getStats() };
+});
+
 // Register routes
 await registerConnectorRoutes(app);
 
@@ -1,4 +1,5 @@
 import type { FastifyInstance } from 'fastify';
+import { parseCountStrategy, parseExportFormat, EXPORT_CONTENT_TYPES } from '@dataspace/db';
 import { ConnectorRepository } from '../repositories/connector-repository.js';
 import { ConnectorValidator } from '../validators/connector-validator.js';
 import { connectorEventEmitter } from '../events/connector-events.js';
@@ -9,20 +10,57 @@ export async function registerConnectorRoutes(app: FastifyInstance): Promise<voi
 
   // GET /connectors - List all policies with pagination
   app.get<{
-    Querystring: { page?: string; pageSize?: string };
+    Querystring: { page?: string; pageSize?: string; cursor?: string; after?: string; count?: string };
   }>('/connectors', async (request, reply) => {
     try {
       const page = request.query.page ? parseInt(request.query.page) : 1;
       const pageSize = request.query.pageSize ? parseInt(request.query.pageSize) : 10;
+      const cursor = request.query.cursor ?? request.query.after;
+      // The list body carries no total, so counting is opt-in via ?count=
+      const count = parseCountStrategy(request.query.count, 'none');
 
-      const result = await repository.findAll(page, pageSize);
+      if (cursor !== undefined) {
+        const keysetPage = await repository.findAllAfter(cursor || null, pageSize);
+        return reply.send(keysetPage);
+      }
+
+      const result = await repository.findAll(page, pageSize, count);
+      if (result.total !== null) {
+        reply.header('X-Total-Count', String(result.total));
+      }
       return reply.send(result.data);
     } catch (error) {
+      if (
+        error instanceof Error &&
+        (error.message === 'Invalid cursor' || error.message === 'Invalid count strategy')
+      ) {
+        return reply.status(400).send({ error: error.message });
+      }
       const message = error instanceof Error ? error.message : 'Failed to list policies';
       return reply.status(500).send({ error: message });
     }
   });
 
+  // GET /connectors/export - Stream all connectors as CSV or NDJSON
+  app.get<{
+    Querystring: { format?: string };
+  }>('/connectors/export', async (request, reply) => {
+    try {
+      const format = parseExportFormat(request.query.format);
+      const stream = await repository.exportAll(format);
+      return reply
+        .header('Content-Type', EXPORT_CONTENT_TYPES[format])
+        .header('Content-Disposition', `attachment; filename="connectors.${format}"`)
+        .send(stream);
+    } catch (error) {
+      if (error instanceof Error && error.message === 'Invalid export format') {
+        return reply.status(400).send({ error: error.message });
+      }
+      const message = error instanceof Error ? error.message : 'Failed to export connectors';
+      return reply.status(500).send({ error: message });
+    }
+  });
+
   // POST /connectors - Create a new connector
   app.post<{ Body: any }>('/connectors', async (request, reply) => {
     try {
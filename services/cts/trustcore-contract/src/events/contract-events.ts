@@ -1,4 +1,6 @@
 import { EventEmitter } from 'events';
+import { appendToOutbox } from '@dataspace/db';
+import { createDomainEvent, EventTopics, EventType, toOutboxEntry } from '@dataspace/kafka';
 import type { Contract } from '../types/contract.js';
 
 export class ContractEventEmitter extends EventEmitter {
@@ -33,3 +35,32 @@ export class ContractEventEmitter extends EventEmitter {
 }
 
 export const contractEventEmitter = new ContractEventEmitter();
+
+// Events are recorded in the transactional outbox and published to Kafka by
+// the OutboxRelay; call these inside the withTransaction() that writes the change.
+export class ContractEventHandler {
+  // A new contract is published as a proposal
+  async onContractCreated(contract: Contract) {
+    await this.emit(EventType.CONTRACT_PROPOSED, contract);
+  }
+
+  async onContractUpdated(contract: Contract) {
+    await this.emit(EventType.CONTRACT_UPDATED, contract);
+  }
+
+  async onContractDeleted(contractId: string) {
+    const event = createDomainEvent(EventType.CONTRACT_DELETED, 'contract', contractId, { contractId });
+    await appendToOutbox(toOutboxEntry(EventTopics.CONTRACTS, event));
+  }
+
+  private async emit(eventType: EventType, contract: Contract) {
+    const event = createDomainEvent(eventType, 'contract', contract.id, {
+      contractId: contract.id,
+      name: contract.name,
+      description: contract.description,
+      status: contract.status,
+      terms: contract.rules,
+    });
+    await appendToOutbox(toOutboxEntry(EventTopics.CONTRACTS, event));
+  }
+}
@@ -1,7 +1,9 @@
 import Fastify from 'fastify';
 import helmet from '@fastify/helmet';
 import cors from '@fastify/cors';
-import { initializePool } from '@dataspace/db';
+import { createJwtVerifierFromEnv, createRevocationListFromEnv, jwtAuth } from '@dataspace/auth';
+import { initializePool, getStatementStats, getOutboxBacklog, outboxStore } from '@dataspace/db';
+import { KafkaClient, OutboxRelay, outboxRelayOptionsFromEnv } from '@dataspace/kafka';
 import { registerContractRoutes } from './routes/contracts-routes.js';
 
 const app = Fastify({
@@ -17,6 +19,13 @@ await app.register(cors, {
   exposedHeaders: ['Content-Range', 'X-Content-Range'],
 });
 
+// Bearer tokens are verified locally against the IdP's published keys
+// Revoked token ids are replicated from Redis into memory, so checking one
+// costs a Map lookup rather than a round trip per request
+const revocations = await createRevocationListFromEnv();
+const verifier = createJwtVerifierFromEnv(revocations);
+await app.register(jwtAuth, { verifier, required: process.env.AUTH_REQUIRED === 'true' });
+
 // Initialize database pool
 const dbConfig = {
   host: process.env.DB_HOST || 'localhost',
@@ -42,11 +51,38 @@ try {
   process.exit(1);
 }
 
+// Domain events are written to the outbox with each change and relayed to
+// Kafka when it is configured; otherwise they wait in the outbox.
+let outboxRelay: OutboxRelay | null = null;
+if (process.env.KAFKA_BROKERS) {
+  const kafka = new KafkaClient({
+    brokers: process.env.KAFKA_BROKERS.split(','),
+    clientId: process.env.KAFKA_CLIENT_ID || 'trustcore-contract',
+  });
+  outboxRelay = new OutboxRelay(kafka, outboxStore, outboxRelayOptionsFromEnv());
+  outboxRelay.start();
+}
+
 // Health check endpoint
 app.get('/health', async (request, reply) => {
   return { status: 'healthy', service: 'trustcore-contract' };
 });
 
+// Prepared statement metrics (calls, latency percentiles, rows, pool wait)
+app.get('/metrics/db', async (request, reply) => {
+  return { statements: getStatementStats() };
+});
+
+// Access token verification counters
+app.get('/metrics/auth', async (request, reply) => {
+  return { verifier: verifier.getStats(), revocations: revocations.getStats() };
+});
+
+// Outbox relay progress and unpublished backlog
+app.get('/metrics/outbox', async (request, reply) => {
+  return { relay: outboxRelay?.getStats() ?? null, backlog: await getOutboxBacklog() };
+});
+
 // Register routes
 await registerContractRoutes(app);
 
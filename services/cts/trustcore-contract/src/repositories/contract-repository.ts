@@ -1,58 +1,91 @@
 // Repository - PostgreSQL Database
-import { query } from '@dataspace/db';
+import type { Readable } from 'node:stream';
+import {
+  query,
+  queryPage,
+  buildKeysetQuery,
+  toKeysetPage,
+  CrudRepository,
+  type CountStrategy,
+  type ExportFormat,
+  type KeysetPage,
+  type TableDescriptor,
+} from '@dataspace/db';
 import type { Contract, CreateContractInput, UpdateContractInput } from '../types/contract.js';
 
+const CONTRACT_TABLE: TableDescriptor = {
+  table: 'trustcore_contracts',
+  returning: `id, name, description, rules, status,
+              created_at as "createdAt", updated_at as "updatedAt"`,
+  columns: { name: 'name', description: 'description', rules: 'rules', status: 'status' },
+  jsonColumns: ['rules'],
+};
+
 export class ContractRepository {
+  private readonly crud = new CrudRepository<Contract>(CONTRACT_TABLE, (row) => this.mapRowToContract(row));
+
   async create(input: CreateContractInput): Promise<Contract> {
     try {
-      const result = await query(
-        `INSERT INTO trustcore_contracts
-         (name, description, rules, status)
-         VALUES ($1, $2, $3, $4)
-         RETURNING id, name, description, rules, status, created_at as "createdAt", updated_at as "updatedAt"`,
-        [
-          input.name,
-          input.description || null,
-          JSON.stringify(input.rules),
-          input.status || 'draft',
-        ]
-      );
-      return this.mapRowToContract(result.rows[0]);
+      return await this.crud.insert({
+        name: input.name,
+        description: input.description || null,
+        rules: input.rules,
+        status: input.status || 'draft',
+      });
     } catch (error) {
       console.error('Error creating contract:', error);
       throw error;
     }
   }
 
-  async findAll(page: number = 1, pageSize: number = 10): Promise<{ data: Contract[]; total: number }> {
+  async findAll(page: number = 1, pageSize: number = 10, count: CountStrategy = 'exact'): Promise<{ data: Contract[]; total: number | null }> {
     try {
-      const countResult = await query('SELECT COUNT(*) FROM trustcore_contracts');
-      const total = parseInt(countResult.rows[0].count, 10);
-      const offset = (page - 1) * pageSize;
-      const result = await query(
-        `SELECT id, name, description, rules, status, created_at as "createdAt", updated_at as "updatedAt"
-         FROM trustcore_contracts
-         ORDER BY created_at DESC
-         LIMIT $1 OFFSET $2`,
-        [pageSize, offset]
+      const result = await queryPage(
+        {
+          columns: `id, name, description, rules, status, created_at as "createdAt", updated_at as "updatedAt"`,
+          from: 'trustcore_contracts',
+          page,
+          pageSize,
+          count,
+        },
+        (row) => this.mapRowToContract(row)
       );
-      const data = result.rows.map((row: any) => this.mapRowToContract(row));
-      return { data, total };
+
+      return { data: result.data, total: result.total };
     } catch (error) {
       console.error('Error fetching contracts:', error);
       throw error;
     }
   }
 
+  async findAllAfter(after: string | null, pageSize: number = 10): Promise<KeysetPage<Contract>> {
+    try {
+      const { text, values } = buildKeysetQuery({
+        columns: `id, name, description, rules, status, created_at as "createdAt", updated_at as "updatedAt"`,
+        from: 'trustcore_contracts',
+        after,
+        pageSize,
+      });
+      const result = await query(text, values);
+      return toKeysetPage(result.rows, pageSize, (row) => this.mapRowToContract(row));
+    } catch (error) {
+      console.error('Error fetching contracts by cursor:', error);
+      throw error;
+    }
+  }
+
+  async exportAll(format: ExportFormat): Promise<Readable> {
+    try {
+      return await this.crud.export(format);
+    } catch (error) {
+      console.error('Error exporting contracts:', error);
+      throw error;
+    }
+  }
+
   async findById(id: string): Promise<Contract | null> {
     try {
-      const result = await query(
-        `SELECT id, name, description, rules, status, created_at as "createdAt", updated_at as "updatedAt"
-         FROM trustcore_contracts
-         WHERE id = $1`,
-        [id]
-      );
-      return result.rows.length > 0 ? this.mapRowToContract(result.rows[0]) : null;
+      return await this.crud.findById(id);
     } catch (error) {
       console.error('Error fetching contract:', error);
       throw error;
@@ -61,42 +94,7 @@ export class ContractRepository {
 
   async update(id: string, input: UpdateContractInput): Promise<Contract | null> {
     try {
-      const contract = await this.findById(id);
-      if (!contract) return null;
-      const updateFields: string[] = [];
-      const values: any[] = [];
-      let paramIndex = 1;
-      if (input.name !== undefined) {
-        updateFields.push(`name = $${paramIndex}`);
-        values.push(input.name);
-        paramIndex++;
-      }
-      if (input.description !== undefined) {
-        updateFields.push(`description = $${paramIndex}`);
-        values.push(input.description);
-        paramIndex++;
-      }
-      if (input.rules !== undefined) {
-        updateFields.push(`rules = $${paramIndex}`);
-        values.push(JSON.stringify(input.rules));
-        paramIndex++;
-      }
-      if (input.status !== undefined) {
-        updateFields.push(`status = $${paramIndex}`);
-        values.push(input.status);
-        paramIndex++;
-      }
-      if (updateFields.length === 0) return contract;
-      updateFields.push(`updated_at = CURRENT_TIMESTAMP`);
-      values.push(id);
-      const result = await query(
-        `UPDATE trustcore_contracts
-         SET ${updateFields.join(', ')}
-         WHERE id = $${paramIndex}
-         RETURNING id, name, description, rules, status, created_at as "createdAt", updated_at as "updatedAt"`,
-        values
-      );
-      return this.mapRowToContract(result.rows[0]);
+      return await this.crud.update(id, input);
     } catch (error) {
       console.error('Error updating contract:', error);
       throw error;
@@ -105,10 +103,7 @@ export class ContractRepository {
 
   async delete(id: string): Promise<boolean> {
     try {
-      const contract = await this.findById(id);
-      if (!contract) return false;
-      const result = await query('DELETE FROM trustcore_contracts WHERE id = $1', [id]);
-      return result.rowCount ? result.rowCount > 0 : false;
+      return (await this.crud.delete(id)) !== null;
     } catch (error) {
       console.error('Error deleting contract:', error);
       throw error;
@@ -1,33 +1,77 @@
 import type { FastifyInstance } from 'fastify';
+import { parseCountStrategy, parseExportFormat, withTransaction, EXPORT_CONTENT_TYPES } from '@dataspace/db';
 import { ContractRepository } from '../repositories/contract-repository.js';
 import { ContractValidator } from '../validators/contract-validator.js';
-import { contractEventEmitter } from '../events/contract-events.js';
+import { contractEventEmitter, ContractEventHandler } from '../events/contract-events.js';
 
 export async function registerContractRoutes(app: FastifyInstance): Promise<void> {
   const repository = new ContractRepository();
   const validator = new ContractValidator();
+  const events = new ContractEventHandler();
 
   // GET /contracts - List all contracts with pagination
   app.get<{
-    Querystring: { page?: string; pageSize?: string };
+    Querystring: { page?: string; pageSize?: string; cursor?: string; after?: string; count?: string };
   }>('/contracts', async (request, reply) => {
     try {
       const page = request.query.page ? parseInt(request.query.page) : 1;
       const pageSize = request.query.pageSize ? parseInt(request.query.pageSize) : 10;
+      const cursor = request.query.cursor ?? request.query.after;
+      // The list body carries no total, so counting is opt-in via ?count=
+      const count = parseCountStrategy(request.query.count, 'none');
 
-      const result = await repository.findAll(page, pageSize);
+      if (cursor !== undefined) {
+        const keysetPage = await repository.findAllAfter(cursor || null, pageSize);
+        return reply.send(keysetPage);
+      }
+
+      const result = await repository.findAll(page, pageSize, count);
+      if (result.total !== null) {
+        reply.header('X-Total-Count', String(result.total));
+      }
       return reply.send(result.data);
     } catch (error) {
+      if (
+        error instanceof Error &&
+        (error.message === 'Invalid cursor' || error.message === 'Invalid count strategy')
+      ) {
+        return reply.status(400).send({ error: error.message });
+      }
       const message = error instanceof Error ? error.message : 'Failed to list contracts';
       return reply.status(500).send({ error: message });
     }
   });
 
+  // GET /contracts/export - Stream all contracts as CSV or NDJSON
+  app.get<{
+    Querystring: { format?: string };
+  }>('/contracts/export', async (request, reply) => {
+    try {
+      const format = parseExportFormat(request.query.format);
+      const stream = await repository.exportAll(format);
+      return reply
+        .header('Content-Type', EXPORT_CONTENT_TYPES[format])
+        .header('Content-Disposition', `attachment; filename="contracts.${format}"`)
+        .send(stream);
+    } catch (error) {
+      if (error instanceof Error && error.message === 'Invalid export format') {
+        return reply.status(400).send({ error: error.message });
+      }
+      const message = error instanceof Error ? error.message : 'Failed to export contracts';
+      return reply.status(500).send({ error: message });
+    }
+  });
+
   // POST /contracts - Create a new contract
   app.post<{ Body: any }>('/contracts', async (request, reply) => {
     try {
       const input = validator.validateCreateInput(request.body);
-      const contract = await repository.create(input);
+      // The event is recorded in the same transaction as the change
+      const contract = await withTransaction(async () => {
+        const created = await repository.create(input);
+        await events.onContractCreated(created);
+        return created;
+      });
       contractEventEmitter.emitContractCreated(contract);
       return reply.status(201).send(contract);
     } catch (error) {
@@ -56,7 +100,11 @@ export async function registerContractRoutes(app: FastifyInstance): Promise<void
   app.put<{ Params: { id: string }; Body: any }>('/contracts/:id', async (request, reply) => {
     try {
       const input = validator.validateUpdateInput(request.body);
-      const contract = await repository.update(request.params.id, input);
+      const contract = await withTransaction(async () => {
+        const updated = await repository.update(request.params.id, input);
+        if (updated) await events.onContractUpdated(updated);
+        return updated;
+      });
 
       if (!contract) {
         return reply.status(404).send({ error: 'Contract not found' });
@@ -75,7 +123,11 @@ export async function registerContractRoutes(app: FastifyInstance): Promise<void
     Params: { id: string };
   }>('/contracts/:id', async (request, reply) => {
     try {
-      const success = await repository.delete(request.params.id);
+      const success = await withTransaction(async () => {
+        const deleted = await repository.delete(request.params.id);
+        if (deleted) await events.onContractDeleted(request.params.id);
+        return deleted;
+      });
       if (!success) {
         return reply.status(404).send({ error: 'Contract not found' });
       }
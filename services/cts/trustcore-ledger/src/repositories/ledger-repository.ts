@@ -3,25 +3,42 @@
  * Handles all ledger data persistence operations
  */
 
-import { query } from '@dataspace/db';
+import type { Readable } from 'node:stream';
+import {
+  query,
+  queryPage,
+  buildKeysetQuery,
+  toKeysetPage,
+  CrudRepository,
+  type CountStrategy,
+  type ExportFormat,
+  type KeysetPage,
+  type TableDescriptor,
+} from '@dataspace/db';
 import type { Ledger, CreateLedgerInput, UpdateLedgerInput } from '../types/ledger.js';
 
+const LEDGER_TABLE: TableDescriptor = {
+  table: 'trustcore_ledger',
+  returning: `id, name, description, rules, status,
+              created_at as "createdAt", updated_at as "updatedAt"`,
+  columns: { name: 'name', description: 'description', rules: 'rules', status: 'status' },
+  jsonColumns: ['rules'],
+};
+
 export class LedgerRepository {
+  private readonly crud = new CrudRepository<Ledger>(LEDGER_TABLE, (row) => this.mapRowToLedger(row));
+
   /**
    * Create new ledger entry
    */
   async create(input: CreateLedgerInput): Promise<Ledger> {
     try {
-      const result = await query(
-        `INSERT INTO trustcore_ledger
-         (name, description, rules, status)
-         VALUES ($1, $2, $3, $4)
-         RETURNING id, name, description, rules, status,
-                   created_at as "createdAt", updated_at as "updatedAt"`,
-        [input.name, input.description, JSON.stringify(input.rules), input.status || 'draft']
-      );
-
-      return this.mapRowToLedger(result.rows[0]);
+      return await this.crud.insert({
+        name: input.name,
+        description: input.description,
+        rules: input.rules,
+        status: input.status || 'draft',
+      });
     } catch (error) {
       console.error('Error creating ledger entry:', error);
       throw error;
@@ -31,46 +48,66 @@ export class LedgerRepository {
   /**
    * Find all ledger entries with pagination
    */
-  async findAll(page: number = 1, pageSize: number = 10): Promise<{ data: Ledger[]; total: number }> {
+  async findAll(page: number = 1, pageSize: number = 10, count: CountStrategy = 'exact'): Promise<{ data: Ledger[]; total: number | null }> {
     try {
-      // Get total count
-      const countResult = await query('SELECT COUNT(*) FROM trustcore_ledger');
-      const total = parseInt(countResult.rows[0].count, 10);
-
-      // Get paginated data
-      const offset = (page - 1) * pageSize;
-      const result = await query(
-        `SELECT id, name, description, rules, status,
-                created_at as "createdAt", updated_at as "updatedAt"
-         FROM trustcore_ledger
-         ORDER BY created_at DESC
-         LIMIT $1 OFFSET $2`,
-        [pageSize, offset]
+      const result = await queryPage(
+        {
+          columns: `id, name, description, rules, status,
+                    created_at as "createdAt", updated_at as "updatedAt"`,
+          from: 'trustcore_ledger',
+          page,
+          pageSize,
+          count,
+        },
+        (row) => this.mapRowToLedger(row)
       );
 
-      const data = result.rows.map((row: any) => this.mapRowToLedger(row));
-
-      return { data, total };
+      return { data: result.data, total: result.total };
     } catch (error) {
       console.error('Error fetching all ledger entries:', error);
       throw error;
     }
   }
 
+  /**
+   * Find all ledger entries with keyset (cursor) pagination
+   */
+  async findAllAfter(after: string | null, pageSize: number = 10): Promise<KeysetPage<Ledger>> {
+    try {
+      const { text, values } = buildKeysetQuery({
+        columns: `id, name, description, rules, status,
+                  created_at as "createdAt", updated_at as "updatedAt"`,
+        from: 'trustcore_ledger',
+        after,
+        pageSize,
+      });
+      const result = await query(text, values);
+
+      return toKeysetPage(result.rows, pageSize, (row) => this.mapRowToLedger(row));
+    } catch (error) {
+      console.error('Error fetching ledger entries by cursor:', error);
+      throw error;
+    }
+  }
+
+  /**
+   * Stream all ledger entries as CSV or NDJSON
+   */
+  async exportAll(format: ExportFormat): Promise<Readable> {
+    try {
+      return await this.crud.export(format);
+    } catch (error) {
+      console.error('Error exporting ledger entries:', error);
+      throw error;
+    }
+  }
+
   /**
    * Find ledger entry by ID
    */
   async findById(id: string): Promise<Ledger | null> {
     try {
-      const result = await query(
-        `SELECT id, name, description, rules, status,
-                created_at as "createdAt", updated_at as "updatedAt"
-         FROM trustcore_ledger
-         WHERE id = $1`,
-        [id]
-      );
-
-      return result.rows.length > 0 ? this.mapRowToLedger(result.rows[0]) : null;
+      return await this.crud.findById(id);
     } catch (error) {
       console.error('Error fetching ledger entry by ID:', error);
       throw error;
@@ -82,54 +119,7 @@ export class LedgerRepository {
    */
   async update(id: string, input: UpdateLedgerInput): Promise<Ledger | null> {
     try {
-      const ledger = await this.findById(id);
-      if (!ledger) return null;
-
-      const updateFields: string[] = [];
-      const values: any[] = [];
-      let paramIndex = 1;
-
-      if (input.name !== undefined) {
-        updateFields.push(`name = $${paramIndex}`);
-        values.push(input.name);
-        paramIndex++;
-      }
-
-      if (input.description !== undefined) {
-        updateFields.push(`description = $${paramIndex}`);
-        values.push(input.description);
-        paramIndex++;
-      }
-
-      if (input.rules !== undefined) {
-        updateFields.push(`rules = $${paramIndex}`);
-        values.push(JSON.stringify(input.rules));
-        paramIndex++;
-      }
-
-      if (input.status !== undefined) {
-        updateFields.push(`status = $${paramIndex}`);
-        values.push(input.status);
-        paramIndex++;
-      }
-
-      if (updateFields.length === 0) {
-        return ledger;
-      }
-
-      updateFields.push(`updated_at = CURRENT_TIMESTAMP`);
-      values.push(id);
-
-      const result = await query(
-        `UPDATE trustcore_ledger
-         SET ${updateFields.join(', ')}
-         WHERE id = $${paramIndex}
-         RETURNING id, name, description, rules, status,
-                   created_at as "createdAt", updated_at as "updatedAt"`,
-        values
-      );
-
-      return this.mapRowToLedger(result.rows[0]);
+      return await this.crud.update(id, input);
     } catch (error) {
       console.error('Error updating ledger entry:', error);
       throw error;
@@ -141,11 +131,7 @@ export class LedgerRepository {
    */
   async delete(id: string): Promise<boolean> {
     try {
-      const ledger = await this.findById(id);
-      if (!ledger) return false;
-
-      const result = await query('DELETE FROM trustcore_ledger WHERE id = $1', [id]);
-      return result.rowCount ? result.rowCount > 0 : false;
+      return (await this.crud.delete(id)) !== null;
     } catch (error) {
       console.error('Error deleting ledger entry:', error);
       throw error;
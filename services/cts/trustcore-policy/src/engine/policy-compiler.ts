@@ -0,0 +1,307 @@
+/**
+ * Policy Compiler - turns a policy's rules into a decision function
+ *
+ * Rules follow ODRL: an `allow` rule is a permission, a `deny` rule a
+ * prohibition, and its condition is a constraint over the request context:
+ *
+ *   role == "admin"
+ *   purpose in ["research", "statistics"] && consumer.country != "XX"
+ *   dateTime < "2027-01-01T00:00:00Z" || !(action == "distribute")
+ *
+ * Left operands are dotted paths into the context; `dateTime` defaults to the
+ * evaluation time. Operators: == != < <= > >= in, not in, contains. A right
+ * operand of "*" matches any value that is present. A constraint on a missing
+ * attribute is never satisfied.
+ *
+ * Each condition is parsed once into a tree of closures, so evaluating a
+ * request does no parsing and no JSON traversal beyond the paths it reads.
+ */
+
+import type { Policy, PolicyDecision, PolicyRule } from '../types/policy.js';
+
+export type EvaluationContext = Record<string, unknown>;
+
+type Predicate = (context: EvaluationContext, now: number) => boolean;
+type Operand = (context: EvaluationContext, now: number) => unknown;
+type Literal = string | number | boolean | Literal[];
+
+export class PolicyCompileError extends Error {
+  constructor(message: string) {
+    super(message);
+    this.name = 'PolicyCompileError';
+  }
+}
+
+export interface CompiledPolicy {
+  id: string;
+  version: string;
+  active: boolean;
+  decide(context: EvaluationContext): PolicyDecision;
+}
+
+const OPERATORS = ['==', '!=', '<=', '>=', '<', '>', 'in', 'not in', 'contains'] as const;
+type Operator = (typeof OPERATORS)[number];
+
+const TOKEN_PATTERN =
+  /\s*(?:(-?\d+(?:\.\d+)?)|"((?:[^"\\]|\\.)*)"|'((?:[^'\\]|\\.)*)'|(==|!=|<=|>=|&&|\|\||[<>!()[\],])|([A-Za-z_][\w.:-]*))/y;
+
+type Token =
+  | { kind: 'number'; value: number }
+  | { kind: 'string'; value: string }
+  | { kind: 'symbol'; value: string }
+  | { kind: 'word'; value: string };
+
+const tokenize = (source: string): Token[] => {
+  const text = source.trim();
+  const tokens: Token[] = [];
+  TOKEN_PATTERN.lastIndex = 0;
+  while (TOKEN_PATTERN.lastIndex < text.length) {
+    const start = TOKEN_PATTERN.lastIndex;
+    const match = TOKEN_PATTERN.exec(text);
+    if (!match) {
+      const position = text.length - text.slice(start).trimStart().length;
+      throw new PolicyCompileError(`Unexpected character at position ${position}`);
+    }
+    const [, number, double, single, symbol, word] = match;
+    if (number !== undefined) tokens.push({ kind: 'number', value: Number(number) });
+    else if (double !== undefined) tokens.push({ kind: 'string', value: double.replace(/\\(.)/g, '$1') });
+    else if (single !== undefined) tokens.push({ kind: 'string', value: single.replace(/\\(.)/g, '$1') });
+    else if (symbol !== undefined) tokens.push({ kind: 'symbol', value: symbol });
+    else tokens.push({ kind: 'word', value: word });
+  }
+  return tokens;
+};
+
+const resolvePath = (segments: string[]): Operand => {
+  if (segments.length === 1) {
+    const [key] = segments;
+    if (key === 'dateTime') {
+      return (context, now) => (context.dateTime === undefined ? now : context.dateTime);
+    }
+    return (context) => context[key];
+  }
+  return (context) => {
+    let value: unknown = context;
+    for (const segment of segments) {
+      if (value === null || typeof value !== 'object') return undefined;
+      value = (value as Record<string, unknown>)[segment];
+    }
+    return value;
+  };
+};
+
+const ISO_DATE = /^\d{4}-\d{2}-\d{2}(?:[T ][\d:.]+(?:Z|[+-]\d{2}:?\d{2})?)?$/;
+
+// Ordering comparisons are numeric for numbers, by instant for ISO dates
+// (the evaluation time is a number of milliseconds) and lexical otherwise
+const toComparable = (value: unknown, dates: boolean): number | string | undefined => {
+  if (typeof value === 'number') return value;
+  if (typeof value === 'string') return dates ? Date.parse(value) : value;
+  if (value instanceof Date) return value.getTime();
+  return undefined;
+};
+
+const equals = (left: unknown, right: Literal): boolean =>
+  right === '*' ? left !== undefined && left !== null : left === right;
+
+const compileComparison = (operand: Operand, operator: Operator, right: Literal): Predicate => {
+  switch (operator) {
+    case '==':
+      return (context, now) => equals(operand(context, now), right);
+    case '!=':
+      return (context, now) => {
+        const left = operand(context, now);
+        return left !== undefined && !equals(left, right);
+      };
+    case 'in':
+    case 'not in': {
+      if (!Array.isArray(right)) {
+        throw new PolicyCompileError(`Operator ${operator} needs a list`);
+      }
+      const members = new Set(right);
+      const wildcard = members.has('*');
+      const negate = operator === 'not in';
+      return (context, now) => {
+        const left = operand(context, now);
+        if (left === undefined || left === null) return false;
+        return (wildcard || members.has(left as Literal)) !== negate;
+      };
+    }
+    case 'contains':
+      return (context, now) => {
+        const left = operand(context, now);
+        if (Array.isArray(left)) return right === '*' ? left.length > 0 : left.includes(right);
+        return typeof left === 'string' && typeof right === 'string' && left.includes(right);
+      };
+    default: {
+      const dates = typeof right === 'string' && ISO_DATE.test(right);
+      const bound = toComparable(right, dates);
+      if (bound === undefined || Number.isNaN(bound)) {
+        throw new PolicyCompileError(`Operator ${operator} needs a number, date or string`);
+      }
+      const test =
+        operator === '<'
+          ? (value: number | string) => value < bound
+          : operator === '<='
+            ? (value: number | string) => value <= bound
+            : operator === '>'
+              ? (value: number | string) => value > bound
+              : (value: number | string) => value >= bound;
+      return (context, now) => {
+        const value = toComparable(operand(context, now), dates);
+        return value !== undefined && typeof value === typeof bound && !Number.isNaN(value) && test(value);
+      };
+    }
+  }
+};
+
+// Recursive descent over: or := and ('||' and)*, and := unary ('&&' unary)*,
+// unary := '!' unary | '(' or ')' | 'true' | 'false' | path operator literal
+class ConditionParser {
+  private position = 0;
+
+  constructor(private tokens: Token[]) {}
+
+  parse(): Predicate {
+    const predicate = this.parseOr();
+    if (this.position < this.tokens.length) {
+      throw new PolicyCompileError(`Unexpected ${this.describe(this.tokens[this.position])}`);
+    }
+    return predicate;
+  }
+
+  private parseOr(): Predicate {
+    const terms = [this.parseAnd()];
+    while (this.acceptSymbol('||') || this.acceptWord('or')) terms.push(this.parseAnd());
+    return terms.length === 1 ? terms[0] : (context, now) => terms.some((term) => term(context, now));
+  }
+
+  private parseAnd(): Predicate {
+    const terms = [this.parseUnary()];
+    while (this.acceptSymbol('&&') || this.acceptWord('and')) terms.push(this.parseUnary());
+    return terms.length === 1 ? terms[0] : (context, now) => terms.every((term) => term(context, now));
+  }
+
+  private parseUnary(): Predicate {
+    if (this.acceptSymbol('!') || this.acceptWord('not')) {
+      const inner = this.parseUnary();
+      return (context, now) => !inner(context, now);
+    }
+    if (this.acceptSymbol('(')) {
+      const inner = this.parseOr();
+      this.expectSymbol(')');
+      return inner;
+    }
+    if (this.acceptWord('true')) return () => true;
+    if (this.acceptWord('false')) return () => false;
+
+    const token = this.next();
+    if (token?.kind !== 'word') {
+      throw new PolicyCompileError(`Expected an attribute, found ${this.describe(token)}`);
+    }
+    const operand = resolvePath(token.value.split('.'));
+    const operator = this.parseOperator();
+    return compileComparison(operand, operator, this.parseLiteral());
+  }
+
+  private parseOperator(): Operator {
+    const token = this.next();
+    if (token?.kind === 'word' && token.value === 'not' && this.acceptWord('in')) return 'not in';
+    if (token && (token.kind === 'symbol' || token.kind === 'word')) {
+      const operator = OPERATORS.find((candidate) => candidate === token.value);
+      if (operator) return operator;
+    }
+    throw new PolicyCompileError(`Expected an operator, found ${this.describe(token)}`);
+  }
+
+  private parseLiteral(): Literal {
+    if (this.acceptSymbol('[')) {
+      const items: Literal[] = [];
+      if (!this.acceptSymbol(']')) {
+        do items.push(this.parseLiteral());
+        while (this.acceptSymbol(','));
+        this.expectSymbol(']');
+      }
+      return items;
+    }
+    const token = this.next();
+    if (token?.kind === 'string' || token?.kind === 'number') return token.value;
+    if (token?.kind === 'word' && (token.value === 'true' || token.value === 'false')) return token.value === 'true';
+    throw new PolicyCompileError(`Expected a value, found ${this.describe(token)}`);
+  }
+
+  private next(): Token | undefined {
+    return this.tokens[this.position++];
+  }
+
+  private acceptSymbol(value: string): boolean {
+    const token = this.tokens[this.position];
+    if (token?.kind === 'symbol' && token.value === value) {
+      this.position++;
+      return true;
+    }
+    return false;
+  }
+
+  private acceptWord(value: string): boolean {
+    const token = this.tokens[this.position];
+    if (token?.kind === 'word' && token.value === value) {
+      this.position++;
+      return true;
+    }
+    return false;
+  }
+
+  private expectSymbol(value: string): void {
+    if (!this.acceptSymbol(value)) {
+      throw new PolicyCompileError(`Expected '${value}', found ${this.describe(this.tokens[this.position])}`);
+    }
+  }
+
+  private describe(token: Token | undefined): string {
+    return token ? `'${token.value}'` : 'end of condition';
+  }
+}
+
+/**
+ * Compile one rule condition
+ * @throws PolicyCompileError when the condition is not a valid constraint
+ */
+export const compileCondition = (condition: string): Predicate => new ConditionParser(tokenize(condition)).parse();
+
+/**
+ * Compile a policy into a decision function. Rules are tried by ascending
+ * priority, prohibitions first among rules of equal priority, and the first
+ * satisfied rule decides. When none is satisfied the request is denied.
+ * @param version Cache version of the policy, its updated_at
+ * @throws PolicyCompileError naming the first rule that does not compile
+ */
+export const compilePolicy = (policy: Pick<Policy, 'id' | 'rules' | 'status'>, version: string): CompiledPolicy => {
+  const rank = (rule: PolicyRule) => (rule.effect === 'deny' ? 0 : 1);
+  const rules = [...policy.rules]
+    .sort((a, b) => a.priority - b.priority || rank(a) - rank(b))
+    .map((rule) => {
+      try {
+        return { id: rule.id, effect: rule.effect, matches: compileCondition(rule.condition) };
+      } catch (error) {
+        const message = error instanceof Error ? error.message : String(error);
+        throw new PolicyCompileError(`Rule ${rule.id ?? rule.name}: ${message}`);
+      }
+    });
+
+  const policyId = policy.id;
+  return {
+    id: policyId,
+    version,
+    active: policy.status === 'active',
+    decide(context: EvaluationContext): PolicyDecision {
+      const now = Date.now();
+      for (const rule of rules) {
+        if (rule.matches(context, now)) {
+          return { policyId, decision: rule.effect, ruleId: rule.id ?? null, reason: 'matched' };
+        }
+      }
+      return { policyId, decision: 'deny', ruleId: null, reason: 'no_match' };
+    },
+  };
+};
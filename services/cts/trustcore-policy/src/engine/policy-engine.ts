@@ -0,0 +1,135 @@
+/**
+ * Policy Engine - batch evaluation over compiled, cached policies
+ *
+ * Compiled policies are cached by id and version (updated_at). A cached
+ * policy is used as is for `revalidateAfterMs`; after that its version is
+ * re-read (one query for the whole batch, without rules) and only policies
+ * that changed are loaded and compiled again.
+ */
+
+import type { PolicyRepository } from '../repositories/policy-repository.js';
+import type { EvaluationRequest, PolicyDecision } from '../types/policy.js';
+import { compilePolicy, type CompiledPolicy } from './policy-compiler.js';
+
+export interface PolicyEngineOptions {
+  maxEntries?: number; // Compiled policies kept, least recently used evicted first, default 10000
+  revalidateAfterMs?: number; // Default 1000
+}
+
+export interface PolicyEngineStats {
+  evaluations: number;
+  batches: number;
+  compilations: number;
+  compileErrors: number;
+  cacheHits: number; // Policies served without a query
+  revalidations: number; // Policies whose version was checked and still current
+  cacheSize: number;
+}
+
+interface CacheEntry {
+  policy: CompiledPolicy | null; // null when the stored rules do not compile
+  version: string;
+  checkedAt: number;
+}
+
+const UUID_PATTERN = /^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$/i;
+
+export class PolicyEngine {
+  private cache = new Map<string, CacheEntry>();
+  private maxEntries: number;
+  private revalidateAfterMs: number;
+  private stats = { evaluations: 0, batches: 0, compilations: 0, compileErrors: 0, cacheHits: 0, revalidations: 0 };
+
+  constructor(
+    private repository: PolicyRepository,
+    options: PolicyEngineOptions = {}
+  ) {
+    this.maxEntries = options.maxEntries || 10000;
+    this.revalidateAfterMs = options.revalidateAfterMs ?? 1000;
+  }
+
+  /**
+   * Decide every request, in order. Unknown, inactive and uncompilable
+   * policies deny.
+   */
+  async evaluate(requests: EvaluationRequest[]): Promise<PolicyDecision[]> {
+    const policies = await this.resolve([...new Set(requests.map((request) => request.policyId))]);
+    this.stats.batches++;
+    this.stats.evaluations += requests.length;
+
+    return requests.map(({ policyId, context }): PolicyDecision => {
+      const entry = policies.get(policyId);
+      if (!entry) return { policyId, decision: 'deny', ruleId: null, reason: 'not_found' };
+      if (!entry.policy) return { policyId, decision: 'deny', ruleId: null, reason: 'invalid' };
+      if (!entry.policy.active) return { policyId, decision: 'deny', ruleId: null, reason: 'inactive' };
+      return entry.policy.decide(context);
+    });
+  }
+
+  // Drop a policy changed or deleted by this instance, so the next batch reloads it
+  invalidate(policyId: string): void {
+    this.cache.delete(policyId);
+  }
+
+  getStats(): PolicyEngineStats {
+    return { ...this.stats, cacheSize: this.cache.size };
+  }
+
+  private async resolve(ids: string[]): Promise<Map<string, CacheEntry>> {
+    const now = Date.now();
+    const resolved = new Map<string, CacheEntry>();
+    const unchecked: string[] = [];
+
+    for (const id of ids) {
+      if (!UUID_PATTERN.test(id)) continue;
+      const entry = this.cache.get(id);
+      if (entry && now - entry.checkedAt < this.revalidateAfterMs) {
+        this.stats.cacheHits++;
+        resolved.set(id, this.touch(id, entry));
+      } else {
+        unchecked.push(id);
+      }
+    }
+    if (unchecked.length === 0) return resolved;
+
+    const stale = new Set<string>();
+    for (const { id, version } of await this.repository.findVersions(unchecked)) {
+      const entry = this.cache.get(id);
+      if (entry && entry.version === version) {
+        this.stats.revalidations++;
+        entry.checkedAt = now;
+        resolved.set(id, this.touch(id, entry));
+      } else {
+        stale.add(id);
+      }
+    }
+    // Deleted policies simply drop out of the cache
+    for (const id of unchecked) {
+      if (!resolved.has(id) && !stale.has(id)) this.cache.delete(id);
+    }
+    if (stale.size === 0) return resolved;
+
+    for (const row of await this.repository.findForEvaluation([...stale])) {
+      let policy: CompiledPolicy | null = null;
+      try {
+        policy = compilePolicy(row, row.version);
+        this.stats.compilations++;
+      } catch (error) {
+        this.stats.compileErrors++;
+        console.error(`Policy ${row.id} does not compile:`, error);
+      }
+      resolved.set(row.id, this.touch(row.id, { policy, version: row.version, checkedAt: now }));
+    }
+    return resolved;
+  }
+
+  // Re-insert to mark as most recently used, evicting the oldest when full
+  private touch(id: string, entry: CacheEntry): CacheEntry {
+    this.cache.delete(id);
+    this.cache.set(id, entry);
+    if (this.cache.size > this.maxEntries) {
+      this.cache.delete(this.cache.keys().next().value as string);
+    }
+    return entry;
+  }
+}
@@ -1,4 +1,6 @@
 import { EventEmitter } from 'events';
+import { appendToOutbox } from '@dataspace/db';
+import { createDomainEvent, EventTopics, EventType, toOutboxEntry } from '@dataspace/kafka';
 import type { Policy } from '../types/policy.js';
 
 export class PolicyEventEmitter extends EventEmitter {
@@ -33,3 +35,31 @@ export class PolicyEventEmitter extends EventEmitter {
 }
 
 export const policyEventEmitter = new PolicyEventEmitter();
+
+// Events are recorded in the transactional outbox and published to Kafka by
+// the OutboxRelay; call these inside the withTransaction() that writes the change.
+export class PolicyEventHandler {
+  async onPolicyCreated(policy: Policy) {
+    await this.emit(EventType.POLICY_CREATED, policy);
+  }
+
+  async onPolicyUpdated(policy: Policy) {
+    await this.emit(EventType.POLICY_UPDATED, policy);
+  }
+
+  async onPolicyDeleted(policyId: string) {
+    const event = createDomainEvent(EventType.POLICY_DELETED, 'policy', policyId, { policyId });
+    await appendToOutbox(toOutboxEntry(EventTopics.POLICIES, event));
+  }
+
+  private async emit(eventType: EventType, policy: Policy) {
+    const event = createDomainEvent(eventType, 'policy', policy.id, {
+      policyId: policy.id,
+      name: policy.name,
+      description: policy.description,
+      status: policy.status,
+      rules: policy.rules,
+    });
+    await appendToOutbox(toOutboxEntry(EventTopics.POLICIES, event));
+  }
+}
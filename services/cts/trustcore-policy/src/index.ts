@@ -1,8 +1,13 @@
 import Fastify from 'fastify';
 import helmet from '@fastify/helmet';
 import cors from '@fastify/cors';
-import { initializePool } from '@dataspace/db';
+import { createJwtVerifierFromEnv, createRevocationListFromEnv, jwtAuth } from '@dataspace/auth';
+import { initializePool, getStatementStats, getOutboxBacklog, outboxStore } from '@dataspace/db';
+import { KafkaClient, OutboxRelay, outboxRelayOptionsFromEnv } from '@dataspace/kafka';
 import { registerPolicyRoutes } from './routes/policies-routes.js';
+import { PolicyRepository } from './repositories/policy-repository.js';
+import { PolicyEngine } from './engine/policy-engine.js';
+import { policyEventEmitter } from './events/policy-events.js';
 
 const app = Fastify({
   logger: true,
@@ -17,6 +22,13 @@ await app.register(cors, {
   exposedHeaders: ['Content-Range', 'X-Content-Range'],
 });
 
+// Bearer tokens are verified locally against the IdP's published keys
+// Revoked token ids are replicated from Redis into memory, so checking one
+// costs a Map lookup rather than a round trip per request
+const revocations = await createRevocationListFromEnv();
+const verifier = createJwtVerifierFromEnv(revocations);
+await app.register(jwtAuth, { verifier, required: process.env.AUTH_REQUIRED === 'true' });
+
 // Initialize database pool
 const dbConfig = {
   host: process.env.DB_HOST || 'localhost',
@@ -42,13 +54,53 @@ try {
   process.exit(1);
 }
 
+// Domain events are written to the outbox with each change and relayed to
+// Kafka when it is configured; otherwise they wait in the outbox.
+let outboxRelay: OutboxRelay | null = null;
+if (process.env.KAFKA_BROKERS) {
+  const kafka = new KafkaClient({
+    brokers: process.env.KAFKA_BROKERS.split(','),
+    clientId: process.env.KAFKA_CLIENT_ID || 'trustcore-policy',
+  });
+  outboxRelay = new OutboxRelay(kafka, outboxStore, outboxRelayOptionsFromEnv());
+  outboxRelay.start();
+}
+
 // Health check endpoint
 app.get('/health', async (request, reply) => {
   return { status: 'healthy', service: 'trustcore-policy' };
 });
 
+// Prepared statement metrics (calls, latency percentiles, rows, pool wait)
+app.get('/metrics/db', async (request, reply) => {
+  return { statements: getStatementStats() };
+});
+
+// Access token verification counters
+app.get('/metrics/auth', async (request, reply) => {
+  return { verifier: verifier.getStats(), revocations: revocations.getStats() };
+});
+
+// Outbox relay progress and unpublished backlog
+app.get('/metrics/outbox', async (request, reply) => {
+  return { relay: outboxRelay?.getStats() ?? null, backlog: await getOutboxBacklog() };
+});
+
+// Policies are compiled once per version and evaluated in memory. Changes
+// made through this instance apply at once; others within a second.
+const policyEngine = new PolicyEngine(new PolicyRepository(), {
+  revalidateAfterMs: parseInt(process.env.POLICY_REVALIDATE_MS || '1000'),
+});
+policyEventEmitter.onPolicyUpdated((policy) => policyEngine.invalidate(policy.id));
+policyEventEmitter.onPolicyDeleted((policyId) => policyEngine.invalidate(policyId));
+
+// Policy evaluation counters and compiled policy cache size
+app.get('/metrics/policies', async (request, reply) => {
+  return policyEngine.getStats();
+});
+
 // Register routes
-await registerPolicyRoutes(app);
+await registerPolicyRoutes(app, policyEngine);
 
 // Start server
 const start = async () => {
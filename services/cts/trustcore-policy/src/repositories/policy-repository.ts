@@ -3,25 +3,60 @@
  * Handles all policy data persistence operations
  */
 
-import { query } from '@dataspace/db';
+import type { Readable } from 'node:stream';
+import {
+  query,
+  queryPage,
+  buildKeysetQuery,
+  toKeysetPage,
+  CrudRepository,
+  defineStatement,
+  execute,
+  type CountStrategy,
+  type ExportFormat,
+  type KeysetPage,
+  type TableDescriptor,
+} from '@dataspace/db';
 import type { Policy, CreatePolicyInput, UpdatePolicyInput } from '../types/policy.js';
 
+const POLICY_TABLE: TableDescriptor = {
+  table: 'trustcore_policies',
+  returning: `id, name, description, rules, status,
+              created_at as "createdAt", updated_at as "updatedAt"`,
+  columns: { name: 'name', description: 'description', rules: 'rules', status: 'status' },
+  jsonColumns: ['rules'],
+};
+
+// updated_at as text keeps its full microsecond precision for version checks
+const FIND_VERSIONS = defineStatement(
+  'trustcore_policies.findVersions',
+  `SELECT id, updated_at::text as version FROM trustcore_policies WHERE id = ANY($1::uuid[])`
+);
+
+const FIND_FOR_EVALUATION = defineStatement(
+  'trustcore_policies.findForEvaluation',
+  `SELECT id, rules, status, updated_at::text as version FROM trustcore_policies WHERE id = ANY($1::uuid[])`
+);
+
+export interface PolicyVersion {
+  id: string;
+  version: string;
+}
+
 export class PolicyRepository {
+  private readonly crud = new CrudRepository<Policy>(POLICY_TABLE, (row) => this.mapRowToPolicy(row));
+
   /**
    * Create new policy
    */
   async create(input: CreatePolicyInput): Promise<Policy> {
     try {
-      const result = await query(
-        `INSERT INTO trustcore_policies
-         (name, description, rules, status)
-         VALUES ($1, $2, $3, $4)
-         RETURNING id, name, description, rules, status,
-                   created_at as "createdAt", updated_at as "updatedAt"`,
-        [input.name, input.description, JSON.stringify(input.rules), input.status || 'draft']
-      );
-
-      return this.mapRowToPolicy(result.rows[0]);
+      return await this.crud.insert({
+        name: input.name,
+        description: input.description,
+        rules: input.rules,
+        status: input.status || 'draft',
+      });
     } catch (error) {
       console.error('Error creating policy:', error);
       throw error;
@@ -31,46 +66,66 @@ export class PolicyRepository {
   /**
    * Find all policies with pagination
    */
-  async findAll(page: number = 1, pageSize: number = 10): Promise<{ data: Policy[]; total: number }> {
+  async findAll(page: number = 1, pageSize: number = 10, count: CountStrategy = 'exact'): Promise<{ data: Policy[]; total: number | null }> {
     try {
-      // Get total count
-      const countResult = await query('SELECT COUNT(*) FROM trustcore_policies');
-      const total = parseInt(countResult.rows[0].count, 10);
-
-      // Get paginated data
-      const offset = (page - 1) * pageSize;
-      const result = await query(
-        `SELECT id, name, description, rules, status,
-                created_at as "createdAt", updated_at as "updatedAt"
-         FROM trustcore_policies
-         ORDER BY created_at DESC
-         LIMIT $1 OFFSET $2`,
-        [pageSize, offset]
+      const result = await queryPage(
+        {
+          columns: `id, name, description, rules, status,
+                    created_at as "createdAt", updated_at as "updatedAt"`,
+          from: 'trustcore_policies',
+          page,
+          pageSize,
+          count,
+        },
+        (row) => this.mapRowToPolicy(row)
       );
 
-      const data = result.rows.map((row: any) => this.mapRowToPolicy(row));
-
-      return { data, total };
+      return { data: result.data, total: result.total };
     } catch (error) {
       console.error('Error fetching all policies:', error);
       throw error;
     }
   }
 
+  /**
+   * Find all policies with keyset (cursor) pagination
+   */
+  async findAllAfter(after: string | null, pageSize: number = 10): Promise<KeysetPage<Policy>> {
+    try {
+      const { text, values } = buildKeysetQuery({
+        columns: `id, name, description, rules, status,
+                  created_at as "createdAt", updated_at as "updatedAt"`,
+        from: 'trustcore_policies',
+        after,
+        pageSize,
+      });
+      const result = await query(text, values);
+
+      return toKeysetPage(result.rows, pageSize, (row) => this.mapRowToPolicy(row));
+    } catch (error) {
+      console.error('Error fetching policies by cursor:', error);
+      throw error;
+    }
+  }
+
+  /**
+   * Stream all policies as CSV or NDJSON
+   */
+  async exportAll(format: ExportFormat): Promise<Readable> {
+    try {
+      return await this.crud.export(format);
+    } catch (error) {
+      console.error('Error exporting policies:', error);
+      throw error;
+    }
+  }
+
   /**
    * Find policy by ID
    */
   async findById(id: string): Promise<Policy | null> {
     try {
-      const result = await query(
-        `SELECT id, name, description, rules, status,
-                created_at as "createdAt", updated_at as "updatedAt"
-         FROM trustcore_policies
-         WHERE id = $1`,
-        [id]
-      );
-
-      return result.rows.length > 0 ? this.mapRowToPolicy(result.rows[0]) : null;
+      return await this.crud.findById(id);
     } catch (error) {
       console.error('Error fetching policy by ID:', error);
       throw error;
@@ -82,54 +137,7 @@ export class PolicyRepository {
    */
   async update(id: string, input: UpdatePolicyInput): Promise<Policy | null> {
     try {
-      const policy = await this.findById(id);
-      if (!policy) return null;
-
-      const updateFields: string[] = [];
-      const values: any[] = [];
-      let paramIndex = 1;
-
-      if (input.name !== undefined) {
-        updateFields.push(`name = $${paramIndex}`);
-        values.push(input.name);
-        paramIndex++;
-      }
-
-      if (input.description !== undefined) {
-        updateFields.push(`description = $${paramIndex}`);
-        values.push(input.description);
-        paramIndex++;
-      }
-
-      if (input.rules !== undefined) {
-        updateFields.push(`rules = $${paramIndex}`);
-        values.push(JSON.stringify(input.rules));
-        paramIndex++;
-      }
-
-      if (input.status !== undefined) {
-        updateFields.push(`status = $${paramIndex}`);
-        values.push(input.status);
-        paramIndex++;
-      }
-
-      if (updateFields.length === 0) {
-        return policy;
-      }
-
-      updateFields.push(`updated_at = CURRENT_TIMESTAMP`);
-      values.push(id);
-
-      const result = await query(
-        `UPDATE trustcore_policies
-         SET ${updateFields.join(', ')}
-         WHERE id = $${paramIndex}
-         RETURNING id, name, description, rules, status,
-                   created_at as "createdAt", updated_at as "updatedAt"`,
-        values
-      );
-
-      return this.mapRowToPolicy(result.rows[0]);
+      return await this.crud.update(id, input);
     } catch (error) {
       console.error('Error updating policy:', error);
       throw error;
@@ -141,17 +149,45 @@ export class PolicyRepository {
    */
   async delete(id: string): Promise<boolean> {
     try {
-      const policy = await this.findById(id);
-      if (!policy) return false;
-
-      const result = await query('DELETE FROM trustcore_policies WHERE id = $1', [id]);
-      return result.rowCount ? result.rowCount > 0 : false;
+      return (await this.crud.delete(id)) !== null;
     } catch (error) {
       console.error('Error deleting policy:', error);
       throw error;
     }
   }
 
+  /**
+   * Current version (updated_at) of each policy found, without its rules;
+   * used to tell whether a compiled policy is still current
+   */
+  async findVersions(ids: string[]): Promise<PolicyVersion[]> {
+    try {
+      const result = await execute(FIND_VERSIONS, [ids]);
+      return result.rows.map((row) => ({ id: row.id, version: row.version }));
+    } catch (error) {
+      console.error('Error fetching policy versions:', error);
+      throw error;
+    }
+  }
+
+  /**
+   * Rules, status and version of each policy found, for compilation
+   */
+  async findForEvaluation(ids: string[]): Promise<(Pick<Policy, 'id' | 'rules' | 'status'> & { version: string })[]> {
+    try {
+      const result = await execute(FIND_FOR_EVALUATION, [ids]);
+      return result.rows.map((row) => ({
+        id: row.id,
+        rules: typeof row.rules === 'string' ? JSON.parse(row.rules) : row.rules,
+        status: row.status,
+        version: row.version,
+      }));
+    } catch (error) {
+      console.error('Error fetching policies for evaluation:', error);
+      throw error;
+    }
+  }
+
   /**
    * Map database row to Policy object
    */
@@ -1,33 +1,78 @@
 import type { FastifyInstance } from 'fastify';
+import { parseCountStrategy, parseExportFormat, withTransaction, EXPORT_CONTENT_TYPES } from '@dataspace/db';
 import { PolicyRepository } from '../repositories/policy-repository.js';
 import { PolicyValidator } from '../validators/policy-validator.js';
-import { policyEventEmitter } from '../events/policy-events.js';
+import { policyEventEmitter, PolicyEventHandler } from '../events/policy-events.js';
+import type { PolicyEngine } from '../engine/policy-engine.js';
 
-export async function registerPolicyRoutes(app: FastifyInstance): Promise<void> {
+export async function registerPolicyRoutes(app: FastifyInstance, engine: PolicyEngine): Promise<void> {
   const repository = new PolicyRepository();
   const validator = new PolicyValidator();
+  const events = new PolicyEventHandler();
 
   // GET /policies - List all policies with pagination
   app.get<{
-    Querystring: { page?: string; pageSize?: string };
+    Querystring: { page?: string; pageSize?: string; cursor?: string; after?: string; count?: string };
   }>('/policies', async (request, reply) => {
     try {
       const page = request.query.page ? parseInt(request.query.page) : 1;
       const pageSize = request.query.pageSize ? parseInt(request.query.pageSize) : 10;
+      const cursor = request.query.cursor ?? request.query.after;
+      // The list body carries no total, so counting is opt-in via ?count=
+      const count = parseCountStrategy(request.query.count, 'none');
 
-      const result = await repository.findAll(page, pageSize);
+      if (cursor !== undefined) {
+        const keysetPage = await repository.findAllAfter(cursor || null, pageSize);
+        return reply.send(keysetPage);
+      }
+
+      const result = await repository.findAll(page, pageSize, count);
+      if (result.total !== null) {
+        reply.header('X-Total-Count', String(result.total));
+      }
       return reply.send(result.data);
     } catch (error) {
+      if (
+        error instanceof Error &&
+        (error.message === 'Invalid cursor' || error.message === 'Invalid count strategy')
+      ) {
+        return reply.status(400).send({ error: error.message });
+      }
       const message = error instanceof Error ? error.message : 'Failed to list policies';
       return reply.status(500).send({ error: message });
     }
   });
 
+  // GET /policies/export - Stream all policies as CSV or NDJSON
+  app.get<{
+    Querystring: { format?: string };
+  }>('/policies/export', async (request, reply) => {
+    try {
+      const format = parseExportFormat(request.query.format);
+      const stream = await repository.exportAll(format);
+      return reply
+        .header('Content-Type', EXPORT_CONTENT_TYPES[format])
+        .header('Content-Disposition', `attachment; filename="policies.${format}"`)
+        .send(stream);
+    } catch (error) {
+      if (error instanceof Error && error.message === 'Invalid export format') {
+        return reply.status(400).send({ error: error.message });
+      }
+      const message = error instanceof Error ? error.message : 'Failed to export policies';
+      return reply.status(500).send({ error: message });
+    }
+  });
+
   // POST /policies - Create a new policy
   app.post<{ Body: any }>('/policies', async (request, reply) => {
     try {
       const input = validator.validateCreateInput(request.body);
-      const policy = await repository.create(input);
+      // The event is recorded in the same transaction as the change
+      const policy = await withTransaction(async () => {
+        const created = await repository.create(input);
+        await events.onPolicyCreated(created);
+        return created;
+      });
       policyEventEmitter.emitPolicyCreated(policy);
       return reply.status(201).send(policy);
     } catch (error) {
@@ -36,6 +81,25 @@ export async function registerPolicyRoutes(app: FastifyInstance): Promise<void>
     }
   });
 
+  // POST /policies/evaluate - Decide many (policy, request context) pairs in one call
+  app.post<{ Body: any }>('/policies/evaluate', async (request, reply) => {
+    let requests;
+    try {
+      requests = validator.validateEvaluateInput(request.body);
+    } catch (error) {
+      const message = error instanceof Error ? error.message : 'Invalid evaluation request';
+      return reply.status(400).send({ error: message });
+    }
+
+    try {
+      const results = await engine.evaluate(requests);
+      return reply.send({ results });
+    } catch (error) {
+      const message = error instanceof Error ? error.message : 'Failed to evaluate policies';
+      return reply.status(500).send({ error: message });
+    }
+  });
+
   // GET /policies/:id - Get a single policy
   app.get<{
     Params: { id: string };
@@ -56,7 +120,11 @@ export async function registerPolicyRoutes(app: FastifyInstance): Promise<void>
   app.put<{ Params: { id: string }; Body: any }>('/policies/:id', async (request, reply) => {
     try {
       const input = validator.validateUpdateInput(request.body);
-      const policy = await repository.update(request.params.id, input);
+      const policy = await withTransaction(async () => {
+        const updated = await repository.update(request.params.id, input);
+        if (updated) await events.onPolicyUpdated(updated);
+        return updated;
+      });
 
       if (!policy) {
         return reply.status(404).send({ error: 'Policy not found' });
@@ -75,7 +143,11 @@ export async function registerPolicyRoutes(app: FastifyInstance): Promise<void>
     Params: { id: string };
   }>('/policies/:id', async (request, reply) => {
     try {
-      const success = await repository.delete(request.params.id);
+      const success = await withTransaction(async () => {
+        const deleted = await repository.delete(request.params.id);
+        if (deleted) await events.onPolicyDeleted(request.params.id);
+        return deleted;
+      });
       if (!success) {
         return reply.status(404).send({ error: 'Policy not found' });
       }
@@ -29,3 +29,15 @@ export interface UpdatePolicyInput {
   rules?: PolicyRule[];
   status?: 'draft' | 'active' | 'deprecated';
 }
+
+export interface EvaluationRequest {
+  policyId: string;
+  context: Record<string, unknown>;
+}
+
+export interface PolicyDecision {
+  policyId: string;
+  decision: 'allow' | 'deny';
+  ruleId: string | null; // Rule that decided, null when the default deny applied
+  reason: 'matched' | 'no_match' | 'inactive' | 'not_found' | 'invalid';
+}
@@ -1,4 +1,16 @@
-import type { CreatePolicyInput, UpdatePolicyInput } from '../types/policy.js';
+import type { CreatePolicyInput, EvaluationRequest, UpdatePolicyInput } from '../types/policy.js';
+import { compileCondition } from '../engine/policy-compiler.js';
+
+export const MAX_EVALUATION_BATCH = 1000;
+
+const checkCondition = (condition: string, index: number): void => {
+  try {
+    compileCondition(condition);
+  } catch (error) {
+    const message = error instanceof Error ? error.message : String(error);
+    throw new Error(`Rule ${index} condition is invalid: ${message}`);
+  }
+};
 
 export class PolicyValidator {
   validateCreateInput(input: any): CreatePolicyInput {
@@ -22,6 +34,7 @@ export class PolicyValidator {
       if (!rule.condition || typeof rule.condition !== 'string') {
         throw new Error(`Rule ${index} must have a condition`);
       }
+      checkCondition(rule.condition, index);
       if (!['allow', 'deny'].includes(rule.effect)) {
         throw new Error(`Rule ${index} effect must be either 'allow' or 'deny'`);
       }
@@ -70,6 +83,7 @@ export class PolicyValidator {
         if (!rule.condition || typeof rule.condition !== 'string') {
           throw new Error(`Rule ${index} must have a condition`);
         }
+        checkCondition(rule.condition, index);
         if (!['allow', 'deny'].includes(rule.effect)) {
           throw new Error(`Rule ${index} effect must be either 'allow' or 'deny'`);
         }
@@ -89,4 +103,24 @@ export class PolicyValidator {
 
     return updated;
   }
+
+  validateEvaluateInput(input: any): EvaluationRequest[] {
+    if (!input || !Array.isArray(input.requests) || input.requests.length === 0) {
+      throw new Error('requests must be a non-empty array');
+    }
+    if (input.requests.length > MAX_EVALUATION_BATCH) {
+      throw new Error(`At most ${MAX_EVALUATION_BATCH} requests can be evaluated per call`);
+    }
+
+    return input.requests.map((request: any, index: number) => {
+      if (!request || typeof request.policyId !== 'string' || request.policyId === '') {
+        throw new Error(`Request ${index} must have a policyId`);
+      }
+      const context = request.context ?? {};
+      if (typeof context !== 'object' || Array.isArray(context)) {
+        throw new Error(`Request ${index} context must be an object`);
+      }
+      return { policyId: request.policyId, context };
+    });
+  }
 }
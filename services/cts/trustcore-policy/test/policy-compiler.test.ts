@@ -0,0 +1,235 @@
+import { describe, it, expect } from 'vitest';
+import { compileCondition, compilePolicy, PolicyCompileError } from '../src/engine/policy-compiler.js';
+import type { PolicyRule } from '../src/types/policy.js';
+
+const NOW = Date.parse('2026-06-01T00:00:00Z');
+
+const matches = (condition: string, context: Record<string, unknown>, now: number = NOW) =>
+  compileCondition(condition)(context, now);
+
+const rule = (id: string, condition: string, effect: 'allow' | 'deny', priority: number): PolicyRule => ({
+  id,
+  name: id,
+  condition,
+  effect,
+  priority,
+});
+
+describe('compileCondition', () => {
+  describe('comparisons', () => {
+    it('compares strings, numbers and booleans', () => {
+      expect(matches('role == "admin"', { role: 'admin' })).toBe(true);
+      expect(matches("role == 'admin'", { role: 'user' })).toBe(false);
+      expect(matches('role != "admin"', { role: 'user' })).toBe(true);
+      expect(matches('amount >= 10', { amount: 10 })).toBe(true);
+      expect(matches('amount < 10', { amount: 10 })).toBe(false);
+      expect(matches('verified == true', { verified: true })).toBe(true);
+    });
+
+    it('accepts negative and decimal numbers', () => {
+      expect(matches('amount > -5', { amount: -1 })).toBe(true);
+      expect(matches('amount > -5', { amount: -7 })).toBe(false);
+      expect(matches('amount>-5', { amount: 0 })).toBe(true);
+      expect(matches('score <= -0.5', { score: -0.75 })).toBe(true);
+      expect(matches('delta in [-1, 0, 1]', { delta: -1 })).toBe(true);
+    });
+
+    it('does not compare across types', () => {
+      expect(matches('amount > 5', { amount: '10' })).toBe(false);
+      expect(matches('amount == 5', { amount: '5' })).toBe(false);
+    });
+
+    it('unescapes quoted strings', () => {
+      expect(matches('name == "say \\"hi\\""', { name: 'say "hi"' })).toBe(true);
+    });
+
+    it('reads dotted paths', () => {
+      expect(matches('consumer.country == "ID"', { consumer: { country: 'ID' } })).toBe(true);
+      expect(matches('consumer.country == "ID"', { consumer: 'ID' })).toBe(false);
+    });
+  });
+
+  describe('in, not in and contains', () => {
+    it('tests list membership', () => {
+      expect(matches('purpose in ["research", "statistics"]', { purpose: 'research' })).toBe(true);
+      expect(matches('purpose in ["research", "statistics"]', { purpose: 'marketing' })).toBe(false);
+      expect(matches('purpose not in ["marketing"]', { purpose: 'research' })).toBe(true);
+      expect(matches('purpose not in ["marketing"]', { purpose: 'marketing' })).toBe(false);
+      expect(matches('purpose in []', { purpose: 'research' })).toBe(false);
+    });
+
+    it('tests array and substring containment', () => {
+      expect(matches('roles contains "admin"', { roles: ['user', 'admin'] })).toBe(true);
+      expect(matches('roles contains "admin"', { roles: ['user'] })).toBe(false);
+      expect(matches('email contains "@example.org"', { email: 'a@example.org' })).toBe(true);
+      expect(matches('roles contains "admin"', { roles: 42 })).toBe(false);
+    });
+  });
+
+  describe('missing attributes', () => {
+    it('never satisfies a constraint on a missing attribute', () => {
+      expect(matches('role == "admin"', {})).toBe(false);
+      expect(matches('role != "admin"', {})).toBe(false);
+      expect(matches('amount > -5', {})).toBe(false);
+      expect(matches('purpose in ["research"]', {})).toBe(false);
+      expect(matches('purpose not in ["research"]', {})).toBe(false);
+      expect(matches('roles contains "admin"', {})).toBe(false);
+      expect(matches('consumer.country == "ID"', {})).toBe(false);
+    });
+
+    it('treats null as missing for membership', () => {
+      expect(matches('purpose not in ["research"]', { purpose: null })).toBe(false);
+    });
+
+    it('satisfies a negated constraint on a missing attribute', () => {
+      expect(matches('!(role == "admin")', {})).toBe(true);
+    });
+  });
+
+  describe('wildcard', () => {
+    it('matches any value that is present', () => {
+      expect(matches('role == "*"', { role: 'anything' })).toBe(true);
+      expect(matches('role == "*"', { role: 0 })).toBe(true);
+      expect(matches('role == "*"', { role: null })).toBe(false);
+      expect(matches('role == "*"', {})).toBe(false);
+      expect(matches('role != "*"', { role: 'anything' })).toBe(false);
+    });
+
+    it('matches any member in lists and containment', () => {
+      expect(matches('purpose in ["*"]', { purpose: 'marketing' })).toBe(true);
+      expect(matches('purpose in ["*"]', {})).toBe(false);
+      expect(matches('purpose not in ["*"]', { purpose: 'marketing' })).toBe(false);
+      expect(matches('roles contains "*"', { roles: ['user'] })).toBe(true);
+      expect(matches('roles contains "*"', { roles: [] })).toBe(false);
+    });
+  });
+
+  describe('dateTime', () => {
+    it('defaults to the evaluation time', () => {
+      expect(matches('dateTime < "2027-01-01T00:00:00Z"', {})).toBe(true);
+      expect(matches('dateTime < "2027-01-01T00:00:00Z"', {}, Date.parse('2027-06-01T00:00:00Z'))).toBe(false);
+      expect(matches('dateTime >= "2026-06-01"', {})).toBe(true);
+    });
+
+    it('prefers a dateTime from the context', () => {
+      expect(matches('dateTime < "2027-01-01T00:00:00Z"', { dateTime: '2028-01-01T00:00:00Z' })).toBe(false);
+      expect(matches('dateTime < "2027-01-01T00:00:00Z"', { dateTime: new Date('2026-01-01T00:00:00Z') })).toBe(true);
+    });
+
+    it('compares other ISO dates by instant', () => {
+      expect(matches('validUntil > "2026-01-01T00:00:00Z"', { validUntil: '2026-01-01T07:00:00+07:00' })).toBe(false);
+      expect(matches('validUntil > "2026-01-01T00:00:00Z"', { validUntil: '2026-01-01T08:00:00+07:00' })).toBe(true);
+    });
+  });
+
+  describe('precedence', () => {
+    it('binds && tighter than ||', () => {
+      const condition = 'a == 1 || b == 1 && c == 1';
+      expect(matches(condition, { a: 1, b: 0, c: 0 })).toBe(true);
+      expect(matches(condition, { a: 0, b: 1, c: 0 })).toBe(false);
+      expect(matches(condition, { a: 0, b: 1, c: 1 })).toBe(true);
+    });
+
+    it('groups with parentheses', () => {
+      const condition = '(a == 1 || b == 1) && c == 1';
+      expect(matches(condition, { a: 1, b: 0, c: 0 })).toBe(false);
+      expect(matches(condition, { a: 1, b: 0, c: 1 })).toBe(true);
+    });
+
+    it('binds ! to the next term only', () => {
+      expect(matches('!a == 1 && b == 1', { a: 0, b: 1 })).toBe(true);
+      expect(matches('!(a == 1 && b == 1)', { a: 1, b: 0 })).toBe(true);
+      expect(matches('not a == 1 and b == 1 or c == 1', { a: 1, b: 1, c: 1 })).toBe(true);
+    });
+
+    it('accepts true and false as conditions', () => {
+      expect(matches('true', {})).toBe(true);
+      expect(matches('false || true', {})).toBe(true);
+      expect(matches('!true', {})).toBe(false);
+    });
+  });
+
+  describe('compile errors', () => {
+    it.each([
+      ['', 'Expected an attribute, found end of condition'],
+      ['role ==', 'Expected a value, found end of condition'],
+      ['role "admin"', "Expected an operator, found 'admin'"],
+      ['role ~ "admin"', 'Unexpected character at position 5'],
+      ['(role == "admin"', "Expected ')', found end of condition"],
+      ['role == "admin")', "Unexpected ')'"],
+      ['purpose in "research"', 'Operator in needs a list'],
+      ['amount > [1]', 'Operator > needs a number, date or string'],
+      ['amount > true', 'Operator > needs a number, date or string'],
+      ['role == "admin" &&', 'Expected an attribute, found end of condition'],
+    ])('rejects %j', (condition, message) => {
+      expect(() => compileCondition(condition)).toThrow(PolicyCompileError);
+      expect(() => compileCondition(condition)).toThrow(message);
+    });
+  });
+});
+
+describe('compilePolicy', () => {
+  it('lets the lowest priority decide', () => {
+    const policy = compilePolicy(
+      {
+        id: 'p1',
+        status: 'active',
+        rules: [rule('allow-admins', 'role == "admin"', 'allow', 2), rule('deny-blocked', 'blocked == true', 'deny', 1)],
+      },
+      'v1'
+    );
+
+    expect(policy.decide({ role: 'admin', blocked: true })).toEqual({
+      policyId: 'p1',
+      decision: 'deny',
+      ruleId: 'deny-blocked',
+      reason: 'matched',
+    });
+    expect(policy.decide({ role: 'admin', blocked: false }).ruleId).toBe('allow-admins');
+  });
+
+  it('tries prohibitions before permissions of equal priority', () => {
+    const policy = compilePolicy(
+      {
+        id: 'p1',
+        status: 'active',
+        rules: [rule('allow-all', 'role == "*"', 'allow', 1), rule('deny-guests', 'role == "guest"', 'deny', 1)],
+      },
+      'v1'
+    );
+
+    expect(policy.decide({ role: 'guest' })).toMatchObject({ decision: 'deny', ruleId: 'deny-guests' });
+    expect(policy.decide({ role: 'member' })).toMatchObject({ decision: 'allow', ruleId: 'allow-all' });
+  });
+
+  it('denies when no rule is satisfied', () => {
+    const policy = compilePolicy(
+      { id: 'p1', status: 'active', rules: [rule('allow-admins', 'role == "admin"', 'allow', 1)] },
+      'v1'
+    );
+
+    expect(policy.decide({})).toEqual({ policyId: 'p1', decision: 'deny', ruleId: null, reason: 'no_match' });
+  });
+
+  it('records version and status', () => {
+    const policy = compilePolicy({ id: 'p1', status: 'draft', rules: [] }, '2026-06-01T00:00:00.000Z');
+
+    expect(policy.version).toBe('2026-06-01T00:00:00.000Z');
+    expect(policy.active).toBe(false);
+  });
+
+  it('names the rule that does not compile', () => {
+    const compile = () =>
+      compilePolicy(
+        {
+          id: 'p1',
+          status: 'active',
+          rules: [rule('ok', 'role == "admin"', 'allow', 1), rule('broken', 'role ==', 'deny', 2)],
+        },
+        'v1'
+      );
+
+    expect(compile).toThrow(PolicyCompileError);
+    expect(compile).toThrow('Rule broken: Expected a value, found end of condition');
+  });
+});